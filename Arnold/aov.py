@@ -3,9 +3,10 @@
 import c4d
 from typing import Union,Optional
 
-from ..constants import *
+from ..constants.common_id import *
+from ..constants.arnold_id import *
 from . material import MaterialHelper
-from ..utils import get_nodes, iter_node, GetVideoPost
+from ..utils import get_nodes, iter_node, GetVideoPost, AOVPreset, AOVPlan, AOVState, trace
 
 class AOVHelper:
 
@@ -107,6 +108,7 @@ class AOVHelper:
             driver.SetParameter(path_id, path, c4d.DESCFLAGS_SET_0)
 
     # 创建aov ==> ok
+    @trace
     def create_aov_shader(self, aov_name: str = 'beauty') -> c4d.BaseObject:
         """
         Create an aov object with given name(copy from aov name)
@@ -185,6 +187,7 @@ class AOVHelper:
         return driver
 
     # 将aov添加到driver ==> ok
+    @trace
     def add_aov(self, driver: c4d.BaseObject, aov: c4d.BaseObject) -> Union[c4d.BaseObject,bool]:
                 
         if self.vp is None:
@@ -321,6 +324,73 @@ class AOVHelper:
         aov = self.get_aov(driver,aov_type)
         aov.Remove()        
 
+    # 获取所有driver ==> ok
+    def get_drivers(self) -> list[c4d.BaseObject]:
+        """
+        Get all the arnold drivers in the scene.
+        """
+        drivers = get_nodes(self.doc, TRACKED_TYPES=[ARNOLD_DRIVER])
+        return drivers if drivers else []
+
+    # 读取aov状态, 用于预设比较 ==> ok
+    def get_aov_state(self, driver: c4d.BaseObject, aov: c4d.BaseObject) -> AOVState:
+        """
+        Get the aov to compare with an ``AOVSpec``, the type is the aov name and the driver the driver name.
+        """
+        return AOVState(aov, {"type": aov.GetName(), "driver": driver.GetName()})
+
+    # 比较预设 ==> ok
+    @trace
+    def diff_preset(self, preset: AOVPreset, prune: bool = False) -> AOVPlan:
+        """
+        Compare the preset with the drivers and aovs of the scene without changing anything.
+        The aovs of a preset need a ``driver`` name.
+        """
+        if self.vp is None:
+            raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
+        preset.check_renderer("Arnold")
+        for spec in preset.aovs:
+            if spec.driver is None:
+                raise ValueError(f"The {spec.type} aov need a driver name")
+
+        drivers = self.get_drivers()
+        states = [self.get_aov_state(driver, aov) for driver in drivers for aov in self.get_aovs(driver)]
+        return preset.diff(states, prune, drivers=[driver.GetName() for driver in drivers])
+
+    # 应用预设 ==> ok
+    @trace
+    def apply_preset(self, preset: AOVPreset, prune: bool = False) -> AOVPlan:
+        """
+        Create the missing drivers and aovs of the preset, an existing driver is found by name.
+
+        Args:
+            preset (AOVPreset): the aov layout.
+            prune (bool, optional): remove the aovs not in the preset, the drivers are kept. Defaults to False.
+
+        Returns:
+            AOVPlan: the applied difference, ``plan.empty`` if nothing changed.
+        """
+        plan = self.diff_preset(preset, prune)
+        if plan.empty:
+            return plan
+
+        drivers = {driver.GetName(): driver for driver in self.get_drivers()}
+        for spec in plan.drivers:
+            driver = self.create_aov_driver(isDisplay = spec.driver_type is None,
+                                            driver_type = spec.driver_type if spec.driver_type is not None else C4DAIN_DRIVER_EXR,
+                                            denoise = spec.denoise, render_path = spec.render_path, sRGB = spec.srgb)
+            driver.SetName(spec.name)
+            drivers[spec.name] = driver
+
+        for state in plan.remove:
+            state.handle.Remove()
+        for spec in plan.add:
+            driver = drivers.get(spec.driver)
+            if driver is None:
+                raise ValueError(f"Can't find the arnold driver named {spec.driver}")
+            self.add_aov(driver, self.create_aov_shader(spec.type))
+        return plan
+
     # 设置Cryptomatte ==> ok
     def setup_cryptomatte(self, driver: c4d.BaseObject=None):
         if driver is None:
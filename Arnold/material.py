@@ -3,8 +3,9 @@ import c4d
 import maxon
 from typing import Union,Optional
 
-from ..constants import *
-from ..utils.node_helper import NodeGraghHelper
+from ..constants.common_id import *
+from ..constants.arnold_id import *
+from ..utils.node_helper import NodeGraghHelper, EditGraph
 from ..utils import EasyTransaction
 
 def IsArnoldMaterial(material: c4d.BaseMaterial) -> bool:
@@ -282,6 +283,7 @@ class MaterialHelper(NodeGraghHelper):
         
         return self.material
 
+    @EditGraph
     def AddNode(self, nodeId:str):
         """
         Adds a new shader to the graph.
@@ -776,6 +778,7 @@ class MaterialHelper(NodeGraghHelper):
             )   
     
     # 创建Texture ==> OK
+    @EditGraph
     def AddTexture(self, shadername :str = 'Texture', filepath: str = None, raw: bool = True, target_port: maxon.GraphNode = None) -> maxon.GraphNode :
         """
         Adds a new texture shader to the graph.
@@ -6,7 +6,8 @@ from typing import Union
 
 import c4d
 
-from ..constants import *
+from ..constants.common_id import *
+from ..constants.arnold_id import *
 from ..utils import EasyTransaction, generate_random_color
 # Avoid circular import with package-level functions in __init__
 # Delay-import `GetShaderLink`, `SetShaderLink`, `ArnoldShaderLinkCustomData`
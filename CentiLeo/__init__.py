@@ -5,7 +5,8 @@
 """
 from typing import Union, Optional
 import c4d
-from ..constants import *
+from ..constants.common_id import *
+from ..constants.centileo_id import *
 from .scene import SceneHelper as Scene
 from .material import MaterialHelper as Material
 from .aov import AOVHelper as AOV
@@ -1,6 +1,7 @@
 from warnings import warn
 import c4d
-from ..constants import *
+from ..constants.common_id import *
+from ..constants.centileo_id import *
 from ..utils import GetVideoPost
 
 # todo : not finished yet, wait for CentiLeoupdate their aov system.
@@ -3,8 +3,9 @@ import c4d
 import maxon
 from typing import Union, Optional
 
-from ..constants import *
-from ..utils.node_helper import NodeGraghHelper
+from ..constants.common_id import *
+from ..constants.centileo_id import *
+from ..utils.node_helper import NodeGraghHelper, EditGraph
 from ..utils import EasyTransaction
 
 
@@ -250,6 +251,7 @@ class MaterialHelper(NodeGraghHelper):
         
         return self.material
 
+    @EditGraph
     def AddNode(self, nodeId:str):
         """
         Adds a new shader to the graph.
@@ -437,6 +439,7 @@ class MaterialHelper(NodeGraghHelper):
             )   
     
     # 创建Texture ==> OK
+    @EditGraph
     def AddTexture(self, shadername :str = 'Texture', filepath: str = None, raw: bool = True, target_port: maxon.GraphNode = None) -> maxon.GraphNode :
         """
         Adds a new texture shader to the graph.
@@ -3,8 +3,9 @@
 import c4d
 from typing import Optional, Generator
 
-from ..constants import *
-from ..utils import GetVideoPost
+from ..constants.common_id import *
+from ..constants.corona_id import *
+from ..utils import GetVideoPost, AOVIndex, AOVPreset, AOVPlan, AOVState, trace
 
 class AOVHelper:
 
@@ -14,6 +15,8 @@ class AOVHelper:
 
     def __init__(self, vp: c4d.documents.BaseVideoPost = None):
         
+        self._aovIndex: Optional[AOVIndex] = None
+
         if isinstance(vp, c4d.documents.BaseVideoPost):
             if vp.GetType() == int(ID_CORONA):
                 self.doc = vp.GetDocument()
@@ -59,6 +62,24 @@ class AOVHelper:
 
             node = node.GetNext()
 
+    # 获取aov索引 ==> ok
+    def get_index(self) -> AOVIndex:
+        """
+        Get the type and name index of the render elements, it is built on the first lookup
+        and dropped by the helper edits. Call ``invalidate_index`` after editing the aovs elsewhere.
+        """
+        if self._aovIndex is None:
+            self._aovIndex = AOVIndex(get_type = self.get_type,
+                                      get_name = self.get_name).Build(self.iterater(self.get_master_head().GetFirst()))
+        return self._aovIndex
+
+    # 清除aov索引 ==> ok
+    def invalidate_index(self) -> None:
+        """
+        Drop the aov index, it is built again on the next lookup.
+        """
+        self._aovIndex = None
+
     # 获取Render Elemnt的GeListHead
     def get_master_head(self) -> Optional[c4d.GeListHead]:
         """Get the master head of the render element.
@@ -105,14 +126,17 @@ class AOVHelper:
 
     def set_type(self, node: c4d.BaseObject, arg: int) -> bool:
         """Set the type of the given node."""
+        self.invalidate_index()
         return node.SetParameter(CORONA_MULTIPASS_BASE_TYPE, arg, c4d.DESCFLAGS_SET_NONE)
 
     def set_type_name(self, node: c4d.BaseObject, arg: int) -> bool:
         """Set the type of the given node."""
+        self.invalidate_index()
         return node.SetParameter(CORONA_MULTIPASS_BASE_TYPE_NAME, arg, c4d.DESCFLAGS_SET_NONE)
 
     def set_name(self, node: c4d.BaseObject, arg: str) -> str:
         """Set the name of the given node."""
+        self.invalidate_index()
         return node.SetParameter(CORONA_MULTIPASS_BASE_NAME, arg, c4d.DESCFLAGS_SET_NONE)
 
     def set_enable(self, node: c4d.BaseObject, arg: int) -> bool:
@@ -124,6 +148,7 @@ class AOVHelper:
         return node.SetParameter(CORONA_MULTIPASS_BASE_ANTIALIASED, arg, c4d.DESCFLAGS_SET_NONE)
 
     # 获取所有aov shader ==> ok
+    @trace
     def get_all_aovs(self) -> list[c4d.BaseObject] :
         """
         Get all corona aovs in a list.
@@ -134,10 +159,7 @@ class AOVHelper:
         """
         
         """Get all render elements in the scene."""
-        res = []
-        for node in self.iterater(self.get_master_head().GetFirst()):
-            res.append(node)
-        return res
+        return self.get_index().GetAll()
 
     # 获取指定类型的aov shader ==> ok
     def get_aov(self, aov_type: int) -> list[c4d.BaseObject]:
@@ -152,18 +174,7 @@ class AOVHelper:
 
         """
 
-        # The list.
-        result: list = []
-
-        start_shader = self.get_master_head().GetFirst()
-        if not start_shader:
-            return result
-        for obj in self.iterater(start_shader):
-            if self.get_type(obj) != aov_type:
-                continue
-            result.append(obj)
-
-        return result
+        return self.get_index().GetType(aov_type)
 
     # 打印aov ==> ok
     def print_aov(self):
@@ -213,6 +224,7 @@ class AOVHelper:
         print ("--- CORONA RENDER ---")
 
     # 创建aov ==> ok
+    @trace
     def create_aov_shader(self, aov_type: int, aov_name: str = None) -> c4d.BaseObject :
         """
         Create a shader of corona aov.
@@ -236,6 +248,7 @@ class AOVHelper:
         return aov
     
     # 将aov添加到vp ==> ok
+    @trace
     def add_aov(self, aov_shader: c4d.BaseObject) -> c4d.BaseObject:
         """
         Add the corona aov shader to Octane Render.
@@ -254,6 +267,7 @@ class AOVHelper:
             self.doc.AddUndo(c4d.UNDOTYPE_NEWOBJ,aov_shader)
         except:
             pass        
+        self.invalidate_index()
         return aov_shader
 
     # 为aov添加属性 ==> ok
@@ -266,6 +280,7 @@ class AOVHelper:
             raise ValueError(f"Aov must be the {self.vpname} aov shader which is a BaseObject")    
         if aov_shader[aov_id] is not None:
             aov_shader[aov_id] = aov_attrib
+            self.invalidate_index()
         return aov_shader
         
     # 删除最新的aov ==> ok
@@ -275,6 +290,7 @@ class AOVHelper:
 
         """
         self.get_all_aovs()[0].Remove()
+        self.invalidate_index()
 
     # 删除全部aov ==> ok
     def remove_all_aov(self):
@@ -285,6 +301,7 @@ class AOVHelper:
         for aov in self.get_all_aovs():
             if isinstance(aov, c4d.BaseObject):
                 aov.Remove()  
+        self.invalidate_index()
 
     # 按照Type删除aov ==> ok
     def remove_aov_type(self, aov_type: int, filter_type: int = None):
@@ -301,6 +318,53 @@ class AOVHelper:
                         aov.Remove()  
                 else:
                     aov.Remove() 
+        self.invalidate_index()
+
+    # 读取aov状态, 用于预设比较 ==> ok
+    def get_aov_state(self, aov: c4d.BaseObject) -> AOVState:
+        """
+        Get the current values of the aov to compare with an ``AOVSpec``.
+        """
+        return AOVState(aov, {"type": self.get_type(aov), "name": self.get_name(aov), "enabled": bool(self.get_enable(aov))})
+
+    # 比较预设 ==> ok
+    @trace
+    def diff_preset(self, preset: AOVPreset, prune: bool = False) -> AOVPlan:
+        """
+        Compare the preset with the aovs of the render element without changing anything.
+        """
+        preset.check_renderer("Corona")
+        return preset.diff([self.get_aov_state(aov) for aov in self.get_index().GetAll()], prune, type_key=None)
+
+    # 应用预设 ==> ok
+    @trace
+    def apply_preset(self, preset: AOVPreset, prune: bool = False) -> AOVPlan:
+        """
+        Apply only the difference between the preset and the aovs of the render element.
+
+        Args:
+            preset (AOVPreset): the aov layout.
+            prune (bool, optional): remove the aovs not in the preset. Defaults to False.
+
+        Returns:
+            AOVPlan: the applied difference, ``plan.empty`` if nothing changed.
+        """
+        plan = self.diff_preset(preset, prune)
+
+        for state, spec, changes in plan.update:
+            if "name" in changes:
+                self.set_name(state.handle, changes["name"])
+            if "enabled" in changes:
+                self.set_enable(state.handle, changes["enabled"])
+        for state in plan.remove:
+            state.handle.Remove()
+        # 预设顺序, InsertFirst插入
+        for spec in reversed(plan.add):
+            aov = self.add_aov(self.create_aov_shader(spec.type, spec.name))
+            self.set_enable(aov, spec.enabled is not False)
+
+        self.invalidate_index()
+        return plan
 
 __all__ = [
     "AOVHelper"
@@ -3,8 +3,10 @@
 import c4d
 from typing import Union, Any
 import sys
-from ..constants import *
+from ..constants.common_id import *
+from ..constants.corona_id import *
 from ..utils import iterate
+from ..utils.shader_graph import ShaderGraph
 
 def IsCoronaMaterial(material: c4d.BaseMaterial) -> bool:
     if isinstance(material, c4d.BaseMaterial):
@@ -21,6 +23,7 @@ class MaterialHelper:
     def __init__(self, material: c4d.BaseMaterial = None):
         
         self.materialType: str = "Corona Material"
+        self._shaderGraph: ShaderGraph = None
 
         # First we want to modify exsited material
         if isinstance(material, c4d.BaseMaterial):
@@ -86,6 +89,7 @@ class MaterialHelper:
             if not self.IsCoronaMaterial():
                 raise ValueError("This is not an Corona Material")
         self.material: c4d.BaseMaterial = material
+        self.InvalidateShaderGraph()
         return self.material
     
     # 获取材质 ==> ok
@@ -244,6 +248,10 @@ class MaterialHelper:
         self.material.InsertShader(theNode)
         if self.doc is not None:
             self.doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, self.material)
+        if self._shaderGraph is not None:
+            self._shaderGraph.AddShader(theNode)
+            if parentNode:
+                self._shaderGraph.SetLink(self.material, parentNode, theNode)
         return theNode
 
     # 在shader后插入shader ==> ok
@@ -259,6 +267,11 @@ class MaterialHelper:
             slot = self.GetMaterialPort(shader)
         newShader[inputSlot] = shader
         parrent[slot] = newShader
+        if self._shaderGraph is not None:
+            if newShader not in self._shaderGraph:
+                self._shaderGraph.AddShader(newShader)
+            self._shaderGraph.SetLink(newShader, inputSlot, shader)
+            self._shaderGraph.SetLink(parrent, slot, newShader)
         return newShader
 
     # todo
@@ -266,6 +279,8 @@ class MaterialHelper:
         pass
 
     def RemoveShader(self, shader: c4d.BaseShader) -> None:
+        if self._shaderGraph is not None:
+            self._shaderGraph.RemoveShader(shader)
         return shader.Remove()
 
     # 是否是shader ==> ok
@@ -349,10 +364,57 @@ class MaterialHelper:
     
         try:
             node[paramId] = value
-            return True
         except Exception:
             return False
 
+        if self._shaderGraph is not None:
+            if isinstance(paramId, int):
+                self._shaderGraph.SetLink(node, paramId, value if isinstance(value, c4d.BaseShader) else None)
+            else:
+                self.InvalidateShaderGraph()
+        return True
+
+    #=============================================
+    # Connections
+    #=============================================
+
+    # 获取连接图, 一次遍历所有BaseContainer ==> ok
+    def GetShaderGraph(self) -> ShaderGraph:
+        """
+        Get the connection graph of the material, it is built lazily from one BaseContainer sweep,
+        the methods of the helper keep it up to date.
+        Call ``InvalidateShaderGraph`` after linking shaders by hand, e.g. ``shader[slot] = another``.
+
+        Returns:
+            ShaderGraph: the connection graph
+        """
+        if self._shaderGraph is None:
+            shaders = list(iterate(self.material.GetFirstShader()))
+            self._shaderGraph = ShaderGraph().Build(self.material, shaders, self._GetLinks)
+        return self._shaderGraph
+
+    # 废弃连接图 ==> ok
+    def InvalidateShaderGraph(self) -> None:
+        """
+        Drop the connection graph, it will be rebuilt at the next query.
+        """
+        self._shaderGraph = None
+
+    # 读取材质或shader上连接的shader ==> ok
+    def _GetLinks(self, owner: c4d.BaseList2D) -> list[tuple[int, c4d.BaseShader]]:
+        result: list = []
+        bc = owner.GetDataInstance()
+        if bc is None:
+            return result
+        for key in range(len(bc)):
+            key = bc.GetIndexId(key)
+            try:
+                if isinstance(bc[key], c4d.BaseShader):
+                    result.append((key, bc[key]))
+            except Exception :
+                pass
+        return result
+
     # New 获取前方节点(只包含子节点)  ==> ok
     def GetPreNode(self, node: c4d.BaseShader) -> list[c4d.BaseShader]:
         """
@@ -364,10 +426,7 @@ class MaterialHelper:
         Returns:
             list[c4d.BaseShader]: Return the nodes directly connected before the node.
         """
-        result = list()
-        for _ ,shader in self.GetConnections(node):
-            result.append(shader)
-        return result
+        return [shader for _, shader in self.GetShaderGraph().GetLinks(node)]
 
     # New 获取后方节点(只包含子节点)  ==> ok
     def GetNextNode(self, node: c4d.BaseShader) -> list[c4d.BaseShader]:
@@ -383,13 +442,8 @@ class MaterialHelper:
         # Bail when the passed node is not a true node.
         if not isinstance(node, c4d.BaseShader):
             raise ValueError(f'{sys._getframe().f_code.co_name} Expected a BaseShader, got {type(node)}')
-        # The list.
-        result: list = []
-        for shader in self.GetAllShaders():
-            for i in self.GetConnections(shader):
-                if i[1] == node:                
-                    result.append(shader)
-        return result
+
+        return [shader for _, shader in self.GetShaderGraph().GetParents(node, include_root=False)]
     
     # New 获取前方节点树(包含节点树)  ==> ok
     def GetPreNodes(self, node: c4d.BaseShader, filter_asset: str = None) -> list:
@@ -406,22 +460,9 @@ class MaterialHelper:
         # Bail when the passed node is not a true node.
         if not isinstance(node, c4d.BaseShader):
             raise ValueError(f'{sys._getframe().f_code.co_name} Expected a BaseShader, got {type(node)}')
-        
-        # The list.
-        result: list = []
 
-        for shader in iterate(node):
-            if filter_asset is not None:
-                if shader.GetType() == filter_asset and shader not in result:
-                    result.append(shader)
-            else:
-                if shader not in result:
-                    result.append(shader)
-
-        # remove the node self
-        result.remove(node)
-
-        return result
+        return [shader for shader in self.GetShaderGraph().IterDescendants(node)
+                if shader != node and (filter_asset is None or shader.GetType() == filter_asset)]
     
     # New 获取后方节点树(包含节点树)  ==> ok
     def GetNextNodes(self, node: c4d.BaseShader, filter_asset: str = None) -> list:
@@ -439,14 +480,47 @@ class MaterialHelper:
         # Bail when the passed node is not a true node.
         if not isinstance(node, c4d.BaseShader):
             raise ValueError(f'{sys._getframe().f_code.co_name} Expected a BaseShader, got {type(node)}')
-        # The list.
-        result: list = []
 
-        for shader in self.GetAllShaders():
-            if node in self.GetPreNodes(shader):
-                result.append(shader)
+        return [shader for shader in self.GetShaderGraph().IterAncestors(node)
+                if shader != node and (filter_asset is None or shader.GetType() == filter_asset)]
 
-        return result
+    # 获取材质插槽上的所有shader ==> ok
+    def GetSlotShaders(self, slot: int) -> list[c4d.BaseShader]:
+        """
+        Get all the shaders reachable from the given material slot, include all the node chain.
+
+        Args:
+            slot (int): the material slot, e.g. c4d.CORONA_MATERIAL_DIFFUSE_TEXTURE
+
+        Returns:
+            list[c4d.BaseShader]: the shaders
+        """
+        return self.GetShaderGraph().GetReachable(slot)
+
+    # 获取没有被使用的shader ==> ok
+    def GetOrphanShaders(self) -> list[c4d.BaseShader]:
+        """
+        Get all the shaders not reachable from any material slot.
+
+        Returns:
+            list[c4d.BaseShader]: the orphan shaders
+        """
+        return self.GetShaderGraph().GetOrphans()
+
+    # 删除没有被使用的shader ==> ok
+    def RemoveOrphanShaders(self) -> int:
+        """
+        Remove all the shaders not reachable from any material slot.
+
+        Returns:
+            int: the count of removed shaders
+        """
+        orphans = self.GetOrphanShaders()
+        for shader in orphans:
+            if self.doc is not None:
+                self.doc.AddUndo(c4d.UNDOTYPE_DELETEOBJ, shader)
+            self.RemoveShader(shader)
+        return len(orphans)
 
     # 获取材质上被连接的端口列表 ==> ok
     def GetRootConnectedNodes(self) -> list[c4d.BaseShader]:
@@ -481,10 +555,7 @@ class MaterialHelper:
             bool: True if connect to material, False if not.
 
         """
-        for _, shader in self.GetRootConnectedNodes(node):
-            if shader == node:
-                return True
-        return False
+        return self.GetShaderGraph().IsRoot(node)
     
     # 获取shader上被连接的端口列表 ==> ok
     def GetConnections(self, node: c4d.BaseShader) -> list[tuple[int, c4d.BaseShader]]:
@@ -517,9 +588,7 @@ class MaterialHelper:
             bool: True if isolated, False if not.
 
         """
-        if self.GetPreNode(node) or self.GetNextNode(node) or self.IsRootShader(node):
-            return True
-        return False
+        return self.GetShaderGraph().IsConnected(node)
 
     # 寻找shader在材质上的插槽
     def GetMaterialPort(self, node: c4d.BaseShader) -> int:
@@ -563,29 +632,13 @@ class MaterialHelper:
     # 查询shader连接的端口
     def GetConnectedPortAfter(self, node: c4d.BaseShader) -> int:
         """
-        Add a Transform node to all the Image nodes.
+        Get the slot the node plugged into, the material slot first, then the next shader.
         """
-        for _, shader in self.GetRootConnectedNodes(node):
-            if shader == node:
-                return self.GetMaterialPort(node)
-        
-        # Get the next node.
-        after_node: c4d.BaseShader = self.GetNextNode(node)[0]#node.GetUp()
-
-        bc = after_node.GetDataInstance()
-        if bc is None:
-            raise RuntimeError("Failed to retrieve bc")
-
-        # Iterates over the content of the BaseContainer using a for loop
-        for key in range(len(bc)):
-            # Check if the data retrieved can be printed in python (some DataType are not supported in Python)
-            key = bc.GetIndexId(key)
-            try:
-                if bc[key] == node:
-                    return key
-            except Exception :
-                pass
-        return False
+        graph = self.GetShaderGraph()
+        slot = graph.GetSlot(node, graph.root)
+        if slot is None:
+            slot = graph.GetSlot(node)
+        return slot if slot is not None else False
 
     def AddTexture(self, texturePath: str = None, nodeName: str = None, color_space: int = CR_COLORSPACE_LINEAR,
                            parentNode: c4d.BaseList2D = None) -> c4d.BaseList2D:
@@ -615,6 +668,9 @@ class MaterialHelper:
         normal_shader = c4d.BaseList2D(1035405)
         self.material.InsertShader(normal_shader)
         self.material[slot] = normal_shader
+        if self._shaderGraph is not None:
+            self._shaderGraph.AddShader(normal_shader)
+            self._shaderGraph.SetLink(self.material, slot, normal_shader)
 
         shader = c4d.BaseList2D(1036473)
         shader[c4d.CORONA_BITMAP_FILENAME] = img_path
@@ -623,6 +679,9 @@ class MaterialHelper:
         shader[c4d.ID_BASELIST_NAME] = name
         self.material.InsertShader(shader)
         normal_shader[c4d.CORONA_NORMALMAP_TEXTURE] = shader
+        if self._shaderGraph is not None:
+            self._shaderGraph.AddShader(shader)
+            self._shaderGraph.SetLink(normal_shader, c4d.CORONA_NORMALMAP_TEXTURE, shader)
         return normal_shader
 
     # Create a corona bitmap shader to load a texture
@@ -635,6 +694,9 @@ class MaterialHelper:
         shader[c4d.CORONA_BITMAP_COLORPROFILE] = color_space
         self.material.InsertShader(shader)
         self.material[slot] = shader
+        if self._shaderGraph is not None:
+            self._shaderGraph.AddShader(shader)
+            self._shaderGraph.SetLink(self.material, slot, shader)
         return shader
 
 __all__ = [
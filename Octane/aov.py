@@ -2,10 +2,20 @@
 
 import c4d
 import re
-from typing import Iterator
+from typing import Iterator, Optional
 
-from ..constants import *
-from ..utils import iterate, GetVideoPost
+from ..constants.common_id import *
+from ..constants.octane_id import *
+from ..utils import iterate, GetVideoPost, AOVIndex, AOVPreset, AOVPlan, AOVState, trace
+
+
+def _aov_groups(aov: c4d.BaseList2D) -> list[tuple]:
+    aov_type = aov[RNDAOV_TYPE]
+    if aov_type == RNDAOV_CUSTOM:
+        return [("custom", aov[c4d.RNDAOV_CUSTOM_IDS])]
+    if aov_type == RNDAOV_LIGHT:
+        return [("light", aov[c4d.RNDAOV_LIGHT_ID])]
+    return []
 
 class AOVHelper:
 
@@ -15,6 +25,8 @@ class AOVHelper:
 
     def __init__(self, vp: c4d.documents.BaseVideoPost = None):
         
+        self._aovIndex: Optional[AOVIndex] = None
+
         if isinstance(vp, c4d.documents.BaseVideoPost):
             if vp.GetType() == int(ID_OCTANE):
                 self.doc = vp.GetDocument()
@@ -49,6 +61,26 @@ class AOVHelper:
             
         return new_data
     
+    # 获取aov索引 ==> ok
+    def get_index(self) -> AOVIndex:
+        """
+        Get the type, name, custom id and light id index of the aov shaders, it is built on the
+        first lookup and dropped by the helper edits. Call ``invalidate_index`` after editing the aovs elsewhere.
+        """
+        if self._aovIndex is None:
+            start_shader = self.vp.GetFirstShader()
+            self._aovIndex = AOVIndex(get_type = lambda aov: aov[RNDAOV_TYPE],
+                                      get_name = lambda aov: aov[RNDAOV_NAME],
+                                      get_groups = _aov_groups).Build(iterate(start_shader) if start_shader else [])
+        return self._aovIndex
+
+    # 清除aov索引 ==> ok
+    def invalidate_index(self) -> None:
+        """
+        Drop the aov index, it is built again on the next lookup.
+        """
+        self._aovIndex = None
+
     # aov data
     def get_aov_data(self) -> list[c4d.BaseContainer]:
         """
@@ -74,6 +106,7 @@ class AOVHelper:
         else: return None
 
     # 获取所有aov shader ==> ok
+    @trace
     def get_all_aovs(self) -> list[c4d.BaseShader] :
         """
         Get all octane aovs in a list.
@@ -111,19 +144,7 @@ class AOVHelper:
 
         """
 
-        # The list.
-        result: list = []
-
-        start_shader = self.vp.GetFirstShader()
-        if not start_shader:
-            #raise RuntimeError("No shader found")
-            return result
-        for obj in iterate(start_shader):
-            if obj[RNDAOV_TYPE] != aov_type:
-                continue
-            result.append(obj)
-
-        return result
+        return self.get_index().GetType(aov_type)
 
     # 打印aov ==> ok
     def print_aov(self):
@@ -199,6 +220,7 @@ class AOVHelper:
         print ("--- OCTANERENDER ---")
 
     # 创建aov ==> ok
+    @trace
     def create_aov_shader(self, aov_type: int = RNDAOV_ZDEPTH, aov_name: str = "") -> c4d.BaseShader :
         """
         Create a shader of octane aov.
@@ -227,6 +249,7 @@ class AOVHelper:
         return aov
     
     # 将aov添加到vp ==> ok
+    @trace
     def add_aov(self, aov_shader: c4d.BaseList2D) -> c4d.BaseList2D:
         """
         Add the octane aov shader to Octane Render.
@@ -259,6 +282,7 @@ class AOVHelper:
         except:
             pass
         self.vp[SET_RENDERAOV_INPUT_0 + old_aovCnt] = aov_shader
+        self.invalidate_index()
         
         return aov_shader
     
@@ -274,6 +298,7 @@ class AOVHelper:
             raise ValueError(f"Aov must be the {self.vpname} aov shader which is a BaseList2D")    
         if aov_shader[aov_id] is not None:
             aov_shader[aov_id] = aov_attrib
+            self.invalidate_index()
         return aov_shader
         
     # 删除最新的aov ==> ok
@@ -306,6 +331,7 @@ class AOVHelper:
                     slot_shader.Remove()
                 
             self.vp[SET_RENDERAOV_IN_CNT] = aovCnt - 1
+        self.invalidate_index()
     
     # 删除空的aov ==> ok
     def remove_empty_aov(self):
@@ -325,6 +351,7 @@ class AOVHelper:
             # None 在最后
             if slot_shader is None:                
                 self.vp[SET_RENDERAOV_IN_CNT] -= 1
+        self.invalidate_index()
                  
     # 删除全部aov ==> ok
     def remove_all_aov(self):
@@ -347,6 +374,7 @@ class AOVHelper:
                     slot_shader.Remove()
                 
         self.vp[SET_RENDERAOV_IN_CNT] = 0      
+        self.invalidate_index()
 
     # 按照Type删除aov ==> ok
     def remove_aov_type(self, aov_type: int):
@@ -389,11 +417,8 @@ class AOVHelper:
         :return: the aov shader
         :rtype: c4d.BaseList2D
         """
-        est_aovs = self.get_aov(RNDAOV_CUSTOM)
-        for aov in est_aovs:
-            if aov[c4d.RNDAOV_CUSTOM_IDS] == customID - 1: # start at 0
-                return aov
-        else: return None
+        est_aovs = self.get_index().GetGroup(("custom", customID - 1)) # start at 0
+        return est_aovs[0] if est_aovs else None
 
     # 添加custom aov（id） ==> ok
     def add_custom_aov(self, customID: int = 1) -> c4d.BaseList2D:
@@ -409,6 +434,7 @@ class AOVHelper:
             aov = self.create_aov_shader(RNDAOV_CUSTOM)            
             self.add_aov(aov)
             aov[c4d.RNDAOV_CUSTOM_IDS] = customID - 1
+            self.invalidate_index()
             return aov
 
     # 获取light aov（id） ==> ok
@@ -421,12 +447,8 @@ class AOVHelper:
         :return: the aov shader
         :rtype: c4d.BaseList2D
         """
-        est_aovs = self.get_aov(RNDAOV_LIGHT)
-        if est_aovs is None: return None
-        for aov in est_aovs:
-            if aov[c4d.RNDAOV_LIGHT_ID] == lightID + 1: # start at 0
-                return aov
-        else: return None
+        est_aovs = self.get_index().GetGroup(("light", lightID + 1)) # start at 0
+        return est_aovs[0] if est_aovs else None
 
     # 添加light aov（id） ==> ok
     def add_light_aov(self, lightID: int = 1, lightName: str = None) -> c4d.BaseList2D:
@@ -442,6 +464,7 @@ class AOVHelper:
             aov = self.create_aov_shader(RNDAOV_LIGHT, lightName)            
             self.add_aov(aov)
             aov[c4d.RNDAOV_LIGHT_ID] = lightID + 1
+            self.invalidate_index()
             return aov
 
     # 删除light aov（id） ==> ok
@@ -454,14 +477,88 @@ class AOVHelper:
         :return: the aov shader
         :rtype: c4d.BaseList2D
         """
-        est_aovs = self.get_aov(RNDAOV_LIGHT)
-        if est_aovs is None: return None
-        for aov in est_aovs:
-            if aov[c4d.RNDAOV_LIGHT_ID] == lightID + 1: # start at 0
-                aov.Remove()
+        for aov in self.get_index().GetGroup(("light", lightID + 1)): # start at 0
+            aov.Remove()
         self.remove_empty_aov()
         return None
 
+    # 读取aov状态, 用于预设比较 ==> ok
+    def get_aov_state(self, aov: c4d.BaseList2D) -> AOVState:
+        """
+        Get the current values of the aov to compare with an ``AOVSpec``, the custom and light ids
+        are the ids of ``get_custom_aov`` and ``get_light_aov``.
+        """
+        aov_type = aov[RNDAOV_TYPE]
+        aov_id = None
+        if aov_type == RNDAOV_CUSTOM:
+            aov_id = aov[c4d.RNDAOV_CUSTOM_IDS] + 1
+        elif aov_type == RNDAOV_LIGHT:
+            aov_id = aov[c4d.RNDAOV_LIGHT_ID] - 1
+        return AOVState(aov, {"type": aov_type, "id": aov_id, "name": aov[RNDAOV_NAME], "enabled": bool(aov[RNDAOV_ENABLED])})
+
+    # 比较预设 ==> ok
+    @trace
+    def diff_preset(self, preset: AOVPreset, prune: bool = False) -> AOVPlan:
+        """
+        Compare the preset with the aovs of the VideoPost without changing anything.
+        """
+        if self.vp is None:
+            raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
+        preset.check_renderer("Octane")
+        return preset.diff([self.get_aov_state(aov) for aov in self.get_index().GetAll()], prune)
+
+    # 应用预设 ==> ok
+    @trace
+    def apply_preset(self, preset: AOVPreset, prune: bool = False) -> AOVPlan:
+        """
+        Apply only the difference between the preset and the aovs of the VideoPost.
+
+        Args:
+            preset (AOVPreset): the aov layout.
+            prune (bool, optional): remove the aovs not in the preset. Defaults to False.
+
+        Returns:
+            AOVPlan: the applied difference, ``plan.empty`` if nothing changed.
+        """
+        plan = self.diff_preset(preset, prune)
+
+        for state, spec, changes in plan.update:
+            if "name" in changes:
+                state.handle[RNDAOV_NAME] = changes["name"]
+            if "enabled" in changes:
+                state.handle[RNDAOV_ENABLED] = changes["enabled"]
+
+        if plan.remove:
+            # Cinema 4D makes a new wrapper on each access, compare the shaders with == and not with id
+            removed = [state.handle for state in plan.remove]
+            aovCnt = self.vp[SET_RENDERAOV_IN_CNT]
+            aovs = [self.vp[SET_RENDERAOV_INPUT_0+i] for i in range(0, aovCnt)]
+            for state in plan.remove:
+                state.handle.Remove()
+            # 清空input, 重新链接aov shader
+            for i in range(0, aovCnt):
+                self.vp[SET_RENDERAOV_INPUT_0+i] = None
+            self.remove_empty_aov()
+            for aov in aovs:
+                if aov is not None and not any(aov == handle for handle in removed):
+                    self.add_aov(aov)
+
+        for spec in plan.add:
+            if spec.type == RNDAOV_CUSTOM and spec.id is not None:
+                aov = self.add_custom_aov(spec.id)
+            elif spec.type == RNDAOV_LIGHT and spec.id is not None:
+                aov = self.add_light_aov(spec.id, spec.name)
+            else:
+                aov = self.add_aov(self.create_aov_shader(spec.type, spec.name))
+            if aov is None:
+                continue
+            if spec.name is not None:
+                aov[RNDAOV_NAME] = spec.name
+            aov[RNDAOV_ENABLED] = spec.enabled is not False
+
+        self.invalidate_index()
+        return plan
+
 __all__ = [
     "AOVHelper"
 ]
@@ -2,8 +2,11 @@
 
 import c4d
 from typing import Any
-from ..constants import *
+from ..constants.common_id import *
+from ..constants.octane_id import *
 from ..utils import iterate
+from ..utils.shader_graph import ShaderGraph
+from ..utils.graph_traversal import IterNodes
 
 def IsOctaneMaterial(material: c4d.BaseMaterial) -> bool:
     if isinstance(material, c4d.BaseMaterial):
@@ -26,6 +29,7 @@ class MaterialHelper:
     def __init__(self, material: c4d.BaseMaterial = None, create_standard: bool = False):
         
         self.materialType: str = "Octane"
+        self._shaderGraph: ShaderGraph = None
 
         # First we want to modify exsited material
         if isinstance(material, c4d.BaseMaterial):
@@ -187,6 +191,7 @@ class MaterialHelper:
             if not self.IsOctaneMaterial():
                 raise ValueError("This is not an Octane Material")
         self.material: c4d.BaseMaterial = material
+        self.InvalidateShaderGraph()
         return self.material
     
     # 获取材质 ==> ok
@@ -345,6 +350,7 @@ class MaterialHelper:
         self.material.InsertShader(theNode)
         if self.doc is not None:
             self.doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, self.material)
+        self.InvalidateShaderGraph()
         return theNode
 
     # 在shader后插入shader ==> ok
@@ -360,6 +366,7 @@ class MaterialHelper:
             slot = self.GetMaterialPort(shader)
         newShader[inputSlot] = shader
         parrent[slot] = newShader
+        self.InvalidateShaderGraph()
         return newShader
 
     # todo
@@ -367,6 +374,7 @@ class MaterialHelper:
         pass
 
     def RemoveShader(self, shader: c4d.BaseShader) -> None:
+        self.InvalidateShaderGraph()
         return shader.Remove()
 
     # 比较shader是否为相同的shader
@@ -463,12 +471,62 @@ class MaterialHelper:
         if paramId is None:
             raise ValueError("The given paramId is None")
     
+        # a link is added, replaced or removed when the old or the new value is a shader
+        relink = isinstance(value, c4d.BaseShader)
+        if not relink and self._shaderGraph is not None:
+            try:
+                relink = isinstance(node[paramId], c4d.BaseShader)
+            except Exception:
+                relink = True
         try:
             node[paramId] = value
+            if relink:
+                self.InvalidateShaderGraph()
             return True
         except Exception:
             return False
 
+    #=============================================
+    # Connections
+    #=============================================
+
+    # 获取连接图, 一次遍历所有BaseContainer ==> ok
+    def GetShaderGraph(self) -> ShaderGraph:
+        """
+        Get the connection graph of the material, it is built lazily from one BaseContainer sweep,
+        and invalidated by ``AddShader``, ``AddConnectShader``, ``RemoveShader`` and ``SetShaderValue``.
+        Call ``InvalidateShaderGraph`` after linking shaders by hand, e.g. ``shader[slot] = another``.
+
+        Returns:
+            ShaderGraph: the connection graph
+        """
+        if self._shaderGraph is None:
+            shaders = list(iterate(self.material.GetFirstShader()))
+            self._shaderGraph = ShaderGraph().Build(self.material, shaders, self._GetLinks)
+        return self._shaderGraph
+
+    # 废弃连接图 ==> ok
+    def InvalidateShaderGraph(self) -> None:
+        """
+        Drop the connection graph, it will be rebuilt at the next query.
+        """
+        self._shaderGraph = None
+
+    # 读取材质或shader上连接的shader ==> ok
+    def _GetLinks(self, owner: c4d.BaseList2D) -> list[tuple[int, c4d.BaseShader]]:
+        result: list = []
+        bc = owner.GetDataInstance()
+        if bc is None:
+            return result
+        for key in range(len(bc)):
+            key = bc.GetIndexId(key)
+            try:
+                if isinstance(bc[key], c4d.BaseShader):
+                    result.append((key, bc[key]))
+            except Exception :
+                pass
+        return result
+
     # New 获取前方节点(只包含子节点)  ==> ok
     def GetPreNode(self, node: c4d.BaseShader) -> list[c4d.BaseShader]:
         """
@@ -480,10 +538,7 @@ class MaterialHelper:
         Returns:
             list[c4d.BaseShader]: Return the nodes directly connected before the node.
         """
-        result = list()
-        for _ ,shader in self.GetConnections(node):
-            result.append(shader)
-        return result
+        return [shader for _, shader in self.GetShaderGraph().GetLinks(node)]
 
     # New 获取后方节点(只包含子节点)  ==> ok
     def GetNextNode(self, node: c4d.BaseShader) -> list[c4d.BaseShader,c4d.BaseMaterial]:
@@ -500,13 +555,7 @@ class MaterialHelper:
         if not isinstance(node, c4d.BaseShader):
             raise ValueError(f'{sys._getframe().f_code.co_name} Expected a BaseShader, got {type(node)}')
 
-        # The list.
-        result: list = []
-        for shader in self.GetAllShaders():
-            for i in self.GetConnections(shader):
-                if i[1] == node:                
-                    result.append(shader)
-        return result
+        return [shader for _, shader in self.GetShaderGraph().GetParents(node, include_root=False)]
     
     # New 获取前方节点树(包含节点树)  ==> ok
     def GetPreNodes(self, node: c4d.BaseShader, filter_asset: str = None) -> list:
@@ -523,22 +572,10 @@ class MaterialHelper:
         # Bail when the passed node is not a true node.
         if not isinstance(node, c4d.BaseShader):
             raise ValueError(f'{sys._getframe().f_code.co_name} Expected a BaseShader, got {type(node)}')
-        
-        # The list.
-        result: list = []
-
-        for shader in iterate(node):
-            if filter_asset is not None:
-                if shader.GetType() == filter_asset and shader not in result:
-                    result.append(shader)
-            else:
-                if shader not in result:
-                    result.append(shader)
-
-        # remove the node self
-        result.remove(node)
 
-        return result
+        graph = self.GetShaderGraph()
+        node_filter = None if filter_asset is None else (lambda shader: shader.GetType() == filter_asset)
+        return [shader for shader in IterNodes(node, graph.GetLinks, node_filter=node_filter) if shader != node]
     
     # New 获取后方节点树(包含节点树)  ==> ok
     def GetNextNodes(self, node: c4d.BaseShader, filter_asset: str = None) -> list:
@@ -556,14 +593,11 @@ class MaterialHelper:
         # Bail when the passed node is not a true node.
         if not isinstance(node, c4d.BaseShader):
             raise ValueError(f'{sys._getframe().f_code.co_name} Expected a BaseShader, got {type(node)}')
-        # The list.
-        result: list = []
 
-        for shader in self.GetAllShaders():
-            if node in self.GetPreNodes(shader):
-                result.append(shader)
-
-        return result
+        graph = self.GetShaderGraph()
+        node_filter = None if filter_asset is None else (lambda shader: shader.GetType() == filter_asset)
+        get_edges = lambda shader: graph.GetParents(shader, include_root=False)
+        return [shader for shader in IterNodes(node, get_edges, node_filter=node_filter) if shader != node]
 
     # 获取材质上被连接的端口列表 ==> ok
     def GetRootConnectedNodes(self) -> list[c4d.BaseShader]:
@@ -598,10 +632,7 @@ class MaterialHelper:
             bool: True if connect to material, False if not.
 
         """
-        for _, shader in self.GetRootConnectedNodes(node):
-            if shader == node:
-                return True
-        return False
+        return self.GetShaderGraph().IsRoot(node)
 
     # 获取shader上被连接的端口列表 ==> ok
     def GetConnections(self, node: c4d.BaseShader) -> list[tuple[int, c4d.BaseShader]]:
@@ -634,9 +665,7 @@ class MaterialHelper:
             bool: True if isolated, False if not.
 
         """
-        if self.GetPreNode(node) or self.GetNextNode(node) or self.IsRootShader(node):
-            return True
-        return False
+        return self.GetShaderGraph().IsConnected(node)
 
     # 寻找shader在材质上的插槽
     def GetMaterialPort(self, node: c4d.BaseShader) -> int:
@@ -680,30 +709,13 @@ class MaterialHelper:
     # 查询shader连接的端口
     def GetConnectedPortAfter(self, node: c4d.BaseShader) -> int:
         """
-        Add a Transform node to all the Image nodes.
+        Get the slot the node plugged into, the material slot first, then the next shader.
         """
-        for _, shader in self.GetRootConnectedNodes():
-            if shader == node:
-                return self.GetMaterialPort(node)
-        
-        # Get the next node.
-        after_node: c4d.BaseShader = self.GetNextNode(node)[0]#node.GetUp()
-        if after_node is None:
-            return False
-        bc = after_node.GetDataInstance()
-        if bc is None:
-            raise RuntimeError("Failed to retrieve bc")
-
-        # Iterates over the content of the BaseContainer using a for loop
-        for key in range(len(bc)):
-            # Check if the data retrieved can be printed in python (some DataType are not supported in Python)
-            key = bc.GetIndexId(key)
-            try:
-                if bc[key] == node:
-                    return key
-            except Exception :
-                pass
-        return False
+        graph = self.GetShaderGraph()
+        slot = graph.GetSlot(node, graph.root)
+        if slot is None:
+            slot = graph.GetSlot(node)
+        return slot if slot is not None else False
 
     # 刷新贴图 ==> ok
     def RefreshTextures(self):
@@ -5,7 +5,8 @@ import random
 from typing import Union
 import os
 
-from ..constants import *
+from ..constants.common_id import *
+from ..constants.octane_id import *
 from ..utils import iterate, generate_random_color
 
 class SceneHelper:
@@ -7,6 +7,7 @@ from ..constants.redshift_id import *
 from .scene import SceneHelper as Scene
 from .material import MaterialHelper as Material
 from .aov import AOVHelper as AOV
+from .aov import AOVBatch
 from ..constants import CID_NODE_EDITOR, ID_MATERIAL_MANAGER
 
 def GetPreference() -> c4d.BaseList2D:
@@ -1,11 +1,23 @@
 import c4d
+from typing import Optional
 
 
-from ..constants import *
-from ..utils import GetVideoPost
+from ..constants.common_id import *
+from ..constants.redshift_id import *
+from ..utils import GetVideoPost, AOVIndex, AOVPreset, AOVPlan, AOVState, trace, tracer
 if c4d.plugins.FindPlugin(ID_REDSHIFT, type=c4d.PLUGINTYPE_ANY) is not None:
     import redshift
 
+
+def _aov_light_groups(aov: c4d.redshift.RSAOV) -> list[str]:
+    groups = aov.GetParameter(c4d.REDSHIFT_AOV_LIGHTGROUP_NAMES) or ""
+    return [group.strip() for group in groups.split("\n") if group.strip()]
+
+def _new_aov_index() -> AOVIndex:
+    return AOVIndex(get_type = lambda aov: aov.GetParameter(c4d.REDSHIFT_AOV_TYPE),
+                    get_name = lambda aov: aov.GetParameter(c4d.REDSHIFT_AOV_NAME),
+                    get_groups = _aov_light_groups)
+
 class AOVHelper:
     """
     Custom helper to easier modify AOV.
@@ -13,6 +25,9 @@ class AOVHelper:
 
     def __init__(self, vp: c4d.documents.BaseVideoPost = None):
         
+        self._batch: Optional[AOVBatch] = None
+        self._aovIndex: Optional[AOVIndex] = None
+
         if isinstance(vp, c4d.documents.BaseVideoPost):
             if vp.GetType() == int(ID_REDSHIFT):
                 self.doc = vp.GetDocument()
@@ -27,6 +42,55 @@ class AOVHelper:
     def __str__(self) -> str:
         return (f'<Redshift> {__class__.__name__} with videopost named {self.vpname}')
 
+    # 读取aov列表, 批处理时读取暂存列表 ==> ok
+    def _get_aovs(self) -> list[c4d.redshift.RSAOV]:
+        if self._batch is not None:
+            return self._batch.get_aovs()
+        tracer.count("RendererGetAOVs")
+        return redshift.RendererGetAOVs(self.vp)
+
+    # 写入aov列表, 批处理时写入暂存列表 ==> ok
+    def _set_aovs(self, aovs: list[c4d.redshift.RSAOV]) -> bool:
+        if self._batch is not None:
+            return self._batch.set_aovs(aovs)
+        self.invalidate_index()
+        tracer.count("RendererSetAOVs")
+        return redshift.RendererSetAOVs(self.vp, aovs)
+
+    # 获取aov索引 ==> ok
+    def get_index(self) -> AOVIndex:
+        """
+        Get the type, name and light group index of the aovs, it is built on the first lookup
+        and dropped by the helper edits. Call ``invalidate_index`` after editing the aovs elsewhere.
+        """
+        if self._batch is not None:
+            return self._batch.index
+        if self._aovIndex is None:
+            tracer.count("RendererGetAOVs")
+            self._aovIndex = _new_aov_index().Build(redshift.RendererGetAOVs(self.vp))
+        return self._aovIndex
+
+    # 清除aov索引 ==> ok
+    def invalidate_index(self) -> None:
+        """
+        Drop the aov index, it is built again on the next lookup.
+        """
+        self._aovIndex = None
+
+    # 批量修改aov ==> ok
+    def batch(self) -> "AOVBatch":
+        """
+        Stage all the aov edits in the with block and commit them with one ``RendererSetAOVs``.
+
+        Example:
+
+            with aov_helper.batch() as batch:
+                aov_helper.add_aov(aov_helper.create_aov_shader(REDSHIFT_AOV_TYPE_DIFFUSE_LIGHTING))
+                aov_helper.set_light_group(REDSHIFT_AOV_TYPE_DIFFUSE_LIGHTING, "key")
+            print(batch.saved_calls)
+        """
+        return AOVBatch(self)
+
     # 获取aov默认名称 ==> ok
     def get_type_name(self, aov_type: c4d.BaseList2D) -> str:
         """
@@ -62,6 +126,7 @@ class AOVHelper:
         return self.update_aov(aov, c4d.REDSHIFT_AOV_NAME, aov_attrib = name)
 
     # 获取所有aov shader ==> ok
+    @trace
     def get_all_aovs(self) -> list[c4d.redshift.RSAOV] :
         """
         Get all aovs in a list.
@@ -70,7 +135,7 @@ class AOVHelper:
             list[c4d.BaseShader]: A List of all find aovs
         """
 
-        return redshift.RendererGetAOVs(self.vp)
+        return self._get_aovs()
 
     # 获取指定类型的aov列表 ==> ok
     def get_aovs(self, aov_type: c4d.BaseList2D) -> list[c4d.redshift.RSAOV]:
@@ -81,15 +146,10 @@ class AOVHelper:
         if self.vp is None:
             raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
         
-        aov_list: list = []
-        
-        # keep original aovs
-        current_aovs = redshift.RendererGetAOVs(self.vp)
-        for aov in current_aovs:
-            if aov.GetParameter(c4d.REDSHIFT_AOV_TYPE) == aov_type:
-                aov_list.append(aov)
+        if self._batch is not None:
+            return self._batch.get_type(aov_type)
 
-        return aov_list
+        return self.get_index().GetType(aov_type)
     
     # 获取指定类型的aov shader ==> ok
     def get_aov(self, aov_type: c4d.BaseList2D) -> c4d.redshift.RSAOV|None:
@@ -100,20 +160,29 @@ class AOVHelper:
         if self.vp is None:
             raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
                 
-        # keep original aovs
-        current_aovs = redshift.RendererGetAOVs(self.vp)
-        for aov in current_aovs:
-            if aov.GetParameter(c4d.REDSHIFT_AOV_TYPE) == aov_type:
-                return aov
+        if self._batch is not None:
+            aovs = self._batch.get_type(aov_type)
+            return aovs[0] if aovs else None
 
-        return None
+        return self.get_index().GetFirst(aov_type)
+
+    # 获取灯光组的aov列表 ==> ok
+    def get_light_group_aovs(self, group_name: str) -> list[c4d.redshift.RSAOV]:
+        """
+        Get all the aovs with the given light group.
+
+        """
+        if self.vp is None:
+            raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
+
+        return self.get_index().GetGroup(group_name.strip())
     
     # 打印aov ==> ok
     def print_aov(self):
         if self.vp is None:
             raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
 
-        aovs = redshift.RendererGetAOVs(self.vp)
+        aovs = self.get_index().GetAll()
         aovCnt = len(aovs)
         
         print ("--- REDSHIFTRENDER ---")
@@ -140,6 +209,7 @@ class AOVHelper:
         print ("--- REDSHIFTRENDER ---")
     
     # 创建aov ==> ok
+    @trace
     def create_aov_shader(self, aov_type: c4d.BaseList2D, aov_enabled: bool = True, aov_name: str = None, muti_enabled: bool = True, muti_bit: int = 16) -> c4d.redshift.RSAOV:
                 
         if self.vp is None:
@@ -182,6 +252,9 @@ class AOVHelper:
             raise ValueError(f"Aov must be the {self.vpname} aov")
 
         aov_shader.SetParameter(aov_id, aov_attrib)
+        if self._batch is not None:
+            self._batch.invalidate()
+        self.invalidate_index()
     
     # 更新aov属性 ==> ok
     # todo新建的AOV会丢失属性
@@ -200,7 +273,7 @@ class AOVHelper:
         
         aov_list: list = []
         # keep original aovs
-        current_aovs = redshift.RendererGetAOVs(self.vp)
+        current_aovs = self._get_aovs()
         self.remove_aov_type(aov_type)
         for aov in current_aovs:
             if aov.GetParameter(c4d.REDSHIFT_AOV_TYPE) == aov_type:
@@ -210,26 +283,26 @@ class AOVHelper:
         
         self.set_aov(aovshader,aov_id, aov_attrib)
         # set aovs
-        redshift.RendererSetAOVs(self.vp, aov_list)
+        self._set_aovs(aov_list)
         return aovshader
 
+    # 更新aov属性, 保持aov顺序 ==> ok
     def update_aov(self, aov_type: int|c4d.redshift.RSAOV, aov_id: int, aov_attrib):
+        if isinstance(aov_type, c4d.redshift.RSAOV):
+            aov_type = aov_type.GetParameter(c4d.REDSHIFT_AOV_TYPE)
         allaovs = self.get_all_aovs()
-        aov_update_list = []
         for aov in allaovs:
             if aov.GetParameter(c4d.REDSHIFT_AOV_TYPE) == aov_type:
-                aov_update_list.append(aov)
-        aovs_temp = [allaovs.remove(aov_update) for aov_update in aov_update_list]
-        [self.set_aov(aov_update, aov_id, aov_attrib) for aov_update in aov_update_list]
-        aovs_temp.extend(aov_update_list)
-        return redshift.RendererSetAOVs(self.vp, aovs_temp)
+                self.set_aov(aov, aov_id, aov_attrib)
+        return self._set_aovs(allaovs)
 
     # 将aov添加到vp ==> ok
+    @trace
     def add_aov(self, aov_shader: c4d.redshift.RSAOV|list[c4d.redshift.RSAOV]):
         
         if self.vp is None:
             raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
-        if not isinstance(aov_shader,c4d.redshift.RSAOV):
+        if not isinstance(aov_shader, (c4d.redshift.RSAOV, list)):
             raise ValueError(f"Aov must be the {self.vpname} aov")
         
         aov_list: list = []
@@ -238,23 +311,23 @@ class AOVHelper:
         if isinstance(aov_shader, c4d.redshift.RSAOV):
             
             # keep original aovs
-            current_aovs = redshift.RendererGetAOVs(self.vp)
+            current_aovs = self._get_aovs()
             for aov in current_aovs:
                 aov_list.append(aov)
             # add our new aov  
             aov_list.append(aov_shader)
             # set aovs
-            redshift.RendererSetAOVs(self.vp, aov_list)
+            self._set_aovs(aov_list)
 
         # aovs
         if isinstance(aov_shader, list):
             
             # keep original aovs
-            current_aovs = redshift.RendererGetAOVs(self.vp)
+            current_aovs = self._get_aovs()
             # merge aovs
             aov_list = current_aovs + aov_shader
             # set aovs
-            redshift.RendererSetAOVs(self.vp, aov_list)
+            self._set_aovs(aov_list)
         return aov_shader
 
     # 删除最新的aov ==> ok
@@ -268,9 +341,9 @@ class AOVHelper:
         if self.vp is None:
             raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
         
-        aovs = redshift.RendererGetAOVs(self.vp)
+        aovs = self._get_aovs()
         del(aovs[-1])
-        redshift.RendererSetAOVs(self.vp, aovs)
+        self._set_aovs(aovs)
 
     # 删除全部aov ==> ok
     def remove_all_aov(self):
@@ -282,7 +355,7 @@ class AOVHelper:
         if self.vp is None:
             raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
         aovs = []
-        redshift.RendererSetAOVs(self.vp, aovs)  
+        self._set_aovs(aovs)
                        
     # 按照Type删除aov ==> ok
     def remove_aov_type(self, aov_type: int):
@@ -298,13 +371,13 @@ class AOVHelper:
         aov_list: list = []
         
         # keep original aovs
-        current_aovs = redshift.RendererGetAOVs(self.vp)
+        current_aovs = self._get_aovs()
         for aov in current_aovs:
             if aov.GetParameter(c4d.REDSHIFT_AOV_TYPE) == aov_type:
                 continue
             aov_list.append(aov)
         # set aovs
-        redshift.RendererSetAOVs(self.vp, aov_list)
+        self._set_aovs(aov_list)
 
     # 添加灯光组 ==> ok
     def set_light_group(self, aov: c4d.redshift.RSAOV, group_name: str = None):
@@ -359,6 +432,218 @@ class AOVHelper:
         self.add_aov(aov)
         return aov
 
+    # 读取aov状态, 用于预设比较 ==> ok
+    def get_aov_state(self, aov: c4d.redshift.RSAOV) -> AOVState:
+        """
+        Get the current values of the aov to compare with an ``AOVSpec``.
+        """
+        aov_type = aov.GetParameter(c4d.REDSHIFT_AOV_TYPE)
+        bits = {c4d.REDSHIFT_AOV_MULTIPASS_BIT_DEPTH_8: 8,
+                c4d.REDSHIFT_AOV_MULTIPASS_BIT_DEPTH_16: 16,
+                c4d.REDSHIFT_AOV_MULTIPASS_BIT_DEPTH_32: 32}
+        return AOVState(aov, {
+            "type": aov_type,
+            "id": aov.GetParameter(c4d.REDSHIFT_AOV_PUZZLE_MATTE_RED_ID) if aov_type == REDSHIFT_AOV_TYPE_PUZZLE_MATTE else None,
+            "name": aov.GetParameter(c4d.REDSHIFT_AOV_NAME),
+            "enabled": bool(aov.GetParameter(c4d.REDSHIFT_AOV_ENABLED)),
+            "bits": bits.get(aov.GetParameter(c4d.REDSHIFT_AOV_MULTIPASS_BIT_DEPTH)),
+            "denoise": bool(aov.GetParameter(c4d.REDSHIFT_AOV_DENOISE_ENABLED)),
+            "light_groups": tuple(_aov_light_groups(aov)),
+        })
+
+    # 按预设值设置aov ==> ok
+    def _set_aov_values(self, aov: c4d.redshift.RSAOV, values: dict) -> None:
+        for key, value in values.items():
+            if key == "name":
+                aov.SetParameter(c4d.REDSHIFT_AOV_NAME, value)
+            elif key == "enabled":
+                aov.SetParameter(c4d.REDSHIFT_AOV_ENABLED, value)
+            elif key == "bits":
+                bit = {8: c4d.REDSHIFT_AOV_MULTIPASS_BIT_DEPTH_8,
+                       32: c4d.REDSHIFT_AOV_MULTIPASS_BIT_DEPTH_32}.get(value, c4d.REDSHIFT_AOV_MULTIPASS_BIT_DEPTH_16)
+                aov.SetParameter(c4d.REDSHIFT_AOV_MULTIPASS_BIT_DEPTH, bit)
+            elif key == "denoise":
+                aov.SetParameter(c4d.REDSHIFT_AOV_DENOISE_ENABLED, value)
+            elif key == "light_groups":
+                aov.SetParameter(c4d.REDSHIFT_AOV_LIGHTGROUP_NAMES, "".join(group + "\n" for group in value))
+            elif key == "id":
+                aov.SetParameter(c4d.REDSHIFT_AOV_PUZZLE_MATTE_MODE, REDSHIFT_AOV_PUZZLE_MATTE_MODE_OBJECT_ID)
+                aov.SetParameter(c4d.REDSHIFT_AOV_PUZZLE_MATTE_RED_ID, value)
+                aov.SetParameter(c4d.REDSHIFT_AOV_PUZZLE_MATTE_GREEN_ID, value)
+                aov.SetParameter(c4d.REDSHIFT_AOV_PUZZLE_MATTE_BLUE_ID, value)
+                aov.SetParameter(c4d.REDSHIFT_AOV_PUZZLE_MATTE_REFLECTION_REFRACTION, False)
+
+    # 比较预设 ==> ok
+    @trace
+    def diff_preset(self, preset: AOVPreset, prune: bool = False) -> AOVPlan:
+        """
+        Compare the preset with the aovs of the VideoPost without changing anything.
+        """
+        if self.vp is None:
+            raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
+        preset.check_renderer("Redshift")
+        return preset.diff([self.get_aov_state(aov) for aov in self.get_index().GetAll()], prune)
+
+    # 应用预设 ==> ok
+    @trace
+    def apply_preset(self, preset: AOVPreset, prune: bool = False) -> AOVPlan:
+        """
+        Apply only the difference between the preset and the aovs of the VideoPost,
+        with one ``RendererGetAOVs`` and at most one ``RendererSetAOVs``.
+
+        Args:
+            preset (AOVPreset): the aov layout.
+            prune (bool, optional): remove the aovs not in the preset. Defaults to False.
+
+        Returns:
+            AOVPlan: the applied difference, ``plan.empty`` if nothing changed.
+        """
+        if self.vp is None:
+            raise RuntimeError(f"Can't get the {self.vpname} VideoPost")
+        preset.check_renderer("Redshift")
+
+        with self.batch():
+            aovs = self._get_aovs()
+            plan = preset.diff([self.get_aov_state(aov) for aov in aovs], prune)
+            if plan.empty:
+                return plan
+
+            for state, spec, changes in plan.update:
+                self._set_aov_values(state.handle, changes)
+            removed = {id(state.handle) for state in plan.remove}
+            aovs = [aov for aov in aovs if id(aov) not in removed]
+            for spec in plan.add:
+                aov = self.create_aov_shader(spec.type, spec.enabled is not False, spec.name, True, spec.bits or 16)
+                values = spec.values()
+                if spec.id is not None:
+                    values["id"] = spec.id
+                self._set_aov_values(aov, values)
+                aovs.append(aov)
+            self._set_aovs(aovs)
+        return plan
+
+class AOVBatch:
+    """
+    Stage the aov edits of a Redshift AOVHelper and commit them with a single ``RendererSetAOVs``.
+
+    The aov list is read once when the block starts, all the helper methods (add, update, remove,
+    light groups, puzzle mattes) run against the staging list, the lookups by type and name are
+    answered from an index of it. Nothing is written if the block raises.
+
+    批处理: 进入时读取一次aov列表, 所有修改在暂存列表中完成, 退出时只执行一次RendererSetAOVs.
+
+    Example:
+
+        aov_helper = Redshift.AOV(vp)
+        with Redshift.AOVBatch(aov_helper) as batch:
+            for aov_type in (REDSHIFT_AOV_TYPE_DIFFUSE_LIGHTING, REDSHIFT_AOV_TYPE_REFLECTIONS):
+                aov_helper.add_aov(aov_helper.create_aov_shader(aov_type))
+            aov_helper.set_light_group(REDSHIFT_AOV_TYPE_DIFFUSE_LIGHTING, "key")
+        print(batch)  # ... 2 native calls, 7 saved
+    """
+
+    def __init__(self, helper: AOVHelper):
+        self.helper: AOVHelper = helper
+        self.aovs: list[c4d.redshift.RSAOV] = []
+        self.staged_gets: int = 0
+        self.staged_sets: int = 0
+        self.native_calls: int = 0
+        self._index: Optional[AOVIndex] = None
+        self._outer: Optional[AOVBatch] = None
+
+    def __str__(self) -> str:
+        return (f'<Redshift> {self.__class__.__name__} with {len(self.aovs)} aovs, '
+                f'{self.native_calls} native calls, {self.saved_calls} saved')
+
+    def __enter__(self) -> "AOVBatch":
+        if self.helper.vp is None:
+            raise RuntimeError(f"Can't get the {self.helper.vpname} VideoPost")
+        # a nested batch joins the outer one
+        if self.helper._batch is not None:
+            self._outer = self.helper._batch
+            return self._outer
+        tracer.count("RendererGetAOVs")
+        self.aovs = list(redshift.RendererGetAOVs(self.helper.vp))
+        self.native_calls += 1
+        self.helper._batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if self._outer is not None:
+            self._outer = None
+            return False
+        self.helper._batch = None
+        if exc_type is None and self.staged_sets:
+            self.commit()
+        return False
+
+    @property
+    def saved_calls(self) -> int:
+        """
+        The count of ``RendererGetAOVs`` / ``RendererSetAOVs`` round trips saved by the batch.
+        """
+        return max(self.staged_gets + self.staged_sets - self.native_calls, 0)
+
+    # 写入vp ==> ok
+    def commit(self) -> bool:
+        """
+        Write the staging list to the VideoPost.
+        """
+        self.native_calls += 1
+        self.helper.invalidate_index()
+        tracer.count("RendererSetAOVs")
+        return redshift.RendererSetAOVs(self.helper.vp, self.aovs)
+
+    # 暂存列表 ==> ok
+    def get_aovs(self) -> list[c4d.redshift.RSAOV]:
+        """
+        Get a copy of the staging list.
+        """
+        self.staged_gets += 1
+        return list(self.aovs)
+
+    def set_aovs(self, aovs: list[c4d.redshift.RSAOV]) -> bool:
+        """
+        Replace the staging list.
+        """
+        self.staged_sets += 1
+        self.aovs = list(aovs)
+        self.invalidate()
+        return True
+
+    def invalidate(self) -> None:
+        """
+        Drop the type and name index, it is built again on the next lookup.
+        """
+        self._index = None
+
+    @property
+    def index(self) -> AOVIndex:
+        """
+        The index of the staging list.
+        """
+        if self._index is None:
+            self._index = _new_aov_index().Build(self.aovs)
+        return self._index
+
+    # 按类型查找 ==> ok
+    def get_type(self, aov_type: int) -> list[c4d.redshift.RSAOV]:
+        """
+        Get the staged aovs of the given type.
+        """
+        self.staged_gets += 1
+        return self.index.GetType(aov_type)
+
+    # 按名称查找 ==> ok
+    def get_name(self, name: str) -> Optional[c4d.redshift.RSAOV]:
+        """
+        Get the first staged aov with the given name.
+        """
+        self.staged_gets += 1
+        return self.index.GetName(name)
+
+
 __all__ = [
-    "AOVHelper"
+    "AOVHelper",
+    "AOVBatch"
 ]
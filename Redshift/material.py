@@ -1,7 +1,8 @@
 import c4d
 import maxon
-from ..constants import *
-from ..utils.node_helper import NodeGraghHelper
+from ..constants.common_id import *
+from ..constants.redshift_id import *
+from ..utils.node_helper import NodeGraghHelper, EditGraph
 from ..utils import EasyTransaction
 
 from typing import Union, TypeAlias 
@@ -350,6 +351,7 @@ class MaterialHelper(NodeGraghHelper):
         return redshiftMaterial.material
     
     # 创建Shader ==> OK 
+    @EditGraph
     def AddNode(self, nodeId: str , outport_id: str = None, targret_shader = None, target_port= None) -> maxon.GraphNode :
         """
         Adds a new shader to the graph.
@@ -809,6 +811,7 @@ class MaterialHelper(NodeGraghHelper):
     ### Bump ###
 
     # 创建Bump ==> OK
+    @EditGraph
     def AddBump(self, input_port: maxon.GraphNode = None, target_port: maxon.GraphNode = None, bump_mode: int = 1) -> maxon.GraphNode :
         """
         Adds a new Bump shader to the graph.
@@ -868,6 +871,7 @@ class MaterialHelper(NodeGraghHelper):
             )
     
     # 创建displacement ==> OK
+    @EditGraph
     def AddDisplacement(self, input_port: maxon.GraphNode = None, target_port: maxon.GraphNode = None) -> maxon.GraphNode :
         """
         Adds a new displacement shader to the graph.
@@ -1084,6 +1088,7 @@ class MaterialHelper(NodeGraghHelper):
             )
 
     # 创建Texture ==> OK
+    @EditGraph
     def AddTexture(self, shadername :str = 'Texture', filepath: str = None, raw: bool = True, gamma: int = 1, target_port: maxon.GraphNode = None) -> maxon.GraphNode :
         """
         Adds a new texture shader to the graph.
@@ -1231,6 +1236,7 @@ class MaterialHelper(NodeGraghHelper):
         return self.AddConnection(soure_node, outPort, rsoutput, rsoutputPort) is not None
 
     # 添加统一缩放（类似Octane的transform）
+    @EditGraph
     def AddUniTransform(self, tex_shader: maxon.GraphNode) -> maxon.GraphNode:
         """
         Connects a UniTransform node to the given texture shader.
@@ -1344,6 +1350,7 @@ class MaterialHelper(NodeGraghHelper):
 
     # TEST
     # 添加统一缩放（类似Octane的transform）
+    @EditGraph
     def AddUniTransforms(self, tex_shaders: list[maxon.GraphNode]) -> maxon.GraphNode:
         """
         Connects a UniTransform node to the given texture shader.
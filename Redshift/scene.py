@@ -2,7 +2,8 @@
 import c4d
 import os
 import random
-from ..constants import *
+from ..constants.common_id import *
+from ..constants.redshift_id import *
 from ..utils.node_helper import NodeGraghHelper
 from .. utils import generate_random_color
 
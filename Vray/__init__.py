@@ -4,7 +4,8 @@
 """Provides classes that expose commonly used constants as immutable objects.
 """
 import c4d
-from ..constants import *
+from ..constants.common_id import *
+from ..constants.vray_id import *
 
 from .scene import SceneHelper as Scene
 from .material import MaterialHelper as Material
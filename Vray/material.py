@@ -4,8 +4,9 @@ import c4d
 import maxon
 
 from typing import Union
-from ..constants import *
-from ..utils.node_helper import NodeGraghHelper
+from ..constants.common_id import *
+from ..constants.vray_id import *
+from ..utils.node_helper import NodeGraghHelper, EditGraph
 from ..utils import EasyTransaction
 
 def IsVrayMaterial(material: c4d.BaseMaterial) -> bool:
@@ -123,6 +124,7 @@ class MaterialHelper(NodeGraghHelper):
                 self.material[c4d.MATERIAL_PREVIEWSIZE] = 0 # default
 
     # 创建Shader ==> OK 
+    @EditGraph
     def AddNode(self, nodeId: str , outport_id: str = None, targret_shader = None, target_port= None) -> maxon.GraphNode :
         """
         Adds a new shader to the graph.
@@ -233,6 +235,7 @@ class MaterialHelper(NodeGraghHelper):
     ### Bump ###
 
     # 创建Bump ==> # todo
+    @EditGraph
     def AddRootBump(self, input_port: maxon.GraphNode = None) -> maxon.GraphNode :
         """
         Adds a new displacement shader to the graph.
@@ -272,6 +275,7 @@ class MaterialHelper(NodeGraghHelper):
         return displacement
     
     # 创建Normal ==> OK
+    @EditGraph
     def AddNormal(self, input_port: maxon.GraphNode = None, target_port: maxon.GraphNode = None, bump_mode: int = 1) -> maxon.GraphNode :
         """
         Adds a new Normal shader to the graph.
@@ -335,6 +339,7 @@ class MaterialHelper(NodeGraghHelper):
             )
 
     # 创建Texture ==> OK
+    @EditGraph
     def AddTexture(self, shadername :str = 'Texture', filepath: str = None, raw: bool = True, target_port: maxon.GraphNode = None) -> maxon.GraphNode :
         """
         Adds a new texture shader to the graph.
@@ -370,6 +375,7 @@ class MaterialHelper(NodeGraghHelper):
 
         return shader
 
+    @EditGraph
     def AddLayer(self, inputA: Union[str,maxon.GraphNode] = None, inputB: Union[str,maxon.GraphNode] = None, target: Union[str,maxon.GraphNode] = None, blend: int = 5) -> maxon.GraphNode :
         """
         Adds a new color correct shader to the graph.
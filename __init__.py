@@ -91,12 +91,37 @@ def _reload_loaded_submodules(
     return reloaded_module_names
 
 
+# the attributes loaded on first access (PEP 562): name -> (module, attribute or None for the module itself)
+_LAZY_ATTRIBUTES: dict[str, tuple[str, Optional[str]]] = {
+    "TextureHelper": (".utils.texture_helper", "TextureHelper"),
+    "g_texture_helper": (".utils.texture_helper", "g_texture_helper"),
+    "MaterialMaker": (".utils.material_maker", None),
+    "PBRPackage": (".utils.material_maker", "PBRPackage"),
+    "DescriptionMaterialMaker": (".utils.material_maker", "DescriptionMaterialMaker"),
+    "BatchMaterialMaker": (".utils.material_maker", "BatchMaterialMaker"),
+    "decorators": (".utils.decorators", None),
+}
+
+# the renderer sub-packages, loaded on first access if the plugin is installed
+_LAZY_RENDERERS: dict[str, str] = {
+    "Redshift": "ID_REDSHIFT",
+    "Arnold": "ID_ARNOLD",
+    "Octane": "ID_OCTANE",
+    "Vray": "ID_VRAY",
+    "Corona": "ID_CORONA",
+    "CentiLeo": "ID_CENTILEO",
+}
+
+
 # 在包被 reload(Renderer) 时，先深度重载已加载的 Renderer 子模块。
 if globals().get("_RENDERER_PACKAGE_INITIALIZED", False):
     _RELOADED_SUBMODULES: list[str] = _reload_loaded_submodules(
         __name__,
         skip_modules={__name__},
     )
+    # drop the cached lazy attributes, they are loaded again from the reloaded modules
+    for _name in _LAZY_ATTRIBUTES:
+        globals().pop(_name, None)
 else:
     _RELOADED_SUBMODULES = []
 
@@ -104,11 +129,6 @@ else:
 from . import constants, utils
 from .constants.common_id import *
 from .utils import NodeGraghHelper, EasyTransaction
-from .utils.texture_helper import TextureHelper, g_texture_helper
-
-from .utils import material_maker as MaterialMaker
-from .utils.material_maker import PBRPackage, DescriptionMaterialMaker
-from .utils import decorators
 
 # New unified PBR pipeline (preferred for new code)
 
@@ -120,19 +140,27 @@ from .utils import (GetVideoPost,
                     )
 
 
-# import moudule if plugin installed
-if c4d.plugins.FindPlugin(ID_REDSHIFT, type=c4d.PLUGINTYPE_ANY) is not None:
-    from . import Redshift
-if c4d.plugins.FindPlugin(ID_ARNOLD, type=c4d.PLUGINTYPE_ANY) is not None:
-    from . import Arnold
-if c4d.plugins.FindPlugin(ID_OCTANE, type=c4d.PLUGINTYPE_ANY) is not None:
-    from . import Octane
-if c4d.plugins.FindPlugin(ID_VRAY, type=c4d.PLUGINTYPE_ANY) is not None:
-    from . import Vray
-if c4d.plugins.FindPlugin(ID_CORONA, type=c4d.PLUGINTYPE_ANY) is not None:
-    from . import Corona
-if c4d.plugins.FindPlugin(ID_CENTILEO, type=c4d.PLUGINTYPE_ANY) is not None:
-    from . import CentiLeo
+def __getattr__(name: str):
+    """
+    Load the texture helper, the material maker, the decorators and the renderer sub-packages
+    on first access instead of at import, the plugin startup only pays for what it uses.
+    """
+    if name in _LAZY_ATTRIBUTES:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+        module = importlib.import_module(module_name, __name__)
+        value = module if attribute is None else getattr(module, attribute)
+    # import moudule if plugin installed
+    elif name in _LAZY_RENDERERS and c4d.plugins.FindPlugin(globals()[_LAZY_RENDERERS[name]], type=c4d.PLUGINTYPE_ANY) is not None:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_RENDERERS))
+
 
 SUPPORT_RENDERER: list[int] = [ID_REDSHIFT, ID_ARNOLD, ID_OCTANE, ID_CORONA, ID_VRAY, ID_CENTILEO]
 
@@ -0,0 +1,85 @@
+"""
+Stand-in ``c4d``, ``maxon``, ``mxutils`` and ``redshift`` modules, just enough to import the ``Renderer`` package
+outside of Cinema 4D to time the imports: every attribute is a stub class and calls return the stub.
+Nothing can run against these stand-ins.
+"""
+import os
+import sys
+import types
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+C4D_VERSION = 2025000
+
+
+class _StubMeta(type):
+
+    def __getattr__(cls, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        child = _StubMeta(name, (), {})
+        type.__setattr__(cls, name, child)
+        return child
+
+    def __call__(cls, *args, **kwargs):
+        return cls
+
+    def __getitem__(cls, key):
+        return cls
+
+    def __int__(cls) -> int:
+        return 0
+
+    def __index__(cls) -> int:
+        return 0
+
+    def __add__(cls, other):
+        return cls
+
+    __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = __and__ = __rand__ = __add__
+    __ror__ = __add__
+
+
+class _StubModule(types.ModuleType):
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        stub = _StubMeta(name, (), {})
+        setattr(self, name, stub)
+        return stub
+
+
+def install(plugins_installed: bool = True) -> None:
+    """
+    Put the stand-ins in ``sys.modules``.
+
+    Args:
+        plugins_installed (bool, optional): what ``c4d.plugins.FindPlugin`` answers. Defaults to True.
+    """
+    c4d = _StubModule("c4d")
+    c4d.GetC4DVersion = lambda: C4D_VERSION
+    plugins = _StubModule("c4d.plugins")
+    plugins.FindPlugin = lambda *args, **kwargs: object() if plugins_installed else None
+    c4d.plugins = plugins
+    sys.modules.update({"c4d": c4d, "c4d.plugins": plugins})
+    for name in ("documents", "modules", "utils", "gui", "storage", "bitmaps"):
+        module = _StubModule(f"c4d.{name}")
+        setattr(c4d, name, module)
+        sys.modules[f"c4d.{name}"] = module
+    for name in ("maxon", "mxutils", "redshift"):
+        sys.modules[name] = _StubModule(name)
+
+
+def package_parent() -> str:
+    """
+    A folder to put on ``sys.path`` so the repository imports as ``Renderer``.
+    """
+    if os.path.basename(ROOT) == "Renderer":
+        return os.path.dirname(ROOT)
+    parent = os.path.join(tempfile.gettempdir(), "renderer_bench_path")
+    link = os.path.join(parent, "Renderer")
+    if not os.path.exists(link):
+        os.makedirs(parent, exist_ok=True)
+        os.symlink(ROOT, link, target_is_directory=True)
+    return parent
@@ -0,0 +1,97 @@
+"""
+Benchmark DescriptionConverter.convert_to on large synthetic Redshift descriptions: the scans of
+DESCRIPTION_MAPS per key against the compiled DESCRIPTION_TABLE. This can run without Cinema 4D,
+the package is imported with the stand-in modules of ``_stubs``.
+
+    python benchmarks/bench_description_converter.py
+"""
+import os
+import sys
+import copy
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _stubs
+
+_stubs.install()
+sys.path.insert(0, _stubs.package_parent())
+from Renderer.utils import _description_helper as helper
+
+SIZES = (1_000, 10_000, 50_000)
+RS, AR = helper.RS_NODESPACE, helper.AR_NODESPACE
+
+
+class LegacyConverter(helper.DescriptionConverter):
+    """The lookups of DescriptionConverter before the compiled table."""
+
+    def replace_type(self, dict_data):
+        for key, value in dict_data.items():
+            if isinstance(value, dict):
+                dict_data[key] = self.replace_type(value)
+            elif isinstance(value, str) and key == '$type':
+                node_type = value.replace('#', '')
+                current_map = helper.DESCRIPTION_MAPS[self.get_desc_index(helper.DESCRIPTION_MAPS, node_type)]
+                dict_data[key] = f'#{current_map[self.target_index]}'
+        return dict_data
+
+    def replace_slot(self, original_dict):
+        new_dict = {}
+        for key, value in original_dict.items():
+            if key.startswith('#<'):
+                node_type = original_dict.get('$type', '').replace('#', '')
+                current_map = helper.DESCRIPTION_MAPS[self.get_desc_index(helper.DESCRIPTION_MAPS, node_type)]
+                slots_map = current_map[-1]
+                sub_map = slots_map[self.get_desc_index(slots_map, key.replace('#<', ''))]
+                new_key = f'#<{sub_map[self.target_index]}'
+            else:
+                new_key = key
+            new_dict[new_key] = self.replace_slot(value) if isinstance(value, dict) else value
+        return new_dict
+
+
+def generate(count: int, seed: int = 0) -> tuple[dict, int]:
+    # a tree of Redshift nodes, every node plugs children into the known ports of its type
+    rng = random.Random(seed)
+    rows = [row for row in helper.DESCRIPTION_MAPS if row[-1] and row[-1][0]]
+    made = 0
+
+    def node(depth: int) -> dict:
+        nonlocal made
+        made += 1
+        row = rng.choice(rows)
+        node_type = row[0][0] if isinstance(row[0], list) else row[0]
+        data = {"$type": f"#{node_type}", "$id": f"{node_type.split('.')[-1]}@{made:08d}"}
+        for port in row[-1]:
+            if made < count and depth < 14 and rng.random() < 0.9:
+                data[f"#<{port[0]}"] = node(depth + 1)
+            else:
+                data[f"#<{port[0]}"] = 0.5
+        return data
+
+    output = {"$type": f"#{helper.OUTPUT_DESCRIPTION[0]}", "$id": "output@root"}
+    for port in helper.OUTPUT_PORTS:
+        output[f"#<{port[0]}"] = node(0)
+    return output, made
+
+
+def run(converter_type: type, data: dict, source: str) -> tuple[float, dict]:
+    data = copy.deepcopy(data)
+    start = time.perf_counter()
+    result = converter_type(data, source).convert_to(AR)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    for size in SIZES:
+        data, size = generate(size)
+        legacy_time, legacy = run(LegacyConverter, data, RS)
+        table_time, result = run(helper.DescriptionConverter, data, RS)
+        assert result == legacy
+        guess_time, _ = run(helper.DescriptionConverter, data, None)
+        print(f"{size:>7,} nodes  legacy {legacy_time * 1000:8.1f} ms  table {table_time * 1000:8.1f} ms  "
+              f"x{legacy_time / table_time:.1f}  guessed space {guess_time * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark the filename parsing of the PBR scanner in filenames per second: the old per-field
+detect_* path against FilenameClassifier without cache, cold cache and warm cache.
+This can run without Cinema 4D.
+
+    python benchmarks/bench_filename_classifier.py
+"""
+import os
+import re
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from _pure import load
+
+pbr_helper = load("pbr_helper")
+COUNT = 200000
+UNIQUE = 20000
+
+
+def legacy_parse(filename: str) -> tuple:
+    # the detection of PBRLibraryScanner.scan before FilenameClassifier
+    tokens = list(filter(None, re.split(r"[._\-\s]+", Path(filename).stem.lower())))
+    map_type = None
+    for token in tokens:
+        token = "disp16" if re.fullmatch(r"disp\d+", token) else token
+        if token in pbr_helper.KEYWORD_TO_TYPE:
+            map_type = pbr_helper.KEYWORD_TO_TYPE[token]
+            break
+    if not map_type:
+        return None
+    filtered = []
+    all_keywords = set(pbr_helper.KEYWORD_TO_TYPE.keys()) | {"dx", "gl", "opengl", "directx"}
+    for t in tokens:
+        normalized = "disp16" if re.fullmatch(r"disp\d+", t) else t
+        if normalized in all_keywords or re.fullmatch(r"\d+k", t) or pbr_helper.UDIM_PATTERN.fullmatch(t):
+            continue
+        filtered.append(t)
+    match = pbr_helper.RESOLUTION_PATTERN.search(filename.lower())
+    udim = pbr_helper.UDIM_PATTERN.search(filename)
+    normal = None
+    if any(k in tokens for k in ("dx", "directx", "nrm_dx", "normaldx")): normal = "directx"
+    elif any(k in tokens for k in ("gl", "opengl", "nrm_gl", "normalgl")): normal = "opengl"
+    return ("_".join(filtered) or "asset", map_type, match, udim, normal)
+
+
+def make_names() -> list[str]:
+    rng = random.Random(0)
+    maps = ("BaseColor", "Roughness", "Metallic", "Normal_GL", "AO", "Height", "Opacity", "disp16")
+    unique = [f"Asset{rng.randint(0, 999):03d}_{rng.choice(('Rock', 'Wood', 'Fabric'))}_{rng.choice(('2K', '4K', '8K'))}"
+              f"_{rng.choice(maps)}{rng.choice(('.png', '.exr', '.jpg'))}" for _ in range(UNIQUE)]
+    return [rng.choice(unique) for _ in range(COUNT)]
+
+
+def rate(label: str, func, names: list[str]) -> float:
+    start = time.perf_counter()
+    for name in names:
+        func(name)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<20} {len(names) / elapsed:>12,.0f} names/s")
+    return elapsed
+
+
+if __name__ == '__main__':
+    names = make_names()
+    print(f"{COUNT:,} names, {len(set(names)):,} unique")
+    legacy = rate("legacy", legacy_parse, names)
+    parse = rate("classifier parse", pbr_helper.FilenameClassifier.parse, names)
+    classifier = pbr_helper.FilenameClassifier()
+    cold = rate("classifier cold", classifier.classify, names)
+    warm = rate("classifier warm", classifier.classify, names)
+    print(f"parse x{legacy / parse:.1f}  cold x{legacy / cold:.1f}  warm x{legacy / warm:.1f}")
@@ -0,0 +1,73 @@
+"""
+Benchmark the iterative traversal engine against the old recursive list-membership walk
+on synthetic 10k-node graphs, this can run without Cinema 4D.
+
+    python benchmarks/bench_graph_traversal.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from _pure import load
+
+IterNodes = load("graph_traversal").IterNodes
+
+
+def legacy_pre_nodes(graph: dict, node, result: list) -> None:
+    # the walk of NodeGraghHelper.GetPreNodes before the traversal engine
+    for pre_node in graph.get(node, []):
+        if pre_node not in result:
+            result.append(pre_node)
+        legacy_pre_nodes(graph, pre_node, result)
+
+
+def make_tree(count: int, fan_in: int = 4) -> dict:
+    # every node has its own sub tree, no shared nodes
+    return {i: [c for c in range(i * fan_in + 1, i * fan_in + fan_in + 1) if c < count] for i in range(count)}
+
+
+def make_layers(layers: int, width: int) -> dict:
+    # every node of a layer feeds two nodes of the next layer, like stacked material layers
+    graph = {"out": [(0, i) for i in range(width)]}
+    for layer in range(layers - 1):
+        for i in range(width):
+            graph[(layer, i)] = [(layer + 1, i), (layer + 1, (i + 1) % width)]
+    return graph
+
+
+def make_chain(count: int) -> dict:
+    return {i: [i + 1] for i in range(count)}
+
+
+def timeit(func, repeat: int = 3) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        cost = time.perf_counter() - start
+        best = cost if best is None else min(best, cost)
+    return best
+
+
+def run(label: str, graph: dict, start, legacy: bool = True) -> None:
+    edges = lambda node: [(None, pre) for pre in graph.get(node, [])]
+    new_cost = timeit(lambda: list(IterNodes(start, edges)))
+    line = f"{label:<32} nodes={len(graph):>6}  engine={new_cost * 1000:9.2f} ms"
+    if legacy:
+        try:
+            legacy_cost = timeit(lambda: legacy_pre_nodes(graph, start, []), repeat=1)
+            line += f"  legacy={legacy_cost * 1000:9.2f} ms  x{legacy_cost / new_cost:.1f}"
+        except RecursionError:
+            line += "  legacy=RecursionError"
+    else:
+        line += "  legacy=skipped (exponential)"
+    print(line)
+
+
+if __name__ == '__main__':
+    print(f"Python {sys.version.split()[0]}, recursion limit {sys.getrecursionlimit()}")
+    run("tree 10k", make_tree(10000), 0)
+    run("layers 14x8 (fan-in)", make_layers(14, 8), "out")
+    run("layers 100x100 (fan-in)", make_layers(100, 100), "out", legacy=False)
+    run("chain 10k", make_chain(10000), 0)
@@ -0,0 +1,71 @@
+"""
+Benchmark the cold import time of the ``Renderer`` package and of each sub module, with the stand-in
+``c4d``/``maxon`` modules of ``_stubs``. Every measure is a new interpreter (the .pyc files are warm),
+the median of a few runs is kept.
+
+    python benchmarks/bench_import_time.py [runs]
+
+``import Renderer`` only loads the common ids and ``Renderer.utils``, the "everything" row touches all the
+lazy attributes, which is what the package used to import at startup.
+"""
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+RUNS = 7
+
+# name -> statement to time after the stand-ins are installed
+SCENARIOS: dict[str, str] = {
+    "Renderer": "import Renderer",
+    "Renderer.constants *": "from Renderer.constants import *",
+    "Renderer.utils": "import Renderer.utils",
+    "g_texture_helper": "import Renderer; Renderer.g_texture_helper",
+    "MaterialMaker": "import Renderer; Renderer.MaterialMaker",
+    "decorators": "import Renderer; Renderer.decorators",
+    "Redshift": "import Renderer; Renderer.Redshift",
+    "Arnold": "import Renderer; Renderer.Arnold",
+    "Octane": "import Renderer; Renderer.Octane",
+    "Vray": "import Renderer; Renderer.Vray",
+    "Corona": "import Renderer; Renderer.Corona",
+    "CentiLeo": "import Renderer; Renderer.CentiLeo",
+    "everything": "import Renderer; [getattr(Renderer, name) for name in dir(Renderer)]",
+}
+
+RUNNER = """
+import sys, time, json
+sys.path.insert(0, {benchmarks!r})
+import _stubs
+_stubs.install()
+sys.path.insert(0, _stubs.package_parent())
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, len([name for name in sys.modules if name.startswith("Renderer")])]))
+"""
+
+
+def measure(statement: str, runs: int) -> tuple[float, int]:
+    code = RUNNER.format(benchmarks=BENCHMARKS, statement=statement)
+    times, modules = [], 0
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        elapsed, modules = json.loads(output.strip().splitlines()[-1])
+        times.append(elapsed)
+    return statistics.median(times), modules
+
+
+def main(runs: int) -> None:
+    # a first run to write the .pyc files
+    measure(SCENARIOS["everything"], 1)
+    baseline = None
+    for name, statement in SCENARIOS.items():
+        elapsed, modules = measure(statement, runs)
+        baseline = baseline or elapsed
+        print(f"{name:<22} {elapsed * 1000:8.2f} ms  {modules:3d} modules  x{elapsed / baseline:.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else RUNS)
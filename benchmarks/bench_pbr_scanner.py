@@ -0,0 +1,78 @@
+"""
+Benchmark PBRLibraryScanner on a generated library of 100k files: the serial scan, the thread
+and process shards with more and more workers, and a rescan with the index.
+This can run without Cinema 4D.
+
+    python benchmarks/bench_pbr_scanner.py [root]
+
+Pass a root on the NAS to measure the listing latency, the generated tree is removed afterwards.
+On a local SSD the listing is cheap and the parsing holds the GIL, thread scaling stops early there.
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from _pure import load
+
+pbr_helper = load("pbr_helper")
+SHARDS = 50
+ASSETS = 50     # per shard
+MAPS = ("diffuse", "roughness", "metallic", "normal_gl", "ao", "height", "opacity", "specular", "emission", "sheen")
+RESOLUTIONS = ("2k", "4k")
+EXTENSIONS = (".png", ".exr")
+WORKERS = (2, 4, 8, 16, 32)
+
+
+def generate(root: str) -> int:
+    count = 0
+    for shard in range(SHARDS):
+        for asset in range(ASSETS):
+            name = f"asset{shard:02d}{asset:03d}"
+            folder = os.path.join(root, f"shard{shard:02d}", name)
+            os.makedirs(folder)
+            for map_name in MAPS:
+                for resolution in RESOLUTIONS:
+                    for extension in EXTENSIONS:
+                        open(os.path.join(folder, f"{name}_{resolution}_{map_name}{extension}"), "wb").close()
+                        count += 1
+            open(os.path.join(folder, "preview.txt"), "wb").close()
+            count += 1
+    return count
+
+
+def timed(root: str, **kwargs) -> tuple[float, int]:
+    start = time.perf_counter()
+    packages = pbr_helper.PBRLibraryScanner(root, kwargs.pop("index_path", None)).build(**kwargs)
+    return time.perf_counter() - start, len(packages)
+
+
+def main(parent: str) -> None:
+    root = tempfile.mkdtemp(prefix="pbr_bench_", dir=parent)
+    try:
+        start = time.perf_counter()
+        count = generate(root)
+        print(f"generated {count:,} files in {time.perf_counter() - start:.1f} s, cpu count {os.cpu_count()}")
+
+        serial, assets = timed(root)
+        print(f"{'serial':<16} {serial:7.2f} s  {assets} assets")
+        for processes in (False, True):
+            label = "processes" if processes else "threads"
+            for workers in WORKERS:
+                elapsed, _ = timed(root, workers=workers, processes=processes)
+                print(f"{label + ' x' + str(workers):<16} {elapsed:7.2f} s  x{serial / elapsed:.2f}")
+
+        index_path = os.path.join(parent or tempfile.gettempdir(), "pbr_bench_index.jsonl")
+        cold, _ = timed(root, index_path=index_path)
+        warm, _ = timed(root, index_path=index_path)
+        print(f"{'index cold':<16} {cold:7.2f} s")
+        print(f"{'index warm':<16} {warm:7.2f} s  x{serial / warm:.2f}")
+        os.remove(index_path)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,64 @@
+"""
+Benchmark 100k converter port lookups, reading the json per lookup (the old ConverterPorts)
+against the cached PortTable, this can run without Cinema 4D.
+
+    python benchmarks/bench_port_table.py
+"""
+import os
+import sys
+import json
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from _pure import load, ROOT
+
+port_table = load("port_table")
+COUNT = 100000
+
+
+def legacy_input(path: str, asset_id: str) -> str:
+    # the lookup of ConverterPorts.GetConvertInput before the cache
+    with open(path, 'r', encoding='UTF-8') as file:
+        data: dict = json.loads(file.read())
+    item: dict = data.get(asset_id, "")
+    if item == "":
+        return ""
+    return item.get("input", "")
+
+
+def run(name: str) -> None:
+    path = os.path.join(ROOT, "constants", name)
+    with open(path, 'r', encoding='UTF-8') as file:
+        asset_ids = list(json.load(file).keys())
+    rng = random.Random(0)
+    keys = [rng.choice(asset_ids) for _ in range(COUNT)]
+    short_keys = [key.split(".")[-1] for key in keys]
+
+    # the old path is far too slow for 100k, time 1k and scale
+    sample = keys[:1000]
+    start = time.perf_counter()
+    for key in sample:
+        legacy_input(path, key)
+    legacy = (time.perf_counter() - start) * COUNT / len(sample)
+
+    port_table.ClearPortTables()
+    start = time.perf_counter()
+    table = port_table.GetPortTable(path)
+    for key in keys:
+        port_table.GetPortTable(path).GetInput(key)
+    cached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in short_keys:
+        table.GetInput(key, trim=True)
+    short = time.perf_counter() - start
+
+    print(f"{name:<14} entries={len(table):>4}  legacy~{legacy:8.2f} s  cached={cached * 1000:8.2f} ms"
+          f"  short+trim={short * 1000:8.2f} ms  x{legacy / cached:,.0f}")
+
+
+if __name__ == '__main__':
+    print(f"{COUNT:,} lookups per table")
+    for name in ("Redshift.json", "Arnold.json", "Vray.json", "CentiLeo.json"):
+        run(name)
@@ -0,0 +1,46 @@
+"""
+Benchmark SequenceChecker on a render output of 3 passes x 1,000 EXR frames of 512 KB,
+with more and more workers. This can run without Cinema 4D.
+
+    python benchmarks/bench_sequence_checker.py [target parent]
+
+Pass a parent folder on the render share to measure the network latency, the generated files are removed afterwards.
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from _pure import load
+from test_sequence_checker import exr
+
+sequence_checker = load("sequence_checker")
+PASSES = 3
+FRAMES = 1000
+WORKERS = (1, 4, 8, 16)
+
+
+def main(parent: str) -> None:
+    root = tempfile.mkdtemp(prefix="seq_check_bench_", dir=parent)
+    try:
+        data = exr(256, 1024)
+        for index in range(PASSES):
+            for frame in range(1, FRAMES + 1):
+                with open(os.path.join(root, f"shot_pass{index}.{frame:04d}.exr"), "wb") as file:
+                    file.write(data if frame % 250 else data[:-100])
+        print(f"{PASSES} passes x {FRAMES:,} frames of {len(data) // 1024} KB")
+        serial = None
+        for workers in WORKERS:
+            start = time.perf_counter()
+            reports = sequence_checker.SequenceChecker(root, 1, FRAMES, workers=workers).check()
+            elapsed = time.perf_counter() - start
+            serial = serial or elapsed
+            print(f"{'workers x' + str(workers):<14} {elapsed:7.3f} s  x{serial / elapsed:.2f}  {reports[0]}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,80 @@
+"""
+Benchmark ImageSequence on a render folder of 10 passes x 5,000 frames: the old per instance
+``os.listdir`` + ``re.match`` of the whole folder against the shared SequenceIndex, for one
+ImageSequence per pass and for 1,000 frame lookups. This can run without Cinema 4D.
+
+    python benchmarks/bench_sequence_index.py
+"""
+import os
+import re
+import sys
+import time
+import shutil
+import tempfile
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from _pure import load
+
+image_helper = load("image_helper")
+PASSES = 10
+FRAMES = 5000
+LOOKUPS = 1000
+
+
+def legacy_sequence(image_path: str) -> list[str]:
+    # ImageSequence.get_sequence before the shared index
+    pattern = image_helper.SEQUENCE_PATTERN
+    folder, image_name = os.path.split(image_path)
+    extension = os.path.splitext(image_path)[1][1:]
+    sequences = defaultdict(list)
+    for image in [img for img in os.listdir(folder) if img.lower().endswith(extension)]:
+        match = re.match(pattern, image, re.I)
+        if match:
+            prefix, number, ext = match.groups()
+            sequences[f"{prefix}.{ext}"].append((int(number), image))
+    for key in sequences:
+        sequences[key].sort()
+    prefix, _, ext = re.match(pattern, image_name, re.I).groups()
+    return [img for _, img in sequences.get(f"{prefix}.{ext}", [])]
+
+
+def main() -> None:
+    root = tempfile.mkdtemp(prefix="seq_bench_")
+    try:
+        for index in range(PASSES):
+            for frame in range(FRAMES):
+                open(os.path.join(root, f"shot_pass{index:02d}.{frame:04d}.exr"), "wb").close()
+        images = [os.path.join(root, f"shot_pass{index:02d}.0000.exr") for index in range(PASSES)]
+        print(f"{PASSES} passes x {FRAMES:,} frames")
+
+        start = time.perf_counter()
+        for image in images:
+            legacy = legacy_sequence(image)
+        legacy_time = time.perf_counter() - start
+
+        image_helper.SequenceIndex.clear_cache()
+        start = time.perf_counter()
+        for image in images:
+            sequence = image_helper.ImageSequence(image)
+        index_time = time.perf_counter() - start
+        assert sequence.result == legacy
+        print(f"{'legacy':<14} {legacy_time * 1000:9.1f} ms")
+        print(f"{'shared index':<14} {index_time * 1000:9.1f} ms  x{legacy_time / index_time:.1f}")
+
+        start = time.perf_counter()
+        for frame in range(LOOKUPS):
+            f"shot_pass09.{frame:04d}.exr" in legacy
+        list_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for frame in range(LOOKUPS):
+            sequence.get_frame_path(frame)
+        lookup_time = time.perf_counter() - start
+        print(f"{'list lookups':<14} {list_time * 1000:9.2f} ms")
+        print(f"{'mask lookups':<14} {lookup_time * 1000:9.2f} ms  x{list_time / lookup_time:.1f}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
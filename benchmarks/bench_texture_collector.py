@@ -0,0 +1,69 @@
+"""
+Benchmark TextureCollector on 2,000 texture records drawn from 500 files: the serial copy, the thread
+pool with more and more workers and a second collect that skips everything.
+This can run without Cinema 4D.
+
+    python benchmarks/bench_texture_collector.py [target parent]
+
+Pass a parent folder on the SMB share to measure the network latency, the generated files are removed afterwards.
+"""
+import os
+import sys
+import time
+import shutil
+import random
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from _pure import load
+
+texture_collector = load("texture_collector")
+RECORDS = 2000
+UNIQUE = 500
+FILE_SIZE = 256 * 1024
+WORKERS = (1, 2, 4, 8, 16)
+
+
+def generate(root: str) -> list[str]:
+    sources = []
+    payload = os.urandom(FILE_SIZE)
+    for index in range(UNIQUE):
+        path = os.path.join(root, f"material{index // 10:03d}", f"texture{index:04d}_diffuse.png")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(payload)
+        sources.append(path)
+    rng = random.Random(0)
+    return [rng.choice(sources) for _ in range(RECORDS)]
+
+
+def collect(records: list[str], target: str, workers: int) -> texture_collector.CollectReport:
+    collector = texture_collector.TextureCollector(target, workers=workers)
+    collector.plan(records)
+    return collector.copy()
+
+
+def main(parent: str) -> None:
+    source_root = tempfile.mkdtemp(prefix="tex_bench_src_")
+    target_root = tempfile.mkdtemp(prefix="tex_bench_dst_", dir=parent)
+    try:
+        records = generate(source_root)
+        print(f"{RECORDS:,} records, {len(set(records))} unique files of {FILE_SIZE // 1024} KB")
+        serial = None
+        for workers in WORKERS:
+            target = os.path.join(target_root, f"x{workers}")
+            start = time.perf_counter()
+            report = collect(records, target, workers)
+            elapsed = time.perf_counter() - start
+            serial = serial or elapsed
+            print(f"{'workers x' + str(workers):<14} {elapsed:7.2f} s  x{serial / elapsed:.2f}  {report}")
+        start = time.perf_counter()
+        report = collect(records, target, WORKERS[-1])
+        print(f"{'recollect':<14} {time.perf_counter() - start:7.2f} s  {report}")
+    finally:
+        shutil.rmtree(source_root, ignore_errors=True)
+        shutil.rmtree(target_root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
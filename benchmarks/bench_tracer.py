@@ -0,0 +1,49 @@
+"""
+Benchmark the cost of the tracer on a traced call: a plain function, the same function decorated
+with ``trace`` while the tracer is disabled and while it is enabled, and a ``span`` block.
+This can run without Cinema 4D.
+
+    python benchmarks/bench_tracer.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from _pure import load
+
+tracer_module = load("tracer")
+CALLS = 1_000_000
+
+
+def plain(x: int) -> int:
+    return x + 1
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    for index in range(CALLS):
+        func(index)
+    return (time.perf_counter() - start) / CALLS * 1e9
+
+
+def main() -> None:
+    tracer = tracer_module.Tracer()
+    traced = tracer.trace(plain)
+
+    def block(x: int) -> int:
+        with tracer.span("block"):
+            return x + 1
+
+    base = timed(plain)
+    print(f"{'plain':<18} {base:7.1f} ns/call")
+    print(f"{'trace disabled':<18} {timed(traced):7.1f} ns/call")
+    print(f"{'span disabled':<18} {timed(block):7.1f} ns/call")
+    tracer.enable()
+    print(f"{'trace enabled':<18} {timed(traced):7.1f} ns/call")
+    tracer.enable()
+    print(f"{'span enabled':<18} {timed(block):7.1f} ns/call")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,333 @@
+"""
+Benchmark suite of the hot helper paths on the in-memory stand-ins of ``Renderer.testing``, with a regression gate.
+This can run without Cinema 4D.
+
+Each scenario reports the best wall time of its repeats, the native calls of one run (``testing.native_calls``)
+and the peak memory of one run under ``tracemalloc``, the results are written as JSON. With a baseline the run
+fails, exit code 1, when a scenario is slower, makes more native calls or peaks higher by more than the threshold.
+
+    python benchmarks/suite.py [-o results.json] [--quick] [-k GetPreNodes] [--repeat 3]
+    python benchmarks/suite.py --baseline baseline.json [--threshold 10]
+    python benchmarks/suite.py --baseline baseline.json --current results.json
+
+``--quick`` skips the large sizes: the 10k node graphs and the 100k file library.
+"""
+import os
+import sys
+import copy
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+from _sim import setup
+
+Renderer, testing = setup()
+import c4d
+from Renderer.utils.node_helper import NodeGraghHelper
+from Renderer.utils.pbr_helper import PBRLibraryScanner
+from Renderer.utils.image_helper import ImageSequence, SequenceIndex
+from Renderer.utils.aov_preset import AOVPreset, AOVSpec
+from Renderer.utils import _description_helper as description
+
+METRICS = ("wall", "native_calls", "peak_memory")
+THRESHOLD = 10.0    # percent
+MIN_WALL = 0.001    # seconds, a smaller wall time difference is noise
+TEXTURES = {"Diffuse": "/tex/wood_diffuse.png", "AO": "/tex/wood_ao.png", "Roughness": "/tex/wood_roughness.png",
+            "Metalness": "/tex/wood_metalness.png", "Normal": "/tex/wood_normal.png",
+            "Displacement": "/tex/wood_height.png", "Alpha": "/tex/wood_opacity.png"}
+PBR_MAPS = ("diffuse", "roughness", "metallic", "normal_gl", "ao", "height", "opacity", "specular", "emission", "sheen")
+
+
+@dataclass
+class Scenario:
+    """
+    A benchmark scenario, ``setup`` is a context manager yielding ``(run, prepare)``, ``prepare`` makes the fresh
+    input of each run outside of the measure, or None.
+    """
+    name: str
+    setup: Callable[[], Any]
+    repeat: int = 3
+    large: bool = False
+
+
+SCENARIOS: list[Scenario] = []
+
+
+def scenario(name: str, repeat: int = 3, large: bool = False, **kwargs) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        manager = contextlib.contextmanager(func)
+        SCENARIOS.append(Scenario(name, lambda: manager(**kwargs), repeat, large))
+        return func
+    return decorator
+
+
+class Skip(Exception):
+    """A scenario which can not run in this tree."""
+
+
+# =============================================
+# Scenarios
+# =============================================
+
+def node_graph(size: int) -> tuple[NodeGraghHelper, Any]:
+    testing.set_nodespace(testing.RS_NODESPACE)
+    material = testing.scenes.NodeMaterial(testing.RS_NODESPACE, nodes=size, chains=4)
+    helper = NodeGraghHelper(material)
+    return helper, helper.GetNodes("com.redshift3d.redshift4c4d.nodes.core.standardmaterial")[0]
+
+
+for _size in (1_000, 10_000):
+    @scenario(f"graph.GetAllShaders[{_size // 1000}k]", large=_size > 1_000, size=_size)
+    def graph_all_shaders(size: int) -> Iterator:
+        helper, _ = node_graph(size)
+        yield lambda _: helper.GetAllShaders(), None
+
+    @scenario(f"graph.GetPreNodes[{_size // 1000}k]", large=_size > 1_000, size=_size)
+    def graph_pre_nodes(size: int) -> Iterator:
+        helper, brdf = node_graph(size)
+        yield lambda _: helper.GetPreNodes(brdf), None
+
+
+for _renderer, _space in (("Redshift", testing.RS_NODESPACE), ("Arnold", testing.AR_NODESPACE),
+                          ("Vray", testing.VR_NODESPACE), ("CentiLeo", testing.CL_NODESPACE)):
+    @scenario(f"SetupTextures[{_renderer}]", repeat=5, renderer=_renderer, space=_space)
+    def setup_textures(renderer: str, space: str) -> Iterator:
+        module = getattr(Renderer, renderer)
+        if not hasattr(module.Material, "SetupTextures"):
+            raise Skip(f"{renderer} MaterialHelper has no SetupTextures")
+        testing.set_nodespace(space)
+
+        def run(_) -> None:
+            material = module.Material()
+            with Renderer.EasyTransaction(material) as tr:
+                tr.SetupTextures(dict(TEXTURES), "Wood")
+
+        yield run, None
+
+
+def pbr_library(root: str, files: int) -> int:
+    # assets of 10 maps x 2 resolutions x 2 formats and a preview, 50 assets per shard
+    per_asset = len(PBR_MAPS) * 4 + 1
+    count = 0
+    for index in range(files // per_asset):
+        name = f"asset{index:05d}"
+        folder = os.path.join(root, f"shard{index // 50:03d}", name)
+        os.makedirs(folder)
+        for map_name in PBR_MAPS:
+            for resolution in ("2k", "4k"):
+                for extension in (".png", ".exr"):
+                    open(os.path.join(folder, f"{name}_{resolution}_{map_name}{extension}"), "wb").close()
+        open(os.path.join(folder, "preview.txt"), "wb").close()
+        count += per_asset
+    return count
+
+
+for _files in (10_000, 100_000):
+    @scenario(f"PBRLibraryScanner.build[{_files // 1000}k]", repeat=3 if _files < 100_000 else 1,
+              large=_files > 10_000, files=_files)
+    def pbr_scanner(files: int) -> Iterator:
+        root = tempfile.mkdtemp(prefix="pbr_suite_")
+        try:
+            pbr_library(root, files)
+            yield lambda _: PBRLibraryScanner(root).build(), None
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+@scenario("ImageSequence[50k]", frames=50_000)
+def image_sequence(frames: int) -> Iterator:
+    root = tempfile.mkdtemp(prefix="seq_suite_")
+    try:
+        for frame in range(frames):
+            open(os.path.join(root, f"shot_beauty.{frame:05d}.exr"), "wb").close()
+        image = os.path.join(root, "shot_beauty.00000.exr")
+
+        def run(_) -> None:
+            sequence = ImageSequence(image)
+            for frame in range(0, frames, 50):
+                sequence.get_frame_path(frame)
+
+        yield run, SequenceIndex.clear_cache
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def aov_preset(renderer: str, videopost: Callable, aov_types: list[int]) -> tuple[Callable, Callable]:
+    # half of the aovs are there, the preset updates them and adds the other half
+    preset = AOVPreset(renderer, [AOVSpec(aov_type, enabled=True) for aov_type in aov_types])
+
+    def prepare() -> Any:
+        vp = videopost(c4d.documents.BaseDocument(), aovs=len(aov_types) // 2, aov_types=aov_types)
+        return getattr(Renderer, renderer).AOV(vp)
+
+    return lambda helper: helper.apply_preset(preset), prepare
+
+
+@scenario("AOVPreset.apply[Redshift]")
+def redshift_aov_preset() -> Iterator:
+    from Renderer.constants.redshift_id import REDSHIFT_AOVS
+    run, prepare = aov_preset("Redshift", testing.scenes.RedshiftVideoPost, list(REDSHIFT_AOVS))
+    yield run, prepare
+
+
+@scenario("AOVPreset.apply[Octane]")
+def octane_aov_preset() -> Iterator:
+    from Renderer.constants.octane_id import AOV_SYMBOLS, RNDAOV_CUSTOM, RNDAOV_LIGHT
+    # the custom and light aovs are told apart by their ids
+    aov_types = [aov_type for aov_type in AOV_SYMBOLS if aov_type not in (RNDAOV_CUSTOM, RNDAOV_LIGHT)]
+    run, prepare = aov_preset("Octane", testing.scenes.OctaneVideoPost, aov_types)
+    yield run, prepare
+
+
+def redshift_description(count: int, seed: int = 0) -> dict:
+    # a tree of Redshift nodes, every node plugs children into the known ports of its type
+    rng = random.Random(seed)
+    rows = [row for row in description.DESCRIPTION_MAPS if row[-1] and row[-1][0]]
+    made = 0
+
+    def node(depth: int) -> dict:
+        nonlocal made
+        made += 1
+        row = rng.choice(rows)
+        node_type = row[0][0] if isinstance(row[0], list) else row[0]
+        data = {"$type": f"#{node_type}", "$id": f"{node_type.split('.')[-1]}@{made:08d}"}
+        for port in row[-1]:
+            if made < count and depth < 14 and rng.random() < 0.9:
+                data[f"#<{port[0]}"] = node(depth + 1)
+            else:
+                data[f"#<{port[0]}"] = 0.5
+        return data
+
+    output = {"$type": f"#{description.OUTPUT_DESCRIPTION[0]}", "$id": "output@root"}
+    for port in description.OUTPUT_PORTS:
+        output[f"#<{port[0]}"] = node(0)
+    return output
+
+
+@scenario("DescriptionConverter.convert_to[10k]", count=10_000)
+def description_converter(count: int) -> Iterator:
+    data = redshift_description(count)
+    yield (lambda data: description.DescriptionConverter(data, description.RS_NODESPACE)
+           .convert_to(description.AR_NODESPACE)), lambda: copy.deepcopy(data)
+
+
+# =============================================
+# Run and compare
+# =============================================
+
+def measure(item: Scenario) -> dict:
+    """
+    Run a scenario, the result is ``{"status": "ok", "wall", "native_calls", "peak_memory"}``,
+    or ``{"status": "skipped" | "error", "reason"}``.
+    """
+    try:
+        with item.setup() as (run, prepare):
+            prepare = prepare or (lambda: None)
+            walls, calls = [], None
+            for _ in range(item.repeat):
+                state = prepare()
+                with testing.native_calls.measure() as counter:
+                    start = time.perf_counter()
+                    run(state)
+                    walls.append(time.perf_counter() - start)
+                calls = counter.total if calls is None else calls
+
+            state = prepare()
+            tracemalloc.start()
+            try:
+                base = tracemalloc.get_traced_memory()[0]
+                run(state)
+                peak = tracemalloc.get_traced_memory()[1] - base
+            finally:
+                tracemalloc.stop()
+    except Skip as error:
+        return {"status": "skipped", "reason": str(error)}
+    except Exception as error:
+        return {"status": "error", "reason": f"{error.__class__.__name__}: {error}"}
+    return {"status": "ok", "wall": min(walls), "native_calls": calls, "peak_memory": peak}
+
+
+def run_suite(keyword: str = None, quick: bool = False, repeat: int = None) -> dict:
+    results = {}
+    for item in SCENARIOS:
+        if (keyword and keyword.lower() not in item.name.lower()) or (quick and item.large):
+            continue
+        if repeat:
+            item.repeat = repeat
+        results[item.name] = result = measure(item)
+        if result["status"] == "ok":
+            print(f"{item.name:<40} {result['wall'] * 1000:10.2f} ms {result['native_calls']:>10,} calls "
+                  f"{result['peak_memory'] / 1024:>10,.0f} KiB")
+        else:
+            print(f"{item.name:<40} {result['status']}: {result['reason']}")
+    return {"python": platform.python_version(), "platform": platform.platform(), "scenarios": results}
+
+
+def compare(baseline: dict, current: dict, threshold: float = THRESHOLD) -> list[str]:
+    """
+    Compare two results of ``run_suite``.
+
+    Returns:
+        list[str]: the regressions, a metric over the baseline by more than #threshold percent,
+            or a scenario which ran in the baseline and fails now.
+    """
+    regressions = []
+    for name, before in baseline["scenarios"].items():
+        after = current["scenarios"].get(name)
+        if after is None or before["status"] != "ok" or after["status"] == "skipped":
+            continue
+        if after["status"] != "ok":
+            regressions.append(f"{name}: {after['status']}, {after['reason']}")
+            continue
+        for metric in METRICS:
+            old, new = before[metric], after[metric]
+            if metric == "wall" and new - old < MIN_WALL:
+                continue
+            if new > old * (1 + threshold / 100):
+                change = f"+{(new - old) / old * 100:.1f}%" if old else "from 0"
+                regressions.append(f"{name}: {metric} {old:,.4g} -> {new:,.4g} ({change})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", default=os.path.join(tempfile.gettempdir(), "renderer_benchmarks.json"))
+    parser.add_argument("-k", "--keyword", help="run the scenarios with the keyword in their name")
+    parser.add_argument("--quick", action="store_true", help="skip the large sizes")
+    parser.add_argument("--repeat", type=int, help="the repeats of each scenario")
+    parser.add_argument("--baseline", help="fail on a regression against these results")
+    parser.add_argument("--current", help="compare these results with the baseline instead of running")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="the regression threshold in percent")
+    args = parser.parse_args()
+
+    if args.current:
+        with open(args.current, "r", encoding="utf-8") as file:
+            current = json.load(file)
+    else:
+        current = run_suite(args.keyword, args.quick, args.repeat)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+        print(f"results written to {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = compare(baseline, current, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regressions over {args.threshold:g}% against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,11 +2,42 @@
 # -*- coding: utf-8 -*-
 
 """Provides classes that expose commonly used constants as immutable objects.
+
+The common ids are loaded with the package, the per renderer tables (``redshift_id``, ``octane_id``...)
+are loaded on the first access of a name they define (PEP 562), or by ``from Renderer.constants import *``.
+Import a table directly to load only that table, e.g. ``from Renderer.constants.redshift_id import *``.
 """
+import importlib
 from Renderer.constants.common_id import *
-from Renderer.constants.redshift_id import *
-from Renderer.constants.octane_id import *
-from Renderer.constants.arnold_id import *
-from Renderer.constants.vray_id import *
-from Renderer.constants.corona_id import *
-from Renderer.constants.centileo_id import *
+
+# the tables in the order of the star imports, a later table wins a duplicated name
+_RENDERER_TABLES: tuple[str, ...] = ("redshift_id", "octane_id", "arnold_id", "vray_id", "corona_id", "centileo_id")
+_TABLES_LOADED: bool = False
+
+
+def _load_tables() -> None:
+    global _TABLES_LOADED
+    for table in _RENDERER_TABLES:
+        module = importlib.import_module(f"{__name__}.{table}")
+        globals().update({name: value for name, value in vars(module).items() if not name.startswith("_")})
+    _TABLES_LOADED = True
+
+
+def __getattr__(name: str):
+    # star imports read __all__, so all the tables are there for them
+    if name == "__all__":
+        if not _TABLES_LOADED:
+            _load_tables()
+        return [key for key in globals() if not key.startswith("_")]
+    if name.startswith("__") or _TABLES_LOADED:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    _load_tables()
+    if name in globals():
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    if not _TABLES_LOADED:
+        _load_tables()
+    return sorted(globals())
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory stand-ins of the ``c4d``, ``maxon`` and ``redshift`` modules, so the helpers of the package run,
+and can be tested and measured, in a plain CPython without Cinema 4D.
+
+The stand-ins keep real state: node graphs with transactions, ports and wires, materials with shaders in their
+containers, documents with object and tag trees, video posts with aovs. Each call into the stand-in API is
+counted by ``native_calls``, the count of native round trips of a helper is a cost we can compare.
+What is not simulated is a placeholder which raises ``NotImplementedError`` when it is called.
+
+This package imports nothing of ``Renderer``, ``install`` puts the modules in ``sys.modules`` before the
+package is imported. ``Renderer/__init__.py`` imports c4d, so outside of Cinema 4D the package is set up by
+``testing/bootstrap.py``, loaded by path (or run with a script, see the bootstrap).
+
+Example:
+
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("renderer_bootstrap", "/path/to/Renderer/testing/bootstrap.py")
+    bootstrap = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bootstrap)
+    Renderer, testing = bootstrap.setup(nodespace="com.redshift3d.redshift4c4d.class.nodespace")
+
+    material = testing.scenes.NodeMaterial(testing.RS_NODESPACE, nodes=1000)
+    helper = Renderer.NodeGraghHelper(material)
+    with testing.native_calls.measure() as calls:
+        helper.GetAllShaders()
+    print(calls.total)
+
+离线替身: 在CPython中模拟c4d/maxon/redshift, 运行和测量助手并统计原生调用次数.
+"""
+import sys
+from typing import Iterable, Optional
+
+from .native_calls import NativeCalls, native_calls, native
+from .missing import Missing, StandinModule
+from . import maxon_standin, c4d_standin
+from .maxon_standin import (RS_NODESPACE, AR_NODESPACE, VR_NODESPACE, CL_NODESPACE, STANDARD_NODESPACE,
+                            NodeTemplate, NodeSpace, RegisterNodeTemplate, RegisterNodeSpace, GetNodeTemplate)
+from . import scenes
+
+MODULE_NAMES: tuple[str, ...] = ("c4d", "c4d.documents", "c4d.plugins", "c4d.modules", "c4d.utils", "c4d.gui",
+                                 "c4d.storage", "c4d.bitmaps", "c4d.threading", "maxon", "redshift", "mxutils")
+
+_saved: Optional[dict] = None
+
+
+def install(version: int = c4d_standin.DEFAULT_VERSION, nodespace: str = RS_NODESPACE,
+            plugins: Optional[Iterable[int]] = None, fresh_wrappers: bool = False) -> dict:
+    """
+    Put the stand-in modules in ``sys.modules``, the modules there before are restored by ``uninstall``.
+
+    Args:
+        version (int, optional): what ``c4d.GetC4DVersion`` returns. Defaults to 2025100.
+        nodespace (str, optional): the active node space. Defaults to RS_NODESPACE.
+        plugins (Iterable[int], optional): the ids ``c4d.plugins.FindPlugin`` finds, None for all. Defaults to None.
+        fresh_wrappers (bool, optional): True to return a new wrapper on each link read, as Cinema 4D does,
+            the nodes are equal with ``==`` but not with ``is``. Defaults to False.
+
+    Returns:
+        dict: the stand-in modules by name.
+    """
+    global _saved
+    if _saved is None:
+        _saved = {name: sys.modules.get(name) for name in MODULE_NAMES}
+    modules = c4d_standin.CreateModules()
+    modules["maxon"] = maxon_standin.CreateModule()
+    modules["mxutils"] = StandinModule("mxutils", "The mxutils stand-in.")
+    sys.modules.update(modules)
+
+    state = c4d_standin.state
+    state.version = version
+    state.nodespace = str(nodespace)
+    state.plugins = None if plugins is None else set(plugins)
+    state.document = c4d_standin.BaseDocument()
+    state.events = 0
+    state.fresh_wrappers = fresh_wrappers
+    native_calls.reset()
+    return modules
+
+
+def uninstall() -> None:
+    """
+    Restore the modules replaced by ``install``.
+    """
+    global _saved
+    if _saved is None:
+        return
+    for name, module in _saved.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+    _saved = None
+
+
+def set_nodespace(nodespace: str) -> None:
+    """
+    Set what ``c4d.GetActiveNodeSpaceId`` returns.
+    """
+    c4d_standin.state.nodespace = str(nodespace)
+
+
+__all__ = [
+    "NativeCalls",
+    "native_calls",
+    "native",
+    "Missing",
+    "StandinModule",
+    "maxon_standin",
+    "c4d_standin",
+    "scenes",
+    "RS_NODESPACE",
+    "AR_NODESPACE",
+    "VR_NODESPACE",
+    "CL_NODESPACE",
+    "STANDARD_NODESPACE",
+    "NodeTemplate",
+    "NodeSpace",
+    "RegisterNodeTemplate",
+    "RegisterNodeSpace",
+    "GetNodeTemplate",
+    "install",
+    "uninstall",
+    "set_nodespace",
+]
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Import the ``Renderer`` package against the in-memory stand-ins of ``Renderer.testing``, in a plain CPython.
+
+``Renderer/__init__.py`` imports c4d, so ``import Renderer.testing`` only works in Cinema 4D. This file imports
+nothing of the package and is loaded by path: ``Renderer.testing`` is loaded without its parent, the stand-ins
+are installed, then the package is imported from a folder where the repository is named ``Renderer``.
+
+Load it by path:
+
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("renderer_bootstrap", "/path/to/Renderer/testing/bootstrap.py")
+    bootstrap = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bootstrap)
+
+    Renderer, testing = bootstrap.setup()
+    testing.set_nodespace(testing.RS_NODESPACE)
+    material = testing.scenes.NodeMaterial(testing.RS_NODESPACE, nodes=1000)
+
+Or run a script with the stand-ins installed, the script imports ``Renderer`` as in Cinema 4D:
+
+    python /path/to/Renderer/testing/bootstrap.py my_script.py [args...]
+
+离线引导: 按路径加载, 安装替身后导入Renderer包, 也可以直接运行脚本.
+"""
+import os
+import sys
+import types
+import runpy
+import hashlib
+import tempfile
+import importlib
+import importlib.util
+
+TESTING_DIR: str = os.path.dirname(os.path.abspath(__file__))
+ROOT: str = os.path.dirname(TESTING_DIR)
+
+
+def package_parent() -> str:
+    """
+    A folder to put on ``sys.path`` so the repository imports as ``Renderer``.
+
+    A checkout with another folder name gets a ``Renderer`` link in a temp folder of its own,
+    a link that points somewhere else (a moved or replaced checkout) is pointed back to ``ROOT``.
+
+    Raises:
+        OSError: The link cannot be made, on Windows a symlink needs the Developer Mode or an elevated shell.
+    """
+    if os.path.basename(ROOT) == "Renderer":
+        return os.path.dirname(ROOT)
+    root = os.path.realpath(ROOT)
+    parent = os.path.join(tempfile.gettempdir(), "renderer_sim_path_" + hashlib.sha1(root.encode("utf-8")).hexdigest()[:12])
+    link = os.path.join(parent, "Renderer")
+    if os.path.realpath(link) == root:
+        return parent
+    try:
+        os.makedirs(parent, exist_ok=True)
+        if os.path.lexists(link):
+            os.remove(link)
+        os.symlink(ROOT, link, target_is_directory=True)
+    except OSError as error:
+        raise OSError(f'{package_parent.__name__} Cannot link {link} to {ROOT}: {error}. On Windows a symlink needs '
+                      f'the Developer Mode or an elevated shell, or name the checkout folder "Renderer".') from error
+    return parent
+
+
+def load_testing() -> types.ModuleType:
+    """
+    Load ``Renderer.testing`` without importing ``Renderer``.
+    """
+    if "Renderer.testing" in sys.modules:
+        return sys.modules["Renderer.testing"]
+    # an empty parent package while the sub-package loads, the real one is imported after the install
+    parent = "Renderer" not in sys.modules
+    if parent:
+        package = types.ModuleType("Renderer")
+        package.__path__ = [ROOT]
+        sys.modules["Renderer"] = package
+    try:
+        spec = importlib.util.spec_from_file_location("Renderer.testing", os.path.join(TESTING_DIR, "__init__.py"),
+                                                      submodule_search_locations=[TESTING_DIR])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["Renderer.testing"] = module
+        spec.loader.exec_module(module)
+    finally:
+        if parent:
+            del sys.modules["Renderer"]
+    return module
+
+
+def setup(**kwargs) -> tuple[types.ModuleType, types.ModuleType]:
+    """
+    Install the stand-ins and import the package, the keyword arguments go to ``testing.install``.
+
+    Returns:
+        tuple[types.ModuleType, types.ModuleType]: ``Renderer`` and ``Renderer.testing``.
+    """
+    testing = load_testing()
+    testing.install(**kwargs)
+    parent = package_parent()
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    return importlib.import_module("Renderer"), testing
+
+
+def main(argv: list[str]) -> int:
+    if not argv or argv[0] in ("-h", "--help"):
+        print(__doc__)
+        return 0 if argv else 2
+    setup()
+    sys.argv = list(argv)
+    runpy.run_path(argv[0], run_name="__main__")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,1182 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory stand-in of the ``c4d`` API the helpers use: ``BaseContainer``, the ``GeListNode`` trees
+(objects, tags, materials, shaders, render data and video posts), ``BaseDocument``, the node materials with
+their ``maxon`` graphs, and the ``redshift`` aov module.
+
+The named constants are the ones of ``constants/*.py`` (read with ``ast``, nothing is imported), the rest get a
+stable id from their name, so ``c4d.RNDAOV_NAME`` and ``RNDAOV_NAME`` agree as they do in Cinema 4D.
+An API name that is not simulated is a placeholder which raises when it is called.
+
+c4d替身: 容器, 节点树, 文档, 节点材质和redshift AOV, 在内存中运行.
+"""
+import os
+import ast
+import glob
+import math
+import zlib
+import re
+from typing import Any, Iterator, Optional
+
+from .native_calls import native
+from .missing import Missing, StandinModule
+from . import maxon_standin
+from .maxon_standin import Id, GraphModelRef, GraphNode, NimbusBaseRef
+
+CONSTANTS_DIR: str = maxon_standin.CONSTANTS_DIR
+DEFAULT_VERSION: int = 2025100
+
+# the ids with a meaning for the stand-ins, the type ids the package compares with literals
+KNOWN_SYMBOLS: dict[str, int] = {
+    "NOTOK": -1,
+    "PLUGINTYPE_ANY": 0,
+    "DESCFLAGS_GET_NONE": 0,
+    "DESCFLAGS_SET_NONE": 0,
+    "SELECTION_NEW": 0,
+    "SELECTION_ADD": 1,
+    "SELECTION_SUB": 2,
+    "BIT_ACTIVE": 2,
+    "ID_BASELIST_NAME": 900,
+    "RDATA_RENDERENGINE_STANDARD": 0,
+    "RDATA_FRAMESEQUENCE_MANUAL": 0,
+    "RDATA_FRAMESEQUENCE_CURRENTFRAME": 1,
+    "RDATA_FRAMESEQUENCE_ALLFRAMES": 2,
+    "RDATA_FRAMESEQUENCE_PREVIEWRANGE": 3,
+    "Mmaterial": 5703,
+    "Ttexture": 5616,
+    "Tpolygonselection": 5673,
+}
+
+# ALL_CAPS constants and the type ids as Mmaterial, Ocube, Ttexture, Xbitmap, Vbase
+_SYMBOL_PATTERN = re.compile(r"^(?:[A-Z][A-Z0-9_]*|[MOTXV][a-z][a-z0-9]*)$")
+
+_symbols: Optional[dict[str, int]] = None
+
+
+def LoadSymbols(constants_dir: str = CONSTANTS_DIR) -> dict[str, int]:
+    """
+    Read the integer constants of ``constants/*.py``, the stand-in ids come first.
+    """
+    symbols = dict(KNOWN_SYMBOLS)
+    for path in sorted(glob.glob(os.path.join(constants_dir, "*.py"))):
+        with open(path, "r", encoding="utf-8") as file:
+            tree = ast.parse(file.read())
+        for item in tree.body:
+            if isinstance(item, ast.Assign) and len(item.targets) == 1 and isinstance(item.targets[0], ast.Name):
+                name, value = item.targets[0].id, item.value
+            elif isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name) and item.value is not None:
+                name, value = item.target.id, item.value
+            else:
+                continue
+            if isinstance(value, ast.Constant) and type(value.value) is int:
+                symbols.setdefault(name, value.value)
+    return symbols
+
+
+def GetSymbol(name: str) -> Optional[int]:
+    """
+    Get the id of a c4d constant, None if the name is not a constant.
+    """
+    global _symbols
+    if _symbols is None:
+        _symbols = LoadSymbols()
+    value = _symbols.get(name)
+    if value is None and _SYMBOL_PATTERN.match(name):
+        value = _symbols[name] = zlib.crc32(name.encode("utf-8")) & 0x7fffffff
+    return value
+
+
+class _State:
+    """The application state: version, active document and node space, installed plugins."""
+
+    def __init__(self) -> None:
+        self.version: int = DEFAULT_VERSION
+        self.nodespace: str = maxon_standin.RS_NODESPACE
+        self.plugins: Optional[set[int]] = None     # None: every plugin is installed
+        self.document: Optional[BaseDocument] = None
+        self.events: int = 0
+        self.fresh_wrappers: bool = False           # a link read returns a new wrapper, as Cinema 4D does
+
+
+state: _State = _State()
+
+ID_BASELIST_NAME: int = GetSymbol("ID_BASELIST_NAME")
+Mmaterial: int = GetSymbol("Mmaterial")
+Ttexture: int = GetSymbol("Ttexture")
+Tpolygonselection: int = GetSymbol("Tpolygonselection")
+TEXTURETAG_MATERIAL: int = GetSymbol("TEXTURETAG_MATERIAL")
+SELECTION_ADD: int = GetSymbol("SELECTION_ADD")
+SELECTION_SUB: int = GetSymbol("SELECTION_SUB")
+RDATA_RENDERENGINE: int = GetSymbol("RDATA_RENDERENGINE")
+RDATA_RENDERENGINE_STANDARD: int = GetSymbol("RDATA_RENDERENGINE_STANDARD")
+RDATA_FRAMESEQUENCE: int = GetSymbol("RDATA_FRAMESEQUENCE")
+RDATA_FRAMESEQUENCE_MANUAL: int = GetSymbol("RDATA_FRAMESEQUENCE_MANUAL")
+RDATA_FRAMEFROM: int = GetSymbol("RDATA_FRAMEFROM")
+RDATA_FRAMETO: int = GetSymbol("RDATA_FRAMETO")
+RDATA_FRAMESTEP: int = GetSymbol("RDATA_FRAMESTEP")
+
+# the classes of BaseList2D(type), BaseTag(type) and BaseMaterial(type) by type id, filled below the classes
+TYPE_CLASSES: dict[int, type] = {}
+
+
+#=============================================
+# Data
+#=============================================
+
+@native
+class Vector:
+    """``c4d.Vector``."""
+
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x: Any = 0.0, y: float = None, z: float = None) -> None:
+        if y is None and z is None:
+            if isinstance(x, Vector):
+                x, y, z = x.x, x.y, x.z
+            else:
+                y = z = x
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    def __repr__(self) -> str:
+        return f"Vector({self.x:g}, {self.y:g}, {self.z:g})"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Vector) and (self.x, self.y, self.z) == (other.x, other.y, other.z)
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y, self.z))
+
+    def __add__(self, other: "Vector") -> "Vector":
+        return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other: "Vector") -> "Vector":
+        return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, other: Any) -> Any:
+        if isinstance(other, Vector):
+            return self.x * other.x + self.y * other.y + self.z * other.z
+        return Vector(self.x * other, self.y * other, self.z * other)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> "Vector":
+        return Vector(-self.x, -self.y, -self.z)
+
+    def GetLength(self) -> float:
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def GetNormalized(self) -> "Vector":
+        length = math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+        return Vector(self) if length == 0 else Vector(self.x / length, self.y / length, self.z / length)
+
+
+@native
+class BaseTime:
+    """``c4d.BaseTime``, ``BaseTime(seconds)`` or ``BaseTime(frame, fps)``."""
+
+    def __init__(self, value: float = 0.0, denominator: float = None) -> None:
+        self._seconds: float = float(value) / denominator if denominator else float(value)
+
+    def __repr__(self) -> str:
+        return f"BaseTime({self._seconds:g})"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, BaseTime) and self._seconds == other._seconds
+
+    def __lt__(self, other: "BaseTime") -> bool:
+        return self._seconds < other._seconds
+
+    def __hash__(self) -> int:
+        return hash(self._seconds)
+
+    def __add__(self, other: "BaseTime") -> "BaseTime":
+        return BaseTime(self._seconds + other._seconds)
+
+    def __sub__(self, other: "BaseTime") -> "BaseTime":
+        return BaseTime(self._seconds - other._seconds)
+
+    def Get(self) -> float:
+        return self._seconds
+
+    def GetFrame(self, fps: int) -> int:
+        return int(math.floor(self._seconds * fps + 1e-6))
+
+
+@native
+class DescLevel:
+    """``c4d.DescLevel``."""
+
+    def __init__(self, t_id: int, t_datatype: int = 0, t_creator: int = 0) -> None:
+        self.id: int = t_id
+        self.dtype: int = t_datatype
+        self.creator: int = t_creator
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, DescLevel) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+
+@native
+class DescID:
+    """``c4d.DescID``, a parameter path, a single level id is the parameter id itself."""
+
+    def __init__(self, *levels: Any) -> None:
+        self._levels: tuple = tuple(level if isinstance(level, DescLevel) else DescLevel(level) for level in levels)
+
+    def __repr__(self) -> str:
+        return f"DescID{tuple(level.id for level in self._levels)}"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, DescID) and self._levels == other._levels
+
+    def __hash__(self) -> int:
+        return hash(self._levels)
+
+    def __getitem__(self, index: int) -> DescLevel:
+        return self._levels[index]
+
+    def _key(self) -> Any:
+        return self._levels[0].id if len(self._levels) == 1 else tuple(level.id for level in self._levels)
+
+    def GetDepth(self) -> int:
+        return len(self._levels)
+
+
+def _key(key: Any) -> Any:
+    return key._key() if isinstance(key, DescID) else key
+
+
+class AtomWrapper:
+    """
+    A new Python object for a node, as Cinema 4D makes one on each access: ``is`` and ``id`` differ from
+    the other wrappers of the node, ``==`` and ``hash`` are the ones of the node.
+    The link reads return one when ``state.fresh_wrappers`` is True.
+    """
+    __slots__ = ("_atom",)
+
+    def __init__(self, atom: Any) -> None:
+        object.__setattr__(self, "_atom", _unwrap(atom))
+
+    @property
+    def __class__(self) -> type:
+        return type(self._atom)
+
+    def __repr__(self) -> str:
+        return repr(self._atom)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._atom, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._atom, name, value)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._atom[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._atom[key] = value
+
+    def __eq__(self, other: Any) -> bool:
+        return self._atom is _unwrap(other)
+
+    def __ne__(self, other: Any) -> bool:
+        return self._atom is not _unwrap(other)
+
+    def __hash__(self) -> int:
+        return hash(self._atom)
+
+    def __bool__(self) -> bool:
+        return True
+
+
+def _unwrap(value: Any) -> Any:
+    return object.__getattribute__(value, "_atom") if type(value) is AtomWrapper else value
+
+
+@native
+class BaseContainer:
+    """``c4d.BaseContainer``, an ordered dict, a missing id reads as None."""
+
+    def __init__(self, container_id: Any = 0) -> None:
+        if isinstance(container_id, BaseContainer):
+            self._id, self._data = container_id._id, dict(container_id._data)
+        else:
+            self._id, self._data = container_id, {}
+
+    def __repr__(self) -> str:
+        return f"BaseContainer({self._id}, {len(self._data)} values)"
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[tuple[Any, Any]]:
+        return iter(list(self._data.items()))
+
+    def __contains__(self, key: Any) -> bool:
+        return _key(key) in self._data
+
+    def _get(self, key: Any) -> Any:
+        return self._data.get(_key(key))
+
+    def _set(self, key: Any, value: Any) -> None:
+        self._data[_key(key)] = _unwrap(value)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._get(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._set(key, value)
+
+    def GetId(self) -> Any:
+        return self._id
+
+    def SetId(self, container_id: Any) -> None:
+        self._id = container_id
+
+    def GetIndexId(self, index: int) -> Any:
+        keys = list(self._data)
+        return keys[index] if 0 <= index < len(keys) else -1
+
+    def GetData(self, key: Any, default: Any = None) -> Any:
+        return self._data.get(_key(key), default)
+
+    def SetData(self, key: Any, value: Any) -> None:
+        self._data[_key(key)] = _unwrap(value)
+
+    GetInt32 = GetFloat = GetString = GetBool = GetLink = GetVector = GetTime = GetContainer = GetData
+    SetInt32 = SetFloat = SetString = SetBool = SetLink = SetVector = SetTime = SetContainer = SetData
+
+    def RemoveData(self, key: Any) -> bool:
+        return self._data.pop(_key(key), None) is not None
+
+    def FlushAll(self) -> None:
+        self._data.clear()
+
+    def GetClone(self, flags: int = 0) -> "BaseContainer":
+        return BaseContainer(self)
+
+
+#=============================================
+# Lists
+#=============================================
+
+@native
+class GeListNode:
+    """
+    ``c4d.GeListNode``: a node of a list with children, the top nodes of a list hang under a ``GeListHead``.
+    """
+
+    def __init__(self) -> None:
+        self._next: Optional[GeListNode] = None
+        self._pred: Optional[GeListNode] = None
+        self._up: Optional[GeListNode] = None       # the parent node or the GeListHead
+        self._down: Optional[GeListNode] = None     # the first child
+
+    # --- internal, not counted ---
+
+    def _unlink(self) -> None:
+        if self._up is not None and self._up._down is self:
+            self._up._down = self._next
+        if self._pred is not None:
+            self._pred._next = self._next
+        if self._next is not None:
+            self._next._pred = self._pred
+        self._up = self._next = self._pred = None
+
+    def _insert(self, parent: "GeListNode", pred: Optional["GeListNode"] = None, first: bool = False) -> None:
+        parent, pred = _unwrap(parent), _unwrap(pred)
+        self._unlink()
+        self._up = parent
+        if first or (pred is None and parent._down is None):
+            self._next, parent._down = parent._down, self
+            if self._next is not None:
+                self._next._pred = self
+            return
+        if pred is None:
+            pred = parent._down
+            while pred._next is not None:
+                pred = pred._next
+        self._pred, self._next = pred, pred._next
+        if pred._next is not None:
+            pred._next._pred = self
+        pred._next = self
+
+    def _children(self) -> Iterator["GeListNode"]:
+        node = self._down
+        while node is not None:
+            yield node
+            node = node._next
+
+    def _walk(self) -> Iterator["GeListNode"]:
+        stack = list(reversed(list(self._children())))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(list(node._children())))
+
+    def _head(self) -> Optional["GeListHead"]:
+        node = self
+        while node is not None and not isinstance(node, GeListHead):
+            node = node._up
+        return node
+
+    # --- c4d API ---
+
+    def GetNext(self) -> Optional["GeListNode"]:
+        return self._next
+
+    def GetPred(self) -> Optional["GeListNode"]:
+        return self._pred
+
+    def GetUp(self) -> Optional["GeListNode"]:
+        return None if isinstance(self._up, GeListHead) else self._up
+
+    def GetDown(self) -> Optional["GeListNode"]:
+        return self._down
+
+    def GetDownLast(self) -> Optional["GeListNode"]:
+        node = self._down
+        while node is not None and node._next is not None:
+            node = node._next
+        return node
+
+    def GetChildren(self) -> list["GeListNode"]:
+        return list(self._children())
+
+    def GetListHead(self) -> Optional["GeListHead"]:
+        return self._head()
+
+    def InsertUnder(self, node: "GeListNode") -> None:
+        self._insert(node, first=True)
+
+    def InsertUnderLast(self, node: "GeListNode") -> None:
+        self._insert(node)
+
+    def InsertBefore(self, node: "GeListNode") -> None:
+        if node._pred is None:
+            self._insert(node._up, first=True)
+        else:
+            self._insert(node._up, node._pred)
+
+    def InsertAfter(self, node: "GeListNode") -> None:
+        self._insert(node._up, node)
+
+    def Remove(self) -> None:
+        self._unlink()
+
+    def GetDocument(self) -> Optional["BaseDocument"]:
+        head = self._head()
+        return None if head is None else head._document()
+
+    def GetMain(self) -> Any:
+        head = self._head()
+        return None if head is None else head._owner
+
+    def IsAlive(self) -> bool:
+        return True
+
+
+@native
+class GeListHead(GeListNode):
+    """``c4d.GeListHead``, the head of a list owned by a document or a node."""
+
+    def __init__(self, owner: Any = None) -> None:
+        super().__init__()
+        self._owner = owner
+
+    def _document(self) -> Optional["BaseDocument"]:
+        owner = self._owner
+        if isinstance(owner, BaseDocument):
+            return owner
+        if isinstance(owner, GeListNode):
+            head = owner._head()
+            return None if head is None else head._document()
+        return None
+
+    def GetFirst(self) -> Optional[GeListNode]:
+        return self._down
+
+    def GetLast(self) -> Optional[GeListNode]:
+        node = self._down
+        while node is not None and node._next is not None:
+            node = node._next
+        return node
+
+    def InsertFirst(self, node: GeListNode) -> None:
+        node._insert(self, first=True)
+
+    def InsertLast(self, node: GeListNode) -> None:
+        node._insert(self)
+
+    def FlushAll(self) -> None:
+        while self._down is not None:
+            self._down._unlink()
+
+
+@native
+class BaseList2D(GeListNode):
+    """
+    ``c4d.BaseList2D``: a node with a type, a name, the parameters in a ``BaseContainer`` and a shader list.
+    ``BaseList2D(type)`` creates a ``BaseShader`` unless the type is registered in ``TYPE_CLASSES``.
+    """
+
+    DEFAULT_NAME: str = "BaseList2D"
+
+    def __new__(cls, node_type: int = 0, *args, **kwargs) -> "BaseList2D":
+        return object.__new__(cls._class_of(node_type))
+
+    @classmethod
+    def _class_of(cls, node_type: int) -> type:
+        registered = TYPE_CLASSES.get(node_type)
+        if registered is not None and issubclass(registered, cls):
+            return registered
+        return BaseShader if cls is BaseList2D else cls
+
+    def __init__(self, node_type: int = 0) -> None:
+        super().__init__()
+        self._type: int = node_type
+        self._bc: BaseContainer = BaseContainer(node_type)
+        self._bc._set(ID_BASELIST_NAME, self.DEFAULT_NAME)
+        self._bits: int = 0
+        self._shaders: GeListHead = GeListHead(self)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._bc._get(ID_BASELIST_NAME)!r} type {self._type}>"
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._bc._get(key)
+        if state.fresh_wrappers and isinstance(value, BaseList2D):
+            return AtomWrapper(value)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._bc._set(key, value)
+
+    def GetType(self) -> int:
+        return self._type
+
+    def GetRealType(self) -> int:
+        return self._type
+
+    def CheckType(self, node_type: int) -> bool:
+        return self._type == node_type
+
+    def IsInstanceOf(self, node_type: int) -> bool:
+        return self._type == node_type
+
+    def GetName(self) -> str:
+        return self._bc._get(ID_BASELIST_NAME)
+
+    def SetName(self, name: str) -> None:
+        self._bc._set(ID_BASELIST_NAME, name)
+
+    def GetDataInstance(self) -> BaseContainer:
+        return self._bc
+
+    def GetData(self) -> BaseContainer:
+        return BaseContainer(self._bc)
+
+    def SetData(self, bc: BaseContainer, add: bool = True) -> bool:
+        if not add:
+            self._bc._data.clear()
+        for key, value in bc:
+            self._bc._set(key, value)
+        return True
+
+    def GetParameter(self, key: Any, flags: int = 0) -> Any:
+        return self._bc._get(key)
+
+    def SetParameter(self, key: Any, value: Any, flags: int = 0) -> bool:
+        self._bc._set(key, value)
+        return True
+
+    def Message(self, message_id: int, data: Any = None) -> bool:
+        return True
+
+    def SetBit(self, mask: int) -> None:
+        self._bits |= mask
+
+    def DelBit(self, mask: int) -> None:
+        self._bits &= ~mask
+
+    def GetBit(self, mask: int) -> bool:
+        return bool(self._bits & mask)
+
+    def ToggleBit(self, mask: int) -> None:
+        self._bits ^= mask
+
+    def GetFirstShader(self) -> Optional["BaseShader"]:
+        return self._shaders._down
+
+    def InsertShader(self, shader: "BaseShader", pred: "BaseShader" = None) -> None:
+        if pred is None:
+            shader._insert(self._shaders, first=True)
+        else:
+            shader._insert(self._shaders, pred)
+
+    def GetShaderRepository(self) -> GeListHead:
+        return self._shaders
+
+    def FindUniqueID(self, app_id: int) -> Optional[bytes]:
+        return str(id(self)).encode("ascii")
+
+
+@native
+class BaseShader(BaseList2D):
+    """``c4d.BaseShader``."""
+
+    DEFAULT_NAME = "Shader"
+
+
+@native
+class BaseTag(BaseList2D):
+    """``c4d.BaseTag``, ``BaseTag(Ttexture)`` is a ``TextureTag``."""
+
+    DEFAULT_NAME = "Tag"
+
+    def GetObject(self) -> Optional["BaseObject"]:
+        head = self._up
+        return head._owner if isinstance(head, GeListHead) else None
+
+    def GetOrigin(self) -> Optional["BaseObject"]:
+        return self.GetObject()
+
+
+@native
+class TextureTag(BaseTag):
+    """``c4d.TextureTag``."""
+
+    DEFAULT_NAME = "Material"
+
+    def __init__(self, node_type: int = None) -> None:
+        super().__init__(Ttexture if node_type is None else node_type)
+
+    def GetMaterial(self, ignoredocument: bool = False) -> Optional["BaseMaterial"]:
+        return self._bc._get(TEXTURETAG_MATERIAL)
+
+    def SetMaterial(self, material: "BaseMaterial") -> None:
+        self._bc._set(TEXTURETAG_MATERIAL, material)
+
+
+@native
+class SelectionTag(BaseTag):
+    """``c4d.SelectionTag``."""
+
+    DEFAULT_NAME = "Selection"
+
+    def __init__(self, node_type: int = None) -> None:
+        super().__init__(Tpolygonselection if node_type is None else node_type)
+
+
+@native
+class BaseObject(BaseList2D):
+    """``c4d.BaseObject`` with its tag list."""
+
+    DEFAULT_NAME = "Object"
+
+    def __init__(self, node_type: int = 0) -> None:
+        super().__init__(node_type)
+        self._tags: GeListHead = GeListHead(self)
+
+    def GetTags(self) -> list[BaseTag]:
+        return list(self._tags._children())
+
+    def GetFirstTag(self) -> Optional[BaseTag]:
+        return self._tags._down
+
+    def GetTag(self, tag_type: int, nr: int = 0) -> Optional[BaseTag]:
+        for tag in self._tags._children():
+            if tag._type == tag_type:
+                if nr == 0:
+                    return tag
+                nr -= 1
+        return None
+
+    def InsertTag(self, tag: BaseTag, pred: BaseTag = None) -> None:
+        if pred is None:
+            tag._insert(self._tags, first=True)
+        else:
+            tag._insert(self._tags, pred)
+
+    def MakeTag(self, tag_type: int, pred: BaseTag = None) -> BaseTag:
+        tag = BaseTag(tag_type)
+        self.InsertTag(tag, pred)
+        return tag
+
+    def KillTag(self, tag_type: int, nr: int = 0) -> None:
+        tag = self.GetTag(tag_type, nr)
+        if tag is not None:
+            tag._unlink()
+
+
+@native
+class BaseMaterial(BaseList2D):
+    """
+    ``c4d.BaseMaterial``, ``BaseMaterial(Mmaterial)`` is a node ``Material``.
+    """
+
+    DEFAULT_NAME = "Mat"
+
+    def Update(self, preview: bool = True, rttm: bool = True) -> None:
+        return None
+
+    def GetNodeMaterialReference(self) -> "NodeMaterial":
+        # a classic material has no node space
+        return self if isinstance(self, NodeMaterial) else NodeMaterial(self._type)
+
+
+@native
+class NodeMaterial(BaseMaterial):
+    """
+    ``c4d.NodeMaterial``, the node graphs of a material by node space.
+    """
+
+    def __init__(self, node_type: int = None) -> None:
+        super().__init__(Mmaterial if node_type is None else node_type)
+        self._graphs: dict[str, tuple[GraphModelRef, GraphNode]] = {}
+
+    def _add_graph(self, space_id: Any, graph: GraphModelRef, end_node: GraphNode) -> GraphModelRef:
+        graph._owner = self
+        self._graphs[str(space_id)] = (graph, end_node)
+        return graph
+
+    def HasSpace(self, space_id: Any) -> bool:
+        return str(space_id) in self._graphs
+
+    def GetGraph(self, space_id: Any) -> Any:
+        item = self._graphs.get(str(space_id))
+        return item[0] if item is not None else maxon_standin._NullGraph()
+
+    def CreateDefaultGraph(self, space_id: Any) -> GraphModelRef:
+        return self._add_graph(space_id, *maxon_standin.CreateDefaultGraph(str(space_id)))
+
+    def CreateEmptyGraph(self, space_id: Any) -> GraphModelRef:
+        return self._add_graph(space_id, *maxon_standin.CreateEmptyGraph(str(space_id)))
+
+    def RemoveGraph(self, space_id: Any) -> None:
+        self._graphs.pop(str(space_id), None)
+
+    def GetNimbusRef(self, space_id: Any) -> Optional[NimbusBaseRef]:
+        item = self._graphs.get(str(space_id))
+        return NimbusBaseRef(*item) if item is not None else None
+
+    @staticmethod
+    def GetMaterial(graph: GraphModelRef) -> Optional["NodeMaterial"]:
+        return getattr(graph, "_owner", None)
+
+
+@native
+class Material(NodeMaterial):
+    """``c4d.Material``, the standard material, a node material."""
+
+
+@native
+class BaseVideoPost(BaseList2D):
+    """``c4d.documents.BaseVideoPost``, the Redshift aovs are kept in ``_aovs``."""
+
+    DEFAULT_NAME = "Video Post"
+
+    def __init__(self, node_type: int = 0) -> None:
+        super().__init__(node_type)
+        self._aovs: list = []
+
+    def RenderEngineCheck(self, engine_id: int) -> bool:
+        return self._type == engine_id
+
+
+@native
+class RenderData(BaseList2D):
+    """``c4d.documents.RenderData`` with its video post list."""
+
+    DEFAULT_NAME = "My Render Setting"
+
+    def __init__(self, node_type: int = 0) -> None:
+        super().__init__(node_type)
+        self._videoposts: GeListHead = GeListHead(self)
+        self._bc._set(RDATA_RENDERENGINE, RDATA_RENDERENGINE_STANDARD)
+        self._bc._set(RDATA_FRAMESEQUENCE, RDATA_FRAMESEQUENCE_MANUAL)
+        self._bc._set(RDATA_FRAMEFROM, BaseTime(0))
+        self._bc._set(RDATA_FRAMETO, BaseTime(90, 30))
+        self._bc._set(RDATA_FRAMESTEP, 1)
+
+    def GetFirstVideoPost(self) -> Optional[BaseVideoPost]:
+        return self._videoposts._down
+
+    def InsertVideoPost(self, videopost: BaseVideoPost, pred: BaseVideoPost = None) -> None:
+        if pred is None:
+            videopost._insert(self._videoposts, first=True)
+        else:
+            videopost._insert(self._videoposts, pred)
+
+    def InsertVideoPostLast(self, videopost: BaseVideoPost) -> None:
+        videopost._insert(self._videoposts)
+
+
+@native
+class BaseDocument(BaseList2D):
+    """
+    ``c4d.documents.BaseDocument``: the object, material and render data lists, the active items,
+    the time and an undo counter.
+    """
+
+    DEFAULT_NAME = "Untitled 1"
+
+    def __init__(self, node_type: int = 0) -> None:
+        super().__init__(node_type)
+        self._objects: GeListHead = GeListHead(self)
+        self._materials: GeListHead = GeListHead(self)
+        self._renderdata: GeListHead = GeListHead(self)
+        self._scenehooks: dict[int, BaseList2D] = {}
+        self._active_objects: list = []
+        self._active_materials: list = []
+        self._active_tag: Optional[BaseTag] = None
+        self._fps: int = 30
+        self._time: BaseTime = BaseTime(0)
+        self._min_time: BaseTime = BaseTime(0)
+        self._max_time: BaseTime = BaseTime(90, 30)
+        self._loop_min_time: BaseTime = BaseTime(0)
+        self._loop_max_time: BaseTime = BaseTime(90, 30)
+        self.undo_count: int = 0
+        rdata = RenderData()
+        rdata._insert(self._renderdata)
+        self._active_renderdata: RenderData = rdata
+
+    def GetDocument(self) -> "BaseDocument":
+        return self
+
+    # --- objects ---
+
+    def GetFirstObject(self) -> Optional[BaseObject]:
+        return self._objects._down
+
+    def GetObjects(self) -> list[BaseObject]:
+        return list(self._objects._children())
+
+    def InsertObject(self, op: BaseObject, parent: BaseObject = None, pred: BaseObject = None, checknames: bool = False) -> None:
+        if pred is not None:
+            op._insert(pred._up, pred)
+        else:
+            op._insert(parent if parent is not None else self._objects, first=True)
+
+    def SearchObject(self, name: str) -> Optional[BaseObject]:
+        for node in self._objects._walk():
+            if node._bc._get(ID_BASELIST_NAME) == name:
+                return node
+        return None
+
+    def GetActiveObject(self) -> Optional[BaseObject]:
+        return self._active_objects[-1] if self._active_objects else None
+
+    def GetActiveObjects(self, flags: int = 0) -> list[BaseObject]:
+        return list(self._active_objects)
+
+    def SetActiveObject(self, op: BaseObject, mode: int = 0) -> None:
+        self._active_objects = self._select(self._active_objects, op, mode)
+
+    def GetActiveTag(self) -> Optional[BaseTag]:
+        return self._active_tag
+
+    def SetActiveTag(self, tag: BaseTag, mode: int = 0) -> None:
+        self._active_tag = tag
+
+    # --- materials ---
+
+    def GetFirstMaterial(self) -> Optional[BaseMaterial]:
+        return self._materials._down
+
+    def GetMaterials(self) -> list[BaseMaterial]:
+        return list(self._materials._children())
+
+    def InsertMaterial(self, material: BaseMaterial, pred: BaseMaterial = None, checknames: bool = False) -> None:
+        if pred is None:
+            material._insert(self._materials, first=True)
+        else:
+            material._insert(self._materials, pred)
+
+    def SearchMaterial(self, name: str) -> Optional[BaseMaterial]:
+        for material in self._materials._children():
+            if material._bc._get(ID_BASELIST_NAME) == name:
+                return material
+        return None
+
+    def GetActiveMaterial(self) -> Optional[BaseMaterial]:
+        return self._active_materials[-1] if self._active_materials else None
+
+    def GetActiveMaterials(self) -> list[BaseMaterial]:
+        return list(self._active_materials)
+
+    def SetActiveMaterial(self, material: BaseMaterial, mode: int = 0) -> None:
+        self._active_materials = self._select(self._active_materials, material, mode)
+
+    @staticmethod
+    def _select(selection: list, item: Any, mode: int) -> list:
+        if mode == SELECTION_ADD:
+            return selection + [item] if item not in selection else selection
+        if mode == SELECTION_SUB:
+            return [node for node in selection if node is not item]
+        return [item] if item is not None else []
+
+    # --- render data ---
+
+    def GetActiveRenderData(self) -> RenderData:
+        return self._active_renderdata
+
+    def SetActiveRenderData(self, rdata: RenderData) -> None:
+        self._active_renderdata = rdata
+
+    def GetFirstRenderData(self) -> Optional[RenderData]:
+        return self._renderdata._down
+
+    def InsertRenderData(self, rdata: RenderData, parent: RenderData = None, pred: RenderData = None) -> None:
+        if pred is not None:
+            rdata._insert(pred._up, pred)
+        else:
+            rdata._insert(parent if parent is not None else self._renderdata)
+
+    def FindSceneHook(self, hook_id: int) -> Optional[BaseList2D]:
+        return self._scenehooks.get(hook_id)
+
+    def AddSceneHook(self, hook: BaseList2D) -> BaseList2D:
+        """Not a c4d method, register the scene hook of a renderer."""
+        self._scenehooks[hook._type] = hook
+        return hook
+
+    # --- undo ---
+
+    def StartUndo(self) -> bool:
+        return True
+
+    def EndUndo(self) -> bool:
+        return True
+
+    def AddUndo(self, undo_type: int, node: Any = None) -> bool:
+        self.undo_count += 1
+        return True
+
+    # --- time ---
+
+    def GetFps(self) -> int:
+        return self._fps
+
+    def SetFps(self, fps: int) -> None:
+        self._fps = fps
+
+    def GetTime(self) -> BaseTime:
+        return self._time
+
+    def SetTime(self, time: BaseTime) -> None:
+        self._time = time
+
+    def GetMinTime(self) -> BaseTime:
+        return self._min_time
+
+    def SetMinTime(self, time: BaseTime) -> None:
+        self._min_time = time
+
+    def GetMaxTime(self) -> BaseTime:
+        return self._max_time
+
+    def SetMaxTime(self, time: BaseTime) -> None:
+        self._max_time = time
+
+    def GetLoopMinTime(self) -> BaseTime:
+        return self._loop_min_time
+
+    def SetLoopMinTime(self, time: BaseTime) -> None:
+        self._loop_min_time = time
+
+    def GetLoopMaxTime(self) -> BaseTime:
+        return self._loop_max_time
+
+    def SetLoopMaxTime(self, time: BaseTime) -> None:
+        self._loop_max_time = time
+
+    def ExecutePasses(self, bt: Any = None, animation: bool = True, expressions: bool = True,
+                      caches: bool = True, flags: int = 0) -> bool:
+        return True
+
+
+@native
+class BasePlugin:
+    """``c4d.plugins.BasePlugin``, what ``FindPlugin`` returns."""
+
+    def __init__(self, plugin_id: int) -> None:
+        self._id = plugin_id
+
+    def GetID(self) -> int:
+        return self._id
+
+
+
+#=============================================
+# Redshift
+#=============================================
+
+@native
+class RSAOV:
+    """``redshift.RSAOV``, the parameters of an aov."""
+
+    def __init__(self) -> None:
+        self._params: dict = {}
+
+    def GetParameter(self, key: Any) -> Any:
+        return self._params.get(_key(key))
+
+    def SetParameter(self, key: Any, value: Any) -> bool:
+        self._params[_key(key)] = value
+        return True
+
+
+@native(prefix="redshift")
+class _RedshiftAPI:
+
+    @staticmethod
+    def RendererGetAOVs(videopost: BaseVideoPost) -> list[RSAOV]:
+        return list(videopost._aovs)
+
+    @staticmethod
+    def RendererSetAOVs(videopost: BaseVideoPost, aovs: list[RSAOV]) -> bool:
+        videopost._aovs = list(aovs)
+        return True
+
+    @staticmethod
+    def GetCoreVersion() -> str:
+        return "2025.1.0"
+
+
+def CreateRedshiftModule() -> StandinModule:
+    """
+    Create the ``redshift`` stand-in module, it is ``c4d.redshift`` too.
+    """
+    module = StandinModule("redshift", "The redshift stand-in.")
+    module.symbol = GetSymbol
+    module.RSAOV = RSAOV
+    module.RendererGetAOVs = _RedshiftAPI.RendererGetAOVs
+    module.RendererSetAOVs = _RedshiftAPI.RendererSetAOVs
+    module.GetCoreVersion = _RedshiftAPI.GetCoreVersion
+    return module
+
+
+#=============================================
+# Module
+#=============================================
+
+@native(prefix="c4d")
+class _C4DAPI:
+
+    @staticmethod
+    def GetC4DVersion() -> int:
+        return state.version
+
+    @staticmethod
+    def GetActiveNodeSpaceId() -> Id:
+        return Id(state.nodespace)
+
+    @staticmethod
+    def EventAdd(flags: int = 0) -> None:
+        state.events += 1
+
+    @staticmethod
+    def GetGlobalTexturePaths() -> list:
+        return []
+
+    @staticmethod
+    def GetActiveDocument() -> BaseDocument:
+        if state.document is None:
+            state.document = BaseDocument()
+        return state.document
+
+    @staticmethod
+    def SetActiveDocument(doc: BaseDocument) -> None:
+        state.document = doc
+
+    @staticmethod
+    def FindPlugin(plugin_id: int, type: int = 0) -> Optional[BasePlugin]:
+        if state.plugins is None or plugin_id in state.plugins:
+            return BasePlugin(plugin_id)
+        return None
+
+
+class C4DModule(StandinModule):
+    """The ``c4d`` stand-in module."""
+
+    def symbol(self, name: str) -> Optional[int]:
+        return GetSymbol(name)
+
+
+def CreateModules() -> dict[str, StandinModule]:
+    """
+    Create the ``c4d`` stand-in modules by ``sys.modules`` name: ``c4d``, its sub-modules and ``redshift``.
+    """
+    c4d = C4DModule("c4d", __doc__)
+    for name in ("Vector", "BaseTime", "DescLevel", "DescID", "BaseContainer", "GeListNode", "GeListHead",
+                 "BaseList2D", "BaseShader", "BaseTag", "TextureTag", "SelectionTag", "BaseObject", "BaseMaterial",
+                 "NodeMaterial", "Material"):
+        setattr(c4d, name, globals()[name])
+    for name in ("GetC4DVersion", "GetActiveNodeSpaceId", "EventAdd", "GetGlobalTexturePaths"):
+        setattr(c4d, name, getattr(_C4DAPI, name))
+    # the classes spelled like a type id
+    c4d.Matrix = Missing("c4d.Matrix")
+
+    documents = C4DModule("c4d.documents")
+    documents.BaseDocument = BaseDocument
+    documents.BaseVideoPost = BaseVideoPost
+    documents.RenderData = RenderData
+    documents.GetActiveDocument = _C4DAPI.GetActiveDocument
+    documents.SetActiveDocument = _C4DAPI.SetActiveDocument
+
+    plugins = C4DModule("c4d.plugins")
+    plugins.BasePlugin = BasePlugin
+    plugins.FindPlugin = _C4DAPI.FindPlugin
+
+    redshift = CreateRedshiftModule()
+    modules = {"c4d": c4d, "c4d.documents": documents, "c4d.plugins": plugins, "redshift": redshift}
+    for name in ("modules", "utils", "gui", "storage", "bitmaps", "threading"):
+        modules[f"c4d.{name}"] = C4DModule(f"c4d.{name}")
+    for name, module in modules.items():
+        if name.startswith("c4d."):
+            setattr(c4d, name[4:], module)
+    c4d.redshift = redshift
+    return modules
+
+
+TYPE_CLASSES.update({
+    Mmaterial: Material,
+    Ttexture: TextureTag,
+    Tpolygonselection: SelectionTag,
+})
+
+
+__all__ = [
+    "KNOWN_SYMBOLS",
+    "LoadSymbols",
+    "GetSymbol",
+    "state",
+    "Vector",
+    "BaseTime",
+    "DescLevel",
+    "DescID",
+    "AtomWrapper",
+    "BaseContainer",
+    "GeListNode",
+    "GeListHead",
+    "BaseList2D",
+    "BaseShader",
+    "BaseTag",
+    "TextureTag",
+    "SelectionTag",
+    "BaseObject",
+    "BaseMaterial",
+    "NodeMaterial",
+    "Material",
+    "BaseVideoPost",
+    "RenderData",
+    "BaseDocument",
+    "BasePlugin",
+    "TYPE_CLASSES",
+    "RSAOV",
+    "CreateRedshiftModule",
+    "CreateModules",
+]
@@ -0,0 +1,1020 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory stand-in of the ``maxon`` node graph API the helpers use: node graphs with transactions,
+true nodes, port lists, ports and wires, the ``GraphModelHelper`` queries, and the node templates and
+default graphs of the node spaces (Redshift, Arnold, V-Ray, CentiLeo).
+
+Paths follow Cinema 4D: ``/node`` for a node, ``/node<port`` for an input and ``/node>port`` for an output.
+The nodes get their ports from a ``NodeTemplate``, the converter tables of ``constants/*.json`` are registered
+as templates, more ports can be added with ``RegisterNodeTemplate``. Edits outside of a transaction raise,
+as in Cinema 4D, a transaction is not rolled back.
+
+maxon节点图替身: 图, 事务, 节点, 端口, 连线和GraphModelHelper查询, 在内存中运行.
+"""
+import os
+import json
+import itertools
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from .native_calls import native
+from .missing import StandinModule
+
+CONSTANTS_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "constants")
+
+RS_NODESPACE: str = "com.redshift3d.redshift4c4d.class.nodespace"
+AR_NODESPACE: str = "com.autodesk.arnold.nodespace"
+VR_NODESPACE: str = "com.chaos.class.vray_node_renderer_nodespace"
+CL_NODESPACE: str = "com.centileo.class.nodespace"
+STANDARD_NODESPACE: str = "net.maxon.nodespace.standard"
+
+ASSET_ID_ATTRIBUTE: str = "net.maxon.node.attribute.assetid"
+DEFAULT_VALUE_ATTRIBUTE: str = "net.maxon.description.data.base.defaultvalue"
+
+
+#=============================================
+# Data
+#=============================================
+
+class Id(str):
+    """``maxon.Id``, a string, ``Id()`` is the empty id."""
+
+    def __new__(cls, value: Any = "") -> "Id":
+        return super().__new__(cls, "" if value is None else str(value))
+
+    def IsEmpty(self) -> bool:
+        return not self
+
+    def IsPopulated(self) -> bool:
+        return bool(self)
+
+    def ToString(self) -> str:
+        return str(self)
+
+
+class NodePath(str):
+    """``maxon.NodePath``, a string."""
+
+
+class Url(str):
+    """``maxon.Url``, a string."""
+
+    def GetUrl(self) -> str:
+        return str(self)
+
+    def GetSystemPath(self) -> str:
+        return str(self)
+
+    def GetPath(self) -> str:
+        return str(self)
+
+    def GetName(self) -> str:
+        return os.path.basename(str(self))
+
+
+class Vector:
+    """``maxon.Vector``, from three numbers or anything with ``x``, ``y`` and ``z``."""
+
+    def __init__(self, x: Any = 0.0, y: float = None, z: float = None) -> None:
+        if y is None and z is None and hasattr(x, "x"):
+            x, y, z = x.x, x.y, x.z
+        self.x, self.y, self.z = float(x), float(y if y is not None else x), float(z if z is not None else x)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Vector) and (self.x, self.y, self.z) == (other.x, other.y, other.z)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.x}, {self.y}, {self.z})"
+
+
+class Color(Vector):
+    """``maxon.Color``."""
+
+
+class IdAndVersion:
+    """The value of the asset id attribute, ``str()`` is ``(id,version)`` as in Cinema 4D."""
+
+    def __init__(self, asset_id: str, version: str = "") -> None:
+        self.id = Id(asset_id)
+        self.version = version
+
+    def __str__(self) -> str:
+        return f"({self.id},{self.version})"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, IdAndVersion) and (self.id, self.version) == (other.id, other.version)
+
+
+class DataDictionary(dict):
+    """``maxon.DataDictionary``."""
+
+    def Set(self, key: Any, value: Any) -> None:
+        self[str(key)] = value
+
+    def Get(self, key: Any, default: Any = None) -> Any:
+        return self.get(str(key), default)
+
+
+def Bool(value: Any) -> bool:
+    return bool(value)
+
+
+def String(value: Any = "") -> str:
+    return str(value)
+
+
+def Int(value: Any = 0) -> int:
+    return int(value)
+
+
+def Float(value: Any = 0.0) -> float:
+    return float(value)
+
+
+def MaxonConvert(data: Any, mode: int = 0) -> Any:
+    return data
+
+
+def Cast(cls: Any, value: Any) -> Any:
+    return value
+
+
+class CONVERSIONMODE:
+    DEFAULT = 0
+    TOMAXON = 1
+    TOC4D = 2
+
+
+#=============================================
+# Enums
+#=============================================
+
+class NODE_KIND:
+    NONE = 0
+    NODE = 1
+    INPUTS = 2
+    OUTPUTS = 4
+    INPORT = 8
+    OUTPORT = 16
+    PORTLIST_MASK = INPUTS | OUTPUTS
+    PORT_MASK = INPORT | OUTPORT
+    IN_MASK = INPUTS | INPORT
+    OUT_MASK = OUTPUTS | OUTPORT
+    ALL_MASK = NODE | PORTLIST_MASK | PORT_MASK
+
+
+class PORT_DIR:
+    INPUT = 0
+    OUTPUT = 1
+    BEGIN = 0
+    END = 2
+
+
+class WIRE_MODE:
+    NONE = 0
+    NORMAL = 1
+    IMPLICIT = 2
+    HIDDEN = 4
+    ALL = 0xff
+
+
+class NIMBUS_PATH:
+    MATERIALENDNODE = 0
+    DISPLACEMENTENDNODE = 1
+
+
+class Wires:
+    """``maxon.Wires``, the wire modes of a connection."""
+
+    def __init__(self, *modes: int) -> None:
+        self.modes: tuple = modes or (WIRE_MODE.NORMAL,)
+
+    @staticmethod
+    def All() -> "Wires":
+        return Wires(WIRE_MODE.ALL)
+
+    def __repr__(self) -> str:
+        return f"Wires{self.modes}"
+
+
+class NODE:
+    class BASE:
+        NAME = Id("net.maxon.node.base.name")
+        COLOR = Id("net.maxon.node.base.color")
+        DISPLAYPREVIEW = Id("net.maxon.node.base.preview")
+
+    class ATTRIBUTE:
+        HIDEPORTINNODEGRAPH = Id("net.maxon.node.attribute.hideportinnodegraph")
+
+
+EffectiveName: Id = Id("effectivename")
+
+
+class _NodesNamespace:
+    """``maxon.nodes``."""
+
+    UndoMode = Id("net.maxon.nodes.undomode")
+
+    class UNDO_MODE:
+        NONE = 0
+        START = 1
+        ADD = 2
+
+    class NODESPACE:
+        NodeSpaceContext = Id("net.maxon.nodes.nodespace.context")
+        SPACEID = Id("net.maxon.nodes.nodespace.spaceid")
+        IMAGENODEASSETID = Id("net.maxon.nodes.nodespace.imagenodeassetid")
+        IMAGENODEPORTS = Id("net.maxon.nodes.nodespace.imagenodeports")
+
+
+nodes = _NodesNamespace
+
+
+#=============================================
+# Templates
+#=============================================
+
+PortSpec = Union[str, tuple]
+
+
+class NodeTemplate:
+    """
+    The ports of a node asset, a port is an id or ``(id, default value)``, ``bundle/id`` is a port in a bundle.
+    """
+
+    def __init__(self, asset_id: str, inputs: Iterable[PortSpec] = (), outputs: Iterable[PortSpec] = (),
+                 version: str = "") -> None:
+        self.asset_id: str = str(asset_id)
+        self.version: str = version
+        self.inputs: dict[str, Any] = {}
+        self.outputs: dict[str, Any] = {}
+        # the input / output port of the converter tables, the ports a chain of nodes is wired through
+        self.converter: tuple[Optional[str], Optional[str]] = (None, None)
+        self.extend(inputs, outputs)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.asset_id}, {len(self.inputs)} inputs, {len(self.outputs)} outputs)"
+
+    @staticmethod
+    def _specs(ports: Iterable[PortSpec]) -> Iterator[tuple[str, Any]]:
+        for port in ports:
+            if isinstance(port, tuple):
+                yield str(port[0]), port[1]
+            elif port:
+                yield str(port), None
+
+    def extend(self, inputs: Iterable[PortSpec] = (), outputs: Iterable[PortSpec] = ()) -> "NodeTemplate":
+        for port_id, value in self._specs(inputs):
+            self.inputs.setdefault(port_id, value)
+        for port_id, value in self._specs(outputs):
+            self.outputs.setdefault(port_id, value)
+        return self
+
+
+class NodeSpace:
+    """
+    A node space: the end node of its materials and the default graph, end node <- brdf.
+    """
+
+    def __init__(self, space_id: str, end_asset: str, end_input: str, brdf_asset: str = None, brdf_output: str = None,
+                 image_asset: str = None) -> None:
+        self.space_id: str = space_id
+        self.end_asset: str = end_asset
+        self.end_input: str = end_input
+        self.brdf_asset: Optional[str] = brdf_asset
+        self.brdf_output: Optional[str] = brdf_output
+        self.image_asset: Optional[str] = image_asset
+
+
+NODE_TEMPLATES: dict[str, NodeTemplate] = {}
+NODE_SPACES: dict[str, NodeSpace] = {}
+_CONVERTER_FILES: dict[str, str] = {
+    RS_NODESPACE: "Redshift.json",
+    AR_NODESPACE: "Arnold.json",
+    VR_NODESPACE: "Vray.json",
+    CL_NODESPACE: "CentiLeo.json",
+}
+_converters_loaded: bool = False
+
+
+def RegisterNodeTemplate(asset_id: str, inputs: Iterable[PortSpec] = (), outputs: Iterable[PortSpec] = (),
+                         prefix: bool = False) -> NodeTemplate:
+    """
+    Register the ports of a node asset, the ports are added to a template already registered.
+
+    Args:
+        asset_id (str): the asset id, e.g. "com.redshift3d.redshift4c4d.nodes.core.texturesampler".
+        inputs (Iterable): the input port ids, or ``(id, default value)``.
+        outputs (Iterable): the output port ids, or ``(id, default value)``.
+        prefix (bool, optional): True to prefix the port ids with ``asset_id.``, as Redshift and V-Ray do. Defaults to False.
+
+    Returns:
+        NodeTemplate: the template of the asset.
+    """
+    def _prefixed(ports: Iterable[PortSpec]) -> list:
+        if not prefix:
+            return list(ports)
+        return [(f"{asset_id}.{port[0]}", port[1]) if isinstance(port, tuple) else f"{asset_id}.{port}" for port in ports]
+
+    template = NODE_TEMPLATES.get(str(asset_id))
+    if template is None:
+        template = NODE_TEMPLATES[str(asset_id)] = NodeTemplate(asset_id)
+    return template.extend(_prefixed(inputs), _prefixed(outputs))
+
+
+def LoadConverterTemplates(constants_dir: str = CONSTANTS_DIR) -> int:
+    """
+    Register the converter input / output port of every node of ``constants/<Renderer>.json``.
+
+    Returns:
+        int: the count of nodes.
+    """
+    count = 0
+    for file_name in _CONVERTER_FILES.values():
+        path = os.path.join(constants_dir, file_name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        for asset_id, ports in data.items():
+            template = RegisterNodeTemplate(asset_id, [ports.get("input")], [ports.get("output")])
+            template.converter = (ports.get("input"), ports.get("output"))
+            count += 1
+    return count
+
+
+def GetNodeTemplate(asset_id: str) -> NodeTemplate:
+    """
+    Get the template of a node asset, an unknown asset has no ports.
+    """
+    global _converters_loaded
+    if not _converters_loaded:
+        _converters_loaded = True
+        LoadConverterTemplates()
+    template = NODE_TEMPLATES.get(str(asset_id))
+    return template if template is not None else NodeTemplate(asset_id)
+
+
+def RegisterNodeSpace(space: NodeSpace) -> NodeSpace:
+    NODE_SPACES[space.space_id] = space
+    return space
+
+
+def GetNodeSpace(space_id: str) -> Optional[NodeSpace]:
+    return NODE_SPACES.get(str(space_id))
+
+
+#=============================================
+# Graph
+#=============================================
+
+_INPUTS_ID: str = "<"
+_OUTPUTS_ID: str = ">"
+
+
+@native
+class GraphNode:
+    """
+    ``maxon.GraphNode``: a true node, a port list or a port. ``GraphNode()`` is the invalid node.
+    """
+
+    def __init__(self, graph: "GraphModelRef" = None, kind: int = NODE_KIND.NONE, node_id: str = "",
+                 parent: "GraphNode" = None, asset_id: str = None) -> None:
+        self._graph = graph
+        self._kind: int = kind
+        self._id: str = str(node_id)
+        self._parent: Optional[GraphNode] = parent
+        self._children: dict[str, GraphNode] = {}
+        self._values: dict[str, Any] = {}
+        self._asset: Optional[IdAndVersion] = None if asset_id is None else IdAndVersion(asset_id)
+        self._name: Optional[str] = None
+        self._value: Any = None
+        self._sources: list[GraphNode] = []     # in-port: the out-ports wired into it
+        self._targets: list[GraphNode] = []     # out-port: the in-ports it is wired into
+        self._valid: bool = graph is not None
+        self._path: str = self._make_path()
+
+    def _make_path(self) -> str:
+        if self._parent is None:
+            return ""
+        if self._kind == NODE_KIND.NODE:
+            return f"{self._parent._path}/{self._id}"
+        if self._kind & NODE_KIND.PORTLIST_MASK:
+            return self._parent._path + self._id
+        if self._parent._kind & NODE_KIND.PORTLIST_MASK:
+            return self._parent._path + self._id
+        return f"{self._parent._path}/{self._id}"
+
+    def __repr__(self) -> str:
+        return self._path if self._valid else "<invalid GraphNode>"
+
+    __str__ = __repr__
+
+    def __bool__(self) -> bool:
+        return self._valid
+
+    # --- internal, not counted ---
+
+    def _add_child(self, kind: int, child_id: str, asset_id: str = None) -> "GraphNode":
+        child = GraphNode(self._graph, kind, child_id, self, asset_id)
+        self._children[child._id] = child
+        self._graph._paths[child._path] = child
+        return child
+
+    def _add_port(self, port_list: "GraphNode", port_id: str, value: Any) -> "GraphNode":
+        # "bundle/child" is a port nested in a port bundle, e.g. the path of the Redshift tex0
+        kind = NODE_KIND.INPORT if port_list._kind == NODE_KIND.INPUTS else NODE_KIND.OUTPORT
+        parent = port_list
+        *bundles, port_id = port_id.split("/")
+        for bundle in bundles:
+            parent = parent._children.get(bundle) or parent._add_child(kind, bundle)
+        port = parent._children.get(port_id) or parent._add_child(kind, port_id)
+        port._value = value
+        return port
+
+    def _iter_tree(self) -> Iterator["GraphNode"]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(list(node._children.values())))
+
+    def _true_node(self) -> "GraphNode":
+        node = self
+        while node is not None and node._kind != NODE_KIND.NODE:
+            node = node._parent
+        return node if node is not None else GraphNode()
+
+    def _ports(self) -> Iterator["GraphNode"]:
+        for node in self._iter_tree():
+            if node._kind & NODE_KIND.PORT_MASK:
+                yield node
+
+    def _detach(self) -> None:
+        for node in self._iter_tree():
+            for source in node._sources:
+                source._targets.remove(node)
+            for target in node._targets:
+                target._sources.remove(node)
+            node._sources, node._targets = [], []
+            node._valid = False
+            self._graph._paths.pop(node._path, None)
+            self._graph._selection.discard(node)
+
+    def _check(self) -> None:
+        if not self._valid:
+            raise RuntimeError(f"Invalid GraphNode {self._path!r}")
+        self._graph._check_transaction()
+
+    # --- maxon API ---
+
+    def IsValid(self) -> bool:
+        return self._valid
+
+    def IsNullValue(self) -> bool:
+        return not self._valid
+
+    def GetKind(self) -> int:
+        return self._kind
+
+    def GetId(self) -> Id:
+        return Id(self._id)
+
+    def GetPath(self) -> NodePath:
+        return NodePath(self._path)
+
+    def GetGraph(self) -> "GraphModelRef":
+        return self._graph
+
+    def GetParent(self) -> "GraphNode":
+        return self._parent if self._parent is not None else GraphNode()
+
+    def GetChildren(self, result: Optional[list] = None, mask: int = NODE_KIND.ALL_MASK) -> list["GraphNode"]:
+        children = [child for child in self._children.values() if child._kind & mask]
+        if result is not None:
+            result.extend(children)
+            return result
+        return children
+
+    def GetInputs(self) -> "GraphNode":
+        return self._children.get(_INPUTS_ID) or GraphNode()
+
+    def GetOutputs(self) -> "GraphNode":
+        return self._children.get(_OUTPUTS_ID) or GraphNode()
+
+    def FindChild(self, child_id: Any) -> "GraphNode":
+        return self._children.get(str(child_id)) or GraphNode()
+
+    def GetAncestor(self, kind: int) -> "GraphNode":
+        node = self._parent
+        while node is not None:
+            if node._kind & kind:
+                return node
+            node = node._parent
+        return GraphNode()
+
+    def GetInnerNodes(self, mask: int = NODE_KIND.ALL_MASK, includeThis: bool = False, callback: Callable = None) -> list["GraphNode"]:
+        result = [node for node in self._iter_tree() if (includeThis or node is not self) and node._kind & mask]
+        if callback is not None:
+            for node in result:
+                if callback(node) is False:
+                    break
+            return True
+        return result
+
+    def GetValue(self, attribute: Any) -> Any:
+        attribute = str(attribute)
+        if attribute == ASSET_ID_ATTRIBUTE:
+            return self._asset
+        if attribute == NODE.BASE.NAME:
+            return self._name
+        if attribute == EffectiveName:
+            return self._name if self._name is not None else self._id.split(".")[-1]
+        if attribute == "value":
+            return self._value
+        if attribute == "isgroup":
+            return self._asset is not None and str(self._asset.id) == "net.maxon.node.group"
+        return self._values.get(attribute)
+
+    def SetValue(self, attribute: Any, value: Any) -> bool:
+        self._check()
+        attribute = str(attribute)
+        if attribute == NODE.BASE.NAME:
+            self._name = None if value is None else str(value)
+        elif attribute == DEFAULT_VALUE_ATTRIBUTE:
+            self._value = value
+        else:
+            self._values[attribute] = value
+        return True
+
+    def GetPortValue(self) -> Any:
+        return self._value
+
+    def GetDefaultValue(self) -> Any:
+        return self._value
+
+    def SetPortValue(self, value: Any) -> bool:
+        self._check()
+        self._value = value
+        return True
+
+    def GetConnections(self, direction: int = PORT_DIR.INPUT, connections: Optional[list] = None,
+                       mask: Wires = None, mode: int = None) -> list[tuple["GraphNode", Wires]]:
+        ports = self._sources if direction == PORT_DIR.INPUT else self._targets
+        result = [(port, Wires()) for port in ports]
+        if connections is not None:
+            connections.extend(result)
+            return connections
+        return result
+
+    def Connect(self, target: "GraphNode", modes: Wires = None, reverse: bool = False) -> bool:
+        self._check()
+        source = self
+        if reverse or (source._kind == NODE_KIND.INPORT and target._kind == NODE_KIND.OUTPORT):
+            source, target = target, source
+        if source._kind != NODE_KIND.OUTPORT or target._kind != NODE_KIND.INPORT:
+            raise ValueError(f"Cannot connect {source!r} to {target!r}")
+        # an input takes one wire, the wire plugged before is replaced
+        for other in target._sources:
+            other._targets.remove(target)
+        source._targets.append(target)
+        target._sources = [source]
+        return True
+
+    def RemoveConnections(self, direction: int = PORT_DIR.INPUT, mask: Wires = None) -> bool:
+        self._check()
+        if direction == PORT_DIR.INPUT:
+            for source in self._sources:
+                source._targets.remove(self)
+            self._sources = []
+        else:
+            for target in self._targets:
+                target._sources.remove(self)
+            self._targets = []
+        return True
+
+    def Remove(self) -> bool:
+        self._check()
+        if self._parent is not None:
+            self._parent._children.pop(self._id, None)
+        self._detach()
+        return True
+
+
+class _NullGraph:
+    def IsNullValue(self) -> bool:
+        return True
+
+    def IsValid(self) -> bool:
+        return False
+
+
+@native
+class GraphTransaction:
+    """``maxon.GraphTransaction``, ``Commit`` closes it, a transaction left without a commit is not rolled back."""
+
+    def __init__(self, graph: "GraphModelRef", settings: Any = None) -> None:
+        self._graph = graph
+        self._open: bool = True
+        graph._open_transactions += 1
+
+    def __enter__(self) -> "GraphTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._close()
+
+    def _close(self) -> None:
+        if self._open:
+            self._open = False
+            self._graph._open_transactions -= 1
+
+    def Commit(self, settings: Any = None, validate: bool = True) -> bool:
+        if self._open:
+            self._graph._commits += 1
+        self._close()
+        return True
+
+
+@native
+class GraphModelRef:
+    """
+    ``maxon.GraphModelRef`` / ``NodesGraphModelRef``: the node graph of a material in a node space.
+
+    Args:
+        space_id (str): the node space.
+        strict (bool, optional): True to raise on an edit outside of a transaction. Defaults to True.
+    """
+
+    def __init__(self, space_id: str = "", strict: bool = True) -> None:
+        self.space_id: str = str(space_id)
+        self.strict: bool = strict
+        self._paths: dict[str, GraphNode] = {}
+        self._selection: set = set()
+        self._open_transactions: int = 0
+        self._commits: int = 0
+        self._counter = itertools.count(1)
+        self._owner: Any = None     # the material, see c4d.NodeMaterial.GetMaterial
+        self._root: GraphNode = GraphNode(self, NODE_KIND.NODE, "")
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.space_id}, {self.node_count} nodes)"
+
+    @property
+    def node_count(self) -> int:
+        return sum(1 for node in self._root._children.values() if node._kind == NODE_KIND.NODE)
+
+    @property
+    def commits(self) -> int:
+        return self._commits
+
+    def _check_transaction(self) -> None:
+        if self.strict and self._open_transactions == 0:
+            raise RuntimeError("The graph can only be changed within a transaction.")
+
+    def _add_node(self, parent: GraphNode, child_id: str, asset_id: str) -> GraphNode:
+        asset_id = str(asset_id)
+        if not child_id:
+            child_id = f"{asset_id.split('.')[-1]}@{next(self._counter)}"
+        if child_id in parent._children:
+            raise ValueError(f"The node {child_id!r} already exists.")
+        template = GetNodeTemplate(asset_id)
+        node = parent._add_child(NODE_KIND.NODE, child_id, asset_id)
+        inputs = node._add_child(NODE_KIND.INPUTS, _INPUTS_ID)
+        outputs = node._add_child(NODE_KIND.OUTPUTS, _OUTPUTS_ID)
+        for port_id, value in template.inputs.items():
+            node._add_port(inputs, port_id, value)
+        for port_id, value in template.outputs.items():
+            node._add_port(outputs, port_id, value)
+        return node
+
+    def IsNullValue(self) -> bool:
+        return False
+
+    def IsValid(self) -> bool:
+        return True
+
+    def GetRoot(self) -> GraphNode:
+        return self._root
+
+    def GetViewRoot(self) -> GraphNode:
+        return self._root
+
+    def GetNode(self, path: Any) -> GraphNode:
+        return self._paths.get(str(path)) or GraphNode()
+
+    def AddChild(self, childId: Any = "", nodeId: Any = "", args: Any = None) -> GraphNode:
+        self._check_transaction()
+        return self._add_node(self._root, str(childId), nodeId)
+
+    def BeginTransaction(self, settings: Any = None) -> GraphTransaction:
+        return GraphTransaction(self, settings)
+
+
+@native
+class GraphModelHelper:
+    """``maxon.GraphModelHelper``, the static queries of a graph."""
+
+    @staticmethod
+    def _emit(nodes: Iterable[GraphNode], callback: Any) -> Any:
+        if isinstance(callback, list):
+            callback.extend(nodes)
+            return callback
+        if callback is None:
+            return list(nodes)
+        for node in nodes:
+            if callback(node) is False:
+                return False
+        return True
+
+    @staticmethod
+    def _owners(ports: Iterable[GraphNode], kind: int) -> list[GraphNode]:
+        result, seen = [], set()
+        for port in ports:
+            item = port._true_node() if kind == NODE_KIND.NODE else port
+            if item._kind & kind and id(item) not in seen:
+                seen.add(id(item))
+                result.append(item)
+        return result
+
+    @staticmethod
+    def _sources(node: GraphNode) -> Iterator[GraphNode]:
+        for port in node._ports():
+            yield from port._sources
+
+    @staticmethod
+    def _targets(node: GraphNode) -> Iterator[GraphNode]:
+        for port in node._ports():
+            yield from port._targets
+
+    @staticmethod
+    def FindNodesByAssetId(graph: GraphModelRef, assetId: Any, exactId: bool = True, callback: Any = None) -> Any:
+        asset_id = str(assetId)
+        found = [node for node in graph._root._iter_tree()
+                 if node._asset is not None and (str(node._asset.id) == asset_id or (not exactId and asset_id in str(node._asset.id)))]
+        return GraphModelHelper._emit(found, callback)
+
+    @staticmethod
+    def FindNodesById(graph: GraphModelRef, nodeId: Any, kind: int = NODE_KIND.NODE, direction: int = None,
+                      exactId: bool = True, callback: Any = None) -> Any:
+        node_id = str(nodeId)
+        found = [node for node in graph._root._iter_tree()
+                 if node._kind & kind and (node._id == node_id or (not exactId and node_id in node._id))]
+        return GraphModelHelper._emit(found, callback)
+
+    @staticmethod
+    def GetDirectPredecessors(node: GraphNode, nodeKind: int = NODE_KIND.NODE, callback: Any = None) -> Any:
+        sources = node._sources if node._kind & NODE_KIND.PORT_MASK else GraphModelHelper._sources(node)
+        return GraphModelHelper._emit(GraphModelHelper._owners(sources, nodeKind), callback)
+
+    @staticmethod
+    def GetDirectSuccessors(node: GraphNode, nodeKind: int = NODE_KIND.NODE, callback: Any = None) -> Any:
+        targets = node._targets if node._kind & NODE_KIND.PORT_MASK else GraphModelHelper._targets(node)
+        return GraphModelHelper._emit(GraphModelHelper._owners(targets, nodeKind), callback)
+
+    @staticmethod
+    def _walk(node: GraphNode, step: Callable, nodeKind: int) -> list[GraphNode]:
+        start = node._true_node() if node._kind & NODE_KIND.PORT_MASK else node
+        result, seen, stack = [], {id(start)}, [node]
+        while stack:
+            current = stack.pop()
+            ports = list(step(current)) if current._kind == NODE_KIND.NODE else (current._sources if step is GraphModelHelper._sources else current._targets)
+            for port in ports:
+                owner = port._true_node()
+                if id(owner) in seen:
+                    continue
+                seen.add(id(owner))
+                result.extend(GraphModelHelper._owners([port], nodeKind))
+                stack.append(owner)
+        return result
+
+    @staticmethod
+    def GetAllPredecessors(node: GraphNode, nodeKind: int = NODE_KIND.NODE, callback: Any = None) -> Any:
+        return GraphModelHelper._emit(GraphModelHelper._walk(node, GraphModelHelper._sources, nodeKind), callback)
+
+    @staticmethod
+    def GetAllSuccessors(node: GraphNode, nodeKind: int = NODE_KIND.NODE, callback: Any = None) -> Any:
+        return GraphModelHelper._emit(GraphModelHelper._walk(node, GraphModelHelper._targets, nodeKind), callback)
+
+    @staticmethod
+    def IsConnected(source: GraphNode, target: GraphNode) -> bool:
+        source_ports = list(source._ports()) if source._kind == NODE_KIND.NODE else [source]
+        target_ports = {id(port) for port in (target._ports() if target._kind == NODE_KIND.NODE else [target])}
+        return any(id(other) in target_ports for port in source_ports for other in port._sources + port._targets)
+
+    @staticmethod
+    def RemoveConnection(source: GraphNode, target: GraphNode) -> bool:
+        source._check()
+        if target in source._targets:
+            source._targets.remove(target)
+            target._sources.remove(source)
+            return True
+        return False
+
+    @staticmethod
+    def SelectNode(node: GraphNode) -> bool:
+        node._graph._selection.add(node)
+        return True
+
+    @staticmethod
+    def DeselectNode(node: GraphNode) -> bool:
+        node._graph._selection.discard(node)
+        return True
+
+    @staticmethod
+    def GetSelectedNodes(graph: GraphModelRef, kind: int = NODE_KIND.NODE, callback: Any = None) -> list[GraphNode]:
+        selected = [node for node in graph._root._iter_tree() if node in graph._selection and node._kind & kind]
+        if callable(callback):
+            GraphModelHelper._emit(selected, callback)
+        return selected
+
+    @staticmethod
+    def GetSelectedConnections(graph: GraphModelRef, callback: Any = None) -> list:
+        return []
+
+    @staticmethod
+    def CreateInputPort(node: GraphNode, portId: Any, portName: str = None) -> GraphNode:
+        node._check()
+        inputs = node._children[_INPUTS_ID]
+        port = inputs._children.get(str(portId)) or node._add_port(inputs, str(portId), None)
+        port._name = portName
+        return port
+
+    @staticmethod
+    def CreateOutputPort(node: GraphNode, portId: Any, portName: str = None) -> GraphNode:
+        node._check()
+        outputs = node._children[_OUTPUTS_ID]
+        port = outputs._children.get(str(portId)) or node._add_port(outputs, str(portId), None)
+        port._name = portName
+        return port
+
+
+@native
+class NimbusBaseRef:
+    """``maxon.NimbusBaseRef``, the nimbus of a material in a node space."""
+
+    def __init__(self, graph: GraphModelRef, end_node: GraphNode) -> None:
+        self._graph = graph
+        self._end_node = end_node
+
+    def GetGraph(self) -> GraphModelRef:
+        return self._graph
+
+    def GetPath(self, path: int = NIMBUS_PATH.MATERIALENDNODE) -> NodePath:
+        return NodePath(self._end_node._path if path == NIMBUS_PATH.MATERIALENDNODE and self._end_node else "")
+
+    def IsValid(self) -> bool:
+        return True
+
+
+def CreateDefaultGraph(space_id: str, strict: bool = True) -> tuple[GraphModelRef, GraphNode]:
+    """
+    Create the default graph of a node space, the end node and the brdf plugged in.
+
+    Returns:
+        tuple[GraphModelRef, GraphNode]: the graph and the end node, an invalid end node for an unknown space.
+    """
+    graph = GraphModelRef(space_id, strict)
+    space = GetNodeSpace(space_id)
+    if space is None:
+        return graph, GraphNode()
+    end_node = graph._add_node(graph._root, "", space.end_asset)
+    if space.brdf_asset:
+        brdf = graph._add_node(graph._root, "", space.brdf_asset)
+        brdf_out = brdf._children[_OUTPUTS_ID]._children[space.brdf_output]
+        end_in = end_node._children[_INPUTS_ID]._children[space.end_input]
+        brdf_out._targets.append(end_in)
+        end_in._sources.append(brdf_out)
+    return graph, end_node
+
+
+def CreateEmptyGraph(space_id: str, strict: bool = True) -> tuple[GraphModelRef, GraphNode]:
+    """
+    Create the graph of a node space with the end node only.
+    """
+    graph = GraphModelRef(space_id, strict)
+    space = GetNodeSpace(space_id)
+    if space is None:
+        return graph, GraphNode()
+    return graph, graph._add_node(graph._root, "", space.end_asset)
+
+
+#=============================================
+# Node spaces
+#=============================================
+
+RegisterNodeSpace(NodeSpace(RS_NODESPACE,
+                            "com.redshift3d.redshift4c4d.node.output", "com.redshift3d.redshift4c4d.node.output.surface",
+                            "com.redshift3d.redshift4c4d.nodes.core.standardmaterial",
+                            "com.redshift3d.redshift4c4d.nodes.core.standardmaterial.outcolor",
+                            "com.redshift3d.redshift4c4d.nodes.core.texturesampler"))
+RegisterNodeSpace(NodeSpace(AR_NODESPACE,
+                            "com.autodesk.arnold.material", "shader",
+                            "com.autodesk.arnold.shader.standard_surface", "output",
+                            "com.autodesk.arnold.shader.image"))
+RegisterNodeSpace(NodeSpace(VR_NODESPACE,
+                            "com.chaos.vray_node.mtlsinglebrdf", "com.chaos.vray_node.mtlsinglebrdf.brdf",
+                            "com.chaos.vray_node.brdfvraymtl", "com.chaos.vray_node.brdfvraymtl.output.default",
+                            "com.chaos.vray_node.texbitmap"))
+RegisterNodeSpace(NodeSpace(CL_NODESPACE,
+                            "com.centileo.node.output", "surface_material",
+                            "com.centileo.node.material", "result",
+                            "com.centileo.node.bitmap"))
+
+# the end nodes and the brdfs of the default graphs, the converter tables only know one port per node
+RegisterNodeTemplate("com.redshift3d.redshift4c4d.node.output", ["surface", "displacement"], prefix=True)
+RegisterNodeTemplate("com.redshift3d.redshift4c4d.nodes.core.standardmaterial",
+                     ["base_color", "base_color_weight", "metalness", "diffuse_roughness", "refl_color", "refl_weight",
+                      "refl_roughness", "refl_isglossiness", "refr_color", "refr_weight", "opacity_color",
+                      "emission_color", "emission_weight", "bump_input", "coat_weight", "sheen_weight"],
+                     ["outcolor"], prefix=True)
+RegisterNodeTemplate("com.autodesk.arnold.material", ["shader", "displacement"])
+RegisterNodeTemplate("com.autodesk.arnold.shader.standard_surface",
+                     ["base", "base_color", "metalness", "specular", "specular_color", "specular_roughness",
+                      "transmission", "transmission_color", "opacity", "emission", "emission_color", "normal"],
+                     ["output"])
+RegisterNodeTemplate("com.chaos.vray_node.mtlsinglebrdf", ["brdf"], prefix=True)
+RegisterNodeTemplate("com.chaos.vray_node.brdfvraymtl",
+                     ["diffuse", "reflect", "reflect_glossiness", "metalness", "refract", "opacity_color",
+                      "self_illumination", "bump_map"],
+                     ["output.default"], prefix=True)
+RegisterNodeTemplate("com.centileo.node.output", ["surface_material", "displacement"])
+RegisterNodeTemplate("com.centileo.node.material",
+                     ["diffuse_color", "diffuse_weight", "reflection_color", "reflection_roughness", "metalness",
+                      "opacity", "emission_color", "bump_map",
+                      "base_color", "diffuse_rough", "enabled_bump", "specular_color", "specular_roughness",
+                      "refl1_color", "refl1_weight", "refl1_rough", "refl1_ior", "refl1_aniso", "refl1_rotation",
+                      "refl2_color", "refl2_weight", "refl2_rough", "refl2_ior", "refl2_aniso", "refl2_rotation",
+                      "transmission_color", "transmission_ior", "absorb_color", "absorb_radius",
+                      "sss1_weight", "sss1_radius", "sss2_weight", "sss2_radius", "sss3_weight", "sss3_radius"],
+                     ["result"])
+
+# the ports the texture trees of the material helpers set, next to the converter ports
+RegisterNodeTemplate("com.redshift3d.redshift4c4d.nodes.core.texturesampler",
+                     ["tex0/path", "tex0/colorspace", "tex0_gamma", "color_multiplier"], prefix=True)
+RegisterNodeTemplate("com.redshift3d.redshift4c4d.nodes.core.bumpmap", ["inputtype"], prefix=True)
+RegisterNodeTemplate("com.autodesk.arnold.shader.image", ["color_space", "multiply"])
+RegisterNodeTemplate("com.autodesk.arnold.shader.displacement", ["normal_displacement_input"])
+RegisterNodeTemplate("com.centileo.node.bitmap", ["gamma"])
+
+
+#=============================================
+# Module
+#=============================================
+
+class MaxonModule(StandinModule):
+    """The ``maxon`` stand-in module."""
+
+
+def CreateModule() -> MaxonModule:
+    """
+    Create the ``maxon`` stand-in module, the API above and placeholders for the rest.
+    """
+    module = MaxonModule("maxon", __doc__)
+    for name in ("Id", "NodePath", "Url", "Vector", "Color", "IdAndVersion", "DataDictionary", "Bool", "String",
+                 "Int", "Float", "MaxonConvert", "Cast", "CONVERSIONMODE", "NODE_KIND", "PORT_DIR", "WIRE_MODE",
+                 "NIMBUS_PATH", "Wires", "NODE", "EffectiveName", "nodes", "GraphNode", "GraphTransaction",
+                 "GraphModelRef", "GraphModelHelper", "NimbusBaseRef"):
+        setattr(module, name, globals()[name])
+    module.Int32 = module.Int64 = Int
+    module.Float32 = module.Float64 = Float
+    module.Data = object
+    module.NodesGraphModelRef = module.GraphModelInterface = GraphModelRef
+    module.DataDictionaryInterface = DataDictionary
+    module.UrlInterface = Url
+    graph_framework = StandinModule("maxon.frameworks.graph")
+    graph_framework.GraphNode = GraphNode
+    module.frameworks = StandinModule("maxon.frameworks")
+    module.frameworks.graph = graph_framework
+    return module
+
+
+__all__ = [
+    "Id",
+    "NodePath",
+    "Url",
+    "Vector",
+    "Color",
+    "IdAndVersion",
+    "DataDictionary",
+    "NODE_KIND",
+    "PORT_DIR",
+    "WIRE_MODE",
+    "NIMBUS_PATH",
+    "Wires",
+    "NODE",
+    "NodeTemplate",
+    "NodeSpace",
+    "RegisterNodeTemplate",
+    "LoadConverterTemplates",
+    "GetNodeTemplate",
+    "RegisterNodeSpace",
+    "GetNodeSpace",
+    "GraphNode",
+    "GraphTransaction",
+    "GraphModelRef",
+    "GraphModelHelper",
+    "NimbusBaseRef",
+    "CreateDefaultGraph",
+    "CreateEmptyGraph",
+    "CreateModule",
+]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Placeholders for the part of the ``c4d`` / ``maxon`` API that is not simulated. A placeholder can be
+used in annotations, ``isinstance`` checks and attribute chains, so every module imports, but calling it
+raises ``NotImplementedError`` with its full name, a test never passes against a silent fake.
+
+未模拟API的占位: 导入和注解可用, 调用时报错.
+"""
+import types
+
+
+class MissingMeta(type):
+    """
+    The type of a placeholder class, an unknown attribute is a placeholder too.
+    """
+
+    def __getattr__(cls, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        child = Missing(f"{cls.__qualname__}.{name}")
+        type.__setattr__(cls, name, child)
+        return child
+
+    def __call__(cls, *args, **kwargs):
+        raise NotImplementedError(f"{cls.__qualname__} is not simulated by Renderer.testing")
+
+    def __repr__(cls) -> str:
+        return f"<missing {cls.__qualname__}>"
+
+
+def Missing(qualname: str) -> MissingMeta:
+    """
+    Create the placeholder of an API name, e.g. ``Missing("c4d.CTrack")``.
+    """
+    placeholder = MissingMeta(qualname.rsplit(".", 1)[-1], (), {})
+    placeholder.__qualname__ = qualname
+    return placeholder
+
+
+class StandinModule(types.ModuleType):
+    """
+    A module whose unknown attributes are placeholders, ``symbol`` resolves the constants first.
+    """
+
+    def symbol(self, name: str):
+        return None
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = self.symbol(name)
+        if value is None:
+            value = Missing(f"{self.__name__}.{name}")
+        setattr(self, name, value)
+        return value
+
+
+__all__ = [
+    "MissingMeta",
+    "Missing",
+    "StandinModule",
+]
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Count the calls into the stand-in ``c4d`` / ``maxon`` API, each call is what would cross into
+Cinema 4D, so a helper can be measured by its native round trips outside of Cinema 4D.
+
+原生调用计数: 每个替身API调用计一次, 用于在CPython中衡量往返次数.
+"""
+import functools
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+# the item access of the containers is counted too, ``material[slot]`` is a call into c4d
+COUNTED_DUNDERS: tuple[str, ...] = ("__getitem__", "__setitem__")
+
+
+class NativeCalls:
+    """
+    The call counts of the stand-in API by ``Class.Method``.
+
+    Example:
+
+        with native_calls.measure() as calls:
+            helper.GetAllShaders()
+        print(calls.total, calls.counts.most_common(3))
+    """
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+        self.enabled: bool = True
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} {self.total} calls"
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def hit(self, name: str) -> None:
+        if self.enabled:
+            self.counts[name] += 1
+
+    def reset(self) -> None:
+        self.counts.clear()
+
+    def snapshot(self) -> Counter:
+        return Counter(self.counts)
+
+    @contextmanager
+    def measure(self) -> Iterator["NativeCalls"]:
+        """
+        Count the calls of the with block only, the global counts keep running.
+        """
+        before = self.snapshot()
+        result = NativeCalls()
+        try:
+            yield result
+        finally:
+            result.counts = self.counts - before
+
+
+native_calls: NativeCalls = NativeCalls()
+
+
+def _is_native(name: str) -> bool:
+    return name[:1].isupper() or name in COUNTED_DUNDERS
+
+
+def _counted(name: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        native_calls.hit(name)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def native(cls: Optional[type] = None, *, prefix: Optional[str] = None):
+    """
+    Class decorator, count the calls of the public API methods (the ``PascalCase`` ones, as in c4d and maxon)
+    and of the item access. The stand-ins call each other through the private members only,
+    so a count is one call of the code under test.
+
+    Args:
+        cls (type): the stand-in class.
+        prefix (str, optional): the name in the counts. Defaults to the class name.
+    """
+    def decorate(cls: type) -> type:
+        name = prefix or cls.__name__
+        for attribute, value in list(vars(cls).items()):
+            if not _is_native(attribute):
+                continue
+            if isinstance(value, staticmethod):
+                setattr(cls, attribute, staticmethod(_counted(f"{name}.{attribute}", value.__func__)))
+            elif isinstance(value, classmethod):
+                setattr(cls, attribute, classmethod(_counted(f"{name}.{attribute}", value.__func__)))
+            elif callable(value) and not isinstance(value, type):
+                setattr(cls, attribute, _counted(f"{name}.{attribute}", value))
+        return cls
+    return decorate(cls) if cls is not None else decorate
+
+
+__all__ = [
+    "NativeCalls",
+    "native_calls",
+    "native",
+]
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Build stand-in scenes at scale: node materials with long node chains, classic materials with shader chains,
+object trees with tags, and the Redshift and Octane video posts with their aovs.
+
+The builders use the stand-ins directly, building a scene is not counted by ``native_calls``
+and needs no transaction, so a measure only sees the helper under test.
+
+替身场景构建: 大规模节点材质, shader材质, 对象/标签树和AOV渲染设置, 构建过程不计入原生调用.
+"""
+from typing import Iterable, Optional
+
+from . import c4d_standin as c4d
+from . import maxon_standin as maxon
+from .c4d_standin import GetSymbol
+
+
+def _insert(document: Optional[c4d.BaseDocument], material: c4d.BaseMaterial) -> None:
+    if document is not None:
+        material._insert(document._materials)
+
+
+def NodeMaterial(space_id: str = maxon.RS_NODESPACE, nodes: int = 0, chains: int = 1, asset: str = None,
+                 name: str = "Mat", document: c4d.BaseDocument = None) -> c4d.Material:
+    """
+    Create a node material with the default graph and #nodes more nodes in #chains chains,
+    each chain is plugged into its own input of the brdf.
+
+    Args:
+        space_id (str, optional): the node space. Defaults to RS_NODESPACE.
+        nodes (int, optional): the count of nodes added to the default graph. Defaults to 0.
+        chains (int, optional): the count of chains, at most one per brdf input. Defaults to 1.
+        asset (str, optional): the asset of the chain nodes, wired from the converter output to the converter input.
+            Defaults to the image node of the space.
+        name (str, optional): the material name. Defaults to "Mat".
+        document (BaseDocument, optional): the document to insert the material in. Defaults to None.
+
+    Returns:
+        Material: the material.
+    """
+    space = maxon.GetNodeSpace(space_id)
+    if space is None:
+        raise ValueError(f'{NodeMaterial.__name__} Expected a registered node space, got {space_id}')
+    material = c4d.Material()
+    material._bc._set(c4d.ID_BASELIST_NAME, name)
+    graph = material._add_graph(space_id, *maxon.CreateDefaultGraph(space_id))
+    _insert(document, material)
+    if nodes <= 0:
+        return material
+
+    template = maxon.GetNodeTemplate(asset or space.image_asset)
+    if not template.inputs or not template.outputs:
+        raise ValueError(f'{NodeMaterial.__name__} Expected an asset with an input and an output, got {template}')
+    in_id, out_id = template.converter
+    in_id, out_id = in_id or next(iter(template.inputs), None), out_id or next(iter(template.outputs), None)
+    brdf = next(node for node in graph._root._children.values() if str(node._asset.id) == space.brdf_asset)
+    targets = list(brdf._children["<"]._children.values())
+    if chains > len(targets):
+        raise ValueError(f'{NodeMaterial.__name__} Expected at most {len(targets)} chains, got {chains}')
+
+    for chain in range(chains):
+        target = targets[chain]
+        for _ in range(nodes // chains + (1 if chain < nodes % chains else 0)):
+            node = graph._add_node(graph._root, "", template.asset_id)
+            source = node._children[">"]._children[out_id]
+            source._targets.append(target)
+            target._sources = [source]
+            target = node._children["<"]._children[in_id]
+    return material
+
+
+def ShaderMaterial(material_type: int, shaders: int = 0, slots: Iterable[int] = (), link_id: int = None,
+                   shader_type: int = None, name: str = "Mat", document: c4d.BaseDocument = None) -> c4d.BaseMaterial:
+    """
+    Create a classic material with #shaders shaders in chains, one chain per slot of the material,
+    a shader is linked into the #link_id parameter of the one before.
+
+    Args:
+        material_type (int): the material type, e.g. ID_OCTANE_BASE_MATERIAL.
+        shaders (int, optional): the count of shaders. Defaults to 0.
+        slots (Iterable[int], optional): the material parameters the chains are plugged into. Defaults to ().
+        link_id (int, optional): the link parameter of the shaders. Defaults to ``c4d.IMAGETEXTURE_FILE``.
+        shader_type (int, optional): the shader type. Defaults to ``c4d.Xbitmap``.
+        name (str, optional): the material name. Defaults to "Mat".
+        document (BaseDocument, optional): the document to insert the material in. Defaults to None.
+
+    Returns:
+        BaseMaterial: the material.
+    """
+    slots = list(slots)
+    if shaders and not slots:
+        raise ValueError(f'{ShaderMaterial.__name__} Expected a slot for the shaders, got none')
+    link_id = GetSymbol("IMAGETEXTURE_FILE") if link_id is None else link_id
+    shader_type = GetSymbol("Xbitmap") if shader_type is None else shader_type
+    material = c4d.BaseMaterial(material_type)
+    material._bc._set(c4d.ID_BASELIST_NAME, name)
+    _insert(document, material)
+
+    owners: list = [(material, slot) for slot in slots]
+    for index in range(shaders):
+        shader = c4d.BaseShader(shader_type)
+        shader._bc._set(c4d.ID_BASELIST_NAME, f"Shader {index}")
+        shader._insert(material._shaders)
+        owner, slot = owners[index % len(owners)]
+        owner._bc._set(slot, shader)
+        owners[index % len(owners)] = (shader, link_id)
+    return material
+
+
+def ObjectTree(document: c4d.BaseDocument = None, objects: int = 0, children: int = 4,
+               tags: Iterable[int] = (), object_type: int = None) -> c4d.BaseDocument:
+    """
+    Fill a document with #objects objects in a tree, each object has #children children, the first
+    objects at the top, and a tag of each type of #tags. A texture tag of a selection tag is restricted to it.
+
+    Args:
+        document (BaseDocument, optional): the document. Defaults to a new document.
+        objects (int, optional): the count of objects. Defaults to 0.
+        children (int, optional): the children per object. Defaults to 4.
+        tags (Iterable[int], optional): the tag types of each object, e.g. ``[Ttexture, Tpolygonselection]``. Defaults to ().
+        object_type (int, optional): the object type. Defaults to ``c4d.Onull``.
+
+    Returns:
+        BaseDocument: the document.
+    """
+    document = c4d.BaseDocument() if document is None else document
+    object_type = GetSymbol("Onull") if object_type is None else object_type
+    restriction = GetSymbol("TEXTURETAG_RESTRICTION")
+    tags = list(tags)
+    nodes: list = []
+    for index in range(objects):
+        node = c4d.BaseObject(object_type)
+        node._bc._set(c4d.ID_BASELIST_NAME, f"Object {index}")
+        parent = nodes[(index - 1) // children] if index else document._objects
+        node._insert(parent)
+        nodes.append(node)
+        selection = None
+        for tag_type in tags:
+            tag = c4d.BaseTag(tag_type)
+            tag._insert(node._tags)
+            if isinstance(tag, c4d.SelectionTag):
+                selection = f"Selection {index}"
+                tag._bc._set(c4d.ID_BASELIST_NAME, selection)
+            elif isinstance(tag, c4d.TextureTag) and selection is not None:
+                tag._bc._set(restriction, selection)
+    return document
+
+
+def RedshiftVideoPost(document: c4d.BaseDocument = None, aovs: int = 0, aov_types: Iterable[int] = (0,)) -> c4d.BaseVideoPost:
+    """
+    Add the Redshift video post with #aovs aovs to the render data, the types cycle through #aov_types.
+
+    Returns:
+        BaseVideoPost: the video post.
+    """
+    document = c4d.state.document if document is None else document
+    videopost = c4d.BaseVideoPost(GetSymbol("ID_REDSHIFT"))
+    videopost._insert(document._active_renderdata._videoposts)
+    aov_types = list(aov_types)
+    for index in range(aovs):
+        aov = c4d.RSAOV()
+        aov._params[GetSymbol("REDSHIFT_AOV_TYPE")] = aov_types[index % len(aov_types)]
+        aov._params[GetSymbol("REDSHIFT_AOV_NAME")] = f"AOV {index}"
+        aov._params[GetSymbol("REDSHIFT_AOV_ENABLED")] = True
+        aov._params[GetSymbol("REDSHIFT_AOV_MULTIPASS_BIT_DEPTH")] = GetSymbol("REDSHIFT_AOV_MULTIPASS_BIT_DEPTH_16")
+        videopost._aovs.append(aov)
+    return videopost
+
+
+def OctaneVideoPost(document: c4d.BaseDocument = None, aovs: int = 0, aov_types: Iterable[int] = (0,)) -> c4d.BaseVideoPost:
+    """
+    Add the Octane video post with #aovs aov shaders to the render data, the types cycle through #aov_types.
+
+    Returns:
+        BaseVideoPost: the video post.
+    """
+    document = c4d.state.document if document is None else document
+    videopost = c4d.BaseVideoPost(GetSymbol("ID_OCTANE"))
+    videopost._insert(document._active_renderdata._videoposts)
+    aov_types = list(aov_types)
+    type_id, name_id, enabled_id = GetSymbol("RNDAOV_TYPE"), GetSymbol("RNDAOV_NAME"), GetSymbol("RNDAOV_ENABLED")
+    first_input = GetSymbol("SET_RENDERAOV_INPUT_0")
+    for index in range(aovs):
+        aov = c4d.BaseShader(GetSymbol("ID_OCTANE_RENDERPASS_AOV"))
+        aov._bc._set(type_id, aov_types[index % len(aov_types)])
+        aov._bc._set(name_id, f"AOV {index}")
+        aov._bc._set(enabled_id, True)
+        aov._insert(videopost._shaders)
+        videopost._bc._set(first_input + index, aov)
+    videopost._bc._set(GetSymbol("SET_RENDERAOV_IN_CNT"), aovs)
+    return videopost
+
+
+__all__ = [
+    "NodeMaterial",
+    "ShaderMaterial",
+    "ObjectTree",
+    "RedshiftVideoPost",
+    "OctaneVideoPost",
+]
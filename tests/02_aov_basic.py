@@ -65,6 +65,44 @@ def modify_redshift_aov():
 
     Redshift.AovManager()
 
+# How to set up many redshift aovs with one RendererSetAOVs
+def batch_redshift_aov():
+
+    doc: c4d.documents.BaseDocument = c4d.documents.GetActiveDocument()
+    vp: c4d.documents.BaseVideoPost = Renderer.GetVideoPost(doc, Renderer.ID_REDSHIFT)
+    aov_helper = Redshift.AOV(vp)
+
+    # All the edits in the block run against a staging list, the VideoPost is written once on exit
+    with Redshift.AOVBatch(aov_helper) as batch:
+        for aov_type in (Redshift.REDSHIFT_AOV_TYPE_DIFFUSE_LIGHTING, Redshift.REDSHIFT_AOV_TYPE_REFLECTIONS,
+                         Redshift.REDSHIFT_AOV_TYPE_REFRACTIONS, Redshift.REDSHIFT_AOV_TYPE_EMISSION):
+            aov_helper.add_aov(aov_helper.create_aov_shader(aov_type))
+        aov_helper.set_light_group(Redshift.REDSHIFT_AOV_TYPE_DIFFUSE_LIGHTING, "key")
+        aov_helper.set_light_group(Redshift.REDSHIFT_AOV_TYPE_DIFFUSE_LIGHTING, "fill")
+        aov_helper.remove_aov_type(aov_type = Redshift.REDSHIFT_AOV_TYPE_EMISSION)
+        for puzzle_id in range(1, 4):
+            aov_helper.set_puzzle_matte(puzzle_id = puzzle_id)
+
+    # ... with 2 native calls, 20 saved
+    print(batch)
+
+def preset_redshift_aov():
+
+    doc: c4d.documents.BaseDocument = c4d.documents.GetActiveDocument()
+    vp: c4d.documents.BaseVideoPost = Renderer.GetVideoPost(doc, Renderer.ID_REDSHIFT)
+    aov_helper = Redshift.AOV(vp)
+
+    # Describe the aov layout as data, the fields left to None are not touched
+    preset = Renderer.utils.AOVPreset("Redshift", [
+        Renderer.utils.AOVSpec(Redshift.REDSHIFT_AOV_TYPE_BEAUTY, bits=16),
+        Renderer.utils.AOVSpec(Redshift.REDSHIFT_AOV_TYPE_DIFFUSE_LIGHTING, light_groups=("key", "fill")),
+        Renderer.utils.AOVSpec(Redshift.REDSHIFT_AOV_TYPE_PUZZLE_MATTE, "Puzzle 1", id=1),
+    ])
+
+    # Only the difference is applied, the second call finds nothing to do
+    print(aov_helper.apply_preset(preset, prune=True))
+    print(aov_helper.apply_preset(preset, prune=True).empty)
+
 # How to create and modify octane aovs
 def modify_octane_aov():
 
@@ -248,6 +286,8 @@ if __name__ == '__main__':
     Renderer.ClearConsole()
 
     modify_redshift_aov()
+    # batch_redshift_aov()
+    # preset_redshift_aov()
     # modify_octane_aov()
     # modify_arnold_aov()
     # modify_vray_aov()
@@ -0,0 +1,30 @@
+"""
+Load the pure python modules of ``Renderer.utils`` without Cinema 4D.
+
+The ``Renderer`` package import c4d at the top, so the modules are loaded by path into a
+stand-in package, the relative imports between the pure modules still work.
+"""
+import os
+import sys
+import types
+import importlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "_renderer_pure_utils"
+
+
+def load(name: str) -> types.ModuleType:
+    """
+    Load ``Renderer/utils/<name>.py``.
+
+    Args:
+        name (str): the module name, e.g. "graph_index"
+
+    Returns:
+        types.ModuleType: the module
+    """
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [os.path.join(ROOT, "utils")]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
@@ -0,0 +1,17 @@
+"""
+Import the ``Renderer`` package against the in-memory stand-ins of ``Renderer.testing``, without Cinema 4D.
+
+The bootstrap is ``testing/bootstrap.py``, loaded by path as ``Renderer/__init__.py`` imports c4d.
+"""
+import os
+import importlib.util
+
+_spec = importlib.util.spec_from_file_location(
+    "renderer_bootstrap", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "testing", "bootstrap.py"))
+bootstrap = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bootstrap)
+
+ROOT = bootstrap.ROOT
+package_parent = bootstrap.package_parent
+load_testing = bootstrap.load_testing
+setup = bootstrap.setup
@@ -0,0 +1,84 @@
+"""AOVIndex lookups on stand-in aov objects, this can run without Cinema 4D."""
+from _pure import load
+
+aov_index = load("aov_index")
+AOVIndex = aov_index.AOVIndex
+
+TYPE, NAME, GROUPS = 1, 2, 3
+
+
+class FakeAOV:
+    # stand-in of a RSAOV / aov shader, count the parameter reads
+    reads = 0
+
+    def __init__(self, aov_type: int, name: str = "", groups: str = ""):
+        self.data = {TYPE: aov_type, NAME: name, GROUPS: groups}
+
+    def GetParameter(self, key):
+        FakeAOV.reads += 1
+        return self.data[key]
+
+
+def light_groups(aov: FakeAOV) -> list[str]:
+    return [group.strip() for group in aov.GetParameter(GROUPS).split("\n") if group.strip()]
+
+
+def make_index() -> AOVIndex:
+    return AOVIndex(get_type=lambda aov: aov.GetParameter(TYPE),
+                    get_name=lambda aov: aov.GetParameter(NAME),
+                    get_groups=light_groups)
+
+
+def test_lookup():
+    aovs = [FakeAOV(1, "Beauty"), FakeAOV(5, "Diffuse", "key\nrim\n"), FakeAOV(5, "Diffuse 2", "rim\n"),
+            FakeAOV(9, "Z")]
+    FakeAOV.reads = 0
+    index = make_index().Build(aovs)
+    assert FakeAOV.reads == 3 * len(aovs)
+
+    # no parameter is read by the lookups
+    assert index.GetType(5) == aovs[1:3]
+    assert index.GetFirst(9) is aovs[3]
+    assert index.GetFirst(7) is None and index.GetType(7) == []
+    assert index.GetName("Diffuse") is aovs[1]
+    assert index.GetGroup("rim") == aovs[1:3] and index.GetGroup("key") == [aovs[1]]
+    assert index.GetAll() == aovs and index.GetTypes() == [1, 5, 9]
+    assert index.HasType(1) and not index.HasType(2)
+    assert FakeAOV.reads == 3 * len(aovs)
+
+    # the results are copies
+    index.GetType(5).clear()
+    assert len(index.GetType(5)) == 2
+    assert len(index) == 4 and aovs[0] in index and FakeAOV(1) not in index
+
+
+def test_groups():
+    # the octane custom and light aovs keyed by id
+    custom, light = 10, 20
+    aovs = [FakeAOV(custom, "c1", 0), FakeAOV(light, "l1", 2), FakeAOV(light, "l2", 3), FakeAOV(1, "b", 0)]
+
+    def groups(aov):
+        kind = {custom: "custom", light: "light"}.get(aov.GetParameter(TYPE))
+        return [(kind, aov.GetParameter(GROUPS))] if kind else []
+
+    index = AOVIndex(get_type=lambda aov: aov.GetParameter(TYPE), get_groups=groups).Build(aovs)
+    assert index.GetGroup(("custom", 0)) == [aovs[0]]
+    assert index.GetGroup(("light", 3)) == [aovs[2]]
+    assert index.GetGroup(("light", 0)) == []
+    assert index.GetName("c1") is None
+
+    # rebuild after an edit
+    aovs[2].data[GROUPS] = 4
+    index.Build(aovs)
+    assert index.GetGroup(("light", 3)) == [] and index.GetGroup(("light", 4)) == [aovs[2]]
+    index.Add(None)
+    index.Add(FakeAOV(light, "l3", 4))
+    assert len(index.GetGroup(("light", 4))) == 2
+    index.Clear()
+    assert len(index) == 0 and index.GetAll() == []
+
+
+if __name__ == '__main__':
+    test_lookup()
+    test_groups()
+    print("AOV index tests passed")
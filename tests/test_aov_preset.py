@@ -0,0 +1,98 @@
+"""AOVPreset diff on stand-in aov states, this can run without Cinema 4D."""
+import os
+import tempfile
+from _pure import load
+
+aov_preset = load("aov_preset")
+AOVSpec, AOVDriverSpec, AOVState, AOVPreset = (aov_preset.AOVSpec, aov_preset.AOVDriverSpec,
+                                                aov_preset.AOVState, aov_preset.AOVPreset)
+
+BEAUTY, DIFFUSE, PUZZLE, Z = 1, 5, 30, 9
+
+
+def state(aov_type, name, aov_id=None, **values) -> AOVState:
+    values = {"type": aov_type, "id": aov_id, "name": name, "enabled": True, "bits": 16, "light_groups": (), **values}
+    return AOVState(object(), values)
+
+
+def make_preset() -> AOVPreset:
+    return AOVPreset("Redshift", [
+        AOVSpec(BEAUTY, enabled=True, bits=16),
+        AOVSpec(DIFFUSE, light_groups=("key", "rim")),
+        AOVSpec(PUZZLE, "Puzzle 1", id=1),
+        AOVSpec(PUZZLE, "Puzzle 2", id=2),
+    ])
+
+
+def test_diff():
+    preset = make_preset()
+    states = [state(BEAUTY, "Beauty"), state(DIFFUSE, "Diffuse", light_groups=("rim", "key")),
+              state(PUZZLE, "Puzzle 1", 1), state(Z, "Z")]
+
+    plan = preset.diff(states)
+    assert [spec.name for spec in plan.add] == ["Puzzle 2"]
+    assert plan.update == [] and plan.remove == []
+    assert [item.values["type"] for item in plan.keep] == [BEAUTY, DIFFUSE, PUZZLE, Z]
+
+    # the aov not in the preset is removed with prune
+    plan = preset.diff(states, prune=True)
+    assert [item.values["type"] for item in plan.remove] == [Z]
+
+    # only the fields set in the spec are compared, the name override of the beauty is kept
+    states[0].values.update(name="My Beauty", bits=32)
+    states[1].values["light_groups"] = ("key",)
+    plan = preset.diff(states)
+    assert [(item.values["type"], changes) for item, spec, changes in plan.update] == [
+        (BEAUTY, {"bits": 16}), (DIFFUSE, {"light_groups": ("key", "rim")})]
+
+    # a re-apply on a matching VideoPost does nothing
+    states = [state(BEAUTY, "Beauty"), state(DIFFUSE, "Diffuse", light_groups=("key", "rim")),
+              state(PUZZLE, "Puzzle 1", 1), state(PUZZLE, "Puzzle 2", 2)]
+    plan = preset.diff(states, prune=True)
+    assert plan.empty and len(plan.keep) == 4
+
+    # the renderer has no such field
+    plan = AOVPreset("Octane", [AOVSpec(BEAUTY, bits=32, denoise=True)]).diff([AOVState(None, {"type": BEAUTY})])
+    assert plan.empty
+
+
+def test_duplicates_and_drivers():
+    # specs of the same key pair with the aovs in order
+    preset = AOVPreset("Corona", [AOVSpec(DIFFUSE, "A"), AOVSpec(DIFFUSE, "B"), AOVSpec(DIFFUSE, "C")])
+    plan = preset.diff([state(DIFFUSE, "A"), state(DIFFUSE, "X")])
+    assert [changes for item, spec, changes in plan.update] == [{"name": "B"}]
+    assert [spec.name for spec in plan.add] == ["C"]
+
+    # the V-Ray types are [object type, sub type, name]
+    preset = AOVPreset("V-Ray", [AOVSpec([1000, 117, "Z-Depth"])])
+    assert preset.diff([AOVState(None, {"type": 117})], type_key=lambda value: value[1]).empty
+    preset.check_renderer("Vray")
+    try:
+        preset.check_renderer("Redshift")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a V-Ray preset is checked against Redshift")
+
+    preset = AOVPreset("Arnold", [AOVSpec("diffuse", driver="EXR"), AOVSpec("Z", driver="EXR")],
+                       [AOVDriverSpec("EXR", driver_type=1), AOVDriverSpec("<display driver>")])
+    plan = preset.diff([AOVState(None, {"type": "diffuse", "driver": "EXR"})], drivers=["EXR"])
+    assert [spec.name for spec in plan.drivers] == ["<display driver>"]
+    assert [spec.type for spec in plan.add] == ["Z"]
+
+
+def test_json():
+    preset = make_preset()
+    preset.aovs.append(AOVSpec([1000, 117, "Z-Depth"], denoise=False))
+    preset.drivers.append(AOVDriverSpec("EXR", 2, render_path="out/$prj"))
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "preset.json")
+        preset.save(path)
+        assert AOVPreset.load(path) == preset
+
+
+if __name__ == '__main__':
+    test_diff()
+    test_duplicates_and_drivers()
+    test_json()
+    print("AOV preset tests passed")
@@ -0,0 +1,102 @@
+"""CheckArgType / CheckArgCallback compiled validators, on the Renderer.testing stand-ins without Cinema 4D."""
+from _sim import setup
+
+Renderer, testing = setup()
+from Renderer.utils import decorators
+
+
+def raises(error: type, func, *args, **kwargs) -> str:
+    try:
+        func(*args, **kwargs)
+    except error as e:
+        return str(e)
+    raise AssertionError(f"{func.__name__} should raise {error.__name__}")
+
+
+def test_arg_type():
+    @decorators.CheckArgType(name=str, age=(int, float), tags=tuple)
+    def person(name: str = "Bob", age: int = 42, *tags, strict: bool = False) -> tuple:
+        return name, age, tags, strict
+
+    assert person() == ("Bob", 42, (), False)
+    assert person("Ann", 3.5, "a", strict=True) == ("Ann", 3.5, ("a",), True)
+    assert person(age=7) == ("Bob", 7, (), False)
+    assert "Parameter name should be str type, but got int" in raises(TypeError, person, 1)
+    assert "should be int | float type" in raises(TypeError, person, age="7")
+
+    # a default of a wrong type is checked like the legacy decorator did
+    @decorators.CheckArgType(port_id=str)
+    def get_port(shader, port_id=None):
+        return port_id
+
+    assert get_port(None, "outcolor") == "outcolor"
+    raises(TypeError, get_port, None)
+
+    class Helper:
+        @decorators.CheckArgType(port_id=str)
+        def GetPort(self, shader, port_id: str = "out"):
+            return port_id
+
+    assert Helper().GetPort("node") == "out" and Helper().GetPort("node", port_id="in") == "in"
+    raises(TypeError, Helper().GetPort, "node", 3)
+
+
+def test_arg_callback():
+    @decorators.CheckArgCallback(("a", lambda x: x >= 0, lambda x: int(x)),
+                                 ("b", lambda x: isinstance(x, (int, float)), lambda x: int(x) - 1),
+                                 ("c", None, str.upper),
+                                 ("missing", lambda x: False))
+    def add(a: int = 1, b: int = 2.0, *, c: str = "x") -> tuple:
+        return a, b, c
+
+    assert add() == (1, 1, "X")
+    assert add(2.5, 4) == (2, 3, "X")
+    assert add(b=10, c="y") == (1, 9, "Y")
+    assert "Arg: a progress failed: Arg: a validator failed" in raises(ValueError, add, -1)
+    assert "Arg: b progress failed" in raises(ValueError, add, 1, "2")
+
+    # positional only, *args and **kwargs
+    @decorators.CheckArgCallback(("x", None, abs), ("rest", None, lambda r: tuple(v * 2 for v in r)),
+                                 ("options", None, lambda o: {k: str(v) for k, v in o.items()}))
+    def call(x=-1, /, *rest, **options) -> tuple:
+        return x, rest, options
+
+    assert call() == (1, (), {})
+    assert call(-3, 1, 2, key=4) == (3, (2, 4), {"key": "4"})
+
+    class Helper:
+        @decorators.CheckArgCallback(("index", lambda x: x >= 0, int))
+        def GetInput(self, node, index=0):
+            return node, index
+
+    assert Helper().GetInput("node", 2.0) == ("node", 2) and Helper().GetInput("node") == ("node", 0)
+
+
+def test_switch():
+    # the functions are decorated before the switch, as the helpers of the package are at import
+    @decorators.CheckArgType(name=str)
+    def typed(name=None):
+        return name
+
+    @decorators.CheckArgCallback(("name", lambda x: False), ("count", lambda x: x > 0, int))
+    def transformed(name=None, count=1):
+        return name, count
+
+    raises(TypeError, typed, 3)
+    raises(ValueError, transformed, "a")
+    decorators.SetArgValidation(False)
+    try:
+        assert typed(3) == 3
+        # the transformers still run
+        assert transformed("a", -2.5) == ("a", -2)
+    finally:
+        decorators.SetArgValidation(True)
+    raises(TypeError, typed, 3)
+    raises(ValueError, transformed, "a")
+
+
+if __name__ == '__main__':
+    test_arg_type()
+    test_arg_callback()
+    test_switch()
+    print("Arg validator tests passed")
@@ -0,0 +1,83 @@
+"""DAG aware description capture against a pure python fake graph, this can run without Cinema 4D."""
+import json
+import time
+from _pure import load
+
+description_capture = load("description_capture")
+CaptureDescriptions = description_capture.CaptureDescriptions
+NestDescriptions = description_capture.NestDescriptions
+
+
+def make_edges(graph: dict):
+    # graph: node -> [(input port, pre node)], the edge is (pre node, input port)
+    return lambda node: [((pre, port), pre) for port, pre in graph.get(node, [])]
+
+
+def describe(node: str) -> dict:
+    return {"$type": f"#type.{node.rstrip('0123456789')}", "$id": node}
+
+
+def port_key(edge: tuple) -> str:
+    return f"#<{edge[1]}"
+
+
+def capture(graph: dict, start: str = "output") -> list[dict]:
+    return CaptureDescriptions(start, make_edges(graph), describe, port_key)
+
+
+def test_shared_texture():
+    # one texture drives the base color and the AO of the material
+    graph = {"output": [("surface", "material")],
+             "material": [("base_color", "cc"), ("ao", "texture"), ("roughness", "ramp")],
+             "cc": [("input", "texture")], "ramp": [("input", "texture")]}
+    flat = capture(graph)
+    assert [d["$id"] for d in flat] == ["output", "material", "cc", "texture", "ramp"]
+    assert flat[1] == {"$type": "#type.material", "$id": "material",
+                       "#<base_color": "cc", "#<ao": "texture", "#<roughness": "ramp"}
+
+    nested = NestDescriptions(flat)
+    material = nested["#<surface"]
+    assert material["#<base_color"]["#<input"] == {"$type": "#type.texture", "$id": "texture"}
+    assert material["#<ao"] == "#texture" and material["#<roughness"]["#<input"] == "#texture"
+    # the flat descriptions are untouched
+    assert flat[1]["#<base_color"] == "cc"
+
+
+def test_diamonds_are_linear():
+    # 40 stacked diamonds: 2^40 paths, 121 nodes
+    graph, node = {}, "output"
+    for index in range(40):
+        left, right, join = f"left{index}", f"right{index}", f"join{index}"
+        graph[node] = [("a", left), ("b", right)]
+        graph[left] = [("input", join)]
+        graph[right] = [("input", join)]
+        node = join
+    start = time.perf_counter()
+    flat = capture(graph)
+    nested = NestDescriptions(flat)
+    assert time.perf_counter() - start < 1.0
+    assert len(flat) == 121
+    assert json.dumps(nested).count('"$id"') == 121
+
+
+def test_cycle_and_deep_chain():
+    graph = {"output": [("a", "n1")], "n1": [("input", "n2")], "n2": [("input", "n1")]}
+    nested = NestDescriptions(capture(graph))
+    assert nested["#<a"]["#<input"]["#<input"] == "#n1"
+
+    # deeper than the recursion limit
+    count = 20000
+    chain = {f"n{i}" if i else "output": [("input", f"n{i + 1}")] for i in range(count)}
+    flat = capture(chain)
+    assert len(flat) == count + 1
+    node, depth = NestDescriptions(flat), 0
+    while "#<input" in node:
+        node, depth = node["#<input"], depth + 1
+    assert depth == count
+
+
+if __name__ == '__main__':
+    test_shared_texture()
+    test_diamonds_are_linear()
+    test_cycle_and_deep_chain()
+    print("Description capture tests passed")
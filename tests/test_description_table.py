@@ -0,0 +1,62 @@
+"""DescriptionTable lookups and the one pass node space guess, this can run without Cinema 4D."""
+from _pure import load
+
+description_table = load("description_table")
+DescriptionTable = description_table.DescriptionTable
+guess_nodespace = description_table.guess_nodespace
+
+RS, AR, VR, CE = 0, 1, 2, 3
+MAPS = [
+    ["rs.output", "ar.material", ["vr.mtlsinglebrdf", "vr.mtl2sided"], "ce.output",
+     [["rs.output.surface", "shader", "", ""]]],
+    [["rs.standardmaterial", "rs.material"], "ar.standard_surface", "vr.brdfvraymtl", "ce.material",
+     [["rs.standardmaterial.base_color", "base_color", "", ""],
+      ["rs.standardmaterial.refl_roughness", "specular_roughness", "", ""]]],
+    ["rs.texturesampler", "ar.image", "vr.texbitmap", "ce.bitmap",
+     [["Image/Filename/Path", "filename", "", ""]]],
+    ["rs.rscolorcorrection", "ar.color_correct", "vr.colorcorrection", "ce.colorcorrect",
+     [["rs.rscolorcorrection.input", "input", ""]]],
+    ["rs.rsmathmix", "ar.mix_rgba", "vr.texmix", "", [["rs.rsmathmix.input1", "input1", ""]]],
+]
+
+
+def test_table():
+    table = DescriptionTable(MAPS)
+    assert table.get_type("rs.texturesampler", AR) == "ar.image"
+    assert table.get_type("ar.image", RS) == "rs.texturesampler"
+    # alternatives are found, the first one is created
+    assert table.get_type("rs.material", VR) == "vr.brdfvraymtl"
+    assert table.get_type("ar.standard_surface", RS) == "rs.standardmaterial"
+    assert table.get_type("vr.mtl2sided", AR) == "ar.material"
+    # unknown types and empty cells have no counterpart
+    assert table.get_type("rs.unknown", AR) is None and table.get_type_row("rs.unknown") == -1
+    assert table.get_type("rs.rsmathmix", CE) is None
+
+    assert table.get_aid("texturesampler", AR) == "image"
+    assert table.get_aid("standard_surface", RS) == "standardmaterial"
+    assert table.get_aid("nothing", AR) is None
+
+    assert table.get_slot("rs.standardmaterial", "rs.standardmaterial.refl_roughness", AR) == "specular_roughness"
+    assert table.get_slot("ar.standard_surface", "base_color", RS) == "rs.standardmaterial.base_color"
+    assert table.get_slot("ar.image", "filename", RS) == "Image/Filename/Path"
+    assert table.get_slot("ar.image", "unknown", RS) is None
+    # a port without a column for the space
+    assert table.get_slot("rs.rscolorcorrection", "input", CE) is None
+
+
+def test_guess():
+    spaces = ("RS", "AR", "VR", "CE")
+    data = {"$type": "#com.autodesk.arnold.material",
+            "#<shader": {"$type": "#com.autodesk.arnold.shader.image", "#<filename": "tex.png"}}
+    assert guess_nodespace(data, spaces) == "AR"
+    # nested values count, redshift wins over the others
+    data["#<shader"]["#<extra"] = [{"$type": "#com.redshift3d.redshift4c4d.nodes.core.texturesampler"}]
+    assert guess_nodespace(data, spaces) == "RS"
+    assert guess_nodespace({"$type": "#com.chaos.vray_node.texbitmap"}, spaces) == "VR"
+    assert guess_nodespace({"$type": "#net.maxon.node.noise"}, spaces) is None
+
+
+if __name__ == '__main__':
+    test_table()
+    test_guess()
+    print("Description table tests passed")
@@ -0,0 +1,50 @@
+"""FilenameClassifier and the detect_* wrappers, this can run without Cinema 4D."""
+from _pure import load
+
+pbr_helper = load("pbr_helper")
+FilenameClassifier = pbr_helper.FilenameClassifier
+
+
+def test_classify():
+    info = pbr_helper.CLASSIFIER.classify("C:/Assets/Rock01/Rock01_4k_Normal_GL.png")
+    assert info.name == "Rock01_4k_Normal_GL.png"
+    assert info.tokens == ("rock01", "4k", "normal", "gl")
+    assert (info.asset, info.map_type, info.resolution, info.normal_format, info.extension) == ("rock01", "normal", 4096, "opengl", ".png")
+    assert info.is_pbr
+
+    info = pbr_helper.CLASSIFIER.classify("character_disp32.1001.tif")
+    assert (info.asset, info.map_type, info.udim) == ("character", "displacement", 1001)
+    assert not pbr_helper.CLASSIFIER.classify("preview.jpg").is_pbr
+    assert pbr_helper.CLASSIFIER.classify("folder/").tokens == ("folder",)
+
+
+def test_wrappers():
+    assert pbr_helper.tokenize("Grass_01_4k_Diffuse.jpg") == ["grass", "01", "4k", "diffuse"]
+    assert pbr_helper.detect_map_type(["stone", "nrm"]) == "normal"
+    assert pbr_helper.detect_asset_name(["rusty", "iron", "02", "4k", "diffuse"]) == "rusty_iron_02"
+    assert pbr_helper.detect_asset_name(["4k", "diffuse"]) == "asset"
+    assert pbr_helper.detect_normal_format(["stone", "normal", "dx"]) == "directx"
+    assert pbr_helper.detect_resolution("Wall_4096_ao.exr") == 4096
+    assert pbr_helper.detect_udim("character_diffuse.1001.tif") == 1001
+    assert pbr_helper.GetPBRName("Wood_basecolor.png") == "wood"
+    assert pbr_helper.is_in_package("Metal02_normal.tga", "metal02")
+
+
+def test_cache():
+    classifier = FilenameClassifier(cache_size=2)
+    first = classifier.classify("a/rock_diffuse.png")
+    assert classifier.classify("b/rock_diffuse.png") is first
+    assert classifier.cache_info().hits == 1
+    classifier.cache_clear()
+    assert classifier.cache_info().currsize == 0
+
+    uncached = FilenameClassifier(cache_size=0)
+    assert uncached.classify("rock_diffuse.png") == first
+    assert uncached.cache_info() is None
+
+
+if __name__ == '__main__':
+    test_classify()
+    test_wrappers()
+    test_cache()
+    print("Filename classifier tests passed")
@@ -0,0 +1,104 @@
+"""FolderIndex PBR lookups against the old os.path.exists probing, this can run without Cinema 4D."""
+import os
+import random
+import itertools
+import tempfile
+from _pure import load
+
+folder_index = load("folder_index")
+
+KEY_DATA = {
+    "AO": ["AO", "ao", "Ambient_Occlusion", "occlusion"],
+    "Diffuse": ["Base_Color", "BaseColor", "Albedo", "COL", "Color", "color"],
+    "Displacement": ["DISP", "Height", "eight", "Displacement"],
+    "Normal": ["Normal", "NRM", "Normaldx"],
+    "Roughness": ["ROUGHNESS", "Roughness", "Rough"],
+}
+EXT_LIST = [".jpg", ".png", ".exr", ".tif", ".tiff", ".tga"]
+
+
+def legacy_texture_data(fp: str, fn: str, all_keys: list[str]) -> tuple[dict, list, list, str]:
+    # the loops of TextureHelper.get_texture_data before the folder index
+    channels, textures, name = [], [], ""
+    for k in all_keys:
+        if k and k in fn:
+            words = fn.split(k)
+            for k in all_keys:
+                if k:
+                    for key in KEY_DATA:
+                        if k in KEY_DATA[key]:
+                            for e in EXT_LIST:
+                                tex = os.path.join(fp, f"{words[0]}{k}{words[1]}{e}")
+                                if os.path.exists(tex):
+                                    channels.append(key)
+                                    textures.append(tex)
+                                    name = words[0]
+    return dict(zip(channels, textures)), channels, textures, name
+
+
+def legacy_from_path(folder_path: str, name: str) -> tuple[list, list]:
+    all_textures = os.listdir(folder_path)
+    channels, textures = [], []
+    for channel in KEY_DATA.keys():
+        for c in itertools.product([name], KEY_DATA[str(channel)], EXT_LIST):
+            file = f"{c[0]}_{c[1]}{c[2]}"
+            if file in all_textures:
+                channels.append(str(channel))
+                textures.append(os.path.join(folder_path, file))
+    return channels, textures
+
+
+def make_folder(root: str) -> list[str]:
+    names = ["ground_Albedo_2k.jpg", "ground_Roughness_2k.jpg", "ground_Normal_2k.png", "ground_Height_2k.exr",
+             "ground_Displacement_2k.exr", "ground_AO_2k.tif", "ground_ao_2k.tga", "wood_BaseColor.png",
+             "wood_Rough.png", "wood_NRM.png", "wood_Normaldx.png", "wood_COL.jpg", "wood_Color.jpg", "other.txt"]
+    for name in names:
+        open(os.path.join(root, name), "wb").close()
+    return names
+
+
+def test_identical():
+    all_keys = sorted(set(sum(KEY_DATA.values(), [])))
+    with tempfile.TemporaryDirectory() as root:
+        make_folder(root)
+        cache = folder_index.FolderIndexCache()
+        rng = random.Random(0)
+        for _ in range(5):
+            rng.shuffle(all_keys)
+            for stem in ("ground_Albedo_2k", "wood_BaseColor", "wood_Rough", "nothing"):
+                expected = legacy_texture_data(root, stem, all_keys)
+                channels, textures, name = folder_index.find_keyword_textures(
+                    cache.get(root), root, stem, all_keys, KEY_DATA, EXT_LIST)
+                assert (dict(zip(channels, textures)), channels, textures, name) == expected
+            for name in ("ground", "wood", "none"):
+                assert folder_index.find_channel_textures(cache.get(root), root, name, KEY_DATA, EXT_LIST) == \
+                    legacy_from_path(root, name)
+        # the folder was listed once
+        assert cache.misses == 1 and cache.hits > 0
+
+
+def test_cache():
+    with tempfile.TemporaryDirectory() as root:
+        make_folder(root)
+        cache = folder_index.FolderIndexCache(max_size=1)
+        index = cache.get(root)
+        assert index.has("ground_Albedo_2k.jpg") and index.has_exact("ground_Albedo_2k.jpg")
+        assert not index.has_exact("GROUND_albedo_2k.jpg")
+        assert cache.get(root) is index
+
+        # a new file changes the folder mtime
+        open(os.path.join(root, "new_Albedo.jpg"), "wb").close()
+        stat = os.stat(root)
+        os.utime(root, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+        assert cache.get(root).has_exact("new_Albedo.jpg")
+
+        # the oldest folder is dropped
+        with tempfile.TemporaryDirectory() as other:
+            cache.get(other)
+            assert len(cache._items) == 1
+
+
+if __name__ == '__main__':
+    test_identical()
+    test_cache()
+    print("Folder index tests passed")
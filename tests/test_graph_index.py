@@ -0,0 +1,112 @@
+"""GraphIndex against a pure python fake graph, this can run without Cinema 4D."""
+from _pure import load
+
+GraphIndex = load("graph_index").GraphIndex
+
+
+class FakeList:
+    def __init__(self, children: list):
+        self.children = children
+
+    def GetChildren(self) -> list:
+        return self.children
+
+
+class FakePort:
+    def __init__(self, node: "FakeNode", name: str):
+        self.node = node
+        self.name = name
+        self.connections: list = []
+
+    def __repr__(self):
+        return f"{self.node.name}.{self.name}"
+
+
+class FakeNode:
+    def __init__(self, name: str, asset: str, inputs: list, outputs: list):
+        self.name = name
+        self.asset = asset
+        self.inputs = FakeList([FakePort(self, port) for port in inputs])
+        self.outputs = FakeList([FakePort(self, port) for port in outputs])
+
+    def GetInputs(self) -> FakeList:
+        return self.inputs
+
+    def GetOutputs(self) -> FakeList:
+        return self.outputs
+
+    def Port(self, name: str) -> FakePort:
+        for port in self.inputs.GetChildren() + self.outputs.GetChildren():
+            if port.name == name:
+                return port
+
+
+def connect(outPort: FakePort, inPort: FakePort):
+    inPort.connections.append(outPort)
+
+
+def build_graph():
+    tex_a = FakeNode("tex_a", "texturesampler", ["path"], ["outcolor"])
+    tex_b = FakeNode("tex_b", "texturesampler", ["path"], ["outcolor"])
+    mat = FakeNode("mat", "standardmaterial", ["base_color", "refl_roughness"], ["outcolor"])
+    out = FakeNode("out", "output", ["surface"], [])
+    connect(tex_a.Port("outcolor"), mat.Port("base_color"))
+    connect(tex_b.Port("outcolor"), mat.Port("refl_roughness"))
+    connect(mat.Port("outcolor"), out.Port("surface"))
+    root = FakeList([tex_a, tex_b, mat, out])
+    return root, tex_a, tex_b, mat, out
+
+
+def build_index(root) -> GraphIndex:
+    return GraphIndex().Build(root,
+                              get_asset_id=lambda node: node.asset,
+                              get_connections=lambda port: port.connections,
+                              get_owner=lambda port: port.node)
+
+
+def test_build():
+    root, tex_a, tex_b, mat, out = build_graph()
+    index = build_index(root)
+    assert len(index) == 4
+    assert index.GetNodes("texturesampler") == [tex_a, tex_b]
+    assert index.GetNodes("none") == []
+    assert index.GetConnectionCount() == 3
+    assert index.GetConnectedPorts(mat.Port("base_color")) == [tex_a.Port("outcolor")]
+    assert index.GetConnectedPorts(tex_a.Port("outcolor")) == [mat.Port("base_color")]
+    assert index.GetOwner(mat.Port("outcolor")) is mat
+    assert index.IsNodeConnected(out)
+    assert [c[0] for c in index.GetConnections()] == [tex_a, tex_b, mat]
+
+
+def test_update():
+    root, tex_a, tex_b, mat, out = build_graph()
+    index = build_index(root)
+
+    # in port only keep one wire
+    index.AddConnection(tex_a.Port("outcolor"), mat.Port("refl_roughness"))
+    assert index.GetConnectedPorts(mat.Port("refl_roughness")) == [tex_a.Port("outcolor")]
+    assert not index.IsPortConnected(tex_b.Port("outcolor"))
+    assert not index.IsNodeConnected(tex_b)
+
+    index.RemoveConnection(tex_a.Port("outcolor"), mat.Port("base_color"))
+    assert index.GetConnectedPorts(tex_a.Port("outcolor")) == [mat.Port("refl_roughness")]
+
+    index.RemoveNode(tex_a)
+    assert tex_a not in index
+    assert index.GetNodes("texturesampler") == [tex_b]
+    assert not index.IsPortConnected(mat.Port("refl_roughness"))
+
+    new = FakeNode("new", "texturesampler", ["path"], ["outcolor"])
+    index.AddNode(new, new.asset)
+    index.AddConnection(new.Port("outcolor"), mat.Port("base_color"))
+    assert index.GetNodes("texturesampler") == [tex_b, new]
+    assert index.GetConnectionCount() == 2
+
+    index.RemovePortConnections(mat.Port("outcolor"))
+    assert not index.IsNodeConnected(out)
+
+
+if __name__ == '__main__':
+    test_build()
+    test_update()
+    print("GraphIndex tests passed")
@@ -0,0 +1,58 @@
+"""Graph traversal engine against a pure python fake graph, this can run without Cinema 4D."""
+from _pure import load
+
+IterTraverse = load("graph_traversal").IterTraverse
+IterNodes = load("graph_traversal").IterNodes
+
+
+def make_edges(graph: dict):
+    # graph: node -> [pre nodes], the edge is (pre, node)
+    return lambda node: [((pre, node), pre) for pre in graph.get(node, [])]
+
+
+def test_diamond():
+    # out <- mat <- (a, b) <- tex
+    graph = {"out": ["mat"], "mat": ["a", "b"], "a": ["tex"], "b": ["tex"]}
+    assert list(IterNodes("out", make_edges(graph))) == ["mat", "a", "tex", "b"]
+    assert list(IterNodes("out", make_edges(graph), depth_first=False)) == ["mat", "a", "b", "tex"]
+    # the shared edge is yielded once per wire, tex is expanded once
+    edges = [edge for edge, _, _ in IterTraverse("out", make_edges(graph))]
+    assert edges == [("mat", "out"), ("a", "mat"), ("tex", "a"), ("b", "mat"), ("tex", "b")]
+
+
+def test_depth_and_filter():
+    graph = {"out": ["mat"], "mat": ["a", "b"], "a": ["tex"], "b": ["tex"]}
+    assert list(IterNodes("out", make_edges(graph), max_depth=1)) == ["mat"]
+    assert list(IterNodes("out", make_edges(graph), max_depth=2)) == ["mat", "a", "b"]
+    assert list(IterNodes("out", make_edges(graph), node_filter=lambda n: n in ("a", "tex"))) == ["a", "tex"]
+    assert list(IterNodes("out", make_edges(graph), max_depth=0)) == []
+
+
+def test_depth_limit_shorter_path():
+    # A -> B -> C and A -> C -> D: the DFS reaches C at the limit first, the shorter path still expands it
+    graph = {"A": ["B", "C"], "B": ["C"], "C": ["D"]}
+    for depth_first in (True, False):
+        nodes = [node for _, node, _ in IterTraverse("A", make_edges(graph), depth_first=depth_first, max_depth=2)]
+        assert sorted(nodes) == ["B", "C", "C", "D"], depth_first
+        assert sorted(IterNodes("A", make_edges(graph), depth_first=depth_first, max_depth=2)) == ["B", "C", "D"]
+    assert list(IterNodes("A", make_edges(graph), max_depth=1)) == ["B", "C"]
+    # the longer path is the first reach, the depth limit cuts it only
+    assert list(IterNodes("A", make_edges({"A": ["B", "E"], "B": ["C"], "C": ["D"], "E": ["D"]}), max_depth=2)) == ["B", "C", "E", "D"]
+
+
+def test_cycle_and_deep_chain():
+    graph = {"a": ["b"], "b": ["c"], "c": ["a"]}
+    assert list(IterNodes("a", make_edges(graph))) == ["b", "c", "a"]
+
+    # deeper than the recursion limit
+    count = 20000
+    chain = {i: [i + 1] for i in range(count)}
+    assert sum(1 for _ in IterNodes(0, make_edges(chain))) == count
+
+
+if __name__ == '__main__':
+    test_diamond()
+    test_depth_and_filter()
+    test_depth_limit_shorter_path()
+    test_cycle_and_deep_chain()
+    print("Graph traversal tests passed")
@@ -0,0 +1,93 @@
+"""SequenceIndex and ImageSequence on generated empty frames, this can run without Cinema 4D."""
+import os
+import tempfile
+from _pure import load
+
+image_helper = load("image_helper")
+SequenceIndex = image_helper.SequenceIndex
+ImageSequence = image_helper.ImageSequence
+
+
+def touch(folder: str, *names: str):
+    for name in names:
+        open(os.path.join(folder, name), "wb").close()
+
+
+def bump_mtime(path: str):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+
+def test_sequences():
+    with tempfile.TemporaryDirectory() as root:
+        # two passes, a gap in the beauty and a non uniform padding in the depth
+        touch(root, *(f"shot_beauty.{frame:04d}.exr" for frame in range(1, 101) if frame not in (10, 11, 50)))
+        touch(root, *(f"shot_depth.{frame:04d}.exr" for frame in range(1, 10)), "shot_depth.10.exr", "notes.txt")
+        SequenceIndex.clear_cache()
+        index = SequenceIndex.get(root)
+        assert len(index) == 2
+
+        beauty = index.find("shot_beauty.0001.exr")
+        assert (beauty.start, beauty.end, len(beauty), beauty.padding) == (1, 100, 97, 4)
+        assert beauty.gaps == [(10, 11), (50, 50)]
+        assert beauty.missing_frames() == [10, 11, 50]
+        assert beauty.missing_frames(0, 102) == [0, 10, 11, 50, 101, 102]
+        assert 12 in beauty and 10 not in beauty and 1000 not in beauty
+        assert beauty.get_frame(12) == os.path.join(root, "shot_beauty.0012.exr")
+        assert beauty.get_frame(10) is None
+
+        depth = index.find("shot_depth.0003.exr")
+        assert depth.get_name(10) == "shot_depth.10.exr" and depth.get_name(9) == "shot_depth.0009.exr"
+        assert index.find("notes.txt") is None
+
+        sequence = ImageSequence(os.path.join(root, "shot_beauty.0020.exr"))
+        assert sequence.length == 97 and sequence.name == "shot_beauty."
+        assert (sequence.start, sequence.end) == (1, 100)
+        assert sequence.result[0] == "shot_beauty.0001.exr"
+        assert list(sequence.sequences) == ["shot_beauty..exr"]
+        assert sequence.missing_frames() == [10, 11, 50]
+        assert sequence.get_frame_path(50) is None
+        assert str(sequence.get_frame(0)) == os.path.join(root, "shot_beauty.0001.exr")
+
+
+def test_sparse():
+    with tempfile.TemporaryDirectory() as root:
+        touch(root, "far.0001.png", "far.5000000.png")
+        sequence = SequenceIndex(root).find("far.0001.png")
+        assert sequence.has_frame(5000000) and not sequence.has_frame(2)
+        assert sequence._mask is None
+
+
+def test_long_numbers():
+    with tempfile.TemporaryDirectory() as root:
+        # a date stamp over 32 bits and a digit run over 64 bits in the same folder as the sequence
+        touch(root, "shot_0001.exr", "DSC20231012153045.jpg", "hash_12345678901234567890123.png")
+        SequenceIndex.clear_cache()
+        assert str(ImageSequence(os.path.join(root, "shot_0001.exr"))) == "ImageSequence Name: shot_[####].exr | Duration: 0001 - 0001"
+        photo = ImageSequence(os.path.join(root, "DSC20231012153045.jpg"))
+        assert photo.start == 20231012153045 and photo.length == 1
+        sequence = SequenceIndex.get(root).find("hash_12345678901234567890123.png")
+        assert sequence.has_frame(12345678901234567890123) and sequence.get_names() == ["hash_12345678901234567890123.png"]
+
+
+def test_cache():
+    with tempfile.TemporaryDirectory() as root:
+        touch(root, "a.0001.png", "a.0002.png")
+        SequenceIndex.clear_cache()
+        index = SequenceIndex.get(root)
+        assert SequenceIndex.get(root) is index
+        assert ImageSequence(os.path.join(root, "a.0001.png")).sequence is index.find("a.0001.png")
+
+        # a new frame changes the folder mtime
+        touch(root, "a.0003.png")
+        bump_mtime(root)
+        assert SequenceIndex.get(root) is not index
+        assert ImageSequence(os.path.join(root, "a.0002.png")).end == 3
+
+
+if __name__ == '__main__':
+    test_sequences()
+    test_sparse()
+    test_long_numbers()
+    test_cache()
+    print("Image sequence tests passed")
@@ -0,0 +1,109 @@
+"""Graph descriptions of scanned PBR packages, the describe stage of BatchMaterialMaker, this can run without Cinema 4D."""
+import os
+import tempfile
+from _pure import load
+
+pbr_helper = load("pbr_helper")
+pbr_description = load("pbr_description")
+
+
+def touch(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+
+
+def make_library(root: str):
+    for name in ("rock01_4k_diffuse.png", "rock01_4k_roughness.png", "rock01_4k_ao.png", "rock01_4k_normal.png"):
+        touch(os.path.join(root, "Rock", name))
+    for name in ("wood02_2k_albedo.jpg", "wood02_2k_metallic.jpg", "wood02_2k_height.jpg"):
+        touch(os.path.join(root, "Wood", name))
+
+
+def test_descriptions():
+    with tempfile.TemporaryDirectory() as root:
+        make_library(root)
+        packages = pbr_helper.PBRLibraryScanner(root).build()
+
+        rock = pbr_description.RedshiftDescription(packages["rock01"])
+        surface = rock["#~.surface"]
+        assert surface["#~.base_color"]["#~.input"]["#~.color_multiplier"]["#~.tex0/path"] == packages["rock01"].ao
+        assert surface["#~.bump_input"]["#~.input"]["#~.tex0/path"] == packages["rock01"].normal
+        assert "#~.displacement" not in rock
+
+        wood = pbr_description.ArnoldDescription(packages["wood02"], white="white")
+        shader = wood["#<shader"]
+        assert shader["#<base_color"]["#<input"]["#<multiply"] == "white"
+        assert shader["#<metalness"]["#<filename"] == packages["wood02"].metalness
+        assert wood["#<displacement"]["#<normal_displacement_input"]["#<filename"] == packages["wood02"].displacement
+
+        # a missing file is skipped
+        os.remove(packages["wood02"].metalness)
+        assert "#~.metalness" not in pbr_description.VRayDescription(packages["wood02"])["#~.brdf"]
+
+
+def test_build_descriptions():
+    with tempfile.TemporaryDirectory() as root:
+        make_library(root)
+        packages = pbr_helper.PBRLibraryScanner(root).build()
+        packages["empty"] = pbr_helper.PBRPackage("empty")
+
+        serial = pbr_description.BuildDescriptions(packages.values(), pbr_description.RS_NODESPACE)
+        threaded = pbr_description.BuildDescriptions(packages.values(), pbr_description.RS_NODESPACE, workers=4)
+        assert [package.asset_name for package, _ in serial] == ["rock01", "wood02"]
+        assert threaded == serial
+
+        try:
+            pbr_description.BuildDescriptions(packages.values(), "unknown")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("an unknown nodespace should raise")
+
+
+def test_cache():
+    with tempfile.TemporaryDirectory() as root:
+        make_library(os.path.join(root, "library"))
+        packages = pbr_helper.PBRLibraryScanner(os.path.join(root, "library")).build()
+        rock = packages["rock01"]
+        expected = pbr_description.RedshiftDescription(rock)
+
+        cache = pbr_description.DescriptionCache(max_size=1, path=os.path.join(root, "cache"))
+        first = cache.Get(rock, pbr_description.RS_NODESPACE)
+        assert first == expected
+        first["#~.surface"].clear()
+        assert cache.Get(rock, pbr_description.RS_NODESPACE) == expected
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # the white value is not stored, each caller gets its own
+        wood = packages["wood02"]
+        data = cache.Get(wood, pbr_description.RS_NODESPACE, white="white")
+        assert data["#~.surface"]["#~.base_color"]["#~.input"]["#~.color_multiplier"] == "white"
+        assert len(cache) == 1
+
+        # a new process reads the disk cache
+        other = pbr_description.DescriptionCache(path=os.path.join(root, "cache"))
+        assert other.Get(rock, pbr_description.RS_NODESPACE) == expected
+        assert other.GetStats() == {"hits": 1, "disk_hits": 1, "misses": 0, "size": 1}
+        assert other.Get(rock, pbr_description.AR_NODESPACE) == pbr_description.ArnoldDescription(rock)
+        assert other.misses == 1
+
+        # a changed texture is a new key
+        key = other.Key(rock, pbr_description.RS_NODESPACE)
+        rock.mtimes[rock.diffuse] += 1
+        assert other.Key(rock, pbr_description.RS_NODESPACE) != key
+        unscanned = pbr_helper.PBRPackage("rock01", selected=dict(rock.selected), resolution=rock.resolution, workflow=rock.workflow)
+        assert other.Key(unscanned, pbr_description.RS_NODESPACE) == key
+
+        threaded = pbr_description.BuildDescriptions(packages.values(), pbr_description.RS_NODESPACE, workers=4, cache=other)
+        assert threaded == pbr_description.BuildDescriptions(packages.values(), pbr_description.RS_NODESPACE)
+
+        other.Clear(disk=True)
+        assert len(other) == 0 and other.hits == 0
+        assert not os.listdir(os.path.join(root, "cache"))
+
+
+if __name__ == '__main__':
+    test_descriptions()
+    test_build_descriptions()
+    test_cache()
+    print("PBR description tests passed")
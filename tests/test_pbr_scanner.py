@@ -0,0 +1,144 @@
+"""PBRLibraryScanner streaming walk and persistent index on a temp library, this can run without Cinema 4D."""
+import os
+import tempfile
+from _pure import load
+
+pbr_helper = load("pbr_helper")
+PBRLibraryScanner = pbr_helper.PBRLibraryScanner
+
+
+def touch(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(b"0")
+
+
+def bump_mtime(path: str):
+    # make sure the change is visible on file systems with a coarse mtime
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+
+def make_library(root: str):
+    for name in ("rock01_4k_diffuse.png", "rock01_4k_roughness.png", "rock01_4k_normal_gl.png", "readme.txt"):
+        touch(os.path.join(root, "Rock", name))
+    for name in ("wood02_2k_albedo.jpg", "wood02_2k_metallic.jpg", "preview.jpg"):
+        touch(os.path.join(root, "Wood", "maps", name))
+
+
+def test_scan():
+    with tempfile.TemporaryDirectory() as root:
+        make_library(root)
+        packages = PBRLibraryScanner(root).build()
+        assert sorted(packages) == ["rock01", "wood02"]
+        assert packages["rock01"].normal == os.path.join(root, "Rock", "rock01_4k_normal_gl.png")
+        assert packages["rock01"].resolution == 4096
+        assert packages["wood02"].workflow == "unknown"
+
+        textures = list(PBRLibraryScanner(root).iter_scan())
+        assert [tex.map_type for tex in textures] == ["diffuse", "normal", "roughness", "diffuse", "metalness"]
+        assert list(PBRLibraryScanner(os.path.join(root, "none")).iter_scan()) == []
+
+
+def test_index():
+    with tempfile.TemporaryDirectory() as root:
+        library = os.path.join(root, "library")
+        index_path = os.path.join(root, "index.jsonl")
+        make_library(library)
+
+        scanner = PBRLibraryScanner(library, index_path=index_path)
+        first = {tex.path: tex for tex in scanner.iter_scan()}
+        assert scanner.stats == {"dirs": 4, "listed": 4, "reused": 0, "files": 5}
+        assert os.path.isfile(index_path)
+
+        # nothing changed, no directory is listed again
+        scanner = PBRLibraryScanner(library, index_path=index_path)
+        assert {tex.path: tex for tex in scanner.iter_scan()} == first
+        assert scanner.stats == {"dirs": 4, "listed": 0, "reused": 4, "files": 5}
+
+        # only the changed directory is listed
+        touch(os.path.join(library, "Rock", "rock01_4k_ao.png"))
+        bump_mtime(os.path.join(library, "Rock"))
+        scanner = PBRLibraryScanner(library, index_path=index_path)
+        packages = scanner.build()
+        assert scanner.stats["listed"] == 1 and scanner.stats["reused"] == 3
+        assert packages["rock01"].use_ao
+
+        # a removed directory is dropped from the index
+        for name in os.listdir(os.path.join(library, "Wood", "maps")):
+            os.remove(os.path.join(library, "Wood", "maps", name))
+        os.rmdir(os.path.join(library, "Wood", "maps"))
+        bump_mtime(os.path.join(library, "Wood"))
+        scanner = PBRLibraryScanner(library, index_path=index_path)
+        assert sorted(scanner.build()) == ["rock01"]
+        assert len(scanner.index) == 3
+
+        # an index of another root is discarded
+        other = PBRLibraryScanner(os.path.join(library, "Rock"), index_path=index_path)
+        other.scan()
+        assert other.stats["reused"] == 0
+
+
+def test_force():
+    with tempfile.TemporaryDirectory() as root:
+        library = os.path.join(root, "library")
+        index_path = os.path.join(root, "index.jsonl")
+        make_library(library)
+        PBRLibraryScanner(library, index_path=index_path).scan()
+
+        # a texture overwritten in place does not change the directory mtime
+        path = os.path.join(library, "Rock", "rock01_4k_diffuse.png")
+        folder = os.stat(os.path.join(library, "Rock")).st_mtime_ns
+        touch(path)
+        bump_mtime(path)
+        assert os.stat(os.path.join(library, "Rock")).st_mtime_ns == folder
+        mtime = os.stat(path).st_mtime_ns
+
+        scanner = PBRLibraryScanner(library, index_path=index_path)
+        stale = {tex.path: tex.mtime for tex in scanner.iter_scan()}
+        assert scanner.stats["listed"] == 0 and stale[path] != mtime
+
+        scanner = PBRLibraryScanner(library, index_path=index_path)
+        assert {tex.path: tex.mtime for tex in scanner.iter_scan(force=True)}[path] == mtime
+        assert scanner.stats == {"dirs": 4, "listed": 4, "reused": 0, "files": 5}
+
+        # the forced scan rewrote the index
+        scanner = PBRLibraryScanner(library, index_path=index_path)
+        assert {tex.path: tex.mtime for tex in scanner.iter_scan()}[path] == mtime
+        assert scanner.stats["reused"] == 4
+
+
+def test_parallel():
+    with tempfile.TemporaryDirectory() as root:
+        make_library(root)
+        # the asset spans two shards and the root
+        touch(os.path.join(root, "Extra", "rock01_8k_diffuse.exr"))
+        touch(os.path.join(root, "rock01_2k_ao.jpg"))
+
+        serial = PBRLibraryScanner(root)
+        expected = {name: pkg.to_dict() for name, pkg in serial.build().items()}
+        assert expected["rock01"]["maps"]["diffuse"] == os.path.join(root, "Extra", "rock01_8k_diffuse.exr")
+        order = [tex.path for tex in PBRLibraryScanner(root).iter_scan()]
+
+        for processes in (False, True):
+            scanner = PBRLibraryScanner(root)
+            packages = scanner.build(workers=4, processes=processes)
+            assert {name: pkg.to_dict() for name, pkg in packages.items()} == expected
+            assert scanner.stats == serial.stats
+            assert [tex.path for tex in PBRLibraryScanner(root).iter_scan(workers=3, processes=processes)] == order
+
+        # the index written by a parallel scan is reused by a serial one
+        index_path = os.path.join(root, "index.jsonl")
+        PBRLibraryScanner(root, index_path=index_path).scan(workers=2)
+        scanner = PBRLibraryScanner(root, index_path=index_path)
+        scanner.scan()
+        assert scanner.stats["listed"] == 1  # the root, the index file changed its mtime
+        assert scanner.stats["reused"] == scanner.stats["dirs"] - 1
+
+
+if __name__ == '__main__':
+    test_scan()
+    test_index()
+    test_force()
+    test_parallel()
+    print("PBR scanner tests passed")
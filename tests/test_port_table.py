@@ -0,0 +1,47 @@
+"""Converter port tables, this can run without Cinema 4D."""
+import os
+import json
+import time
+import tempfile
+from _pure import load, ROOT
+
+port_table = load("port_table")
+
+
+def test_redshift_table():
+    table = port_table.GetPortTable(os.path.join(ROOT, "constants", "Redshift.json"))
+    with open(table.path, 'r', encoding='UTF-8') as file:
+        data = json.load(file)
+
+    # identical to the json for every asset
+    for asset_id, item in data.items():
+        assert table.GetInput(asset_id) == item["input"]
+        assert table.GetOutput(asset_id) == item["output"]
+
+    sampler = "com.redshift3d.redshift4c4d.nodes.core.texturesampler"
+    assert table.GetOutput("texturesampler") == data[sampler]["output"]
+    assert table.GetOutput(sampler, trim=True) == "outcolor"
+    assert table.GetInput("not.a.node") == ""
+    # the table is shared
+    assert port_table.GetPortTable(table.path) is table
+
+
+def test_mtime_reload():
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "Test.json")
+    with open(path, 'w', encoding='UTF-8') as file:
+        json.dump({"a.node": {"input": "a.node.in", "output": ""}}, file)
+    table = port_table.GetPortTable(path)
+    assert table.GetInput("node", trim=True) == "in"
+
+    with open(path, 'w', encoding='UTF-8') as file:
+        json.dump({"a.node": {"input": "a.node.color", "output": ""}}, file)
+    os.utime(path, (time.time() + 10, time.time() + 10))
+    table.checked -= port_table.MTIME_CHECK_INTERVAL
+    assert port_table.GetPortTable(path).GetInput("a.node") == "a.node.color"
+
+
+if __name__ == '__main__':
+    test_redshift_table()
+    test_mtime_reload()
+    print("Port table tests passed")
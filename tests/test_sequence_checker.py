@@ -0,0 +1,102 @@
+"""SequenceChecker on generated EXR, PNG and TIFF frames, this can run without Cinema 4D."""
+import os
+import struct
+import zlib
+import tempfile
+from _pure import load
+
+sequence_checker = load("sequence_checker")
+SequenceChecker = sequence_checker.SequenceChecker
+check_frame = sequence_checker.check_frame
+
+
+def attribute(name: str, kind: str, value: bytes) -> bytes:
+    return name.encode() + b"\0" + kind.encode() + b"\0" + struct.pack("<i", len(value)) + value
+
+def exr(width: int = 4, height: int = 8, compression: int = 0) -> bytes:
+    header = (b"\x76\x2f\x31\x01" + struct.pack("<I", 2)
+              + attribute("channels", "chlist", b"R\0" + struct.pack("<iBBBBii", 2, 0, 0, 0, 0, 1, 1) + b"\0")
+              + attribute("compression", "compression", bytes([compression]))
+              + attribute("dataWindow", "box2i", struct.pack("<iiii", 0, 0, width - 1, height - 1))
+              + b"\0")
+    lines = {0: 1, 3: 16}[compression]
+    chunks = []
+    for y in range(0, height, lines):
+        data = b"\0" * (width * 2 * min(lines, height - y))
+        chunks.append(struct.pack("<ii", y, len(data)) + data)
+    offset = len(header) + len(chunks) * 8
+    table = b""
+    for chunk in chunks:
+        table += struct.pack("<Q", offset)
+        offset += len(chunk)
+    return header + table + b"".join(chunks)
+
+def png(width: int = 4, height: int = 4) -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(b"\0" * (width * 3 + 1) * height)) + chunk(b"IEND", b""))
+
+def tiff(strip: int = 64) -> bytes:
+    entries = [(256, 3, 1, 4), (257, 3, 1, 4), (273, 4, 1, 62), (279, 4, 1, strip)]
+    ifd = struct.pack("<H", len(entries)) + b"".join(
+        struct.pack("<HHII", tag, kind, count, value) if kind == 4 else
+        struct.pack("<HHIHH", tag, kind, count, value, 0) for tag, kind, count, value in entries) + b"\0" * 4
+    return b"II*\0" + struct.pack("<I", 8) + ifd + b"\0" * strip
+
+
+def write(path: str, data: bytes):
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def test_frames():
+    with tempfile.TemporaryDirectory() as root:
+        cases = {
+            "ok.exr": (exr(), "ok"), "zip.exr": (exr(16, 40, 3), "ok"),
+            "cut.exr": (exr()[:-10], "truncated"), "header.exr": (exr()[:40], "truncated"),
+            "zeros.exr": (exr()[:-(8 * 8 + 8 * 10)] + b"\0" * (8 * 8 + 8 * 10), "truncated"),
+            "ok.png": (png(), "ok"), "cut.png": (png()[:-5], "truncated"), "text.png": (b"hello", "invalid"),
+            "ok.tif": (tiff(), "ok"), "cut.tif": (tiff()[:-1], "truncated"),
+            "ok.jpg": (b"\xff\xd8\xff\xe0" + b"\0" * 16 + b"\xff\xd9", "ok"), "cut.jpg": (b"\xff\xd8\xff\xe0" + b"\0" * 16, "truncated"),
+            "empty.exr": (b"", "empty"), "other.tga": (b"\0" * 20, "ok"),
+        }
+        for name, (data, _) in cases.items():
+            write(os.path.join(root, name), data)
+        for name, (_, status) in cases.items():
+            assert check_frame(os.path.join(root, name)) == status, name
+        assert check_frame(os.path.join(root, "none.exr")) == "missing"
+
+
+def test_checker():
+    with tempfile.TemporaryDirectory() as root:
+        for frame in range(1, 21):
+            write(os.path.join(root, f"shot_mask.{frame:04d}.png"), png())
+            if frame in (5, 6):
+                continue
+            data = exr()
+            if frame == 9:
+                data = b""
+            elif frame == 10:
+                data = data[:-3]
+            write(os.path.join(root, f"shot_beauty.{frame:04d}.exr"), data)
+
+        reports = SequenceChecker(root, workers=4).check()
+        assert [report.sequence.key for report in reports] == ["shot_beauty..exr", "shot_mask..png"]
+        beauty, mask = reports
+        assert beauty.missing == [5, 6] and beauty.empty == [9] and beauty.truncated == [10]
+        assert beauty.bad_ranges() == [(5, 6), (9, 10)]
+        assert mask.complete and mask.bad_ranges() == []
+
+        # the render settings range finds the frames missing at the ends
+        beauty = SequenceChecker(root, start=0, end=22).check("shot_beauty.0001.exr")[0]
+        assert beauty.bad_ranges() == [(0, 0), (5, 6), (9, 10), (21, 22)]
+        beauty = SequenceChecker(root, start=1, end=20, step=2).check("shot_beauty.0001.exr")[0]
+        assert beauty.bad_frames == [5, 9] and beauty.bad_ranges() == [(5, 5), (9, 9)]
+        assert "complete" in str(mask) and "1 missing, 1 empty" in str(beauty)
+
+
+if __name__ == '__main__':
+    test_frames()
+    test_checker()
+    print("Sequence checker tests passed")
@@ -0,0 +1,85 @@
+"""ShaderGraph against pure python fake shaders, this can run without Cinema 4D."""
+from _pure import load
+
+ShaderGraph = load("shader_graph").ShaderGraph
+
+
+class FakeShader:
+    def __init__(self, name: str):
+        self.name = name
+        self.bc: dict = {}
+
+    def __repr__(self):
+        return self.name
+
+
+def get_links(owner: FakeShader) -> list:
+    return list(owner.bc.items())
+
+
+def build_material():
+    # material.diffuse <- multiply(cc <- image, ao) ; material.bump <- image
+    material = FakeShader("material")
+    image, cc, ao, multiply, lonely = (FakeShader(name) for name in ("image", "cc", "ao", "multiply", "lonely"))
+    cc.bc[10] = image
+    multiply.bc[1] = cc
+    multiply.bc[2] = ao
+    material.bc[100] = multiply
+    material.bc[200] = image
+    return material, [image, cc, ao, multiply, lonely]
+
+
+def test_build():
+    material, shaders = build_material()
+    image, cc, ao, multiply, lonely = shaders
+    graph = ShaderGraph().Build(material, shaders, get_links)
+    assert len(graph) == 5
+    assert graph.GetLinkCount() == 5
+    assert graph.GetLinks(multiply) == [(1, cc), (2, ao)]
+    assert graph.GetRootLinks() == [(100, multiply), (200, image)]
+    assert graph.GetParents(image) == [(200, material), (10, cc)]
+    assert graph.GetParents(image, include_root=False) == [(10, cc)]
+    assert graph.IsRoot(image) and not graph.IsRoot(cc)
+    assert graph.GetSlot(image, material) == 200
+    assert graph.GetSlot(ao) == 2
+    assert graph.GetSlot(lonely) is None
+    assert graph.IsConnected(ao) and not graph.IsConnected(lonely)
+
+
+def test_update_and_bulk():
+    material, shaders = build_material()
+    image, cc, ao, multiply, lonely = shaders
+    graph = ShaderGraph().Build(material, shaders, get_links)
+
+    assert graph.GetReachable(100) == [multiply, cc, image, ao]
+    assert graph.GetReachable(200) == [image]
+    assert graph.GetOrphans() == [lonely]
+    assert list(graph.IterAncestors(image)) == [cc, multiply]
+    assert list(graph.IterAncestors(image, include_root=True)) == [material, cc, multiply]
+
+    # replace the link on a slot
+    graph.SetLink(multiply, 2, lonely)
+    assert graph.GetLinks(multiply) == [(1, cc), (2, lonely)]
+    assert not graph.IsConnected(ao)
+    assert graph.GetOrphans() == [ao]
+
+    new = FakeShader("new")
+    graph.AddShader(new, [(5, ao)])
+    graph.SetLink(material, 300, new)
+    assert graph.GetReachable(300) == [new, ao]
+    assert graph.GetOrphans() == []
+
+    graph.RemoveShader(multiply)
+    assert multiply not in graph
+    assert graph.GetParents(cc) == []
+    assert graph.GetRootLinks() == [(200, image), (300, new)]
+    assert graph.GetOrphans() == [cc, lonely]
+
+    graph.RemoveLink(material, 200)
+    assert graph.GetOrphans() == [image, cc, lonely]
+
+
+if __name__ == '__main__':
+    test_build()
+    test_update_and_bulk()
+    print("ShaderGraph tests passed")
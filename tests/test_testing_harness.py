@@ -0,0 +1,224 @@
+"""The helpers on the in-memory stand-ins of Renderer.testing, this can run without Cinema 4D."""
+from _sim import setup
+
+Renderer, testing = setup()
+import c4d
+from Renderer.utils import get_all_nodes, get_tags, iterate
+from Renderer.utils.node_helper import NodeGraghHelper
+from Renderer.utils.aov_preset import AOVPreset, AOVSpec
+
+scenes, GetSymbol = testing.scenes, testing.c4d_standin.GetSymbol
+TEXTURES = {"Diffuse": "/tex/a.png", "AO": "/tex/ao.png", "Roughness": "/tex/r.png", "Metalness": "/tex/m.png",
+            "Normal": "/tex/n.png", "Displacement": "/tex/d.png", "Alpha": "/tex/o.png"}
+
+
+def test_bootstrap_script():
+    # a script run by the bootstrap imports the package as in Cinema 4D
+    import os
+    import subprocess
+    import sys
+    import tempfile
+    import _sim
+    with tempfile.TemporaryDirectory() as root:
+        script = os.path.join(root, "script.py")
+        with open(script, "w") as file:
+            file.write("import sys, Renderer\n"
+                       "from Renderer import testing\n"
+                       "material = testing.scenes.NodeMaterial(testing.RS_NODESPACE, nodes=5)\n"
+                       "print(len(Renderer.NodeGraghHelper(material).GetAllShaders()), sys.argv[1])\n")
+        bootstrap = os.path.join(_sim.ROOT, "testing", "bootstrap.py")
+        output = subprocess.run([sys.executable, bootstrap, script, "arg"], capture_output=True, text=True, cwd=root)
+        assert output.returncode == 0, output.stderr
+        assert output.stdout.split() == ["7", "arg"]
+
+
+def test_package_parent():
+    import os
+    import tempfile
+    import _sim
+    parent = _sim.package_parent()
+    link = os.path.join(parent, "Renderer")
+    assert os.path.realpath(link) == os.path.realpath(_sim.ROOT)
+    if os.path.basename(_sim.ROOT) == "Renderer":
+        return
+    # a link left to another checkout is pointed back to this one
+    with tempfile.TemporaryDirectory() as other:
+        os.remove(link)
+        os.symlink(other, link, target_is_directory=True)
+        assert _sim.package_parent() == parent
+    assert os.path.realpath(link) == os.path.realpath(_sim.ROOT)
+    # a dangling link too
+    with tempfile.TemporaryDirectory() as other:
+        os.remove(link)
+        os.symlink(other, link, target_is_directory=True)
+    assert _sim.package_parent() == parent
+    assert os.path.realpath(link) == os.path.realpath(_sim.ROOT)
+
+
+def test_native_calls():
+    testing.native_calls.reset()
+    material = scenes.NodeMaterial(testing.RS_NODESPACE, nodes=10)
+    # building a scene is not counted
+    assert testing.native_calls.total == 0
+    with testing.native_calls.measure() as calls:
+        c4d.documents.GetActiveDocument()
+        material.GetName()
+    assert calls.total == 2 and calls.counts["c4d.GetActiveDocument"] == 1
+    assert calls.counts["BaseList2D.GetName"] == 1
+
+    # what is not simulated raises
+    try:
+        c4d.Matrix()
+    except NotImplementedError:
+        pass
+    else:
+        raise AssertionError("a placeholder should raise")
+
+
+def test_node_graph():
+    testing.set_nodespace(testing.RS_NODESPACE)
+    material = scenes.NodeMaterial(testing.RS_NODESPACE, nodes=100, chains=4)
+    helper = NodeGraghHelper(material)
+    shaders = helper.GetAllShaders()
+    # the output and the brdf of the default graph
+    assert len(shaders) == 102
+    brdf = helper.GetNodes("com.redshift3d.redshift4c4d.nodes.core.standardmaterial")[0]
+    assert len(helper.GetPreNodes(brdf)) == 100
+
+    # the graph only changes in a transaction
+    try:
+        helper.AddShader("com.redshift3d.redshift4c4d.nodes.core.texturesampler")
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("a change outside of a transaction should raise")
+
+    graph = helper.graph
+    with Renderer.EasyTransaction(material) as tr:
+        node = tr.AddShader("com.redshift3d.redshift4c4d.nodes.core.texturesampler")
+        tr.AddConnection(node, "com.redshift3d.redshift4c4d.nodes.core.texturesampler.outcolor",
+                         brdf, "com.redshift3d.redshift4c4d.nodes.core.standardmaterial.emission_color")
+    assert graph.commits == 1
+    assert node in helper.GetPreNodes(brdf)
+    assert len(helper.GetAllShaders()) == 103
+
+
+def test_graph_index():
+    testing.set_nodespace(testing.RS_NODESPACE)
+    material = Renderer.Redshift.Material()
+    with Renderer.EasyTransaction(material) as tr:
+        tr.BuildIndex()
+        brdf = tr.GetRootBRDF()
+        port = tr.GetPort(brdf, "com.redshift3d.redshift4c4d.nodes.core.standardmaterial.base_color")
+        assert tr.GetPreNodes(brdf) == []
+        # the renderer helpers connect the ports themselves
+        texture = tr.AddTexture("Diffuse", "/tex/a.png", target_port=port)
+        assert tr.GetPreNodes(brdf) == [texture]
+        assert tr.GetNodes("com.redshift3d.redshift4c4d.nodes.core.texturesampler") == [texture]
+        bump = tr.AddBump(target_port=tr.GetPort(brdf, "com.redshift3d.redshift4c4d.nodes.core.standardmaterial.bump_input"))
+        assert bump in tr.GetPreNodes(brdf) and tr.GetIndex() is not None
+
+
+def test_nested_port_capture():
+    from Renderer.utils._description_helper import DescriptionHelper
+    testing.set_nodespace(testing.RS_NODESPACE)
+    material = Renderer.Redshift.Material().material
+    with Renderer.EasyTransaction(material) as tr:
+        brdf = tr.GetRootBRDF()
+        texture = tr.AddTexture("Diffuse", "/tex/a.png",
+                                target_port=tr.GetPort(brdf, "com.redshift3d.redshift4c4d.nodes.core.standardmaterial.base_color"))
+        # a wire into a port of the tex0 bundle
+        path = tr.GetPort(texture, "com.redshift3d.redshift4c4d.nodes.core.texturesampler.tex0").FindChild("path")
+        source = tr.AddShader("com.redshift3d.redshift4c4d.nodes.core.texturesampler")
+        tr.GetPort(source, "com.redshift3d.redshift4c4d.nodes.core.texturesampler.outcolor").Connect(path)
+    data = DescriptionHelper(material)._traverse_graph()
+    assert len(data) == 4
+    assert data[2]["$id"] == str(texture.GetId()) and data[2]["#<path"] == data[3]["$id"] == str(source.GetId())
+
+
+def test_setup_textures():
+    for module, space, count in [("Redshift", testing.RS_NODESPACE, 14), ("Arnold", testing.AR_NODESPACE, 15)]:
+        testing.set_nodespace(space)
+        material = getattr(Renderer, module).Material()
+        with Renderer.EasyTransaction(material) as tr:
+            tr.SetupTextures(dict(TEXTURES), "PBR")
+        assert len(material.GetAllShaders()) == count, module
+
+    helper = Renderer.Octane.Material()
+    helper.SetupTextures({"Diffuse": "/tex/a.png", "Roughness": "/tex/r.png", "Normal": "/tex/n.png"}, "PBR")
+    assert len(helper.GetAllShaders()) > 0
+
+
+def test_shader_materials():
+    for module, material_type, slot in [("Octane", "ID_OCTANE_STANDARD_SURFACE", "OCT_MATERIAL_DIFFUSE_LINK"),
+                                        ("Corona", "CORONA_STR_MATERIAL_PHYSICAL", "CORONA_MATERIAL_DIFFUSE_TEXTURE")]:
+        slot = GetSymbol(slot)
+        material = scenes.ShaderMaterial(GetSymbol(material_type), shaders=20, slots=[slot, slot + 1])
+        helper = getattr(Renderer, module).Material(material)
+        assert len(helper.GetAllShaders()) == 20, module
+        # two chains of ten, the head of a chain has the nine after it
+        assert len(helper.GetPreNodes(material[slot])) == 9, module
+
+    # unlinking a slot or overwriting a link with a value drops the cached connections
+    link, slot = GetSymbol("IMAGETEXTURE_FILE"), GetSymbol("OCT_MATERIAL_DIFFUSE_LINK")
+    helper = Renderer.Octane.Material(scenes.ShaderMaterial(GetSymbol("ID_OCTANE_STANDARD_SURFACE"), shaders=6, slots=[slot]))
+    head = helper.material[slot]
+    assert len(helper.GetPreNodes(head)) == 5
+    second = head[link]
+    assert helper.SetShaderValue(second, link, None)
+    assert helper.GetPreNodes(head) == [second]
+    assert helper.SetShaderValue(head, link, "/tex/a.png")
+    assert helper.GetPreNodes(head) == []
+
+
+def test_scene():
+    document = scenes.ObjectTree(objects=100, children=3, tags=[c4d.Tpolygonselection, c4d.Ttexture])
+    assert len(get_all_nodes(document)) == 100
+    tags = get_tags(document, c4d.Ttexture)
+    assert len(tags) == 100
+    assert tags[0][c4d.TEXTURETAG_RESTRICTION] == "Selection 0"
+    assert len(get_tags(document, [c4d.Ttexture, c4d.Tpolygonselection])) == 200
+
+
+def test_aov_presets():
+    for module, videopost, types in [("Redshift", scenes.RedshiftVideoPost, (1, 5)),
+                                     ("Octane", scenes.OctaneVideoPost, (188, 222))]:
+        helper = getattr(Renderer, module).AOV(videopost(aovs=3, aov_types=types[:1]))
+        assert len(helper.get_all_aovs()) == 3, module
+        plan = helper.apply_preset(AOVPreset(module, [AOVSpec(types[0], enabled=True), AOVSpec(types[1])]))
+        assert len(plan.add) == 1, module
+        assert len(helper.get_all_aovs()) == 4, module
+
+
+def test_aov_prune():
+    # Cinema 4D returns a new wrapper on each link read, the pruned aovs must not come back
+    state = testing.c4d_standin.state
+    state.fresh_wrappers = True
+    try:
+        videopost = scenes.OctaneVideoPost(aovs=4, aov_types=(188, 222))
+        first = GetSymbol("SET_RENDERAOV_INPUT_0")
+        assert videopost[first] is not videopost[first] and videopost[first] == videopost[first]
+        helper = Renderer.Octane.AOV(videopost)
+        plan = helper.apply_preset(AOVPreset("Octane", [AOVSpec(188)]), prune=True)
+        assert len(plan.remove) == 3
+        aovs = helper.get_all_aovs()
+        assert len(aovs) == 1 and aovs[0][GetSymbol("RNDAOV_TYPE")] == 188
+        assert videopost[GetSymbol("SET_RENDERAOV_IN_CNT")] == 1
+        assert len(list(iterate(videopost.GetFirstShader()))) == 1
+    finally:
+        state.fresh_wrappers = False
+
+
+if __name__ == '__main__':
+    test_bootstrap_script()
+    test_package_parent()
+    test_native_calls()
+    test_node_graph()
+    test_graph_index()
+    test_nested_port_capture()
+    test_setup_textures()
+    test_shader_materials()
+    test_scene()
+    test_aov_presets()
+    test_aov_prune()
+    print("Testing harness tests passed")
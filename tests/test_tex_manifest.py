@@ -0,0 +1,122 @@
+"""TextureManifest incremental updates and image headers on a temp tex folder, this can run without Cinema 4D."""
+import os
+import struct
+import tempfile
+from _pure import load
+
+tex_manifest = load("tex_manifest")
+TextureManifest = tex_manifest.TextureManifest
+read_image_size = tex_manifest.read_image_size
+
+
+def png(width: int, height: int) -> bytes:
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0) + b"\0" * 64
+
+def jpeg(width: int, height: int) -> bytes:
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\0" + b"\0" * 9
+    sof = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + app0 + sof + b"\xff\xd9"
+
+def tiff(width: int, height: int) -> bytes:
+    entries = struct.pack("<HHI", 256, 3, 1) + struct.pack("<HH", width, 0) + struct.pack("<HHII", 257, 4, 1, height)
+    return b"II*\0" + struct.pack("<I", 8) + struct.pack("<H", 2) + entries + b"\0" * 4
+
+def exr(width: int, height: int) -> bytes:
+    channels = b"channels\0chlist\0" + struct.pack("<i", 1) + b"\0"
+    window = b"dataWindow\0box2i\0" + struct.pack("<i", 16) + struct.pack("<iiii", 0, 0, width - 1, height - 1)
+    return b"\x76\x2f\x31\x01" + struct.pack("<I", 2) + channels + window + b"\0"
+
+def tga(width: int, height: int) -> bytes:
+    return b"\0\0\x02" + b"\0" * 9 + struct.pack("<HH", width, height) + b"\x18\0" + b"\0" * 16
+
+def bmp(width: int, height: int) -> bytes:
+    return b"BM" + b"\0" * 16 + struct.pack("<ii", width, -height) + b"\0" * 28
+
+def hdr(width: int, height: int) -> bytes:
+    return b"#?RADIANCE\nFORMAT=32-bit_rle_rgbe\n\n" + f"-Y {height} +X {width}\n".encode() + b"\0" * 16
+
+
+def write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def bump_mtime(path: str):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+
+def test_image_size():
+    with tempfile.TemporaryDirectory() as root:
+        for name, data in (("a.png", png(4096, 2048)), ("b.jpg", jpeg(640, 480)), ("c.tif", tiff(300, 200)),
+                           ("d.exr", exr(8192, 4096)), ("e.tga", tga(512, 256)), ("f.bmp", bmp(64, 32)),
+                           ("g.hdr", hdr(2048, 1024))):
+            write(os.path.join(root, name), data)
+        assert read_image_size(os.path.join(root, "a.png")) == (4096, 2048)
+        assert read_image_size(os.path.join(root, "b.jpg")) == (640, 480)
+        assert read_image_size(os.path.join(root, "c.tif")) == (300, 200)
+        assert read_image_size(os.path.join(root, "d.exr")) == (8192, 4096)
+        assert read_image_size(os.path.join(root, "e.tga")) == (512, 256)
+        assert read_image_size(os.path.join(root, "f.bmp")) == (64, 32)
+        assert read_image_size(os.path.join(root, "g.hdr")) == (2048, 1024)
+        write(os.path.join(root, "broken.png"), b"\x89PNG\r\n\x1a\n")
+        assert read_image_size(os.path.join(root, "broken.png")) is None
+        assert read_image_size(os.path.join(root, "missing.png")) is None
+
+
+def test_manifest():
+    with tempfile.TemporaryDirectory() as root:
+        tex = os.path.join(root, "tex")
+        write(os.path.join(tex, "wood_diffuse.png"), png(8192, 8192))
+        write(os.path.join(tex, "wood_rough.jpg"), jpeg(2048, 2048))
+        write(os.path.join(tex, "hdri", "sky.exr"), exr(4096, 2048))
+        write(os.path.join(tex, "notes.txt"), b"hello")
+
+        manifest = TextureManifest(tex).update()
+        assert len(manifest) == 4 and manifest.stats == {"listed": 2, "reused": 0, "headers": 4}
+        sizes = {name: os.path.getsize(os.path.join(tex, name))
+                 for name in ("wood_diffuse.png", "wood_rough.jpg", os.path.join("hdri", "sky.exr"), "notes.txt")}
+        assert manifest.total_size() == sum(sizes.values())
+        assert manifest.size_by_extension()[".exr"] == sizes[os.path.join("hdri", "sky.exr")]
+        assert manifest.largest(1)[0].path == os.path.join(tex, "wood_diffuse.png")
+        assert [os.path.basename(r.path) for r in manifest.over_budget(4000)] == ["wood_diffuse.png", "sky.exr"]
+        assert manifest.get("notes.txt").width is None
+
+        # nothing changed, nothing listed
+        manifest.update()
+        assert manifest.stats == {"listed": 0, "reused": 2, "headers": 0}
+
+        # only the changed folder is listed and only the new file is read
+        write(os.path.join(tex, "hdri", "studio.hdr"), hdr(1024, 512))
+        bump_mtime(os.path.join(tex, "hdri"))
+        manifest.update()
+        assert manifest.stats == {"listed": 1, "reused": 1, "headers": 1}
+        assert manifest.get(os.path.join("hdri", "studio.hdr")).resolution == 1024
+
+        # a removed folder and file leave the manifest
+        for name in os.listdir(os.path.join(tex, "hdri")):
+            os.remove(os.path.join(tex, "hdri", name))
+        os.rmdir(os.path.join(tex, "hdri"))
+        os.remove(os.path.join(tex, "notes.txt"))
+        bump_mtime(tex)
+        manifest.update()
+        assert sorted(os.path.basename(path) for path in manifest.records) == ["wood_diffuse.png", "wood_rough.jpg"]
+        assert ".exr" not in manifest.size_by_extension()
+
+        # a file overwritten in place needs force
+        write(os.path.join(tex, "wood_rough.jpg"), jpeg(8192, 8192))
+        manifest.update(force=True)
+        assert manifest.get("wood_rough.jpg").resolution == 8192
+
+        # the json file is reused by a new manifest
+        path = os.path.join(root, "manifest.json")
+        TextureManifest(tex, path).update()
+        manifest = TextureManifest(tex, path).update()
+        assert manifest.stats["listed"] == 0 and len(manifest) == 2
+
+
+if __name__ == '__main__':
+    test_image_size()
+    test_manifest()
+    print("Tex manifest tests passed")
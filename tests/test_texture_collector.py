@@ -0,0 +1,67 @@
+"""TextureCollector dedupe, parallel copy and skip on a temp folder, this can run without Cinema 4D."""
+import os
+import tempfile
+from _pure import load
+
+texture_collector = load("texture_collector")
+TextureCollector = texture_collector.TextureCollector
+
+
+def write(path: str, data: bytes = b"0"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def test_collect():
+    with tempfile.TemporaryDirectory() as root:
+        a = os.path.join(root, "lib", "a", "wood_diffuse.png")
+        b = os.path.join(root, "lib", "b", "wood_diffuse.png")
+        c = os.path.join(root, "lib", "a", "wood_rough.png")
+        for path in (a, b, c):
+            write(path, path.encode())
+        tex = os.path.join(root, "tex")
+
+        collector = TextureCollector(tex, workers=4)
+        # the records of 2 materials share the textures
+        targets = collector.plan([a, c, b, a, os.path.join(root, "lib", "a", ".", "wood_rough.png")])
+        assert targets == {a: "wood_diffuse.png", c: "wood_rough.png", b: "wood_diffuse_1.png",
+                           os.path.join(root, "lib", "a", ".", "wood_rough.png"): "wood_rough.png"}
+        calls = []
+        report = collector.copy(lambda done, total, job: calls.append((done, total)))
+        assert (report.records, report.unique, report.copied, report.skipped, report.failed) == (5, 3, 3, 0, 0)
+        assert calls[-1] == (3, 3) and report.bytes_copied == sum(os.path.getsize(p) for p in (a, b, c))
+        with open(os.path.join(tex, "wood_diffuse_1.png"), "rb") as file:
+            assert file.read() == b.encode()
+        assert "3 copied" in str(report)
+
+        # a second collect copies nothing
+        collector = TextureCollector(tex)
+        collector.plan([a, b, c])
+        assert collector.copy().skipped == 3
+
+        # a changed source is copied again
+        write(c, b"changed texture")
+        collector = TextureCollector(tex, verify="hash")
+        collector.plan([a, b, c])
+        report = collector.copy()
+        assert (report.copied, report.skipped) == (1, 2)
+
+        # a missing source fails without stopping the others
+        collector = TextureCollector(tex, verify="none")
+        collector.plan([a, os.path.join(root, "missing.png")])
+        report = collector.copy()
+        assert (report.skipped, report.failed) == (1, 1)
+        assert collector.failed() == {os.path.join(root, "missing.png")}
+
+        try:
+            TextureCollector(tex, verify="mtime")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("an unknown verify mode is accepted")
+
+
+if __name__ == '__main__':
+    test_collect()
+    print("Texture collector tests passed")
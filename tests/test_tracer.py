@@ -0,0 +1,141 @@
+"""Tracer spans, aggregates, counters and exports, this can run without Cinema 4D."""
+import json
+import os
+import tempfile
+import threading
+import time
+from _pure import load
+
+tracer_module = load("tracer")
+Tracer = tracer_module.Tracer
+
+
+def test_disabled():
+    tracer = Tracer()
+
+    @tracer.trace
+    def work(x: int) -> int:
+        tracer.count("FindChild")
+        return x + 1
+
+    assert work(1) == 2 and work.__name__ == "work"
+    with tracer.span("block"):
+        pass
+    assert tracer.stats() == {} and tracer.counters == {} and tracer.events == []
+
+
+def test_nested():
+    tracer = Tracer()
+
+    @tracer.trace
+    def inner() -> None:
+        tracer.count("GetConnections", 2)
+        time.sleep(0.002)
+
+    @tracer.trace("outer")
+    def outer() -> None:
+        tracer.count("BeginTransaction")
+        for _ in range(3):
+            inner()
+
+    tracer.enable()
+    outer()
+    with tracer.span("block", size=3):
+        outer()
+    tracer.disable()
+
+    stats = tracer.stats()
+    name = inner.__qualname__
+    assert stats["outer"].count == 2 and stats[name].count == 6 and stats["block"].count == 1
+    # the self time of a parent leaves out its children
+    assert stats["outer"].self_time < stats["outer"].total - stats[name].total / 2
+    assert abs(stats["block"].total - stats["block"].self_time - stats["outer"].total / 2) < 0.002
+    assert stats[name].p50 >= 0.002 and stats[name].p95 >= stats[name].p50
+    # a counter goes to the innermost span and to the totals
+    assert stats[name].counters == {"GetConnections": 12}
+    assert stats["outer"].counters == {"BeginTransaction": 2}
+    assert tracer.counters == {"GetConnections": 12, "BeginTransaction": 2}
+
+    # an exception closes the span
+    tracer.enable()
+    try:
+        with tracer.span("fail"):
+            raise RuntimeError("stop")
+    except RuntimeError:
+        pass
+    assert tracer.stats()["fail"].count == 1 and tracer._stack() == []
+
+
+def test_histogram():
+    stats = tracer_module.SpanStats("GetConnections")
+    assert stats.p50 == 0.0
+    # a long batch: the memory is bounded, the percentiles are at most one bucket over
+    durations = [1e-6 * (1 + index % 1000) for index in range(200_000)]
+    for duration in durations:
+        stats.add(duration, duration)
+    assert len(stats.buckets) <= tracer_module.HISTOGRAM_SIZE and len(stats.buckets) < 100
+    exact = sorted(durations)
+    for q in (0, 0.5, 0.95):
+        value = exact[max(int(q * len(exact)) - 1, 0)]
+        assert value <= stats.percentile(q) <= value * 2 ** (1 / tracer_module.HISTOGRAM_STEPS)
+    assert stats.min == exact[0] and stats.percentile(1) == stats.max == exact[-1]
+
+    # out of the histogram range
+    stats = tracer_module.SpanStats("extremes")
+    stats.add(1e-9, 1e-9)
+    stats.add(1e4, 1e4)
+    assert stats.p50 == tracer_module.HISTOGRAM_MIN and stats.p95 == stats.max == 1e4
+
+
+def test_threads():
+    tracer = Tracer()
+    tracer.enable()
+
+    @tracer.trace("job")
+    def job() -> None:
+        with tracer.span("step"):
+            tracer.count("FindChild")
+
+    threads = [threading.Thread(target=job) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = tracer.stats()
+    assert stats["job"].count == 8 and stats["step"].count == 8
+    assert stats["step"].counters == {"FindChild": 8} and "FindChild" not in stats["job"].counters
+
+
+def test_export():
+    tracer = Tracer(max_events=3)
+    tracer.enable()
+    for index in range(5):
+        with tracer.span("NodeGraghHelper.GetPort", index=index):
+            tracer.count("FindChild")
+
+    data = tracer.to_chrome_trace()
+    assert len(data["traceEvents"]) == 3 and data["otherData"]["dropped"] == 2
+    event = data["traceEvents"][0]
+    assert event["ph"] == "X" and event["cat"] == "NodeGraghHelper" and event["dur"] >= 0
+    assert event["args"] == {"index": 0, "FindChild": 1}
+    path = os.path.join(tempfile.mkdtemp(), "trace.json")
+    assert json.load(open(tracer.export_chrome_trace(path)))["traceEvents"] == data["traceEvents"]
+
+    # the aggregates keep all the spans
+    summary = tracer.summary()
+    assert "NodeGraghHelper.GetPort" in summary and "FindChild=5" in summary and "2 events dropped" in summary
+    try:
+        tracer.summary(sort="name")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an unknown sort should raise")
+
+
+if __name__ == '__main__':
+    test_disabled()
+    test_nested()
+    test_histogram()
+    test_threads()
+    test_export()
+    print("Tracer tests passed")
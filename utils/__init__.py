@@ -9,11 +9,24 @@ from typing import Iterator, Optional, Union
 
 import random
 from .node_helper import NodeGraghHelper
-from .texture_helper import TextureHelper, g_texture_helper
-from .converter_ports import ConverterPorts
-from ..constants import *
+from .texture_helper import TextureHelper
+from .converter_ports import ConverterPorts, GetConverterPorts
+from .graph_index import GraphIndex
+from .aov_index import AOVIndex
+from .aov_preset import AOVSpec, AOVDriverSpec, AOVState, AOVPlan, AOVPreset
+from .image_helper import ImageSequence, SequenceIndex
+from .sequence_checker import SequenceChecker, SequenceReport
+from .tracer import Tracer, SpanStats, tracer, trace, span
+from ..constants.common_id import *
 import os
 
+def __getattr__(name: str):
+    # the shared texture helper is built on first use (PEP 562)
+    if name == "g_texture_helper":
+        from . import texture_helper
+        return texture_helper.g_texture_helper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Custom Transaction with auto Commit
 class EasyTransaction:
     """
@@ -74,6 +87,7 @@ class EasyTransaction:
     # Enable this to merge all the change within the Transaction
     MERGE_UNDO: bool = True
 
+    @trace
     def __init__(self, material: c4d.BaseMaterial):
         """
         Creates a new EasyTransaction class with a material.
@@ -146,14 +160,22 @@ class EasyTransaction:
         self.setting = settings
 
     def __enter__(self):
+        # the span covers the with block and the commit
+        self._span = span("EasyTransaction")
+        self._span.__enter__()
         if self.helper is not None and self.graph is not None:
+            tracer.count("BeginTransaction")
             self.transaction: maxon.GraphTransaction = self.graph.BeginTransaction(self.setting)
         return self.helper
 
     # auto commit
     def __exit__(self, type, value, traceback) -> None:
-        if self.transaction is not None:
-            self.transaction.Commit(self.setting)
+        try:
+            if self.transaction is not None:
+                tracer.count("Commit")
+                self.transaction.Commit(self.setting)
+        finally:
+            self._span.__exit__(type, value, traceback)
 
 ###  ==========  Functions  ==========  ###
 
@@ -275,6 +297,49 @@ def ChangeRenderer(document: c4d.documents.BaseDocument = None, videopost: int =
 
     return AddVideoPost(document, videopost)
 
+# 获取渲染帧范围
+def GetRenderFrameRange(document: c4d.documents.BaseDocument = None) -> tuple[int, int, int]:
+    """
+    Get the frame range of the active render settings.
+
+    Args:
+        document (c4d.documents.BaseDocument, optional): Fill None to check active documents. Defaults to None.
+
+    Returns:
+        tuple[int, int, int]: The first frame, the last frame and the frame step.
+    """
+    if not document:
+        document = c4d.documents.GetActiveDocument()
+    rdata: c4d.documents.RenderData = document.GetActiveRenderData()
+    fps: int = document.GetFps()
+    mode: int = rdata[c4d.RDATA_FRAMESEQUENCE]
+    if mode == c4d.RDATA_FRAMESEQUENCE_CURRENTFRAME:
+        start = end = document.GetTime()
+    elif mode == c4d.RDATA_FRAMESEQUENCE_ALLFRAMES:
+        start, end = document.GetMinTime(), document.GetMaxTime()
+    elif mode == c4d.RDATA_FRAMESEQUENCE_PREVIEWRANGE:
+        start, end = document.GetLoopMinTime(), document.GetLoopMaxTime()
+    else:
+        start, end = rdata[c4d.RDATA_FRAMEFROM], rdata[c4d.RDATA_FRAMETO]
+    return start.GetFrame(fps), end.GetFrame(fps), max(1, rdata[c4d.RDATA_FRAMESTEP] or 1)
+
+# 检查渲染输出序列
+def CheckRenderOutput(folder: str, document: c4d.documents.BaseDocument = None, workers: int = 8) -> list[SequenceReport]:
+    """
+    Check the image sequences of a render output folder against the frame range of the render settings:
+    the missing, zero byte and truncated frames.
+
+    Args:
+        folder (str): The render output folder.
+        document (c4d.documents.BaseDocument, optional): Fill None to check active documents. Defaults to None.
+        workers (int, optional): The threads reading the frames. Defaults to 8.
+
+    Returns:
+        list[SequenceReport]: The report of each sequence, see ``report.bad_ranges()`` to render again.
+    """
+    start, end, step = GetRenderFrameRange(document)
+    return SequenceChecker(folder, start, end, step, workers).check()
+
 # Check if the file is an image
 def IsImageFile(file: str) -> bool:
     """Check if the file is an image"""
@@ -11,6 +11,9 @@ import hashlib
 import random
 import string
 from Renderer import Redshift, Arnold, Octane, Vray, CentiLeo, EasyTransaction, NodeGraghHelper
+from .description_table import DescriptionTable, guess_nodespace
+from .description_capture import CaptureDescriptions, NestDescriptions
+from .graph_traversal import IterTraverse
 # from Renderer.constants.descrition_id import *
 
 RS_NODESPACE = "com.redshift3d.redshift4c4d.class.nodespace"
@@ -18,7 +21,8 @@ AR_NODESPACE = "com.autodesk.arnold.nodespace"
 VR_NODESPACE = "com.chaos.class.vray_node_renderer_nodespace"
 CE_NODESPACE = "com.centileo.class.nodespace"
 
-NODESPACE_INDEX = [RS_NODESPACE, AR_NODESPACE, VR_NODESPACE]
+# the column of each node space in the maps below
+NODESPACE_INDEX = [RS_NODESPACE, AR_NODESPACE, VR_NODESPACE, CE_NODESPACE]
 
 KEYWORD_LIST = ["$type", "$id", "$query", "$qmode", "$commands"]
 
@@ -219,6 +223,9 @@ DESCRIPTION_MAPS = [
     MIX_DESCRIPTION
 ]
 
+# DESCRIPTION_MAPS compiled once for DescriptionConverter
+DESCRIPTION_TABLE = DescriptionTable(DESCRIPTION_MAPS)
+
 
 @dataclass
 class PARTIAL_DESCRIPTION:
@@ -578,9 +585,7 @@ class DescriptionConverter:
         self._reslut: dict[str, str] = None
 
         if self.sourceSpcace is None:
-            nodespace = self._guess_nodespace()
-            if nodespace:
-                self.source_index = NODESPACE_INDEX[nodespace]
+            self.sourceSpcace = self._guess_nodespace()
 
         if self.sourceSpcace not in NODESPACE_INDEX:
             raise ValueError(f"Invalid source space: {self.sourceSpcace}")
@@ -588,30 +593,14 @@ class DescriptionConverter:
         self.source_index: int = NODESPACE_INDEX.index(self.sourceSpcace)
         self.target_index: int = self.source_index
 
-    def _contains(self, pattern: str) -> bool:
-        if isinstance(self.data, dict):
-            for key, value in self.data.items():
-                if pattern.lower() in key.lower() or (isinstance(value, str) and pattern.lower() in value.lower()):
-                    return True
-                elif isinstance(value, dict):
-                    if self._contains(value):
-                        return True
-        return False
-
     def _guess_nodespace(self) -> str:
         """
-        Guess the node space of the node from the description.
+        Guess the node space of the node from the description, in one walk over the description.
         """
-        if self._contains('redshift'):
-            return RS_NODESPACE
-        elif self._contains('arnold'):
-            return AR_NODESPACE
-        elif self._contains('vray'):
-            return VR_NODESPACE
-        elif self._contains('centileo'):
-            return CE_NODESPACE
-        else:
+        nodespace = guess_nodespace(self.data, (RS_NODESPACE, AR_NODESPACE, VR_NODESPACE, CE_NODESPACE))
+        if nodespace is None:
             raise ValueError(f"Cannot guess node space from description: please specify the node space manually.")
+        return nodespace
 
     def in_desc(self, desc: list, value: str) -> bool:
         """
@@ -662,9 +651,10 @@ class DescriptionConverter:
                 dict_data[key] = self.replace_type(value)
             elif isinstance(value, str):
                 if key == search_value:
-                    node_type = value.replace('#', '')
-                    current_map = DESCRIPTION_MAPS[self.get_desc_index(DESCRIPTION_MAPS, node_type)]
-                    dict_data[key] = f'#{current_map[self.target_index]}'
+                    # unknown types are kept
+                    node_type = DESCRIPTION_TABLE.get_type(value.replace('#', ''), self.target_index)
+                    if node_type:
+                        dict_data[key] = f'#{node_type}'
         return dict_data
 
     def replace_extra_data(self, data: list[dict[str, str]]) -> dict[str, str]:
@@ -678,11 +668,10 @@ class DescriptionConverter:
             for key, value in i.items():
                 if key == search_value:
                     node_type, hash_num = value.split('@')
-                    current_map = DESCRIPTION_MAPS[self.get_aid_index(DESCRIPTION_MAPS, node_type)]
-                    new_node = str(current_map[self.target_index])
-                    new_type = new_node.split('.')[-1]
+                    new_type = DESCRIPTION_TABLE.get_aid(node_type, self.target_index)
                     # print(f"{node_type} -> {new_type}")
-                    i[key] = f'{new_type}@{hash_num}'
+                    if new_type:
+                        i[key] = f'{new_type}@{hash_num}'
         return data
 
     # ok, not used because we don't need to replace id, and it will cause problem when we create reference
@@ -706,21 +695,16 @@ class DescriptionConverter:
     # ok
     def replace_slot(self, original_dict: dict[str, str]):
         new_dict = {}
+        node_type = original_dict.get('$type', '').replace('#', '')
         
         for key, value in original_dict.items():
             # 检查当前键是否以 #< 开头
             if key.startswith('#<'):
-                # new_key = key + 'ABC'  # 替换键名称
-                node_type = original_dict.get('$type', '').replace('#', '')
                 old_key = key.replace('#<', '')
                 # print(f"Node type: {node_type}, old key: {old_key}")
-                current_map = DESCRIPTION_MAPS[self.get_desc_index(DESCRIPTION_MAPS, node_type)]
-                slots_map = current_map[-1]
-                # print(f'{ slots_map = }')
-                sub_map_index = self.get_desc_index(slots_map, old_key)
-                sub_map = slots_map[sub_map_index]
-                tar_node_type = sub_map[self.target_index]
-                new_key = f'#<{tar_node_type}'
+                tar_slot = DESCRIPTION_TABLE.get_slot(node_type, old_key, self.target_index)
+                # unknown ports are kept
+                new_key = f'#<{tar_slot}' if tar_slot else key
                 # print(f"{key} -> {new_key}")
             else:
                 new_key = key  # 保持原键名称
@@ -789,6 +773,7 @@ class DescriptionHelper(NodeGraghHelper):
 
     def __post_init__(self) -> None:
         self.data: list[dict[str]] = []
+        self.description: dict[str] = {}
         super().__init__(self.material)
 
         # self.nodeMaterial: c4d.NodeMaterial = self.material.GetNodeMaterialReference()
@@ -803,37 +788,40 @@ class DescriptionHelper(NodeGraghHelper):
         #             self.root: maxon.GraphNode = self.graph.GetRoot()
 
     def _iter_tree(self, node: maxon.GraphNode, depth: int=0) -> Iterator[maxon.GraphNode]:
-
+        """ yield (node, depth) of the node and the nodes before it, each node once
+        """
         yield (node, depth)
-        for child in maxon.GraphModelHelper.GetDirectPredecessors(node, maxon.NODE_KIND.NODE):
-            for item in self._iter_tree(child, depth + 1):
-                yield item
+        seen: set[str] = {self._IndexKey(node)}
+        for _, pre_node, pre_depth in IterTraverse(node, self._GetNestedPreEdges, self._IndexKey):
+            key = self._IndexKey(pre_node)
+            if key not in seen:
+                seen.add(key)
+                yield (pre_node, depth + pre_depth)
+
+    def _describe_node(self, node: maxon.GraphNode) -> dict[str, str]:
+        return {"$type": GetNodeDescription(node), "$id": str(node.GetId())}
+
+    def _describe_edge(self, edge: tuple[maxon.GraphNode, maxon.GraphNode]) -> str:
+        # (outPort, inPort), the key is the input port of the node
+        return f"#<{GetPortId(edge[1])}"
 
     def _traverse_graph(self):
-        """ traverse the graph and create a list of NodeData
+        """ traverse the graph and create a flat description per node, each node is visited once
         """
         with EasyTransaction(self.material) as tr:
             endNode = tr.GetOutput()
-            for item in self._iter_tree(endNode):
-                node = item[0]
-                index = item[1]
-                node_data = NodeData(node=node, depth=index)
-                node_description = node_data.CtreateDescription()
-                self.data.append(node_description)
+            self.data = CaptureDescriptions(endNode, self._GetNestedPreEdges, self._describe_node,
+                                            self._describe_edge, self._IndexKey)
         return self.data
                         
     def __repr__(self) -> str:
         return f"Description Helper of {self.material.GetName()}"
 
-    def _convert(self) -> list[dict[str, str]]:
-        """ convert the data from list to nested dict
+    def _convert(self) -> dict[str, str]:
+        """ convert the data from list to nested dict, a shared node is nested once and referenced by #$id after
         """
-        for i in self.data:
-            for key, value in list(i.items()):
-                if key.startswith('#<'):
-                    for other in self.data:
-                        if other.get('$id') == value:
-                            i[key] = other
+        self.description = NestDescriptions(self.data)
+        return self.description
 
 
     # def replace_duplicate_ids(self, data: Dict[str, Any],seen_ids: Set[str] = None) -> Dict[str, Union[str, Any]]:
@@ -860,9 +848,7 @@ class DescriptionHelper(NodeGraghHelper):
         """
         self._traverse_graph()
         self.extra_data = self.get_image_path_data()
-        self._convert()
-        #self.data = self.replace_duplicate_ids(self.data[0])
-        return self.data[0]
+        return self._convert()
     
     def get_asset_id(self, node: maxon.GraphNode) -> str:
         str(node.GetValue("net.maxon.node.attribute.assetid"))[1:].split(",")[0]
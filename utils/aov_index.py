@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Lookup index of the AOVs of a render VideoPost, shared by the renderer AOVHelpers."""
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+
+class AOVIndex:
+    """
+    One pass index of the AOVs: type -> [aov], name -> aov and group -> [aov].
+
+    The parameters of each AOV are read once in ``Build``, the lookups are dict reads.
+    A group is any hashable key of an AOV, e.g. the light group names of a Redshift AOV
+    or ``("light", id)`` of an Octane light AOV.
+
+    AOVIndex 一次读取所有aov的参数, 按类型/名称/灯光组查询.
+
+    Example:
+
+        index = AOVIndex(get_type=lambda aov: aov[RNDAOV_TYPE]).Build(aovs)
+        index.GetType(RNDAOV_LIGHT)     # [aov, ...]
+        index.GetFirst(RNDAOV_ZDEPTH)   # aov or None
+
+    """
+
+    def __init__(self, get_type: Callable[[Any], Any], get_name: Callable[[Any], str] = None,
+                 get_groups: Callable[[Any], Iterable[Hashable]] = None) -> None:
+        """
+        Args:
+            get_type (Callable): return the type of an aov.
+            get_name (Callable, optional): return the name of an aov. Defaults to None.
+            get_groups (Callable, optional): return the group keys of an aov. Defaults to None.
+        """
+        self._get_type = get_type
+        self._get_name = get_name
+        self._get_groups = get_groups
+        self.Clear()
+
+    def __len__(self) -> int:
+        return len(self._aovs)
+
+    def __contains__(self, aov: Any) -> bool:
+        return any(item is aov for item in self._aovs)
+
+    def __str__(self):
+        return (f"A {self.__class__.__name__} Instance with {len(self._aovs)} aovs of {len(self._types)} types")
+
+    #=============================================
+    # Build
+    #=============================================
+
+    def Clear(self) -> None:
+        """
+        Remove all the data of the index.
+        """
+        self._aovs: list = []
+        self._types: dict = {}      # type -> [aov]
+        self._names: dict = {}      # name -> first aov
+        self._groups: dict = {}     # group -> [aov]
+
+    def Build(self, aovs: Iterable[Any]) -> "AOVIndex":
+        """
+        Build the index, the parameters of each aov are read once.
+
+        Args:
+            aovs (Iterable[Any]): all the aovs in order
+
+        Returns:
+            AOVIndex: the index self.
+        """
+        self.Clear()
+        for aov in aovs:
+            self.Add(aov)
+        return self
+
+    def Add(self, aov: Any) -> None:
+        """
+        Add an aov at the end of the index.
+
+        Args:
+            aov (Any): the aov
+        """
+        if aov is None:
+            return
+        self._aovs.append(aov)
+        self._types.setdefault(self._get_type(aov), []).append(aov)
+        if self._get_name is not None:
+            self._names.setdefault(self._get_name(aov), aov)
+        if self._get_groups is not None:
+            for group in self._get_groups(aov) or ():
+                self._groups.setdefault(group, []).append(aov)
+
+    #=============================================
+    # Query
+    #=============================================
+
+    def GetAll(self) -> list:
+        """
+        Returns:
+            list: all the aovs in order.
+        """
+        return list(self._aovs)
+
+    def GetTypes(self) -> list:
+        """
+        Returns:
+            list: all the aov types in the index.
+        """
+        return list(self._types)
+
+    def GetType(self, aov_type: Any) -> list:
+        """
+        Args:
+            aov_type (Any): the aov type
+
+        Returns:
+            list: the aovs of the type.
+        """
+        return list(self._types.get(aov_type, []))
+
+    def GetFirst(self, aov_type: Any) -> Optional[Any]:
+        """
+        Args:
+            aov_type (Any): the aov type
+
+        Returns:
+            Optional[Any]: the first aov of the type, None if not found.
+        """
+        aovs = self._types.get(aov_type)
+        return aovs[0] if aovs else None
+
+    def GetName(self, name: str) -> Optional[Any]:
+        """
+        Args:
+            name (str): the aov name
+
+        Returns:
+            Optional[Any]: the first aov with the name, None if not found.
+        """
+        return self._names.get(name)
+
+    def GetGroup(self, group: Hashable) -> list:
+        """
+        Args:
+            group (Hashable): the group key
+
+        Returns:
+            list: the aovs of the group.
+        """
+        return list(self._groups.get(group, []))
+
+    def HasType(self, aov_type: Any) -> bool:
+        """
+        Args:
+            aov_type (Any): the aov type
+
+        Returns:
+            bool: True if any aov of the type is in the index.
+        """
+        return bool(self._types.get(aov_type))
+
+
+__all__ = [
+    "AOVIndex",
+]
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Declarative aov layouts: describe the aovs of a renderer as data, diff them against the aovs
+of the VideoPost and apply only the difference with ``AOVHelper.apply_preset``.
+
+声明式aov预设: 与当前vp中的aov比较, 只应用差异部分.
+"""
+import json
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, ClassVar, Iterable, Optional
+
+
+def _freeze(value: Any) -> Any:
+    # json lists (e.g. the V-Ray aov types) back to hashable tuples
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# ====================================================
+# Specs
+# ====================================================
+
+@dataclass
+class AOVSpec:
+    """
+    One aov of a preset.
+
+    ``type`` and ``id`` identify the aov (``id`` is the Octane custom / light id or the Redshift
+    puzzle matte id), ``driver`` is the name of the Arnold driver it belongs to. The other fields
+    are set on the aov, a field left to None is not touched, so the per aov overrides survive a re-apply.
+    A field the renderer does not have is ignored.
+    """
+    type: Any
+    name: Optional[str] = None
+    enabled: Optional[bool] = None
+    bits: Optional[int] = None
+    denoise: Optional[bool] = None
+    light_groups: Optional[tuple[str, ...]] = None
+    id: Optional[int] = None
+    driver: Optional[str] = None
+
+    VALUE_FIELDS: ClassVar[tuple[str, ...]] = ("name", "enabled", "bits", "denoise", "light_groups")
+
+    def __post_init__(self) -> None:
+        self.type = _freeze(self.type)
+        if self.light_groups is not None:
+            self.light_groups = tuple(group.strip() for group in self.light_groups if group.strip())
+
+    def key(self, type_key: Callable[[Any], Any] = None) -> tuple:
+        """The identity of the aov: (driver, type, id)."""
+        return (self.driver, type_key(self.type) if type_key else self.type, self.id)
+
+    def values(self) -> dict[str, Any]:
+        """The fields to set on a new aov."""
+        return {name: getattr(self, name) for name in self.VALUE_FIELDS if getattr(self, name) is not None}
+
+    def changes(self, current: dict[str, Any]) -> dict[str, Any]:
+        """The fields that differ from the ``current`` values of an existing aov."""
+        result = {}
+        for name, value in self.values().items():
+            if name not in current:
+                continue
+            old = current[name]
+            if name == "light_groups":
+                if set(value) != set(old or ()):
+                    result[name] = value
+            elif value != old:
+                result[name] = value
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {item.name: getattr(self, item.name) for item in fields(self)
+                if getattr(self, item.name) is not None}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AOVSpec":
+        return cls(**data)
+
+
+@dataclass
+class AOVDriverSpec:
+    """
+    An Arnold driver of a preset, the arguments of ``Arnold.AOVHelper.create_aov_driver``.
+    ``driver_type`` None is the display driver.
+    """
+    name: str
+    driver_type: Optional[int] = None
+    denoise: bool = True
+    render_path: Optional[str] = None
+    srgb: bool = True
+
+    def to_dict(self) -> dict[str, Any]:
+        return {item.name: getattr(self, item.name) for item in fields(self)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AOVDriverSpec":
+        return cls(**data)
+
+
+@dataclass
+class AOVState:
+    """
+    An existing aov read by an AOVHelper: the renderer object and its current values,
+    with the ``type`` / ``id`` / ``driver`` keys and the fields the renderer has.
+    """
+    handle: Any = field(repr=False, compare=False)
+    values: dict[str, Any] = field(default_factory=dict)
+
+    def key(self) -> tuple:
+        return (self.values.get("driver"), _freeze(self.values.get("type")), self.values.get("id"))
+
+
+# ====================================================
+# Plan
+# ====================================================
+
+@dataclass
+class AOVPlan:
+    """
+    The difference between a preset and the aovs of the VideoPost.
+    """
+    add: list[AOVSpec] = field(default_factory=list)
+    update: list[tuple[AOVState, AOVSpec, dict]] = field(default_factory=list)
+    remove: list[AOVState] = field(default_factory=list)
+    keep: list[AOVState] = field(default_factory=list)
+    drivers: list[AOVDriverSpec] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return (f"{self.__class__.__name__}: {len(self.add)} add, {len(self.update)} update, "
+                f"{len(self.remove)} remove, {len(self.keep)} keep, {len(self.drivers)} drivers")
+
+    @property
+    def empty(self) -> bool:
+        """True if the VideoPost already matches the preset."""
+        return not (self.add or self.update or self.remove or self.drivers)
+
+
+# ====================================================
+# Preset
+# ====================================================
+
+@dataclass
+class AOVPreset:
+    """
+    A full aov layout of a renderer.
+
+    Example:
+
+        preset = AOVPreset("Redshift", [
+            AOVSpec(REDSHIFT_AOV_TYPE_BEAUTY, enabled=True, bits=16),
+            AOVSpec(REDSHIFT_AOV_TYPE_DIFFUSE_LIGHTING, light_groups=("key", "rim")),
+            AOVSpec(REDSHIFT_AOV_TYPE_PUZZLE_MATTE, "Puzzle 1", id=1),
+        ])
+        preset.save("farm.json")
+        plan = Redshift.AOV(vp).apply_preset(AOVPreset.load("farm.json"), prune=True)
+    """
+    renderer: str
+    aovs: list[AOVSpec] = field(default_factory=list)
+    drivers: list[AOVDriverSpec] = field(default_factory=list)
+
+    def check_renderer(self, renderer: str) -> None:
+        """Raise if the preset is made for another renderer."""
+        def normalize(name: str) -> str:
+            return name.lower().replace("-", "").replace(" ", "")
+        if self.renderer and normalize(self.renderer) != normalize(renderer):
+            raise ValueError(f"{self.__class__.__name__} Expected a {renderer} preset, got {self.renderer}")
+
+    def diff(self, states: Iterable[AOVState], prune: bool = False, type_key: Callable[[Any], Any] = None,
+             drivers: Iterable[str] = ()) -> AOVPlan:
+        """
+        Compare the preset with the existing aovs.
+
+        The specs and the aovs with the same (driver, type, id) are paired in order, an unpaired spec
+        is added, an unpaired aov is removed only with ``prune``.
+
+        Args:
+            states (Iterable[AOVState]): the existing aovs in order.
+            prune (bool, optional): remove the aovs not in the preset. Defaults to False.
+            type_key (Callable, optional): map a spec type to the type read from the aovs. Defaults to None.
+            drivers (Iterable[str], optional): the names of the existing Arnold drivers. Defaults to ().
+
+        Returns:
+            AOVPlan: the difference.
+        """
+        plan = AOVPlan()
+        existing: dict[tuple, list[AOVState]] = {}
+        for state in states:
+            existing.setdefault(state.key(), []).append(state)
+
+        for spec in self.aovs:
+            candidates = existing.get(spec.key(type_key))
+            if not candidates:
+                plan.add.append(spec)
+                continue
+            state = candidates.pop(0)
+            changes = spec.changes(state.values)
+            if changes:
+                plan.update.append((state, spec, changes))
+            else:
+                plan.keep.append(state)
+
+        for candidates in existing.values():
+            (plan.remove if prune else plan.keep).extend(candidates)
+
+        names = set(drivers)
+        plan.drivers = [driver for driver in self.drivers if driver.name not in names]
+        return plan
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"renderer": self.renderer,
+                "aovs": [spec.to_dict() for spec in self.aovs],
+                "drivers": [driver.to_dict() for driver in self.drivers]}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AOVPreset":
+        return cls(data.get("renderer", ""),
+                   [AOVSpec.from_dict(item) for item in data.get("aovs", [])],
+                   [AOVDriverSpec.from_dict(item) for item in data.get("drivers", [])])
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+    @classmethod
+    def load(cls, path: str) -> "AOVPreset":
+        with open(path, "r", encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+
+__all__ = [
+    "AOVSpec",
+    "AOVDriverSpec",
+    "AOVState",
+    "AOVPlan",
+    "AOVPreset",
+]
@@ -12,6 +12,35 @@ from ..constants.common_id import (
     VR_NODESPACE,
     CL_NODESPACE,
 )
+from .port_table import PortTable, GetPortTable
+
+# nodespace -> converter data file in constants
+_DATA_FILES: dict = {
+    str(RS_NODESPACE): "Redshift.json",
+    str(AR_NODESPACE): "Arnold.json",
+    str(VR_NODESPACE): "Vray.json",
+    str(CL_NODESPACE): "CentiLeo.json",
+}
+_CONSTANTS_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'constants')
+_instances: dict = {}
+
+
+def GetConverterPorts(nodespaceId: maxon.Id) -> "ConverterPorts":
+    """
+    Get the shared ConverterPorts of the node space, the instance and its table are created once per process.
+
+    Args:
+        nodespaceId (maxon.Id): the node space id
+
+    Returns:
+        ConverterPorts: the converter ports helper
+    """
+    key = str(nodespaceId)
+    instance = _instances.get(key)
+    if instance is None:
+        instance = ConverterPorts(nodespaceId)
+        _instances[key] = instance
+    return instance
 
 
 class ConverterPorts:
@@ -33,20 +62,22 @@ class ConverterPorts:
     def __init__(self, nodespaceId: maxon.Id) -> None:
         self.nodespaceId: maxon.Id = nodespaceId
 
-        FILEPATH, f = os.path.split(__file__)
-        parent_dir = os.path.abspath(os.path.join(FILEPATH, os.pardir))
-
-        if self.nodespaceId == RS_NODESPACE:
-            self.dataPath = os.path.join(parent_dir, 'constants', "Redshift.json")
-        if self.nodespaceId == AR_NODESPACE:
-            self.dataPath = os.path.join(parent_dir, 'constants', "Arnold.json")
-        if self.nodespaceId == VR_NODESPACE:
-            self.dataPath = os.path.join(parent_dir, 'constants', "Vray.json")
-        if self.nodespaceId == CL_NODESPACE:
-            self.dataPath = os.path.join(parent_dir, 'constants', "CentiLeo.json")
+        data_file = _DATA_FILES.get(str(self.nodespaceId))
+        if data_file is None:
+            raise FileNotFoundError(f"the Converter data is not exist for {self.nodespaceId}")
+        self.dataPath = os.path.join(_CONSTANTS_DIR, data_file)
         if not os.path.exists(self.dataPath):
             raise FileNotFoundError(f"the Converter data is not exist at {self.dataPath}")
 
+    def GetTable(self) -> PortTable:
+        """
+        Get the compiled port table, the json is parsed once per process and reloaded when the file changed.
+
+        Returns:
+            PortTable: the table
+        """
+        return GetPortTable(self.dataPath)
+
     @staticmethod
     def _InitData(
         nodespace_id: str,
@@ -218,51 +249,36 @@ class ConverterPorts:
             return True
         return False
 
-    def GetConvertInput(self, StrOrNode: Union[str, maxon.GraphNode]) -> str:
+    def _GetAssetId(self, StrOrNode: Union[str, maxon.GraphNode]) -> str:
+        if isinstance(StrOrNode, str):
+            return StrOrNode
+        if isinstance(StrOrNode, maxon.GraphNode):
+            if StrOrNode.GetKind() == maxon.NODE_KIND.NODE:
+                return str(StrOrNode.GetValue("net.maxon.node.attribute.assetid"))[1:].split(",")[0]
+        return ""
+
+    def GetConvertInput(self, StrOrNode: Union[str, maxon.GraphNode], trim: bool = False) -> str:
         """
         Get the default in port of the node.
 
         Args:
-            StrOrNode (Union[str, maxon.GraphNode]): the node or it's string id.
+            StrOrNode (Union[str, maxon.GraphNode]): the node or it's string id, the id can be the short id without prefix.
+            trim (bool, optional): True to return the port id without the asset id prefix. Defaults to False.
 
         Returns:
             str: the string id of the default in port, else ""
         """
-        assetId = ""
-        if isinstance(StrOrNode, str):
-            assetId = StrOrNode
-        elif isinstance(StrOrNode, maxon.GraphNode):
-            if StrOrNode.GetKind() == maxon.NODE_KIND.NODE:
-                assetId = str(StrOrNode.GetValue("net.maxon.node.attribute.assetid"))[1:].split(",")[0]
-
-        with open(self.dataPath, 'r', encoding='UTF-8') as file:
-            data: dict = json.loads(file.read())
+        return self.GetTable().GetInput(self._GetAssetId(StrOrNode), trim)
 
-        item: dict = data.get(assetId, "")
-        if item == "":
-            return ""
-        return item.get("input", "")
-
-    def GetConvertOutput(self, StrOrNode: Union[str, maxon.GraphNode]) -> str:
+    def GetConvertOutput(self, StrOrNode: Union[str, maxon.GraphNode], trim: bool = False) -> str:
         """
         Get the default out port of the node.
 
         Args:
-            StrOrNode (Union[str, maxon.GraphNode]): the node or it's string id.
+            StrOrNode (Union[str, maxon.GraphNode]): the node or it's string id, the id can be the short id without prefix.
+            trim (bool, optional): True to return the port id without the asset id prefix. Defaults to False.
 
         Returns:
             str: the string id of the default out port, else ""
         """
-        assetId = ""
-        if isinstance(StrOrNode, str):
-            assetId = StrOrNode
-        elif isinstance(StrOrNode, maxon.GraphNode):
-            if StrOrNode.GetKind() == maxon.NODE_KIND.NODE:
-                assetId = str(StrOrNode.GetValue("net.maxon.node.attribute.assetid"))[1:].split(",")[0]
-
-        with open(self.dataPath, 'r', encoding='UTF-8') as file:
-            data: dict = json.loads(file.read())
-        item: dict = data.get(assetId, "")
-        if item == "":
-            return ""
-        return item.get("output", "")
+        return self.GetTable().GetOutput(self._GetAssetId(StrOrNode), trim)
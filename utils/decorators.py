@@ -1,4 +1,5 @@
 import c4d
+import os
 import time
 from inspect import signature
 from functools import wraps
@@ -9,6 +10,7 @@ import inspect
 import io
 import pstats
 import typing
+from .tracer import Tracer, SpanStats, tracer, trace, span
 
 _C4D_VERSION: int = c4d.GetC4DVersion()
 
@@ -116,9 +118,85 @@ def Statusbar(msg: str, spin: bool=False) -> Callable:
         return wrapper
     return decorator
 
+# 参数检查开关, 每次调用时读取, 生产环境设置 RENDERER_ARG_VALIDATION=0 或调用 SetArgValidation(False)
+ARG_VALIDATION: bool = os.environ.get("RENDERER_ARG_VALIDATION", "1") != "0"
+_MISSING = object()
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+def SetArgValidation(enabled: bool) -> None:
+    """Enable or disable the checks of ``CheckArgType`` and ``CheckArgCallback``.
+
+    The switch is read on each call, so it applies to the functions already decorated at import too.
+    While it is off ``CheckArgType`` only forwards the call and ``CheckArgCallback`` only runs the transformers.
+    The environment variable ``RENDERER_ARG_VALIDATION=0`` turns it off from the start.
+    """
+    global ARG_VALIDATION
+    ARG_VALIDATION = bool(enabled)
+
+class _ArgSlot:
+    """Where a parameter of a function is found in the ``args`` / ``kwargs`` of a call, resolved once from the signature.
+    ``get`` is a reader made for the kind of the parameter.
+    """
+    __slots__ = ("name", "index", "kind", "default", "named", "positional_defaults", "get")
+
+    def __init__(self, parameters: list[inspect.Parameter], index: int) -> None:
+        param = parameters[index]
+        self.name: str = param.name
+        self.kind = param.kind
+        self.index: int = index if param.kind in _POSITIONAL or param.kind is inspect.Parameter.VAR_POSITIONAL else -1
+        self.default: Any = _MISSING if param.default is inspect.Parameter.empty else param.default
+        # the keyword names a **kwargs parameter does not get
+        self.named: frozenset = frozenset(p.name for p in parameters if p.kind is not inspect.Parameter.POSITIONAL_ONLY)
+        # the defaults to fill the positional only parameters before this one
+        self.positional_defaults: tuple = tuple(p.default for p in parameters[:index])
+        self.get: Callable[[tuple, dict], Any] = self._Reader()
+
+    def _Reader(self) -> Callable[[tuple, dict], Any]:
+        name, index, default, named = self.name, self.index, self.default, self.named
+        if self.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD:
+            return lambda args, kwargs: args[index] if len(args) > index else kwargs.get(name, default)
+        if self.kind is inspect.Parameter.POSITIONAL_ONLY:
+            return lambda args, kwargs: args[index] if len(args) > index else default
+        if self.kind is inspect.Parameter.KEYWORD_ONLY:
+            return lambda args, kwargs: kwargs.get(name, default)
+        if self.kind is inspect.Parameter.VAR_POSITIONAL:
+            return lambda args, kwargs: tuple(args[index:])
+        return lambda args, kwargs: {key: value for key, value in kwargs.items() if key not in named}
+
+    def put(self, args: list, kwargs: dict, value: Any) -> list:
+        if self.kind is inspect.Parameter.VAR_POSITIONAL:
+            return args[:self.index] + list(value)
+        if self.kind is inspect.Parameter.VAR_KEYWORD:
+            for key in [key for key in kwargs if key not in self.named]:
+                del kwargs[key]
+            kwargs.update(value)
+        elif 0 <= self.index < len(args):
+            args[self.index] = value
+        elif self.kind is inspect.Parameter.POSITIONAL_ONLY:
+            args = args + list(self.positional_defaults[len(args):]) + [value]
+        else:
+            kwargs[self.name] = value
+        return args
+
+def _ArgSlots(func: Callable, names: list[str]) -> dict[str, _ArgSlot]:
+    """Resolve the parameters #names of #func, the names not in the signature are ignored.
+    """
+    parameters: list[inspect.Parameter] = list(signature(func).parameters.values())
+    slots: dict[str, _ArgSlot] = {param.name: _ArgSlot(parameters, index) for index, param in enumerate(parameters)}
+    return {name: slots[name] for name in names if name in slots}
+
+def _TypeName(expected: Any) -> str:
+    if isinstance(expected, tuple):
+        return " | ".join(_TypeName(item) for item in expected)
+    return getattr(expected, "__name__", str(expected))
+
 def CheckArgType(**type_annotations) -> Callable:
     """A decorator for check the args to debug. 
 
+    The parameters are resolved to their position once when the function is decorated, a call only
+    reads its own args. A default value is checked as well. With ``SetArgValidation(False)`` the
+    call is only forwarded.
+
     **Example**
         Indicating the execution of an expensive method. Using `statusbar` as a class decorator will work analogously.
 
@@ -129,16 +207,16 @@ def CheckArgType(**type_annotations) -> Callable:
                 pass
     """
     def decorator(func):
-        sig = signature(func)
+        slots = _ArgSlots(func, list(type_annotations))
+        checks: tuple = tuple((slot.get, name, type_annotations[name]) for name, slot in slots.items())
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            bound_args = sig.bind(*args, **kwargs)
-            bound_args.apply_defaults()
-            for param_name, value in bound_args.arguments.items():
-                if param_name in type_annotations:
-                    expected_type = type_annotations[param_name]
-                    if not isinstance(value, expected_type):
-                        raise TypeError(f"Prameter {param_name} should be {expected_type.__name__} type, but got{type(value).__name__}")
+            if ARG_VALIDATION:
+                for get, param_name, expected_type in checks:
+                    value = get(args, kwargs)
+                    if value is not _MISSING and not isinstance(value, expected_type):
+                        raise TypeError(f"Parameter {param_name} should be {_TypeName(expected_type)} type, but got {type(value).__name__}")
             return func(*args, **kwargs)
         return wrapper
     return decorator
@@ -148,6 +226,10 @@ def CheckArgCallback(*param_specs) -> Callable:
     
     param_specs: tuple(name, validator, transformer)
 
+    The parameters are resolved to their position once when the function is decorated, a call only
+    reads its own args and rebuilds them only when a value is transformed. A default value is checked
+    and transformed as well. With ``SetArgValidation(False)`` only the transformers run.
+
     **Example**
         Indicating the execution of an expensive method. Using `statusbar` as a class decorator will work analogously.
 
@@ -162,54 +244,40 @@ def CheckArgCallback(*param_specs) -> Callable:
     """
 
     def decorator(func):
-        sig = signature(func)
+        specs = [spec for spec in param_specs if len(spec) >= 2]
+        slots = _ArgSlots(func, [spec[0] for spec in specs])
+        steps: tuple = tuple(
+            (slots[spec[0]], slots[spec[0]].get, spec[0], spec[1], spec[2] if len(spec) > 2 else None)
+            for spec in specs if spec[0] in slots
+        )
+        steps = tuple(step for step in steps if step[3] is not None or step[4] is not None)
+        if not steps:
+            return func
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            bound_args = sig.bind(*args, **kwargs)
-            bound_args.apply_defaults()
-            
-            # dict
-            args_dict = bound_args.arguments
-            
-            for spec in param_specs:
-                if len(spec) < 2:
+            new_args = None
+            validate = ARG_VALIDATION
+            for slot, get, param_name, validator, transformer in steps:
+                if transformer is None and not validate:
                     continue
-                    
-                param_name = spec[0]
-                validator = spec[1] if len(spec) > 1 else None
-                transformer = spec[2] if len(spec) > 2 else None
-                
-                if param_name not in args_dict:
+                original_value = get(args, kwargs)
+                if original_value is _MISSING:
                     continue
-                    
-                original_value = args_dict[param_name]
-                
                 try:
-                    if validator is not None:
+                    if validator is not None and validate:
                         if not validator(original_value):
                             raise ValueError(f"Arg: {param_name} validator failed")
-                    
+
                     # transform
                     if transformer is not None:
-                        args_dict[param_name] = transformer(original_value)
-                        
+                        new_args = slot.put(list(args) if new_args is None else new_args, kwargs, transformer(original_value))
+
                 except Exception as e:
                     raise ValueError(f"Arg: {param_name} progress failed: {str(e)}") from e
-            
-            # rebind
-            new_args = []
-            new_kwargs = {}
-            
-            for name, param in sig.parameters.items():
-                if name in args_dict:
-                    if param.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD):
-                        if len(new_args) <= param.default:
-                            new_args.append(args_dict[name])
-                    else:
-                        new_kwargs[name] = args_dict[name]
-            
-            return func(*new_args, **new_kwargs)
-            
+
+            return func(*(args if new_args is None else new_args), **kwargs)
+
         return wrapper
     return decorator
 
@@ -226,6 +294,12 @@ def TIMEIT(enabled: bool, showDigits: int = 5, showArgs: bool = False, showResul
            useProfiler: bool = False, inCallProtection: bool = False) -> typing.Callable[[T], T]:
     """Decorates a function call with a timing or profiling report printed to the console.
 
+    .. note::
+
+        Prefer :func:`trace` of ``Renderer.utils.tracer`` to find where a batch spends its time: the spans nest,
+        are aggregated per name (count, total, self time, p50/p95) and export to a Chrome trace or a text summary,
+        a disabled tracer costs almost nothing. The calls timed by ``TIMEIT`` are recorded as spans too.
+
     Meant for debugging and profiling purposes only. The decorator can be enabled or disabled by passing a boolean flag
     to the decorator. When enabled, the decorator will print a report to the console after the function call has finished.
 
@@ -377,7 +451,8 @@ def TIMEIT(enabled: bool, showDigits: int = 5, showArgs: bool = False, showResul
             if useProfiler:
                 measure.enable()
   
-            result: typing.Any = obj(*args, **kwargs)
+            with span(obj.__qualname__):
+                result: typing.Any = obj(*args, **kwargs)
             report: str
             if useProfiler:
                 measure.disable()
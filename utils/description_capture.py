@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Capture a node graph as a graph description for ``DescriptionHelper``, each node is visited once.
+
+A node that feeds several ports (a texture driving the base color and the AO) is described once and
+nested at its first use, the other uses are ``"#" + $id`` references, so a diamond shaped graph gives a
+description linear in its size instead of one copy of the shared sub graph per path.
+No recursion and no c4d import, the graph is reached through callbacks.
+
+描述捕获: 每个节点只访问一次, 共享节点第一次嵌套, 之后用 #$id 引用.
+"""
+from typing import Any, Callable, Iterable, Optional
+
+# get_edges(node) -> [(edge, pre_node), ...], the nodes plugged into the node
+EdgeGetter = Callable[[Any], Iterable[tuple[Any, Any]]]
+
+PORT_PREFIX: str = "#<"
+
+
+def _identity(item: Any) -> Any:
+    return item
+
+
+def _reference(node_id: str) -> str:
+    return f"#{node_id}"
+
+
+def CaptureDescriptions(start: Any, get_edges: EdgeGetter, describe: Callable[[Any], dict],
+                        port_key: Callable[[Any], str], key: Callable[[Any], Any] = None) -> list[dict]:
+    """
+    Walk the graph from the end node and describe every node once.
+
+    Args:
+        start (Any): the end node, e.g. the material output.
+        get_edges (Callable): return the ``(edge, pre_node)`` pairs of a node.
+        describe (Callable): return the flat description of a node, at least ``{"$type", "$id"}``.
+        port_key (Callable): return the description key of an edge, e.g. ``#<base_color``.
+        key (Callable, optional): return a hashable key for a node. Defaults to the node itself.
+
+    Returns:
+        list[dict]: the flat descriptions in depth first pre-order, the end node first,
+        the port keys have the ``$id`` of the node plugged in.
+    """
+    if key is None:
+        key = _identity
+    start_description = describe(start)
+    result: list[dict] = [start_description]
+    ids: dict[Any, str] = {key(start): start_description["$id"]}
+    stack: list = [(start_description, iter(get_edges(start)))]
+    while stack:
+        description, edges = stack[-1]
+        item = next(edges, None)
+        if item is None:
+            stack.pop()
+            continue
+        edge, pre_node = item
+        pre_key = key(pre_node)
+        pre_id = ids.get(pre_key)
+        if pre_id is None:
+            pre_description = describe(pre_node)
+            pre_id = ids[pre_key] = pre_description["$id"]
+            result.append(pre_description)
+            stack.append((pre_description, iter(get_edges(pre_node))))
+        description[port_key(edge)] = pre_id
+    return result
+
+
+def NestDescriptions(descriptions: list[dict], root_id: Optional[str] = None,
+                     reference: Callable[[str], str] = _reference) -> dict:
+    """
+    Nest flat descriptions into one description: a node is nested at its first use in depth first
+    order and referenced by ``"#" + $id`` at the others, so it is declared before it is referenced.
+
+    Args:
+        descriptions (list[dict]): the flat descriptions, e.g. of ``CaptureDescriptions``.
+        root_id (Optional[str], optional): the ``$id`` of the root. Defaults to the first description.
+        reference (Callable, optional): make the reference of an ``$id``. Defaults to ``"#" + $id``.
+
+    Returns:
+        dict: the nested description, the flat descriptions are not changed.
+    """
+    if not descriptions:
+        return {}
+    by_id: dict[str, dict] = {description["$id"]: description for description in descriptions}
+    if root_id is None:
+        root_id = descriptions[0]["$id"]
+    root = dict(by_id[root_id])
+    emitted: set[str] = {root_id}
+    stack: list = [(root, iter(list(root.items())))]
+    while stack:
+        description, items = stack[-1]
+        item = next(items, None)
+        if item is None:
+            stack.pop()
+            continue
+        name, value = item
+        if not name.startswith(PORT_PREFIX) or not isinstance(value, str) or value not in by_id:
+            continue
+        if value in emitted:
+            description[name] = reference(value)
+            continue
+        emitted.add(value)
+        child = dict(by_id[value])
+        description[name] = child
+        stack.append((child, iter(list(child.items()))))
+    return root
+
+
+__all__ = [
+    "CaptureDescriptions",
+    "NestDescriptions",
+]
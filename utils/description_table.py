@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+The node and port maps of ``DescriptionConverter`` compiled once into dicts, so converting a graph
+description between node spaces is a dict lookup per key instead of a scan of the maps.
+This module has no c4d import, the maps themselves live in ``_description_helper``.
+
+描述转换查找表: DESCRIPTION_MAPS只编译一次, 转换时每个键一次字典查询.
+"""
+from typing import Any, Iterable, Optional, Union
+
+# the keywords of the node spaces, the first found in this order wins
+NODESPACE_KEYWORDS: tuple[str, ...] = ("redshift", "arnold", "vray", "centileo")
+
+
+def _alternatives(value: Union[str, list]) -> list[str]:
+    # a cell of the maps is an id or a list of alternative ids, the first is the one we create
+    return [item for item in value if item] if isinstance(value, list) else ([value] if value else [])
+
+
+class DescriptionTable:
+    """
+    The rows of the description maps indexed by node type, short asset id and port id.
+
+    Every row of the maps is ``[type of space 0, type of space 1, ..., [ports]]`` and every port is
+    ``[id of space 0, id of space 1, ...]``, a cell can be a list of alternative ids.
+
+    Example:
+
+        table = DescriptionTable(DESCRIPTION_MAPS)
+        table.get_type("com.redshift3d.redshift4c4d.nodes.core.texturesampler", 1)
+        # com.autodesk.arnold.shader.image
+    """
+
+    def __init__(self, maps: list[list]) -> None:
+        self.maps: list[list] = maps
+        self.type_rows: dict[str, int] = {}                 # node type of any space -> row
+        self.aid_rows: dict[str, int] = {}                  # last part of the type -> row
+        self.slot_rows: list[dict[str, int]] = []           # per row: port id of any space -> port row
+        for row_index, row in enumerate(maps):
+            for cell in row[:-1]:
+                for node_type in _alternatives(cell):
+                    self.type_rows.setdefault(node_type, row_index)
+                    self.aid_rows.setdefault(node_type.split('.')[-1], row_index)
+            slots: dict[str, int] = {}
+            for port_index, port in enumerate(row[-1]):
+                for cell in port:
+                    for slot in _alternatives(cell):
+                        slots.setdefault(slot, port_index)
+            self.slot_rows.append(slots)
+
+    @staticmethod
+    def _get_cell(cells: list, index: int) -> Optional[str]:
+        if index >= len(cells):
+            return None
+        alternatives = _alternatives(cells[index])
+        return alternatives[0] if alternatives else None
+
+    def _get_node_type(self, row: int, target_index: int) -> Optional[str]:
+        # the last cell of a row is the port list
+        cells = self.maps[row]
+        return self._get_cell(cells, target_index) if target_index < len(cells) - 1 else None
+
+    def get_type_row(self, node_type: str) -> int:
+        """The row of a node type of any space, -1 if unknown."""
+        return self.type_rows.get(node_type, -1)
+
+    def get_type(self, node_type: str, target_index: int) -> Optional[str]:
+        """
+        Get the node type in the target space, None if the type is unknown or has no counterpart.
+        """
+        row = self.type_rows.get(node_type)
+        return None if row is None else self._get_node_type(row, target_index)
+
+    def get_aid(self, aid: str, target_index: int) -> Optional[str]:
+        """
+        Get the short asset id (the last part of the type, e.g. 'texturesampler') in the target space.
+        """
+        row = self.aid_rows.get(aid)
+        if row is None:
+            return None
+        node_type = self._get_node_type(row, target_index)
+        return node_type.split('.')[-1] if node_type else None
+
+    def get_slot(self, node_type: str, slot: str, target_index: int) -> Optional[str]:
+        """
+        Get the port id in the target space of a port of #node_type, None if unknown.
+        """
+        row = self.type_rows.get(node_type)
+        if row is None:
+            return None
+        port = self.slot_rows[row].get(slot)
+        return None if port is None else self._get_cell(self.maps[row][-1][port], target_index)
+
+
+def guess_nodespace(data: Any, nodespaces: Iterable[str], keywords: Iterable[str] = NODESPACE_KEYWORDS) -> Optional[str]:
+    """
+    Guess the node space of a description in one walk over its keys and string values.
+
+    Args:
+        data (Any): the description, nested dicts and lists.
+        nodespaces (Iterable[str]): the node space of each keyword, in the order of #keywords.
+        keywords (Iterable[str], optional): the lower case keywords. Defaults to NODESPACE_KEYWORDS.
+
+    Returns:
+        Optional[str]: the node space of the first keyword found, by keyword order.
+    """
+    keywords = list(keywords)
+    found = [False] * len(keywords)
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            texts = list(item.keys())
+            for value in item.values():
+                if isinstance(value, str):
+                    texts.append(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        elif isinstance(item, list):
+            texts = [value for value in item if isinstance(value, str)]
+            stack.extend(value for value in item if isinstance(value, (dict, list)))
+        else:
+            continue
+        for text in texts:
+            text = str(text).lower()
+            for index, keyword in enumerate(keywords):
+                if not found[index] and keyword in text:
+                    found[index] = True
+        if found[0]:
+            break
+    for index, nodespace in enumerate(nodespaces):
+        if found[index]:
+            return nodespace
+    return None
+
+
+__all__ = [
+    "DescriptionTable",
+    "guess_nodespace",
+]
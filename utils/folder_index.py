@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+A one pass index of the names in a texture folder for the PBR lookups of ``TextureHelper``:
+the folder is listed once and the channel candidates are set lookups instead of ``os.path.exists`` calls.
+The indexes are cached per folder and rebuilt when the folder mtime changes. This module has no c4d import.
+
+贴图文件夹索引: 只列出一次目录, 通道匹配用集合查询代替逐个os.path.exists.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+FOLDER_INDEX_CACHE_SIZE: int = 256
+
+
+class FolderIndex:
+    """
+    The entry names of a folder: the exact names (as ``os.listdir``) and the names normalized
+    with ``os.path.normcase``, which answer like ``os.path.exists`` (case insensitive on Windows).
+    """
+
+    def __init__(self, folder: str, mtime: int = None, names: Iterable[str] = None) -> None:
+        self.folder: str = folder
+        self.mtime: Optional[int] = mtime
+        if names is None:
+            names = os.listdir(folder or ".")
+        self.names: frozenset[str] = frozenset(names)
+        self.normalized: frozenset[str] = frozenset(os.path.normcase(name) for name in self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} of {self.folder} with {len(self.names)} names"
+
+    def has(self, name: str) -> bool:
+        """Like ``os.path.exists(os.path.join(folder, name))``."""
+        return os.path.normcase(name) in self.normalized
+
+    def has_exact(self, name: str) -> bool:
+        """Like ``name in os.listdir(folder)``."""
+        return name in self.names
+
+
+class FolderIndexCache:
+    """
+    A LRU of FolderIndex keyed by folder, an index is reused while the folder mtime is unchanged.
+    """
+
+    def __init__(self, max_size: int = FOLDER_INDEX_CACHE_SIZE) -> None:
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._items: OrderedDict[str, FolderIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, folder: str) -> FolderIndex:
+        """
+        Get the index of the folder, the folder is listed only if it changed.
+
+        Args:
+            folder (str): the folder path.
+
+        Returns:
+            FolderIndex: the index.
+        """
+        key = os.path.normcase(os.path.abspath(folder or "."))
+        mtime = os.stat(folder or ".").st_mtime_ns
+        with self._lock:
+            index = self._items.get(key)
+            if index is not None and index.mtime == mtime:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return index
+        index = FolderIndex(folder, mtime)
+        with self._lock:
+            self.misses += 1
+            self._items[key] = index
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+
+# ====================================================
+# PBR lookups / PBR贴图匹配
+# ====================================================
+
+def find_keyword_textures(index: FolderIndex, folder: str, stem: str, all_keys: list[str],
+                          key_data: dict[str, list[str]], ext_list: list[str]) -> tuple[list[str], list[str], str]:
+    """
+    Find the textures of the other channels of a texture: every keyword found in #stem is replaced
+    by every keyword, in the order of ``TextureHelper.get_texture_data``.
+
+    Args:
+        index (FolderIndex): the index of #folder.
+        folder (str): the folder of the texture.
+        stem (str): the texture file name without extension.
+        all_keys (list[str]): all the keywords.
+        key_data (dict[str, list[str]]): channel -> keywords.
+        ext_list (list[str]): the texture extensions.
+
+    Returns:
+        tuple[list[str], list[str], str]: the channels, the texture paths and the name before the keyword.
+    """
+    # keyword -> the channels it belongs to
+    key_channels: dict[str, list[str]] = {}
+    for channel, keys in key_data.items():
+        for key in keys:
+            channels = key_channels.setdefault(key, [])
+            if channel not in channels:
+                channels.append(channel)
+
+    channels: list[str] = []
+    textures: list[str] = []
+    name = ""
+    for found in all_keys:
+        if not found or found not in stem:
+            continue
+        words = stem.split(found)
+        for key in all_keys:
+            if not key or key not in key_channels:
+                continue
+            base = f"{words[0]}{key}{words[1]}"
+            exts = [ext for ext in ext_list if index.has(base + ext)]
+            if not exts:
+                continue
+            for channel in key_channels[key]:
+                for ext in exts:
+                    channels.append(channel)
+                    textures.append(os.path.join(folder, base + ext))
+                    name = words[0]
+    return channels, textures, name
+
+
+def find_channel_textures(index: FolderIndex, folder: str, name: str, key_data: dict[str, list[str]],
+                          ext_list: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Find the ``{name}_{keyword}{ext}`` textures of every channel, in the order of ``TextureHelper.PBRFromPath``.
+
+    Returns:
+        tuple[list[str], list[str]]: the channels and the texture paths.
+    """
+    channels: list[str] = []
+    textures: list[str] = []
+    for channel, keys in key_data.items():
+        for key in keys:
+            for ext in ext_list:
+                file = f"{name}_{key}{ext}"
+                if index.has_exact(file):
+                    channels.append(str(channel))
+                    textures.append(os.path.join(folder, file))
+    return channels, textures
+
+
+g_folder_index_cache = FolderIndexCache()
+
+
+__all__ = [
+    "FolderIndex",
+    "FolderIndexCache",
+    "find_keyword_textures",
+    "find_channel_textures",
+    "g_folder_index_cache",
+]
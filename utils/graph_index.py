@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""Snapshot index for node graphs, used by NodeGraghHelper to answer repeated queries without walking the graph."""
+from collections import defaultdict
+from typing import Any, Callable, Iterable, Optional
+
+
+class GraphIndex:
+    """
+    A one-pass snapshot of a node graph.
+
+    The index only relies on a few duck-typed calls (``GetChildren``, ``GetInputs``, ``GetOutputs``),
+    the rest is given by the host helper as callables, so it can be built from a maxon graph or from
+    a pure python fake graph.
+
+    GraphIndex 在一次遍历中记录 asset id -> 节点, 节点 -> 输入/输出端口, 端口 -> 连接端口,
+    之后的查询都是字典查找.
+
+    Example:
+
+        index = GraphIndex()
+        index.Build(root, get_asset_id=helper.GetAssetId, get_connections=lambda port: ...)
+        index.GetNodes("com.redshift3d.redshift4c4d.nodes.core.texturesampler")
+
+    """
+
+    def __init__(self, key: Callable[[Any], Any] = None) -> None:
+        """
+        Args:
+            key (Callable, optional): return a hashable key for a node or a port. Defaults to the object itself.
+        """
+        self._key: Callable[[Any], Any] = key if key is not None else (lambda item: item)
+        self.Clear()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: Any) -> bool:
+        return self._key(node) in self._nodes
+
+    def __str__(self):
+        return (f"A {self.__class__.__name__} Instance with {len(self._nodes)} nodes and {self.GetConnectionCount()} connections")
+
+    #=============================================
+    # Build
+    #=============================================
+
+    def Clear(self) -> None:
+        """
+        Remove all the data of the index.
+        """
+        self._nodes: dict = {}                      # node key -> node
+        self._assets: dict = defaultdict(list)      # asset id -> [node]
+        self._node_assets: dict = {}                # node key -> asset id
+        self._inputs: dict = {}                     # node key -> [in port]
+        self._outputs: dict = {}                    # node key -> [out port]
+        self._owners: dict = {}                     # port key -> node
+        self._links: dict = defaultdict(list)       # port key -> [connected port]
+
+    def Build(self, root: Any, get_asset_id: Callable[[Any], str], get_connections: Callable[[Any], Iterable[Any]],
+              is_node: Callable[[Any], bool] = None, get_owner: Callable[[Any], Any] = None) -> "GraphIndex":
+        """
+        Build the index from the children of the root in one pass.
+
+        Args:
+            root (Any): the graph root, the children of the root are the indexed nodes.
+            get_asset_id (Callable): return the asset id of a node.
+            get_connections (Callable): return the out ports connected to an in port.
+            is_node (Callable, optional): filter the children of the root. Defaults to None.
+            get_owner (Callable, optional): return the node of a port that not in the index. Defaults to None.
+
+        Returns:
+            GraphIndex: the index self.
+        """
+        self.Clear()
+
+        for node in root.GetChildren():
+            if is_node is not None and not is_node(node):
+                continue
+            self.AddNode(node, get_asset_id(node))
+
+        for inputs in list(self._inputs.values()):
+            for inPort in inputs:
+                for outPort in get_connections(inPort):
+                    if self._key(outPort) not in self._owners and get_owner is not None:
+                        self._owners[self._key(outPort)] = get_owner(outPort)
+                    self._Link(outPort, inPort)
+        return self
+
+    #=============================================
+    # Update
+    #=============================================
+
+    def AddNode(self, node: Any, asset_id: str, inputs: list = None, outputs: list = None) -> None:
+        """
+        Add a node and its ports to the index.
+
+        Args:
+            node (Any): the node
+            asset_id (str): the asset id of the node
+            inputs (list, optional): the in ports. Defaults to ``node.GetInputs().GetChildren()``.
+            outputs (list, optional): the out ports. Defaults to ``node.GetOutputs().GetChildren()``.
+        """
+        node_key = self._key(node)
+        if node_key in self._nodes:
+            self.RemoveNode(node)
+
+        if inputs is None:
+            inputs = list(node.GetInputs().GetChildren())
+        if outputs is None:
+            outputs = list(node.GetOutputs().GetChildren())
+
+        self._nodes[node_key] = node
+        self._node_assets[node_key] = asset_id
+        self._assets[asset_id].append(node)
+        self._inputs[node_key] = list(inputs)
+        self._outputs[node_key] = list(outputs)
+        for port in self._inputs[node_key] + self._outputs[node_key]:
+            port_key = self._key(port)
+            self._owners[port_key] = node
+
+    def RemoveNode(self, node: Any) -> None:
+        """
+        Remove a node, its ports and all the connections on it from the index.
+
+        Args:
+            node (Any): the node
+        """
+        node_key = self._key(node)
+        if node_key not in self._nodes:
+            return
+
+        for port in self._inputs.pop(node_key, []) + self._outputs.pop(node_key, []):
+            self.RemovePortConnections(port)
+            port_key = self._key(port)
+            self._owners.pop(port_key, None)
+
+        asset_id = self._node_assets.pop(node_key)
+        nodes = self._assets[asset_id]
+        nodes[:] = [item for item in nodes if self._key(item) != node_key]
+        if not nodes:
+            del self._assets[asset_id]
+        del self._nodes[node_key]
+
+    def AddConnection(self, outPort: Any, inPort: Any) -> None:
+        """
+        Add a wire to the index, an in port only keep one wire like the graph does.
+
+        Args:
+            outPort (Any): the out port
+            inPort (Any): the in port
+        """
+        self.RemovePortConnections(inPort)
+        self._Link(outPort, inPort)
+
+    def RemoveConnection(self, outPort: Any, inPort: Any) -> None:
+        """
+        Remove a wire from the index.
+
+        Args:
+            outPort (Any): the out port
+            inPort (Any): the in port
+        """
+        out_key = self._key(outPort)
+        in_key = self._key(inPort)
+        self._Unlink(out_key, in_key)
+        self._Unlink(in_key, out_key)
+
+    def RemovePortConnections(self, port: Any) -> None:
+        """
+        Remove all wires on the port from the index.
+
+        Args:
+            port (Any): the port
+        """
+        port_key = self._key(port)
+        for other in self._links.pop(port_key, []):
+            self._Unlink(self._key(other), port_key)
+
+    def _Link(self, outPort: Any, inPort: Any) -> None:
+        out_key = self._key(outPort)
+        in_key = self._key(inPort)
+        if all(self._key(port) != in_key for port in self._links[out_key]):
+            self._links[out_key].append(inPort)
+        if all(self._key(port) != out_key for port in self._links[in_key]):
+            self._links[in_key].append(outPort)
+
+    def _Unlink(self, port_key: Any, other_key: Any) -> None:
+        links = self._links.get(port_key)
+        if not links:
+            return
+        links[:] = [port for port in links if self._key(port) != other_key]
+        if not links:
+            del self._links[port_key]
+
+    #=============================================
+    # Query
+    #=============================================
+
+    def GetAllNodes(self) -> list:
+        """
+        Returns:
+            list: all the nodes in the index, in the graph order.
+        """
+        return list(self._nodes.values())
+
+    def GetNodes(self, asset_id: str) -> list:
+        """
+        Args:
+            asset_id (str): the asset id
+
+        Returns:
+            list: the nodes of the asset id.
+        """
+        return list(self._assets.get(asset_id, []))
+
+    def GetAssetId(self, node: Any) -> Optional[str]:
+        """
+        Args:
+            node (Any): the node
+
+        Returns:
+            Optional[str]: the asset id of the node, None if the node is not in the index.
+        """
+        return self._node_assets.get(self._key(node))
+
+    def GetInputs(self, node: Any) -> list:
+        """
+        Args:
+            node (Any): the node
+
+        Returns:
+            list: the in ports of the node.
+        """
+        return list(self._inputs.get(self._key(node), []))
+
+    def GetOutputs(self, node: Any) -> list:
+        """
+        Args:
+            node (Any): the node
+
+        Returns:
+            list: the out ports of the node.
+        """
+        return list(self._outputs.get(self._key(node), []))
+
+    def GetOwner(self, port: Any) -> Any:
+        """
+        Args:
+            port (Any): the port
+
+        Returns:
+            Any: the node of the port, None if the port is not in the index.
+        """
+        return self._owners.get(self._key(port))
+
+    def GetConnectedPorts(self, port: Any) -> list:
+        """
+        Args:
+            port (Any): the port
+
+        Returns:
+            list: the ports connected to the port.
+        """
+        return list(self._links.get(self._key(port), []))
+
+    def IsPortConnected(self, port: Any) -> bool:
+        """
+        Args:
+            port (Any): the port
+
+        Returns:
+            bool: True if any wire on the port.
+        """
+        return bool(self._links.get(self._key(port)))
+
+    def IsNodeConnected(self, node: Any) -> bool:
+        """
+        Args:
+            node (Any): the node
+
+        Returns:
+            bool: True if any wire on the ports of the node.
+        """
+        node_key = self._key(node)
+        for port in self._inputs.get(node_key, []) + self._outputs.get(node_key, []):
+            if self._links.get(self._key(port)):
+                return True
+        return False
+
+    def GetConnections(self) -> list[list]:
+        """
+        Get all the wires like ``NodeGraghHelper.GetAllConnections``.
+
+        Returns:
+            list[list]: the list of [source node, out port, target node, in port].
+        """
+        connections = []
+        for node_key, inputs in self._inputs.items():
+            node = self._nodes[node_key]
+            for inPort in inputs:
+                for outPort in self._links.get(self._key(inPort), []):
+                    connections.append([self._owners.get(self._key(outPort)), outPort, node, inPort])
+        return connections
+
+    def GetConnectionCount(self) -> int:
+        """
+        Returns:
+            int: the count of wires in the index.
+        """
+        return sum(len(self._links.get(self._key(port), [])) for inputs in self._inputs.values() for port in inputs)
+
+
+__all__ = [
+    "GraphIndex",
+]
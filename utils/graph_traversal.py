@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Iterative graph traversal used by NodeGraghHelper, no recursion and each node is expanded only once."""
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+# get_edges(node) -> [(edge, next_node), ...]
+EdgeGetter = Callable[[Any], Iterable[tuple[Any, Any]]]
+
+
+def _identity(item: Any) -> Any:
+    return item
+
+
+def IterTraverse(start: Any, get_edges: EdgeGetter, key: Callable[[Any], Any] = None,
+                 depth_first: bool = True, max_depth: Optional[int] = None) -> Iterator[tuple[Any, Any, int]]:
+    """
+    Walk the graph from the start node and yield every edge once.
+
+    The depth first mode keeps the pre-order of a recursive walk, the breadth first mode
+    yields the edges level by level. A node is expanded only once, so shared sub trees and
+    cycles are visited once and the depth of the graph is not limited by the recursion limit.
+    With a ``max_depth`` the depth first mode expands a node again when a shorter path reaches it,
+    so the nodes within the limit are all reached, the edges after it may be yielded again.
+
+    遍历引擎: 使用visited集合, 每个节点只展开一次, 不使用递归 (限制深度时, 更短的路径会再次展开).
+
+    Args:
+        start (Any): the start node, it is not yielded.
+        get_edges (Callable): return the ``(edge, next_node)`` pairs of a node.
+        key (Callable, optional): return a hashable key for a node. Defaults to the node itself.
+        depth_first (bool, optional): True for DFS, False for BFS. Defaults to True.
+        max_depth (Optional[int], optional): the max depth to walk, 1 means only the direct edges. Defaults to None.
+
+    Yields:
+        Iterator[tuple[Any, Any, int]]: ``(edge, next_node, depth)``, the next node may be yielded by several edges.
+    """
+    if key is None:
+        key = _identity
+    if max_depth is not None and max_depth < 1:
+        return
+
+    visited: set = {key(start)}
+    # the shallowest depth a node is reached at, a depth first walk can reach it at the limit first
+    depths: dict = {key(start): 0}
+
+    if depth_first:
+        stack: list = [(iter(get_edges(start)), 1)]
+        while stack:
+            edges, depth = stack[-1]
+            item = next(edges, None)
+            if item is None:
+                stack.pop()
+                continue
+            edge, next_node = item
+            yield edge, next_node, depth
+            next_key = key(next_node)
+            if max_depth is None:
+                if next_key in visited:
+                    continue
+                visited.add(next_key)
+                stack.append((iter(get_edges(next_node)), depth + 1))
+            else:
+                if depths.get(next_key, max_depth + 1) <= depth:
+                    continue
+                depths[next_key] = depth
+                if depth < max_depth:
+                    stack.append((iter(get_edges(next_node)), depth + 1))
+    else:
+        queue: deque = deque([(start, 1)])
+        while queue:
+            node, depth = queue.popleft()
+            for edge, next_node in get_edges(node):
+                yield edge, next_node, depth
+                next_key = key(next_node)
+                if next_key in visited:
+                    continue
+                visited.add(next_key)
+                if max_depth is None or depth < max_depth:
+                    queue.append((next_node, depth + 1))
+
+
+def IterNodes(start: Any, get_edges: EdgeGetter, key: Callable[[Any], Any] = None,
+              depth_first: bool = True, max_depth: Optional[int] = None,
+              node_filter: Callable[[Any], bool] = None) -> Iterator[Any]:
+    """
+    Walk the graph from the start node and yield every reached node once.
+
+    Args:
+        start (Any): the start node, it is not yielded.
+        get_edges (Callable): return the ``(edge, next_node)`` pairs of a node.
+        key (Callable, optional): return a hashable key for a node. Defaults to the node itself.
+        depth_first (bool, optional): True for DFS, False for BFS. Defaults to True.
+        max_depth (Optional[int], optional): the max depth to walk. Defaults to None.
+        node_filter (Callable, optional): only yield the nodes pass the filter, the walk still go through the others. Defaults to None.
+
+    Yields:
+        Iterator[Any]: the reached nodes
+    """
+    if key is None:
+        key = _identity
+    seen: set = set()
+    for _, node, _ in IterTraverse(start, get_edges, key, depth_first, max_depth):
+        node_key = key(node)
+        if node_key in seen:
+            continue
+        seen.add(node_key)
+        if node_filter is None or node_filter(node):
+            yield node
+
+
+__all__ = [
+    "IterTraverse",
+    "IterNodes",
+]
@@ -1,9 +1,12 @@
 import os
 import re
-from collections import defaultdict
+import bisect
+import threading
+from array import array
+from collections import defaultdict, OrderedDict
 from pprint import pp
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Union
 from pathlib import Path
 
 
@@ -14,21 +17,221 @@ Description:
 
 This class is used to analyze image sequences in a folder. It can find all the image sequences in the folder and sort them by their prefix and number. It can also get a specific frame of the sequence by its number.
 
+The folder is scanned once by a SequenceIndex (cached by the folder mtime), all the ImageSequence of the same folder share it.
+
 Usage:
 
 image_path = r'D:\tex\test_something_demo0016.exr'  # replace with your image path
 
 analyzer = ImageSequence(image_path)
 print(analyzer)  # print the image sequence information
+
+index = SequenceIndex.get(r'D:\render')  # all the sequences of a folder
+for sequence in index:
+    print(sequence, sequence.gaps)
 """
 
+SEQUENCE_PATTERN: str = r'(.+?)(\d+)\.(jpg|png|jpeg|tif|tiff|hdr|exr|tx|tga|psd|psb)'
+SEQUENCE_INDEX_CACHE_SIZE: int = 64
+SEQUENCE_MASK_LIMIT: int = 1 << 20
+
+
+@dataclass
+class Sequence:
+    """
+    One image sequence of a folder: ``{prefix}{frame:0{padding}d}.{extension}``.
+    The frame numbers are kept sorted in an ``array('q')`` (a list for the numbers over 64 bits, e.g. a
+    long date stamp), the names only when they don't follow the padding.
+    """
+    folder: str
+    prefix: str
+    extension: str
+    padding: int
+    frames: Union[array, list[int]]
+    _names: Optional[list[str]] = field(default=None, repr=False)
+    _mask: Optional[bytearray] = field(default=None, repr=False)
+
+    @property
+    def key(self) -> str:
+        return f"{self.prefix}.{self.extension}"
+
+    @property
+    def start(self) -> int:
+        return self.frames[0] if self.frames else 0
+
+    @property
+    def end(self) -> int:
+        return self.frames[-1] if self.frames else 0
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __contains__(self, frame: int) -> bool:
+        return self.has_frame(frame)
+
+    def __str__(self) -> str:
+        return f"{self.prefix}[{'#' * self.padding}].{self.extension} | {self.start} - {self.end} | {len(self.frames)} frames"
+
+    def _get_mask(self) -> Optional[bytearray]:
+        # one byte per frame of [start, end], built on the first lookup, None for a too sparse sequence
+        if self._mask is None:
+            span = self.end - self.start + 1 if self.frames else 0
+            if span > max(SEQUENCE_MASK_LIMIT, 4 * len(self.frames)):
+                return None
+            mask = bytearray(span)
+            start = self.start
+            for frame in self.frames:
+                mask[frame - start] = 1
+            self._mask = mask
+        return self._mask
+
+    def has_frame(self, frame: int) -> bool:
+        """O(1) check of a frame number (O(log n) for a very sparse sequence)."""
+        if not self.frames or frame < self.start or frame > self.end:
+            return False
+        mask = self._get_mask()
+        if mask is None:
+            position = bisect.bisect_left(self.frames, frame)
+            return self.frames[position] == frame
+        return bool(mask[frame - self.start])
+
+    def get_name(self, frame: int) -> Optional[str]:
+        """
+        Get the file name of a frame number in O(1), None if the frame is missing.
+        """
+        if not self.has_frame(frame):
+            return None
+        if self._names is not None:
+            return self._names[bisect.bisect_left(self.frames, frame)]
+        return f"{self.prefix}{frame:0{self.padding}d}.{self.extension}"
+
+    def get_frame(self, frame: int) -> Optional[str]:
+        """
+        Get the path of a frame number, None if the frame is missing.
+        """
+        name = self.get_name(frame)
+        return os.path.join(self.folder, name) if name else None
+
+    def get_names(self) -> list[str]:
+        """All the file names sorted by frame."""
+        if self._names is not None:
+            return list(self._names)
+        return [f"{self.prefix}{frame:0{self.padding}d}.{self.extension}" for frame in self.frames]
+
+    @property
+    def gaps(self) -> list[tuple[int, int]]:
+        """The missing frame ranges (first, last) between start and end."""
+        result = []
+        for previous, frame in zip(self.frames, self.frames[1:]):
+            if frame - previous > 1:
+                result.append((previous + 1, frame - 1))
+        return result
+
+    def missing_frames(self, start: int = None, end: int = None) -> list[int]:
+        """
+        The missing frame numbers in [start, end], defaults to the range of the sequence.
+        """
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        return [frame for frame in range(start, end + 1) if not self.has_frame(frame)]
+
+
+def _frame_array(frames: list[int]) -> Union[array, list[int]]:
+    # a digit run can be any length, e.g. DSC20231012153045.jpg, keep a list when it doesn't fit 64 bits
+    try:
+        return array('q', frames)
+    except OverflowError:
+        return frames
+
+
+class SequenceIndex:
+    """
+    All the image sequences of a folder, the folder is listed and matched once.
+
+    ``SequenceIndex.get(folder)`` shares the index of a folder until its mtime changes.
+    """
+
+    _cache: OrderedDict = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, folder: str, pattern: str = SEQUENCE_PATTERN) -> None:
+        self.folder: str = folder
+        self.pattern: str = pattern
+        self.mtime: int = os.stat(folder or ".").st_mtime_ns
+        self.sequences: dict[str, Sequence] = {}
+        self._scan()
+
+    def __len__(self) -> int:
+        return len(self.sequences)
+
+    def __iter__(self):
+        return iter(self.sequences.values())
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} of {self.folder} with {len(self.sequences)} sequences"
+
+    def _scan(self) -> None:
+        regex = re.compile(self.pattern, re.I)
+        groups: dict[str, list[tuple[int, str, str]]] = defaultdict(list)
+        with os.scandir(self.folder or ".") as entries:
+            for entry in entries:
+                match = regex.match(entry.name)
+                if match:
+                    prefix, number, extension = match.groups()
+                    groups[f"{prefix}.{extension}"].append((int(number), number, entry.name))
+
+        for key, items in groups.items():
+            items.sort()
+            prefix, extension = key.rsplit(".", 1)
+            padding = min(len(number) for _, number, _ in items)
+            frames = _frame_array([frame for frame, _, _ in items])
+            uniform = all(name == f"{prefix}{frame:0{padding}d}.{extension}" for frame, _, name in items)
+            self.sequences[key] = Sequence(self.folder, prefix, extension, padding, frames,
+                                           None if uniform else [name for _, _, name in items])
+
+    def find(self, image_name: str) -> Optional[Sequence]:
+        """
+        Get the sequence of an image file name.
+        """
+        match = re.match(self.pattern, os.path.basename(image_name), re.I)
+        if not match:
+            return None
+        prefix, _, extension = match.groups()
+        return self.sequences.get(f"{prefix}.{extension}")
+
+    @classmethod
+    def get(cls, folder: str, pattern: str = SEQUENCE_PATTERN) -> "SequenceIndex":
+        """
+        Get the shared index of a folder, it is scanned again only when the folder mtime changed.
+        """
+        key = (os.path.normcase(os.path.abspath(folder or ".")), pattern)
+        mtime = os.stat(folder or ".").st_mtime_ns
+        with cls._lock:
+            index = cls._cache.get(key)
+            if index is not None and index.mtime == mtime:
+                cls._cache.move_to_end(key)
+                return index
+        index = cls(folder, pattern)
+        with cls._lock:
+            cls._cache[key] = index
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > SEQUENCE_INDEX_CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return index
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._lock:
+            cls._cache.clear()
+
+
 @dataclass
 class ImageSequence:
 
     image_path: str
 
     # override if needed
-    pattern: str = r'(.+?)(\d+)\.(jpg|png|jpeg|tif|tiff|hdr|exr|tx|tga|psd|psb)'
+    pattern: str = SEQUENCE_PATTERN
     sequences: Dict[str, List[Tuple[int, str]]] = field(default_factory=lambda: defaultdict(list))
 
     def __post_init__(self) -> None:
@@ -37,6 +240,7 @@ class ImageSequence:
         self.extension = os.path.splitext(self.image_path)[1][1:]
         self.folder_path = os.path.dirname(self.image_path)
         self.image_name = os.path.basename(self.image_path)
+        self.sequence: Optional[Sequence] = None
         self.result: list = self.get_sequence()
 
     @property
@@ -49,22 +253,19 @@ class ImageSequence:
     
     @property
     def start(self) -> int:
-        if len(self.result) > 0:
-            _, start, _ = re.match(self.pattern, self.result[0], re.I).groups()
-            return start
-        return 0
+        return self.sequence.start if self.sequence else 0
     
     @property
     def end(self) -> int:
-        if len(self.result) > 0:
-            _, end, _ = re.match(self.pattern, self.result[-1], re.I).groups()
-            return end
-        return 0
+        return self.sequence.end if self.sequence else 0
 
     @property
     def duration(self) -> str:
         if len(self.result) > 0:
-            return f'{self.start} - {self.end}'
+            # the frame numbers as written in the file names, e.g. 0001 - 0100
+            first = re.match(self.pattern, self.result[0], re.I).group(2)
+            last = re.match(self.pattern, self.result[-1], re.I).group(2)
+            return f'{first} - {last}'
         return 'unknown'
     
     def __str__(self) -> str:
@@ -73,36 +274,16 @@ class ImageSequence:
         else:
             return f'No Image Sequence Found of {self.image_path}'
 
-    def _analyze_sequences(self) -> None:
-
-        images = [img for img in os.listdir(self.folder_path) if img.lower().endswith(self.extension)]
-
-        for image in images:
-            match = re.match(self.pattern, image, re.I)
-            if match:
-                prefix, number, extension = match.groups()
-                sequence_key = f"{prefix}.{extension}"
-                self.sequences[sequence_key].append((int(number), image))
-        
-        # Sort
-        for key in self.sequences:
-            self.sequences[key].sort()
-
     def get_sequence(self) -> list[str]:
         self.sequences.clear()
         
-        # analyze all sequences
-        self._analyze_sequences()
-        
-        # match the image name
-        match = re.match(self.pattern, self.image_name, re.I)
-        
-        if match:
-            prefix, number, extension = match.groups()
-            sequence_key = f"{prefix}.{extension}"
-            return [img for _, img in self.sequences.get(sequence_key, [])]
-        else:
+        # the shared index of the folder, scanned once
+        self.sequence = SequenceIndex.get(self.folder_path, self.pattern).find(self.image_name)
+        if self.sequence is None:
             return []
+        names = self.sequence.get_names()
+        self.sequences[self.sequence.key] = list(zip(self.sequence.frames, names))
+        return names
 
     def get_frame(self, frame: int) -> str:
         if frame < 0 or frame >= len(self.result):
@@ -111,3 +292,15 @@ class ImageSequence:
             if path.exists():
                 return path
         return ''
+
+    def get_frame_path(self, frame: int) -> Optional[str]:
+        """
+        Get the path of a frame number in O(1), None if the frame is missing.
+        """
+        return self.sequence.get_frame(frame) if self.sequence else None
+
+    def missing_frames(self, start: int = None, end: int = None) -> list[int]:
+        """
+        The missing frame numbers in [start, end], defaults to the range of the sequence.
+        """
+        return self.sequence.missing_frames(start, end) if self.sequence else []
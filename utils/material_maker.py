@@ -1,8 +1,10 @@
 import c4d
 import maxon
 import os
+import time
 from typing import Optional, Any
 from dataclasses import dataclass, field
+from .tracer import trace
 from Renderer.constants.common_id import ID_REDSHIFT, ID_ARNOLD, ID_OCTANE, ID_VRAY, ID_CORONA, ID_CENTILEO
 from Renderer import EasyTransaction
 if c4d.plugins.FindPlugin(ID_REDSHIFT, type=c4d.PLUGINTYPE_ANY) is not None:
@@ -27,28 +29,45 @@ from .pbr_helper import (
     GetPackageNames,
     pbr_from_file,
     pbr_from_folder,
+    PBRLibraryScanner,
     IMAGE_EXTENSIONS
 )
+from .pbr_description import (
+    RS_NODESPACE,
+    AR_NODESPACE,
+    VR_NODESPACE,
+    is_valid_path,
+    ArnoldDescription,
+    RedshiftDescription,
+    VRayDescription,
+    DescriptionCache,
+    g_description_cache,
+    BuildDescriptions
+)
 
 C4D_VERSION: int = c4d.GetC4DVersion()
 
-RS_NODESPACE: str = "com.redshift3d.redshift4c4d.class.nodespace"
-AR_NODESPACE: str = "com.autodesk.arnold.nodespace" 
-VR_NODESPACE: str = "com.chaos.class.vray_node_renderer_nodespace"
+# 渲染器 -> 节点空间
+# Render engine -> node space of the description materials
+ENGINE_NODESPACES: dict[int, str] = {
+    ID_ARNOLD: AR_NODESPACE,
+    ID_REDSHIFT: RS_NODESPACE,
+    ID_VRAY: VR_NODESPACE,
+}
 
 def GetRenderEngine(document: c4d.documents.BaseDocument = None) -> int:
     """Get the current render engine ID."""
     document = document or c4d.documents.GetActiveDocument()
     return document.GetActiveRenderData()[c4d.RDATA_RENDERENGINE]
 
-def is_valid_path(path: Any) -> bool:
-    """Check if a path exists."""
-    if path is None:
-        return False
-    return os.path.exists(str(path))
-
-def _ApplyPBRDescription(material: c4d.BaseMaterial, nodespace: str, data: dict, doc: c4d.documents.BaseDocument) -> bool:
-    """Internal helper to apply graph description to a material."""
+@trace
+def _ApplyPBRDescription(material: c4d.BaseMaterial, nodespace: str, data: dict, doc: c4d.documents.BaseDocument,
+                         undo: bool = False, active: bool = True) -> bool:
+    """
+    Internal helper to apply graph description to a material.
+    With ``undo`` the inserted material is added to the open undo step,
+    ``active=False`` leaves the active material to the caller (batches).
+    """
     if C4D_VERSION < 2024200:
         return False
     
@@ -61,8 +80,11 @@ def _ApplyPBRDescription(material: c4d.BaseMaterial, nodespace: str, data: dict,
     
     if material.GetDocument() is None:
         doc.InsertMaterial(material)
+        if undo:
+            doc.AddUndo(c4d.UNDOTYPE_NEWOBJ, material)
     
-    doc.SetActiveMaterial(material)
+    if active:
+        doc.SetActiveMaterial(material)
     material.Update(True, True)
     return True
 
@@ -72,100 +94,21 @@ def _ApplyPBRDescription(material: c4d.BaseMaterial, nodespace: str, data: dict,
 
 def GetArnoldDescription(asset: PBRPackage) -> dict:
     """Returns Arnold Graph Description dictionary for a PBRPackage."""
-    data = {
-        "$type": "#com.autodesk.arnold.material",
-        "#<shader": { "$type": "#com.autodesk.arnold.shader.standard_surface" }
-    }
-    mat_desc = data["#<shader"]
-    if is_valid_path(asset.diffuse):
-        mat_desc["#<base_color"] = {
-            "$type": "#com.autodesk.arnold.shader.color_correct",
-            "#<input": {
-                "$type": "#com.autodesk.arnold.shader.image",
-                "#<filename": asset.diffuse, 
-                "#<multiply": {"$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.ao} if is_valid_path(asset.ao) else maxon.Vector(1, 1, 1)
-            }
-        }
-    if is_valid_path(asset.metalness): mat_desc["#<metalness"] = { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.metalness }
-    if is_valid_path(asset.roughness): mat_desc["#<specular_roughness"] = { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.roughness }
-    if is_valid_path(asset.alpha): mat_desc["#<opacity"] = { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.alpha }
-    if is_valid_path(asset.transmission): mat_desc["#<transmission_color"] = { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.transmission }
-    if is_valid_path(asset.emission): mat_desc["#<emission_color"] = { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.emission }
-    if is_valid_path(asset.normal):
-        mat_desc["#<normal"] = {
-            "$type": "#com.autodesk.arnold.shader.normal_map",
-            "#<input": { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.normal }
-        }
-    if is_valid_path(asset.displacement):
-        data["#<displacement"] = {
-            "$type": "#com.autodesk.arnold.shader.displacement",
-            "#<normal_displacement_input": { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.displacement }
-        }
-    return data
+    return g_description_cache.Get(asset, AR_NODESPACE, maxon.Vector(1, 1, 1))
 
 def GetRedshiftDescription(asset: PBRPackage) -> dict:
     """Returns Redshift Graph Description dictionary for a PBRPackage."""
-    data = {
-        "$type": "#~.output",
-        "#~.surface": { "$type": "#~.standardmaterial" }
-    }
-    mat_desc = data["#~.surface"]
-    if is_valid_path(asset.diffuse):
-        mat_desc["#~.base_color"] = {
-            "$type": "#~.rscolorcorrection",
-            "#~.input": {
-                "$type": "#~.texturesampler",
-                "#~.tex0/path": asset.diffuse,
-                "#~.color_multiplier": {"$type": "#~.texturesampler", "#~.tex0/path": asset.ao} if is_valid_path(asset.ao) else maxon.Vector(1, 1, 1)
-            }
-        }
-    if is_valid_path(asset.metalness): mat_desc["#~.metalness"] = { "$type": "#~.texturesampler", "#~.tex0/path": asset.metalness }
-    if is_valid_path(asset.roughness): mat_desc["#~.refl_roughness"] = { "$type": "#~.texturesampler", "#~.tex0/path": asset.roughness }
-    if is_valid_path(asset.alpha): mat_desc["#~.opacity_color"] = { "$type": "#~.texturesampler", "#~.tex0/path": asset.alpha }
-    if is_valid_path(asset.normal):
-        mat_desc["#~.bump_input"] = {
-            "$type": "#~.bumpmap", "#~.inputtype": 1,
-            "#~.input": { "$type": "#~.texturesampler", "#~.tex0/path": asset.normal }
-        }
-    if is_valid_path(asset.displacement):
-        data["#~.displacement"] = {
-            "$type": "#~displacement",
-            "#~.texmap": { "$type": "#~.texturesampler", "#~.tex0/path": asset.displacement }
-        }
-    return data
+    return g_description_cache.Get(asset, RS_NODESPACE, maxon.Vector(1, 1, 1))
 
 def GetVRayDescription(asset: PBRPackage) -> dict:
     """Returns VRay Graph Description dictionary for a PBRPackage."""
-    data = {
-        "$type": "#~.mtlsinglebrdf",
-        "#~.brdf": { "$type": "#~.brdfvraymtl" }
-    }
-    mat_desc = data["#~.brdf"]
-    if is_valid_path(asset.diffuse):
-        mat_desc["#~.diffuse"] = {
-            "$type": "#~.colorcorrection",
-            "#~.texture_map": {
-                "$type": "#~.texbitmap",
-                "#~.file": asset.diffuse,
-                "#~.color_mult": {"$type": "#~.texbitmap", "#~.file": asset.ao} if is_valid_path(asset.ao) else maxon.Vector(1, 1, 1)
-            }
-        }
-    if is_valid_path(asset.metalness): mat_desc["#~.metalness"] = { "$type": "#~.texbitmap", "#~.file": asset.metalness }
-    if is_valid_path(asset.roughness):
-        mat_desc["#~.reflect_glossiness"] = { "$type": "#~.texbitmap", "#~.file": asset.roughness }
-        mat_desc["#~.option_use_roughness"] = True
-    if is_valid_path(asset.alpha): mat_desc["#~.opacity_color"] = { "$type": "#~.texbitmap", "#~.file": asset.alpha }
-    if is_valid_path(asset.normal):
-        mat_desc["#~.bump_map"] = {
-            "$type": "#~.texnormalbump", "#~.map_type": 1,
-            "#~.bump_tex_color": { "$type": "#~.texbitmap", "#~.file": asset.normal }
-        }
-    return data
+    return g_description_cache.Get(asset, VR_NODESPACE, maxon.Vector(1, 1, 1))
 
 # =========================================================
 # Description from Package
 # =========================================================
 
+@trace
 def ArnoldDescriptionFromPackage(folder: str, name: str, res: str = None, doc: Optional[c4d.documents.BaseDocument] = None) -> Optional[c4d.BaseMaterial]:
     doc = doc or c4d.documents.GetActiveDocument()
     maker = DescriptionMaterialMaker(folder, name, res)
@@ -176,6 +119,7 @@ def ArnoldDescriptionFromPackage(folder: str, name: str, res: str = None, doc: O
         return material
     return None
 
+@trace
 def RedshiftDescriptionFromPackage(folder: str, name: str, res: str = None, doc: Optional[c4d.documents.BaseDocument] = None) -> Optional[c4d.BaseMaterial]:
     doc = doc or c4d.documents.GetActiveDocument()
     maker = DescriptionMaterialMaker(folder, name, res)
@@ -186,6 +130,7 @@ def RedshiftDescriptionFromPackage(folder: str, name: str, res: str = None, doc:
         return material
     return None
 
+@trace
 def VRayDescriptionFromPackage(folder: str, name: str, res: str = None, doc: Optional[c4d.documents.BaseDocument] = None) -> Optional[c4d.BaseMaterial]:
     doc = doc or c4d.documents.GetActiveDocument()
     maker = DescriptionMaterialMaker(folder, name, res)
@@ -267,6 +212,7 @@ class DescriptionMaterialMaker:
             except (ValueError, TypeError): pass
         self._data = pbr_from_folder(self.folder, self.name, target_res)
 
+    @trace
     def MakeMaterial(self, doc: Optional[c4d.documents.BaseDocument] = None) -> Optional[c4d.BaseMaterial]:
         if C4D_VERSION < 2024200: return None
         if not self._data or not self._data.IsValid: return None
@@ -277,9 +223,115 @@ class DescriptionMaterialMaker:
         if engine == ID_VRAY: return VRayDescriptionFromPackage(self.folder, self.name, self.res, doc)
         return None
 
+@dataclass
+class BatchMaterialMaker:
+    """
+    Create the materials of a whole PBR library: scan -> describe -> apply.
+
+    The descriptions of all the packages are built up front (pure python, threaded with ``workers``),
+    then all the materials are created in one pass inside a single undo step.
+    ``timings`` keeps the seconds of each stage. The descriptions go through ``cache``
+    (the shared in-memory ``g_description_cache`` by default, None to build them all).
+
+    Example:
+        >>> maker = BatchMaterialMaker.FromLibrary("C:/Assets/PBR/", workers=8)
+        >>> materials = maker.MakeMaterials(doc)
+        >>> maker.timings
+        {'scan': 1.2, 'describe': 0.3, 'apply': 4.8}
+
+        >>> packages = PBRLibraryScanner("C:/Assets/PBR/").build()
+        >>> cache = DescriptionCache(path="C:/Cache/descriptions")
+        >>> BatchMaterialMaker(packages, nodespace=RS_NODESPACE, cache=cache).MakeMaterials(doc)
+    """
+    packages: dict[str, PBRPackage] = field(repr=False)
+    nodespace: Optional[str] = None
+    workers: int = 1
+    cache: Optional[DescriptionCache] = field(default_factory=lambda: g_description_cache, repr=False)
+    timings: dict[str, float] = field(init=False, default_factory=dict)
+    _descriptions: Optional[list[tuple[PBRPackage, dict]]] = field(init=False, default=None, repr=False)
+
+    @classmethod
+    def FromLibrary(cls, root: str, nodespace: Optional[str] = None, workers: int = 1, index_path: Optional[str] = None,
+                    cache: Optional[DescriptionCache] = g_description_cache) -> "BatchMaterialMaker":
+        """
+        Scan the library and return a maker of all its packages.
+
+        Args:
+            root: The library folder.
+            nodespace: The node space, None to use the render engine of the document.
+            workers: The count of parallel shards and description threads.
+            index_path: The scan index file, see ``PBRLibraryScanner``.
+            cache: The description cache, None to build all the descriptions.
+        """
+        start = time.perf_counter()
+        packages = PBRLibraryScanner(root, index_path).build(workers)
+        maker = cls(packages, nodespace, workers, cache)
+        maker.timings["scan"] = time.perf_counter() - start
+        return maker
+
+    def GetNodespace(self, doc: Optional[c4d.documents.BaseDocument] = None) -> Optional[str]:
+        """The node space of the batch, from the render engine if not set."""
+        if self.nodespace is None:
+            self.nodespace = ENGINE_NODESPACES.get(GetRenderEngine(doc))
+        return self.nodespace
+
+    @trace
+    def Describe(self, doc: Optional[c4d.documents.BaseDocument] = None) -> list[tuple[PBRPackage, dict]]:
+        """
+        Build the descriptions of all the valid packages.
+
+        Returns:
+            [(package, description)] in the order of the packages, empty if the render engine has no description material.
+        """
+        nodespace = self.GetNodespace(doc)
+        if nodespace is None:
+            return []
+        start = time.perf_counter()
+        self._descriptions = BuildDescriptions(self.packages.values(), nodespace, maxon.Vector(1, 1, 1), self.workers, self.cache)
+        self.timings["describe"] = time.perf_counter() - start
+        return self._descriptions
+
+    @trace
+    def Apply(self, doc: Optional[c4d.documents.BaseDocument] = None) -> list[c4d.BaseMaterial]:
+        """
+        Create the materials of the descriptions in one undo step, ``Describe`` is called if needed.
+
+        Returns:
+            The new materials.
+        """
+        if C4D_VERSION < 2024200: return []
+        doc = doc or c4d.documents.GetActiveDocument()
+        descriptions = self._descriptions if self._descriptions is not None else self.Describe(doc)
+        if not descriptions: return []
+
+        start = time.perf_counter()
+        materials: list[c4d.BaseMaterial] = []
+        doc.StartUndo()
+        try:
+            for package, data in descriptions:
+                material = c4d.BaseMaterial(c4d.Mmaterial)
+                material.SetName(package.asset_name)
+                if _ApplyPBRDescription(material, self.nodespace, data, doc, undo=True, active=False):
+                    materials.append(material)
+        finally:
+            doc.EndUndo()
+
+        if materials:
+            doc.SetActiveMaterial(materials[-1])
+        self.timings["apply"] = time.perf_counter() - start
+        return materials
+
+    @trace
+    def MakeMaterials(self, doc: Optional[c4d.documents.BaseDocument] = None) -> list[c4d.BaseMaterial]:
+        """Describe and apply all the packages, see ``timings`` for the cost of each stage."""
+        doc = doc or c4d.documents.GetActiveDocument()
+        self.Describe(doc)
+        return self.Apply(doc)
+
 #=============================================
 # PBR Material from package (Legacy/Standard API)
 #=============================================
+@trace
 def ArnoldPbrFromPackage(folder: str, pbr_name: str, triplanar: bool = True, use_displacement: bool = False, doc: c4d.documents.BaseDocument=None) -> Optional[c4d.BaseMaterial]:
     if doc is None:
         doc = c4d.documents.GetActiveDocument()
@@ -374,6 +426,7 @@ def ArnoldPbrFromPackage(folder: str, pbr_name: str, triplanar: bool = True, use
     
     return tr.material
 
+@trace
 def RedshiftPbrFromPackage(folder: str, pbr_name: str, triplaner: bool = True, use_displacement: bool = False, doc: c4d.documents.BaseDocument=None) -> Optional[c4d.BaseMaterial]:
     if doc is None:
         doc = c4d.documents.GetActiveDocument()    
@@ -468,6 +521,7 @@ def RedshiftPbrFromPackage(folder: str, pbr_name: str, triplaner: bool = True, u
     
     return tr.material
 
+@trace
 def OctanePbrFromPackage(folder: str, pbr_name: str, triplaner: bool = True, use_displacement: bool = False, doc: c4d.documents.BaseDocument=None) -> Optional[c4d.BaseMaterial]:
     if doc is None:
         doc = c4d.documents.GetActiveDocument()
@@ -533,6 +587,7 @@ def OctanePbrFromPackage(folder: str, pbr_name: str, triplaner: bool = True, use
     
     return tr.material
 
+@trace
 def CoronaPbrFromPackage(folder: str, pbr_name: str, triplaner: bool = True, use_displacement: bool = False, doc: c4d.documents.BaseDocument=None) -> Optional[c4d.BaseMaterial]:
     if doc is None:
         doc = c4d.documents.GetActiveDocument()
@@ -586,6 +641,7 @@ def CoronaPbrFromPackage(folder: str, pbr_name: str, triplaner: bool = True, use
 
     return tr.material
 
+@trace
 def VrayPbrFromPackage(folder: str, pbr_name: str, triplaner: bool = True, use_displacement: bool = False, doc: c4d.documents.BaseDocument=None) -> Optional[c4d.BaseMaterial]:
     if doc is None:
         doc = c4d.documents.GetActiveDocument()
@@ -696,6 +752,7 @@ def VrayPbrFromPackage(folder: str, pbr_name: str, triplaner: bool = True, use_d
 #=============================================
 # PBR Material with PBR slots
 #=============================================
+@trace
 def ArnoldPbrMaterial(doc: c4d.documents.BaseDocument=None, name: str=None, albedo: str=None, ao: str=None, 
                       metalness: str=None, roughness: str=None, alpha: str=None, bump: str=None, normal: str=None, displacement: str=None, 
                       emission: str=None, transmission: str=None, sheen: str=None, specular: str=None, anisotropy: str=None,
@@ -783,6 +840,7 @@ def ArnoldPbrMaterial(doc: c4d.documents.BaseDocument=None, name: str=None, albe
         except Exception as e:
             raise RuntimeError (f"Unable to setup texture with {e}")
 
+@trace
 def RedshiftPbrMaterial(doc: c4d.documents.BaseDocument=None, name: str=None, albedo: str=None, ao: str=None, 
                       metalness: str=None, roughness: str=None, alpha: str=None, bump: str=None, normal: str=None, displacement: str=None, 
                       emission: str=None, transmission: str=None, sheen: str=None, specular: str=None, anisotropy: str=None, glossiness: str=None,
@@ -874,6 +932,7 @@ def RedshiftPbrMaterial(doc: c4d.documents.BaseDocument=None, name: str=None, al
         except Exception as e:
             raise RuntimeError (f"Unable to setup texture with {e}")
 
+@trace
 def VrayPbrMaterial(doc: c4d.documents.BaseDocument=None, name: str=None, albedo: str=None, ao: str=None, 
                       metalness: str=None, roughness: str=None, alpha: str=None, bump: str=None, normal: str=None, displacement: str=None, 
                       emission: str=None, transmission: str=None, sheen: str=None, specular: str=None, anisotropy: str=None, glossiness: str=None,
@@ -969,6 +1028,7 @@ def VrayPbrMaterial(doc: c4d.documents.BaseDocument=None, name: str=None, albedo
     except Exception as e:
         raise RuntimeError(f"Failed to import the textures {e}")
 
+@trace
 def OctanePbrMaterial(doc: c4d.documents.BaseDocument=None, name: str=None, albedo: str=None, ao: str=None, 
                       metalness: str=None, roughness: str=None, alpha: str=None, bump: str=None, normal: str=None, displacement: str=None, 
                       emission: str=None, transmission: str=None, sheen: str=None, specular: str=None, anisotropy: str=None,
@@ -1042,6 +1102,7 @@ def OctanePbrMaterial(doc: c4d.documents.BaseDocument=None, name: str=None, albe
     except Exception as e:
         pass
     
+@trace
 def CoronaPbrMaterial(doc: c4d.documents.BaseDocument=None, name: str=None, albedo: str=None, ao: str=None, 
                       metalness: str=None, roughness: str=None, alpha: str=None, bump: str=None, normal: str=None, displacement: str=None, 
                       emission: str=None, transmission: str=None, sheen: str=None, specular: str=None, anisotropy: str=None,
@@ -5,7 +5,10 @@ import functools
 from typing import Union, Optional, Any, Iterator
 from pprint import pprint
 from ..constants.common_id import *
-from .converter_ports import ConverterPorts
+from .converter_ports import ConverterPorts, GetConverterPorts
+from .graph_index import GraphIndex
+from .graph_traversal import IterTraverse, IterNodes
+from .tracer import trace, tracer
 import os, sys, json
 
 def iterTree(node: maxon.GraphNode) -> Iterator[maxon.GraphNode]:
@@ -14,6 +17,20 @@ def iterTree(node: maxon.GraphNode) -> Iterator[maxon.GraphNode]:
         for item in iterTree(child):
             yield item
 
+# 装饰器 方法直接修改了节点图(没有通过助手), 结束后废弃索引
+def EditGraph(func):
+    """
+    Decorate a helper method which changes the graph without the helper, e.g. ``port.Connect`` or
+    ``graph.AddChild``, the ``GraphIndex`` of the helper is dropped when the method returns.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self.InvalidateIndex()
+    return wrapper
+
 # Custom Helper for New Node Materials Graph
 class NodeGraghHelper:
 
@@ -27,14 +44,17 @@ class NodeGraghHelper:
     # Basic
     #=============================================
 
-    def __init__(self, material: c4d.BaseMaterial):
+    def __init__(self, material: c4d.BaseMaterial, use_index: bool = False):
         """
         A Custom NodeHelper for Node Material. Need a material to initalize the instance.
 
         Args:
             material (c4d.BaseMaterial): the BaseMaterial instance from the C4D document.
+            use_index (bool, optional): True to answer the graph queries from a ``GraphIndex`` snapshot. Defaults to False.
 
         """
+        self.use_index: bool = use_index
+        self._graphIndex: Optional[GraphIndex] = None
 
         self._support_renderers: list = [
             "net.maxon.nodespace.standard",
@@ -106,6 +126,76 @@ class NodeGraghHelper:
             return result
         return wrapper
 
+    #=============================================
+    # Index
+    #=============================================
+
+    # 索引的键, GraphNode用路径作为键 ==> ok
+    def _IndexKey(self, node: maxon.GraphNode) -> str:
+        return str(node.GetPath())
+
+    # 获取端口的连接, 开启索引时从索引读取 ==> ok
+    def _GetPortConnections(self, port: maxon.GraphNode, direction: int, use_index: bool = True) -> list[maxon.GraphNode]:
+        """
+        Get the ports connected to the given port, the index will be used if it is enabled.
+
+        Args:
+            port (maxon.GraphNode): the port
+            direction (int): maxon.PORT_DIR.INPUT or maxon.PORT_DIR.OUTPUT
+            use_index (bool, optional): False to read the graph, e.g. for a nested port the index doesn't hold. Defaults to True.
+
+        Returns:
+            list[maxon.GraphNode]: the connected ports
+        """
+        index = self.GetIndex() if use_index else None
+        if index is not None:
+            return index.GetConnectedPorts(port)
+        tracer.count("GetConnections")
+        return [other for other, wires in port.GetConnections(direction, None, maxon.Wires.All(), maxon.WIRE_MODE.ALL)]
+
+    # 创建索引 ==> ok
+    @trace
+    def BuildIndex(self) -> GraphIndex:
+        """
+        Build a ``GraphIndex`` snapshot of the graph in one pass and enable it.
+        The mutating methods of the helper and the methods decorated with ``EditGraph`` keep the index
+        up to date, call ``InvalidateIndex`` if the graph is changed without the helper.
+
+        Returns:
+            GraphIndex: the index of the graph
+        """
+        self.use_index = True
+        self._graphIndex = GraphIndex(key=self._IndexKey).Build(
+            self.root,
+            get_asset_id=self.GetAssetId,
+            get_connections=lambda port: [c[0] for c in port.GetConnections(maxon.PORT_DIR.INPUT)],
+            is_node=lambda node: node.GetKind() == maxon.NODE_KIND.NODE and self.GetAssetId(node) != "net.maxon.node.group",
+            get_owner=lambda port: port.GetAncestor(maxon.NODE_KIND.NODE),
+        )
+        self._DebugPrint(f"BuildIndex: {self._graphIndex}")
+        return self._graphIndex
+
+    # 获取索引 ==> ok
+    def GetIndex(self) -> Optional[GraphIndex]:
+        """
+        Get the ``GraphIndex`` of the graph, the index will be built lazily if ``use_index`` is True.
+
+        Returns:
+            Optional[GraphIndex]: the index, or None if the index is disabled.
+        """
+        if not self.use_index:
+            return None
+        if self._graphIndex is None:
+            self.BuildIndex()
+        return self._graphIndex
+
+    # 废弃索引, 下一次查询时重建 ==> ok
+    def InvalidateIndex(self) -> None:
+        """
+        Drop the index, it will be rebuilt at the next query if ``use_index`` is True.
+        """
+        self._graphIndex = None
+
     #=============================================
     # Util
     #=============================================
@@ -407,6 +497,7 @@ class NodeGraghHelper:
         return port.SetValue("net.maxon.description.data.base.defaultvalue", self._ConvertData(value))
 
     # 获取所有Shader ==> ok
+    @trace
     def GetAllShaders(self, mask: Union[str,maxon.Id] = None) -> list[maxon.GraphNode]:
         """
         Get all shaders from the graph. can filter by a mask.
@@ -418,6 +509,12 @@ class NodeGraghHelper:
             list[maxon.GraphNode]: list of nodes
         """
         shaders_list: list = []
+
+        index = self.GetIndex()
+        if index is not None:
+            if not mask:
+                return index.GetAllNodes()
+            return [node for node in index.GetAllNodes() if index.GetAssetId(node) == mask or self.GetShaderId(node) == mask]
         
         # 创建shader list
         def _IterGraghNode(node, shaders_list: list):
@@ -469,6 +566,7 @@ class NodeGraghHelper:
         return False
 
     # New 移除独立节点 ==> ok
+    @trace
     def RemoveIsolateNodes(self, filterId: str = None) -> None:
         """
         Remove all the isolate shaders(not connected to any ports or nodes),filled filter to only apply to specfic asset id.
@@ -483,6 +581,7 @@ class NodeGraghHelper:
                         node.Remove()
                 else:
                     node.Remove()
+        self.InvalidateIndex()
 
     # New 备注节点 ==> ok
     def Scaffold(self, node_list: list[maxon.GraphNode], name: str = "Scaffold") -> maxon.GraphNode:
@@ -524,7 +623,7 @@ class NodeGraghHelper:
         Returns:
             bool: True if the node don't have a input data.
         """
-        return ConverterPorts(self.nodespaceId).IsGeneratorNode(node)
+        return GetConverterPorts(self.nodespaceId).IsGeneratorNode(node)
 
     # New 获取默认输入端口
     def GetConvertInput(self, node: maxon.GraphNode) -> Optional[str]:
@@ -537,7 +636,7 @@ class NodeGraghHelper:
         Returns:
             str: the id of the port, or None
         """
-        res = ConverterPorts(self.nodespaceId).GetConvertInput(node)
+        res = GetConverterPorts(self.nodespaceId).GetConvertInput(node)
         return res if res != "" else None
 
     # New 获取默认输出端口
@@ -551,7 +650,7 @@ class NodeGraghHelper:
         Returns:
             str: the id of the port, or None
         """
-        res = ConverterPorts(self.nodespaceId).GetConvertOutput(node)
+        res = GetConverterPorts(self.nodespaceId).GetConvertOutput(node)
         return res if res != "" else None
 
     # 获取端口的BaseList2D
@@ -642,6 +741,7 @@ class NodeGraghHelper:
             ]
 
     # 选择的节点 ==> ok
+    @trace
     def GetActiveNodes(self, single_mode: bool = True, callback: callable = None) -> Union[maxon.GraphNode, list[maxon.GraphNode]]:
         """
         Gets the selected nodes, return a list of them.
@@ -655,6 +755,7 @@ class NodeGraghHelper:
         """
         
         if callback:
+            tracer.count("BeginTransaction")
             with self.graph.BeginTransaction() as transaction:
                 result =  maxon.GraphModelHelper.GetSelectedNodes(self.graph, maxon.NODE_KIND.NODE, callback)
                 transaction.Commit()            
@@ -668,6 +769,7 @@ class NodeGraghHelper:
         return result
 
     # 创建Shader ==> ok
+    @trace
     def AddShader(self, nodeId: Union[str, maxon.Id], name: str=None) -> maxon.GraphNode:
         """
         Adds a new shader to the graph.
@@ -680,9 +782,12 @@ class NodeGraghHelper:
         """
         shader = self.graph.AddChild(childId=maxon.Id(), nodeId=nodeId, args=maxon.DataDictionary())
         if name: self.SetName(shader, name)
+        if self._graphIndex is not None:
+            self._graphIndex.AddNode(shader, self.GetAssetId(shader))
         return shader
     
     # 创建Shader 可以提供链接 ==> ok
+    @trace
     def AddConnectShader(self, nodeID: Union[str, maxon.Id] = None, 
                 input_ports: list[Union[str,maxon.GraphNode]] = None, connect_inNodes: list[maxon.GraphNode] = None,
                 output_ports: list[Union[str,maxon.GraphNode]] = None, connect_outNodes: list[maxon.GraphNode] = None,
@@ -762,9 +867,12 @@ class NodeGraghHelper:
                     output: maxon.GraphNode = self.GetPort(shader,output_port)
                     output.Connect(connect_outNodes[i])
 
+        # the wires are connected without the helper
+        self.InvalidateIndex()
         return shader
 
     # 在Wire中插入Shader （New） ==> ok
+    @trace
     def InsertShader(self, nodeID: Union[str,maxon.Id], wireData: Union[maxon.Wires, list[maxon.GraphNode]], 
                      input_port: list[Union[str,maxon.GraphNode]],
                      output_port: list[Union[str,maxon.GraphNode]]) -> Optional[maxon.GraphNode]:
@@ -798,6 +906,7 @@ class NodeGraghHelper:
         return self.AddConnectShader(nodeID,input_port,pre_port,output_port,next_port)
 
     # 在节点后自动插入Shader ==> ok
+    @trace
     def AddShaderAfter(self, sourceNode: maxon.GraphNode, newNode: Union[str,maxon.GraphNode],
                        source_out: Union[str,maxon.GraphNode]=None, new_input: Union[str,maxon.GraphNode]=None) -> Optional[maxon.GraphNode]:
         """Add a shader after the given source node."""
@@ -830,6 +939,7 @@ class NodeGraghHelper:
         return node
 
     # 删除Shader ==> ok
+    @trace
     def RemoveShader(self, shader: maxon.GraphNode, keep_wire: bool = True) -> bool:
         """
         Removes the given shader from the graph.
@@ -845,6 +955,8 @@ class NodeGraghHelper:
             raise ValueError(f'{sys._getframe().f_code.co_name} Expected a true node GraphNode, got {type(shader)}')
         
         if not keep_wire:
+            if self._graphIndex is not None:
+                self._graphIndex.RemoveNode(shader)
             shader.Remove()
             return True
         
@@ -869,6 +981,8 @@ class NodeGraghHelper:
             else:
                 shader.Remove()
 
+        # the wires across the shader are reconnected without the helper
+        self.InvalidateIndex()
         return True
 
     # 是否是shader ==> ok
@@ -889,6 +1003,7 @@ class NodeGraghHelper:
         return False
 
     # 获取节点  ==> ok
+    @trace
     def GetNodes(self, shader: Union[maxon.GraphNode, str]) -> list[maxon.GraphNode]:
         """
         Get all Nodes of given shader.
@@ -911,6 +1026,10 @@ class NodeGraghHelper:
         if isinstance(shader, str):
             asset_id = shader
 
+        index = self.GetIndex()
+        if index is not None:
+            return index.GetNodes(asset_id)
+
         maxon.GraphModelHelper.FindNodesByAssetId(self.graph, asset_id, True, result)
         return result
 
@@ -944,65 +1063,128 @@ class NodeGraghHelper:
         maxon.GraphModelHelper.GetDirectSuccessors(node, maxon.NODE_KIND.NODE, result)
         return result
 
+    # 节点的前方连接 (outPort, inPort), pre_node ==> ok
+    def _GetPreEdges(self, node: maxon.GraphNode) -> Iterator[tuple]:
+        for inPort in node.GetInputs().GetChildren():
+            for outPort in self._GetPortConnections(inPort, maxon.PORT_DIR.INPUT):
+                yield (outPort, inPort), self._GetPortOwner(outPort)
+
+    # 节点的前方连接, 包括嵌套的输入端口 (例如端口包里的端口) ==> ok
+    def _GetNestedPreEdges(self, node: maxon.GraphNode) -> Iterator[tuple]:
+        stack = [(inPort, True) for inPort in reversed(list(node.GetInputs().GetChildren()))]
+        while stack:
+            inPort, top = stack.pop()
+            # the index only holds the top level ports
+            for outPort in self._GetPortConnections(inPort, maxon.PORT_DIR.INPUT, top):
+                yield (outPort, inPort), self._GetPortOwner(outPort)
+            stack.extend((child, False) for child in reversed(list(inPort.GetChildren())))
+
+    # 节点的后方连接 (outPort, inPort), next_node ==> ok
+    def _GetNextEdges(self, node: maxon.GraphNode) -> Iterator[tuple]:
+        for outPort in node.GetOutputs().GetChildren():
+            for inPort in self._GetPortConnections(outPort, maxon.PORT_DIR.OUTPUT):
+                yield (outPort, inPort), self._GetPortOwner(inPort)
+
+    # 端口所在的节点, 开启索引时从索引读取 ==> ok
+    def _GetPortOwner(self, port: maxon.GraphNode) -> maxon.GraphNode:
+        index = self.GetIndex()
+        if index is not None:
+            owner = index.GetOwner(port)
+            if owner is not None:
+                return owner
+        return port.GetAncestor(maxon.NODE_KIND.NODE)
+
+    # New 遍历前方节点树(生成器)  ==> ok
+    def IterPreNodes(self, node: maxon.GraphNode, filter_asset: str = None,
+                     max_depth: int = None, depth_first: bool = True) -> Iterator[maxon.GraphNode]:
+        """
+        Lazily yield the nodes connected before the node, include all the node chain.
+        Each node is visited once, shared sub trees and deep graphs are safe.
+
+        Args:
+            node (maxon.GraphNode): the node
+            filter_asset (str, optional): the asset id we will keep, fill none to disable. Defaults to None.
+            max_depth (int, optional): the max depth to walk, 1 means only the direct nodes. Defaults to None.
+            depth_first (bool, optional): True for DFS, False for BFS. Defaults to True.
+
+        Yields:
+            Iterator[maxon.GraphNode]: the nodes connected before the node.
+        """
+        # Bail when the passed node is not a true node.
+        if node.GetKind() != maxon.NODE_KIND.NODE:
+            return
+        node_filter = None if filter_asset is None else (lambda pre_node: self.GetAssetId(pre_node) == filter_asset)
+        yield from IterNodes(node, self._GetPreEdges, self._IndexKey, depth_first, max_depth, node_filter)
+
+    # New 遍历后方节点树(生成器)  ==> ok
+    def IterNextNodes(self, node: maxon.GraphNode, filter_asset: str = None,
+                      max_depth: int = None, depth_first: bool = True) -> Iterator[maxon.GraphNode]:
+        """
+        Lazily yield the nodes connected after the node, include all the node chain.
+        Each node is visited once, shared sub trees and deep graphs are safe.
+
+        Args:
+            node (maxon.GraphNode): the node
+            filter_asset (str, optional): the asset id we will keep, fill none to disable. Defaults to None.
+            max_depth (int, optional): the max depth to walk, 1 means only the direct nodes. Defaults to None.
+            depth_first (bool, optional): True for DFS, False for BFS. Defaults to True.
+
+        Yields:
+            Iterator[maxon.GraphNode]: the nodes connected after the node.
+        """
+        # Bail when the passed node is not a true node.
+        if node.GetKind() != maxon.NODE_KIND.NODE:
+            return
+        node_filter = None if filter_asset is None else (lambda next_node: self.GetAssetId(next_node) == filter_asset)
+        yield from IterNodes(node, self._GetNextEdges, self._IndexKey, depth_first, max_depth, node_filter)
+
+    # 把节点加入结果列表, 跳过已有的节点 ==> ok
+    def _ExtendUnique(self, result: list, nodes: Iterator[maxon.GraphNode]) -> list:
+        seen: set = {self._IndexKey(item) for item in result}
+        for item in nodes:
+            item_key = self._IndexKey(item)
+            if item_key not in seen:
+                seen.add(item_key)
+                result.append(item)
+        return result
+
     # New 获取前方节点树(包含节点树)  ==> ok
-    def GetPreNodes(self, node: maxon.GraphNode, result: list, filter_asset: str = None) -> list:
+    @trace
+    def GetPreNodes(self, node: maxon.GraphNode, result: list = None, filter_asset: str = None, max_depth: int = None) -> list:
         """
         Return the nodes connected before the node, include all the node chain.
 
         Args:
             node (maxon.GraphNode): the node
-            result (list): the list we will add return nodes to
+            result (list, optional): the list we will add return nodes to. Defaults to None.
             filter_asset (str): the asset id we will keep, fill none to disable.
+            max_depth (int, optional): the max depth to walk. Defaults to None.
 
         Returns:
             list[maxon.GraphNode]: Return the nodes connected before the node, include all the node chain.
         """
-        # Bail when the passed node is not a true node.
-        if node.GetKind() != maxon.NODE_KIND.NODE:
-            return
-        
-        for inPort in node.GetInputs().GetChildren():
-            # Get the connected output ports and their wires.
-            for outPort, wires in inPort.GetConnections(maxon.PORT_DIR.INPUT, None, maxon.Wires.All(), maxon.WIRE_MODE.ALL):
-                pre_node: maxon.GraphNode = self.GetTrueNode(outPort)
-                if filter_asset is not None:
-                    if self.GetAssetId(pre_node) == filter_asset and pre_node not in result:
-                        result.append(pre_node)
-                else:
-                    if pre_node not in result:
-                        result.append(pre_node)
-
-                self.GetPreNodes(pre_node,result,filter_asset)
+        if result is None:
+            result = []
+        return self._ExtendUnique(result, self.IterPreNodes(node, filter_asset, max_depth))
         
     # New 获取后方节点树(包含节点树)  ==> ok
-    def GetNextNodes(self, node: maxon.GraphNode, result: list, filter_asset: str = None) -> list:
+    @trace
+    def GetNextNodes(self, node: maxon.GraphNode, result: list = None, filter_asset: str = None, max_depth: int = None) -> list:
         """
         Return the nodes connected after the node, include all the node chain.
 
         Args:
             node (maxon.GraphNode): the node
-            result (list): the list we will add return nodes to
+            result (list, optional): the list we will add return nodes to. Defaults to None.
             filter_asset (str): the asset id we will keep, fill none to disable.
+            max_depth (int, optional): the max depth to walk. Defaults to None.
 
         Returns:
             list[maxon.GraphNode]: Return the nodes connected after the node, include all the node chain.
         """
-        # Bail when the passed node is not a true node.
-        if node.GetKind() != maxon.NODE_KIND.NODE:
-            return
-        
-        for outPort in node.GetOutputs().GetChildren():
-            # Get the connected output ports and their wires.
-            for outPort, wires in outPort.GetConnections(maxon.PORT_DIR.OUTPUT, None, maxon.Wires.All(), maxon.WIRE_MODE.ALL):
-                pre_node: maxon.GraphNode = self.GetTrueNode(outPort)
-                if filter_asset is not None:
-                    if self.GetAssetId(pre_node) == filter_asset and pre_node not in result:
-                        result.append(pre_node)
-                else:
-                    if pre_node not in result:
-                        result.append(pre_node)
-
-                self.GetNextNodes(pre_node,result,filter_asset)
+        if result is None:
+            result = []
+        return self._ExtendUnique(result, self.IterNextNodes(node, filter_asset, max_depth))
 
     # New 判断节点是否连接  ==> ok
     def IsNodeConnected(self, node: maxon.GraphNode) -> bool:
@@ -1017,6 +1199,10 @@ class NodeGraghHelper:
         """
         if not self.IsNode(node):
             raise ValueError(f'{sys._getframe().f_code.co_name} Expected a true node GraphNode, got {type(node)}')
+
+        index = self.GetIndex()
+        if index is not None:
+            return index.IsNodeConnected(node)
         
         all_ports = self.GetAllConnectedPorts(node)
 
@@ -1077,6 +1263,7 @@ class NodeGraghHelper:
             Union[maxon.GraphNode, list[maxon.GraphNode]]: the list of selected ports.
         """
         if callback:
+            tracer.count("BeginTransaction")
             with self.graph.BeginTransaction() as transaction:
                 result =  maxon.GraphModelHelper.GetSelectedNodes(self.graph, maxon.NODE_KIND.PORT_MASK, callback)
                 transaction.Commit()
@@ -1089,6 +1276,7 @@ class NodeGraghHelper:
         return result
     
     # NEW 新建（暴露端口） ==> ok
+    @trace
     def AddPort(self, node: maxon.GraphNode, port :Union[str, maxon.GraphNode] = None) -> maxon.GraphNode:
         """
         Add a 'true' port in the gragh ui. Need under a transaction.
@@ -1152,6 +1340,7 @@ class NodeGraghHelper:
         return true_port
 
     # NEW 删除（隐藏端口） ==> ok
+    @trace
     def RemovePort(self, node: maxon.GraphNode, port :Union[str, maxon.GraphNode], Hide: bool = True) -> maxon.GraphNode:
         """
         Hide or remove a 'true' port in the gragh ui. 
@@ -1178,6 +1367,8 @@ class NodeGraghHelper:
                 true_port.SetValue(maxon.NODE.ATTRIBUTE.HIDEPORTINNODEGRAPH, maxon.Bool(True))
             else:
                 true_port.Remove()
+                # the port and its wires are removed without the helper
+                self.InvalidateIndex()
         # True Node
         else:
             if isinstance(port, str):
@@ -1191,6 +1382,7 @@ class NodeGraghHelper:
 
 
     # 获取节点上端口 ==> ok
+    @trace
     def GetPort(self, shader: maxon.GraphNode, port_id :str = None) -> Union[maxon.GraphNode,bool]:
         """
         Get a port from a Shader node, you can specify the port id, or just fill sort of the port name,
@@ -1369,6 +1561,10 @@ class NodeGraghHelper:
 
         if not self.IsPort(port):
             return False
+
+        index = self.GetIndex()
+        if index is not None:
+            return any(not self.OnSameNode(port, other) for other in index.GetConnectedPorts(port))
         
         all_ports = []
         wirs = self.GetAllConnections()
@@ -1385,30 +1581,27 @@ class NodeGraghHelper:
         return False
 
     # New 获取前面节点（们）的端口  ==> ok
-    def GetPreNodePorts(self, node: maxon.GraphNode, result: list, stop: bool = True) -> Union[list[maxon.GraphNode],None]:
+    def GetPreNodePorts(self, node: maxon.GraphNode, result: list = None, stop: bool = True) -> Union[list[maxon.GraphNode],None]:
         """
         Get all the ports of the previous node.
 
         Args:
             node (maxon.GraphNode): The node to get the ports from.
-            result (list): The list to store the ports in.
+            result (list, optional): The list to store the ports in. Defaults to None.
             stop (bool, optional): If True, the function will stop at the first node. Defaults to True.
 
         Returns:
-            Union[list[maxon.GraphNode],None]: The list of ports or None if the node is not connected.
+            Union[list[maxon.GraphNode],None]: The list of (outPort, inPort), each wire only once.
         """
+        if result is None:
+            result = []
         # Bail when the passed node is not a true node.
         if node.GetKind() != maxon.NODE_KIND.NODE:
-            return
+            return result
 
-        for inPort in node.GetInputs().GetChildren():
-            # Get the connected output ports and their wires.
-            for outPort, wires in inPort.GetConnections(maxon.PORT_DIR.INPUT, None, maxon.Wires.All(), maxon.WIRE_MODE.ALL):
-                if not stop:
-                    otherNode: maxon.GraphNode = self.GetTrueNode(outPort)
-                result.append((outPort, inPort))
-                if not stop:
-                    self.GetPreNodePorts(otherNode,result,stop)
+        for (outPort, inPort), _, _ in IterTraverse(node, self._GetPreEdges, self._IndexKey, True, 1 if stop else None):
+            result.append((outPort, inPort))
+        return result
 
     # New 获取前方连接端口  ==> ok
     def GetConnectedPortsBefore(self, node: maxon.GraphNode) -> Union[list[maxon.GraphNode],None]:
@@ -1427,34 +1620,32 @@ class NodeGraghHelper:
         
         for inPort in node.GetInputs().GetChildren():
             # Get the connected output ports and their wires.
+            tracer.count("GetConnections")
             for outPort, wires in inPort.GetConnections(maxon.PORT_DIR.INPUT, None, maxon.Wires.All(), maxon.WIRE_MODE.ALL):
                 return [outPort, inPort]
 
     # New 获取后面节点（们）的端口  ==> ok
-    def GetNextNodePorts(self, node: maxon.GraphNode, result: list, stop: bool = True) -> Union[list[maxon.GraphNode],None]:
+    def GetNextNodePorts(self, node: maxon.GraphNode, result: list = None, stop: bool = True) -> Union[list[maxon.GraphNode],None]:
         """
         Get all the ports of the next node.
 
         Args:
             node (maxon.GraphNode): The node to get the ports from.
-            result (list): The list to store the ports in.
+            result (list, optional): The list to store the ports in. Defaults to None.
             stop (bool, optional): If True, the function will stop at the first node. Defaults to True.
 
         Returns:
-            Union[list[maxon.GraphNode],None]: The list of ports or None if the node is not connected.
+            Union[list[maxon.GraphNode],None]: The list of (outPort, inPort), each wire only once.
         """
+        if result is None:
+            result = []
         # Bail when the passed node is not a true node.
         if node.GetKind() != maxon.NODE_KIND.NODE:
-            return
+            return result
 
-        for inPort in node.GetOutputs().GetChildren():
-            # Get the connected output ports and their wires.
-            for outPort, wires in inPort.GetConnections(maxon.PORT_DIR.OUTPUT, None, maxon.Wires.All(), maxon.WIRE_MODE.ALL):
-                if not stop:
-                    otherNode: maxon.GraphNode = self.GetTrueNode(outPort)
-                result.append((inPort, outPort))
-                if not stop:
-                    self.GetNextNodePorts(otherNode,result, stop)
+        for (outPort, inPort), _, _ in IterTraverse(node, self._GetNextEdges, self._IndexKey, True, 1 if stop else None):
+            result.append((outPort, inPort))
+        return result
 
     # New 获取后方连接端口  ==> ok
     def GetConnectedPortsAfter(self, node: maxon.GraphNode) -> Union[list[maxon.GraphNode],None]:
@@ -1472,6 +1663,7 @@ class NodeGraghHelper:
             return
         for inPort in node.GetOutputs().GetChildren():
             # Get the connected output ports and their wires.
+            tracer.count("GetConnections")
             for outPort, wires in inPort.GetConnections(maxon.PORT_DIR.OUTPUT, None, maxon.Wires.All(), maxon.WIRE_MODE.ALL):
                 return [inPort, outPort]
 
@@ -1516,6 +1708,7 @@ class NodeGraghHelper:
             Union[maxon.Wires, list[maxon.Wires]]: The list of wires.
         """
         if callback:
+            tracer.count("BeginTransaction")
             with self.graph.BeginTransaction() as transaction:
                 result = maxon.GraphModelHelper.GetSelectedConnections(self.graph, callback)
                 transaction.Commit()
@@ -1528,6 +1721,7 @@ class NodeGraghHelper:
         return result
         
     # 获取所有连接线 ==> ok
+    @trace
     def GetAllConnections(self) -> list[list[maxon.GraphNode]]:
         """
         Get all connections.
@@ -1536,10 +1730,15 @@ class NodeGraghHelper:
             list[tuple(maxon.GraphNode)]: The list of connections.
         """
 
+        index = self.GetIndex()
+        if index is not None:
+            return index.GetConnections()
+
         connections = []
 
         for shader in self.GetAllShaders():
             for inPort in shader.GetInputs().GetChildren():
+                tracer.count("GetConnections")
                 for c in inPort.GetConnections(maxon.PORT_DIR.INPUT):
                     outPort = c[0]
                     src = outPort.GetAncestor(maxon.NODE_KIND.NODE)
@@ -1548,6 +1747,7 @@ class NodeGraghHelper:
         return connections
     
     # 添加连接线 ==> ok
+    @trace
     def AddConnection(self, soure_node: maxon.GraphNode, outPort: Union[maxon.GraphNode,str], target_node: maxon.GraphNode, inPort: Union[maxon.GraphNode,str]) -> list[maxon.GraphNode]:
         """
         Add a connection.
@@ -1563,7 +1763,10 @@ class NodeGraghHelper:
         """
 
         if isinstance(outPort,maxon.GraphNode) and isinstance(inPort,maxon.GraphNode):
-            return outPort.Connect(inPort)
+            result = outPort.Connect(inPort)
+            if self._graphIndex is not None:
+                self._graphIndex.AddConnection(outPort, inPort)
+            return result
         
         if soure_node is not None and target_node is not None:
 
@@ -1572,12 +1775,14 @@ class NodeGraghHelper:
 
             if isinstance(outPort, str):
                 outPort_name = outPort
+                tracer.count("FindChild")
                 outPort = soure_node.GetOutputs().FindChild(outPort_name)
                 if not self.IsPortValid(outPort):                    
                     outPort = None
 
             if isinstance(inPort, str):
                 inPort_name = inPort
+                tracer.count("FindChild")
                 inPort = target_node.GetInputs().FindChild(inPort_name)
                 if not self.IsPortValid(inPort):
                     inPort = None
@@ -1586,6 +1791,8 @@ class NodeGraghHelper:
                 return None
 
             outPort.Connect(inPort)
+            if self._graphIndex is not None:
+                self._graphIndex.AddConnection(outPort, inPort)
             return [soure_node, outPort, target_node, inPort]
 
     # NEW 连接节点 ==> ok
@@ -1603,14 +1810,19 @@ class NodeGraghHelper:
         if isinstance(portA,maxon.GraphNode) and portA.GetKind() != maxon.NODE_KIND.INPORT:
             if isinstance(portB,maxon.GraphNode) and portB.GetKind() != maxon.NODE_KIND.OUTPORT:
                 portA.Connect(portB)
+                if self._graphIndex is not None:
+                    self._graphIndex.AddConnection(portA, portB)
                 return True
         elif isinstance(portB,maxon.GraphNode) and portB.GetKind() != maxon.NODE_KIND.INPORT:
             if isinstance(portA,maxon.GraphNode) and portA.GetKind() != maxon.NODE_KIND.OUTPORT:
                 portB.Connect(portA)
+                if self._graphIndex is not None:
+                    self._graphIndex.AddConnection(portB, portA)
                 return True
         return False
 
     # 删除连接线 ==> ok
+    @trace
     def RemoveConnection(self, port: maxon.GraphNode, another_port: Optional[Union[maxon.GraphNode,str]] = None):
         """
         Disconnects the given shader input.
@@ -1626,14 +1838,22 @@ class NodeGraghHelper:
             if isinstance(another_port, maxon.GraphNode) and isinstance(port, maxon.GraphNode):
                 if port.GetKind() == maxon.NODE_KIND.INPORT and another_port.GetKind() == maxon.NODE_KIND.OUTPORT:
                     maxon.GraphModelHelper.RemoveConnection(another_port, port)
+                    if self._graphIndex is not None:
+                        self._graphIndex.RemoveConnection(another_port, port)
                 if port.GetKind() == maxon.NODE_KIND.OUTPORT and another_port.GetKind() == maxon.NODE_KIND.INPORT:
                     maxon.GraphModelHelper.RemoveConnection(port, another_port)
+                    if self._graphIndex is not None:
+                        self._graphIndex.RemoveConnection(port, another_port)
         else:
             mask = maxon.Wires(maxon.WIRE_MODE.NORMAL)
             if isinstance(port, maxon.GraphNode) and port.GetKind() == maxon.NODE_KIND.OUTPORT:
-                port.RemoveConnections(maxon.PORT_DIR.OUTPUT, mask)                
+                port.RemoveConnections(maxon.PORT_DIR.OUTPUT, mask)
+                if self._graphIndex is not None:
+                    self._graphIndex.RemovePortConnections(port)
             if isinstance(port, maxon.GraphNode) and port.GetKind() == maxon.NODE_KIND.INPORT:
                 port.RemoveConnections(maxon.PORT_DIR.INPUT, mask)
+                if self._graphIndex is not None:
+                    self._graphIndex.RemovePortConnections(port)
   
     # 获取节点上端口数据类型ID
     def GetParamDataTypeID(self, node: maxon.GraphNode, paramId: Union[maxon.Id,str]) -> maxon.Id:
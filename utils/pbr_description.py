@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+"""Graph descriptions of PBR packages for the node materials, pure python so it can be built without Cinema 4D."""
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+from .pbr_helper import PBRPackage
+
+# =========================================================
+# Globals & Constants
+# =========================================================
+
+RS_NODESPACE: str = "com.redshift3d.redshift4c4d.class.nodespace"
+AR_NODESPACE: str = "com.autodesk.arnold.nodespace"
+VR_NODESPACE: str = "com.chaos.class.vray_node_renderer_nodespace"
+
+# 没有AO时的乘数, 在C4D中由material_maker替换为maxon.Vector(1, 1, 1)
+# The multiplier without an AO map, material_maker passes maxon.Vector(1, 1, 1) in Cinema 4D
+WHITE: tuple[float, float, float] = (1.0, 1.0, 1.0)
+
+# 缓存中代替white的占位符, 取出时替换为传入的white
+# Placeholder of the white value in the cached descriptions
+WHITE_TOKEN: str = "$white"
+
+# 生成函数修改后需要增加版本号, 旧的磁盘缓存随之失效
+# Bump when a generator changes, the old cache entries on disk are not used anymore
+DESCRIPTION_CACHE_VERSION: int = 1
+
+# 内存缓存的最大数量
+# Default max count of descriptions kept in memory
+DESCRIPTION_CACHE_SIZE: int = 1024
+
+
+def is_valid_path(path: Any) -> bool:
+    """Check if a path exists."""
+    if path is None:
+        return False
+    return os.path.exists(str(path))
+
+# =========================================================
+# Description Generators
+# =========================================================
+
+def ArnoldDescription(asset: PBRPackage, white: Any = WHITE) -> dict:
+    """Returns Arnold Graph Description dictionary for a PBRPackage."""
+    data = {
+        "$type": "#com.autodesk.arnold.material",
+        "#<shader": { "$type": "#com.autodesk.arnold.shader.standard_surface" }
+    }
+    mat_desc = data["#<shader"]
+    if is_valid_path(asset.diffuse):
+        mat_desc["#<base_color"] = {
+            "$type": "#com.autodesk.arnold.shader.color_correct",
+            "#<input": {
+                "$type": "#com.autodesk.arnold.shader.image",
+                "#<filename": asset.diffuse,
+                "#<multiply": {"$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.ao} if is_valid_path(asset.ao) else white
+            }
+        }
+    if is_valid_path(asset.metalness): mat_desc["#<metalness"] = { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.metalness }
+    if is_valid_path(asset.roughness): mat_desc["#<specular_roughness"] = { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.roughness }
+    if is_valid_path(asset.alpha): mat_desc["#<opacity"] = { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.alpha }
+    if is_valid_path(asset.transmission): mat_desc["#<transmission_color"] = { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.transmission }
+    if is_valid_path(asset.emission): mat_desc["#<emission_color"] = { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.emission }
+    if is_valid_path(asset.normal):
+        mat_desc["#<normal"] = {
+            "$type": "#com.autodesk.arnold.shader.normal_map",
+            "#<input": { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.normal }
+        }
+    if is_valid_path(asset.displacement):
+        data["#<displacement"] = {
+            "$type": "#com.autodesk.arnold.shader.displacement",
+            "#<normal_displacement_input": { "$type": "#com.autodesk.arnold.shader.image", "#<filename": asset.displacement }
+        }
+    return data
+
+def RedshiftDescription(asset: PBRPackage, white: Any = WHITE) -> dict:
+    """Returns Redshift Graph Description dictionary for a PBRPackage."""
+    data = {
+        "$type": "#~.output",
+        "#~.surface": { "$type": "#~.standardmaterial" }
+    }
+    mat_desc = data["#~.surface"]
+    if is_valid_path(asset.diffuse):
+        mat_desc["#~.base_color"] = {
+            "$type": "#~.rscolorcorrection",
+            "#~.input": {
+                "$type": "#~.texturesampler",
+                "#~.tex0/path": asset.diffuse,
+                "#~.color_multiplier": {"$type": "#~.texturesampler", "#~.tex0/path": asset.ao} if is_valid_path(asset.ao) else white
+            }
+        }
+    if is_valid_path(asset.metalness): mat_desc["#~.metalness"] = { "$type": "#~.texturesampler", "#~.tex0/path": asset.metalness }
+    if is_valid_path(asset.roughness): mat_desc["#~.refl_roughness"] = { "$type": "#~.texturesampler", "#~.tex0/path": asset.roughness }
+    if is_valid_path(asset.alpha): mat_desc["#~.opacity_color"] = { "$type": "#~.texturesampler", "#~.tex0/path": asset.alpha }
+    if is_valid_path(asset.normal):
+        mat_desc["#~.bump_input"] = {
+            "$type": "#~.bumpmap", "#~.inputtype": 1,
+            "#~.input": { "$type": "#~.texturesampler", "#~.tex0/path": asset.normal }
+        }
+    if is_valid_path(asset.displacement):
+        data["#~.displacement"] = {
+            "$type": "#~displacement",
+            "#~.texmap": { "$type": "#~.texturesampler", "#~.tex0/path": asset.displacement }
+        }
+    return data
+
+def VRayDescription(asset: PBRPackage, white: Any = WHITE) -> dict:
+    """Returns VRay Graph Description dictionary for a PBRPackage."""
+    data = {
+        "$type": "#~.mtlsinglebrdf",
+        "#~.brdf": { "$type": "#~.brdfvraymtl" }
+    }
+    mat_desc = data["#~.brdf"]
+    if is_valid_path(asset.diffuse):
+        mat_desc["#~.diffuse"] = {
+            "$type": "#~.colorcorrection",
+            "#~.texture_map": {
+                "$type": "#~.texbitmap",
+                "#~.file": asset.diffuse,
+                "#~.color_mult": {"$type": "#~.texbitmap", "#~.file": asset.ao} if is_valid_path(asset.ao) else white
+            }
+        }
+    if is_valid_path(asset.metalness): mat_desc["#~.metalness"] = { "$type": "#~.texbitmap", "#~.file": asset.metalness }
+    if is_valid_path(asset.roughness):
+        mat_desc["#~.reflect_glossiness"] = { "$type": "#~.texbitmap", "#~.file": asset.roughness }
+        mat_desc["#~.option_use_roughness"] = True
+    if is_valid_path(asset.alpha): mat_desc["#~.opacity_color"] = { "$type": "#~.texbitmap", "#~.file": asset.alpha }
+    if is_valid_path(asset.normal):
+        mat_desc["#~.bump_map"] = {
+            "$type": "#~.texnormalbump", "#~.map_type": 1,
+            "#~.bump_tex_color": { "$type": "#~.texbitmap", "#~.file": asset.normal }
+        }
+    return data
+
+# 节点空间 -> 描述生成函数
+# Node space -> description generator
+DESCRIPTION_BUILDERS: dict[str, Callable[..., dict]] = {
+    AR_NODESPACE: ArnoldDescription,
+    RS_NODESPACE: RedshiftDescription,
+    VR_NODESPACE: VRayDescription,
+}
+
+# =========================================================
+# Cache
+# =========================================================
+
+def _Restore(data: Any, white: Any) -> Any:
+    """Copy a cached description, the placeholder is replaced by the white value."""
+    if isinstance(data, dict):
+        return {key: _Restore(value, white) for key, value in data.items()}
+    if data == WHITE_TOKEN:
+        return white
+    return data
+
+def _GetMtime(package: PBRPackage, path: str) -> Optional[int]:
+    """The mtime of a texture, from the scan if known, else stat, None if missing."""
+    mtime = package.mtimes.get(path)
+    if mtime is not None:
+        return mtime
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError, ValueError):
+        return None
+
+class DescriptionCache:
+    """
+    Content addressed cache of the graph descriptions.
+
+    The key is a hash of (nodespace, ``PBRPackage.to_dict()``, texture mtimes), an unchanged package
+    skips the ``is_valid_path`` stats and the description construction. The mtimes of a scanned
+    package come from the scan, so a hit costs no stat at all.
+    The descriptions are kept in a LRU in memory, and as ``<key>.json`` files in ``path`` if given.
+
+    Example:
+        >>> cache = DescriptionCache(path="C:/Cache/descriptions")
+        >>> data = cache.Get(package, RS_NODESPACE)
+        >>> cache.hits, cache.misses
+        (0, 1)
+    """
+    def __init__(self, max_size: int = DESCRIPTION_CACHE_SIZE, path: Optional[str | Path] = None) -> None:
+        """
+        Args:
+            max_size: The max count of descriptions in memory.
+            path: The folder of the disk cache, None to keep the cache in memory only.
+        """
+        self.max_size: int = max_size
+        self.path: Optional[Path] = Path(path) if path else None
+        self.hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self._items: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __str__(self) -> str:
+        return (f"A {self.__class__.__name__} Instance with {len(self._items)} descriptions, "
+                f"{self.hits} hits ({self.disk_hits} from disk), {self.misses} misses")
+
+    def Key(self, package: PBRPackage, nodespace: str) -> str:
+        """
+        Args:
+            package: The resolved package.
+            nodespace: The node space id.
+
+        Returns:
+            The hash key of the package description.
+        """
+        info = package.to_dict()
+        paths = sorted({path for path in info["maps"].values() if path})
+        content = [DESCRIPTION_CACHE_VERSION, nodespace, info, [(path, _GetMtime(package, path)) for path in paths]]
+        return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def Get(self, package: PBRPackage, nodespace: str, white: Any = WHITE) -> dict:
+        """
+        Get the description of the package, it is built and stored on a miss.
+
+        Args:
+            package: The resolved package.
+            nodespace: The node space id, a key of ``DESCRIPTION_BUILDERS``.
+            white: The AO multiplier used without an AO map.
+
+        Returns:
+            A new description dict, it can be changed by the caller.
+        """
+        builder: Optional[Callable[..., dict]] = DESCRIPTION_BUILDERS.get(nodespace)
+        if builder is None:
+            raise ValueError(f"DescriptionCache.Get Expected a nodespace in {list(DESCRIPTION_BUILDERS)}, got {nodespace}")
+
+        key = self.Key(package, nodespace)
+        data = self._Lookup(key)
+        if data is None:
+            data = builder(package, WHITE_TOKEN)
+            self._Store(key, data)
+        return _Restore(data, white)
+
+    def _Lookup(self, key: str) -> Optional[dict]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._Read(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._Insert(key, data)
+        return data
+
+    def _Store(self, key: str, data: dict) -> None:
+        with self._lock:
+            self._Insert(key, data)
+        self._Write(key, data)
+
+    def _Insert(self, key: str, data: dict) -> None:
+        self._items[key] = data
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def _Read(self, key: str) -> Optional[dict]:
+        if self.path is None:
+            return None
+        try:
+            with open(self.path / f"{key}.json", "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _Write(self, key: str, data: dict) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            temp = self.path / f"{key}.{threading.get_ident()}.tmp"
+            with open(temp, "w", encoding="utf-8") as file:
+                json.dump(data, file, separators=(",", ":"))
+            os.replace(temp, self.path / f"{key}.json")
+        except OSError:
+            pass
+
+    def Clear(self, disk: bool = False) -> None:
+        """
+        Empty the memory cache and reset the counters.
+
+        Args:
+            disk: True to delete the files of the disk cache too.
+        """
+        with self._lock:
+            self._items.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if disk and self.path is not None and self.path.is_dir():
+            for item in self.path.glob("*.json"):
+                try:
+                    item.unlink()
+                except OSError:
+                    pass
+
+    def GetStats(self) -> dict[str, int]:
+        """
+        Returns:
+            {"hits", "disk_hits", "misses", "size"}
+        """
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "size": len(self._items)}
+
+# 全局的描述缓存, 仅内存
+# The description cache of the Get*Description helpers, in memory only
+g_description_cache = DescriptionCache()
+
+# =========================================================
+# Batch
+# =========================================================
+
+def BuildDescriptions(packages: Iterable[PBRPackage], nodespace: str, white: Any = WHITE, workers: int = 1,
+                      cache: Optional[DescriptionCache] = None) -> list[tuple[PBRPackage, dict]]:
+    """
+    Build the descriptions of many packages up front, the invalid packages are skipped.
+    The generators only stat the texture paths, so ``workers`` uses a thread pool.
+
+    Args:
+        packages: The resolved packages, e.g. ``PBRLibraryScanner.build().values()``.
+        nodespace: The node space id, a key of ``DESCRIPTION_BUILDERS``.
+        white: The AO multiplier used without an AO map.
+        workers: The count of threads, 1 to build in the current thread.
+        cache: The description cache, None to build every description.
+
+    Returns:
+        [(package, description)] in the order of the packages.
+
+    Example:
+        >>> packages = PBRLibraryScanner("C:/Assets/PBR/").build(workers=8)
+        >>> descriptions = BuildDescriptions(packages.values(), RS_NODESPACE, workers=8)
+    """
+    builder: Optional[Callable[..., dict]] = DESCRIPTION_BUILDERS.get(nodespace)
+    if builder is None:
+        raise ValueError(f"BuildDescriptions Expected a nodespace in {list(DESCRIPTION_BUILDERS)}, got {nodespace}")
+
+    if cache is not None:
+        build = lambda package: cache.Get(package, nodespace, white)
+    else:
+        build = lambda package: builder(package, white)
+
+    valid = [package for package in packages if package.IsValid]
+    if workers <= 1 or len(valid) < 2:
+        return [(package, build(package)) for package in valid]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(zip(valid, pool.map(build, valid)))
+
+
+__all__ = [
+    "RS_NODESPACE",
+    "AR_NODESPACE",
+    "VR_NODESPACE",
+    "WHITE",
+    "DESCRIPTION_BUILDERS",
+    "is_valid_path",
+    "ArnoldDescription",
+    "RedshiftDescription",
+    "VRayDescription",
+    "DescriptionCache",
+    "g_description_cache",
+    "BuildDescriptions",
+]
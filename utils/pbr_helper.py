@@ -1,7 +1,10 @@
 
+import os
 import re
+import json
 from dataclasses import dataclass, field
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 from collections import defaultdict
 from pathlib import Path
 
@@ -77,6 +80,185 @@ KEYWORD_TO_TYPE: dict[str, str] = {
 RESOLUTION_PATTERN = re.compile(r"(?P<k_val>\d+)[kK]|(?P<num_val>512|1024|2048|4096|8192)")
 UDIM_PATTERN = re.compile(r"1\d{3}")           # 匹配 UDIM 标准格式 (1001-1999)
 
+# 扫描索引文件的格式版本，版本不一致时索引作废
+# Version of the on-disk scan index, an index of another version is discarded
+SCAN_INDEX_VERSION: int = 1
+
+
+# 文件名分割、贴图关键字的预编译正则
+# Precompiled patterns used by the filename classifier
+TOKEN_SPLIT_PATTERN = re.compile(r"[._\-\s]+")
+DISP_TOKEN_PATTERN = re.compile(r"disp\d+")
+K_RESOLUTION_TOKEN_PATTERN = re.compile(r"\d+k")
+
+# 法线格式关键字
+# Tokens of the normal map formats
+DIRECTX_TOKENS: frozenset[str] = frozenset(("dx", "directx", "nrm_dx", "normaldx"))
+OPENGL_TOKENS: frozenset[str] = frozenset(("gl", "opengl", "nrm_gl", "normalgl"))
+
+# 资产名中需要剔除的关键字
+# Tokens removed from the asset name
+ASSET_STOP_TOKENS: frozenset[str] = frozenset(KEYWORD_TO_TYPE) | {"dx", "gl", "opengl", "directx"}
+
+# 文件名解析缓存大小
+# Default size of the filename classifier LRU cache
+CLASSIFIER_CACHE_SIZE: int = 65536
+
+
+def _split_name(name: str) -> tuple[str, str]:
+    """Split a file name into (stem, suffix) the same way as ``Path.stem`` and ``Path.suffix``."""
+    index = name.rfind(".")
+    if 0 < index < len(name) - 1:
+        return name[:index], name[index:]
+    return name, ""
+
+def _split_tokens(stem: str) -> list[str]:
+    """Split a lowercase stem into tokens."""
+    return [token for token in TOKEN_SPLIT_PATTERN.split(stem) if token]
+
+def _normalize_texture_token(token: str) -> str:
+    """
+    Normalize common texture tokens before PBR slot detection.
+
+    Args:
+        token: The raw filename token.
+
+    Returns:
+        A normalized token that can be matched by ``MAP_KEYWORDS``.
+
+    Example:
+        >>> _normalize_texture_token("disp16")
+        'disp16'
+    """
+    if token.startswith("disp") and DISP_TOKEN_PATTERN.fullmatch(token):
+        return "disp16"
+    return token
+
+def _scan_tokens(tokens: list[str] | tuple[str, ...]) -> tuple[Optional[str], str]:
+    """One pass over the tokens, return (map_type, asset)."""
+    map_type = None
+    filtered = []
+    for token in tokens:
+        normalized = _normalize_texture_token(token)
+        if map_type is None:
+            map_type = KEYWORD_TO_TYPE.get(normalized)
+        # Keep tokens unless they are PBR keywords, resolution tags (e.g., '4k'), or UDIMs.
+        if normalized in ASSET_STOP_TOKENS or K_RESOLUTION_TOKEN_PATTERN.fullmatch(token) or UDIM_PATTERN.fullmatch(token):
+            continue
+        filtered.append(token)
+    return map_type, "_".join(filtered) if filtered else "asset"
+
+def _normal_format(tokens: list[str] | tuple[str, ...]) -> Optional[str]:
+    if not DIRECTX_TOKENS.isdisjoint(tokens): return "directx"
+    if not OPENGL_TOKENS.isdisjoint(tokens): return "opengl"
+    return None
+
+def _resolution(match: Optional[re.Match]) -> Optional[int]:
+    if not match:
+        return None
+    if match.group("k_val"):
+        return int(match.group("k_val")) * 1024
+    if match.group("num_val"):
+        return int(match.group("num_val"))
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class TextureName:
+    """
+    The metadata parsed from one texture file name.
+
+    Example:
+        >>> CLASSIFIER.classify("Rock01_4k_Normal_GL.png")
+        TextureName(name='Rock01_4k_Normal_GL.png', extension='.png', tokens=('rock01', '4k', 'normal', 'gl'), map_type='normal', asset='rock01', resolution=4096, udim=None, normal_format='opengl')
+    """
+    name: str
+    extension: str
+    tokens: tuple[str, ...]
+    map_type: Optional[str]
+    asset: str
+    resolution: Optional[int]
+    udim: Optional[int]
+    normal_format: Optional[str]
+
+    @property
+    def is_pbr(self) -> bool:
+        """True if a PBR map type is detected."""
+        return self.map_type is not None
+
+
+class FilenameClassifier:
+    """
+    Parse a texture file name once into a ``TextureName``, the result is kept in a LRU cache
+    so the names repeated across folders (e.g. ``albedo.png``) are parsed only once.
+
+    Example:
+        >>> classifier = FilenameClassifier()
+        >>> info = classifier.classify("C:/Assets/Rock01/Rock01_4k_diffuse.jpg")
+        >>> info.asset, info.map_type, info.resolution
+        ('rock01', 'diffuse', 4096)
+    """
+    def __init__(self, cache_size: Optional[int] = CLASSIFIER_CACHE_SIZE):
+        """
+        Args:
+            cache_size: The max count of cached names, None for no limit, 0 to disable the cache.
+        """
+        self._classify = lru_cache(maxsize=cache_size)(self.parse) if cache_size != 0 else self.parse
+
+    @staticmethod
+    def parse(name: str) -> TextureName:
+        """
+        Parse a file name (no folder) without the cache.
+
+        Example:
+            >>> FilenameClassifier.parse("character_diffuse.1001.tif").udim
+            1001
+        """
+        lower = name.lower()
+        stem, extension = _split_name(lower)
+        tokens = _split_tokens(stem)
+        map_type, asset = _scan_tokens(tokens)
+        udim = UDIM_PATTERN.search(lower)
+        return TextureName(
+            name=name,
+            extension=extension,
+            tokens=tuple(tokens),
+            map_type=map_type,
+            asset=asset,
+            resolution=_resolution(RESOLUTION_PATTERN.search(lower)),
+            udim=int(udim.group()) if udim else None,
+            normal_format=_normal_format(tokens)
+        )
+
+    def classify(self, filename: str | Path) -> TextureName:
+        """
+        Parse the file name of a path.
+
+        Args:
+            filename: The file name or path.
+
+        Returns:
+            The parsed metadata.
+        """
+        name = os.path.basename(filename)
+        if name in ("", "."):
+            # a trailing separator or dot, e.g. "folder/", same as Path.name
+            name = Path(filename).name
+        return self._classify(name)
+
+    def cache_info(self):
+        """The hits and misses of the cache, None if the cache is disabled."""
+        return getattr(self._classify, "cache_info", lambda: None)()
+
+    def cache_clear(self) -> None:
+        """Empty the cache."""
+        if hasattr(self._classify, "cache_clear"):
+            self._classify.cache_clear()
+
+# 默认的全局解析器
+# The default classifier shared by the helpers
+CLASSIFIER = FilenameClassifier()
+
 
 def tokenize(filename: str | Path) -> list[str]:
     """
@@ -93,8 +275,7 @@ def tokenize(filename: str | Path) -> list[str]:
         ['grass', '01', '4k', 'diffuse']
     """
     # 移除后缀并根据常见分隔符（点、下划线、空格、横杠）分割字符串
-    name = Path(filename).stem
-    return list(filter(None, re.split(r"[._\-\s]+", name.lower())))
+    return list(CLASSIFIER.classify(filename).tokens)
 
 def _normalize_package_name(package_name: str | Path) -> str:
     """
@@ -106,28 +287,10 @@ def _normalize_package_name(package_name: str | Path) -> str:
     Returns:
         A lowercase asset name joined by underscores.
     """
-    tokens = tokenize(Path(package_name).stem)
-    if not tokens:
+    info = CLASSIFIER.classify(Path(package_name).stem)
+    if not info.tokens:
         return ""
-    return detect_asset_name(tokens)
-
-def _normalize_texture_token(token: str) -> str:
-    """
-    Normalize common texture tokens before PBR slot detection.
-
-    Args:
-        token: The raw filename token.
-
-    Returns:
-        A normalized token that can be matched by ``MAP_KEYWORDS``.
-
-    Example:
-        >>> _normalize_texture_token("disp16")
-        'disp16'
-    """
-    if re.fullmatch(r"disp\d+", token):
-        return "disp16"
-    return token
+    return info.asset
 
 
 def detect_map_type(tokens: list[str]) -> Optional[str]:
@@ -148,9 +311,9 @@ def detect_map_type(tokens: list[str]) -> Optional[str]:
     """
     # 遍历令牌，利用全局展平的字典快速查找
     for token in tokens:
-        token = _normalize_texture_token(token)
-        if token in KEYWORD_TO_TYPE:
-            return KEYWORD_TO_TYPE[token]
+        map_type = KEYWORD_TO_TYPE.get(_normalize_texture_token(token))
+        if map_type is not None:
+            return map_type
     return None
 
 def detect_resolution(name: str) -> Optional[int]:
@@ -169,17 +332,7 @@ def detect_resolution(name: str) -> Optional[int]:
         >>> detect_resolution("Wall_4096_ao.exr")
         4096
     """
-    match = RESOLUTION_PATTERN.search(name.lower())
-    if not match:
-        return None
-        
-    if match.group("k_val"):
-        return int(match.group("k_val")) * 1024
-    
-    if match.group("num_val"):
-        return int(match.group("num_val"))
-        
-    return None
+    return _resolution(RESOLUTION_PATTERN.search(name.lower()))
 
 def detect_udim(name: str) -> Optional[int]:
     """
@@ -212,9 +365,7 @@ def detect_normal_format(tokens: list[str]) -> Optional[str]:
         >>> detect_normal_format(['stone', 'normal', 'dx'])
         'directx'
     """
-    if any(k in tokens for k in ("dx", "directx", "nrm_dx", "normaldx")): return "directx"
-    if any(k in tokens for k in ("gl", "opengl", "nrm_gl", "normalgl")): return "opengl"
-    return None
+    return _normal_format(tokens)
 
 def detect_asset_name(tokens: list[str]) -> str:
     """
@@ -227,20 +378,10 @@ def detect_asset_name(tokens: list[str]) -> str:
         The reconstructed asset name string.
 
     Example:
-        >>> detect_asset_name(['rusty', 'metal', '02', '4k', 'diffuse'])
-        'rusty_metal_02'
+        >>> detect_asset_name(['rusty', 'iron', '02', '4k', 'diffuse'])
+        'rusty_iron_02'
     """
-    filtered = []
-    all_keywords = set(KEYWORD_TO_TYPE.keys()) | {"dx", "gl", "opengl", "directx"}
-    
-    for t in tokens:
-        # Keep tokens unless they are PBR keywords, resolution tags (e.g., '4k'), or UDIMs.
-        normalized = _normalize_texture_token(t)
-        if normalized in all_keywords or re.fullmatch(r"\d+k", t) or UDIM_PATTERN.fullmatch(t):
-            continue
-        filtered.append(t)
-
-    return "_".join(filtered) if filtered else "asset"
+    return _scan_tokens(tokens)[1]
 
 
 # =========================================================
@@ -280,10 +421,10 @@ def GetPBRName(filename: str | Path) -> Optional[str]:
         >>> GetPBRName("Wood_basecolor.png")
         'wood'
     """
-    tokens = tokenize(filename)
-    if not detect_map_type(tokens):
+    info = CLASSIFIER.classify(filename)
+    if not info.map_type:
         return None
-    return detect_asset_name(tokens)
+    return info.asset
 
 def is_in_package(filename: str | Path, package_name: str | Path) -> bool:
     """
@@ -396,6 +537,8 @@ class TextureFile:
     udim: Optional[int]
     extension: str
     normal_format: Optional[str] = None
+    # 扫描时记录的修改时间(ns), 未知为None
+    mtime: Optional[int] = None
 
     def format_priority(self) -> int:
         """Get the numeric priority of the file extension."""
@@ -422,6 +565,8 @@ class PBRPackage:
     udim_tiles: dict[str, list[str]] = field(default_factory=dict)
     resolution: Optional[int] = None
     workflow: Optional[str] = None
+    # 选定贴图的修改时间(ns), 来自扫描结果
+    mtimes: dict[str, int] = field(default_factory=dict, repr=False)
 
     def __getattr__(self, name: str) -> Optional[str]:
         """Dynamic access to textures using PBR_SLOTS names."""
@@ -469,6 +614,8 @@ class PBRPackage:
             
             best = files[0]
             self.selected[map_type] = best.path
+            if best.mtime is not None:
+                self.mtimes[best.path] = best.mtime
             
             # 最高分辨率
             if best.resolution:
@@ -525,67 +672,292 @@ class PBRPackage:
 # Scanner
 # =========================================================
 
+class ScanIndex:
+    """
+    Persistent index of a library scan, stored as a compact JSON-lines file.
+
+    The first line is a header (version and root), each other line is one directory:
+    its mtime, the sub directories and the parsed texture files as
+    ``[name, size, mtime, asset, map_type, resolution, udim, extension, normal_format]``.
+    A directory whose mtime did not change is reused without listing or parsing it again.
+    The metadata only depends on the file name, so a texture overwritten in place is still valid,
+    but its size and mtime stay the ones of the last listing (overwriting a file does not change the
+    directory mtime), and the mtime is part of the ``DescriptionCache`` key.
+    ``PBRLibraryScanner.scan(force=True)`` lists every directory again.
+
+    Example:
+        >>> index = ScanIndex("C:/Assets/PBR/.pbr_index.jsonl")
+        >>> index.load("C:/Assets/PBR")
+        >>> index.get("C:/Assets/PBR/Rock_01", mtime)
+    """
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.root: Optional[str] = None
+        # dir -> {"mtime": int, "subdirs": list[str], "files": list[list]}
+        self.dirs: dict[str, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.dirs)
+
+    def load(self, root: str) -> bool:
+        """
+        Read the index file, an index of another root or version is discarded.
+
+        Returns:
+            True if the index was loaded.
+        """
+        self.root = root
+        self.dirs = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                header = json.loads(file.readline() or "{}")
+                if header.get("version") != SCAN_INDEX_VERSION or header.get("root") != root:
+                    return False
+                for line in file:
+                    record = json.loads(line)
+                    self.dirs[record.pop("dir")] = record
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.dirs = {}
+            return False
+        return True
+
+    def save(self) -> None:
+        """Write the index file, the old file is replaced only after the new one is complete."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(self.path.name + ".tmp")
+        with open(temp, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"version": SCAN_INDEX_VERSION, "root": self.root}) + "\n")
+            for directory, record in self.dirs.items():
+                file.write(json.dumps({"dir": directory, **record}, separators=(",", ":")) + "\n")
+        os.replace(temp, self.path)
+
+    def get(self, directory: str, mtime: int) -> Optional[dict]:
+        """Get the record of the directory, None if it is unknown or its mtime changed."""
+        record = self.dirs.get(directory)
+        if record is None or record["mtime"] != mtime:
+            return None
+        return record
+
+def _list_directory(directory: str) -> tuple[list[list], list[list]]:
+    """
+    List one directory, the entry type comes from the ``DirEntry`` cache,
+    only the PBR textures are stat'ed.
+
+    Returns:
+        ([name, mtime] of the sub directories, the file records), both sorted by name.
+    """
+    subdirs: list[list] = []
+    files: list[list] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append([entry.name, entry.stat(follow_symlinks=False).st_mtime_ns])
+                        continue
+                    extension = os.path.splitext(entry.name)[1].lower()
+                    if extension not in IMAGE_EXTENSIONS or not entry.is_file():
+                        continue
+                    info = CLASSIFIER.classify(entry.name)
+                    if info.map_type is None:
+                        continue
+                    stat = entry.stat()
+                    files.append([entry.name, stat.st_size, stat.st_mtime_ns, info.asset, info.map_type,
+                                  info.resolution, info.udim, extension, info.normal_format])
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    subdirs.sort()
+    files.sort()
+    return subdirs, files
+
+def _read_directory(directory: str, mtime: int, known: dict[str, dict], stats: dict[str, int]) -> tuple[dict, list[tuple[str, int]]]:
+    """
+    Get the record of one directory, from ``known`` if its mtime did not change, else list it.
+
+    Returns:
+        (the record, [(path, mtime)] of the sub directories)
+    """
+    stats["dirs"] += 1
+    record = known.get(directory)
+    if record is not None and record["mtime"] == mtime:
+        stats["reused"] += 1
+        children: list[tuple[str, int]] = []
+        for name in record["subdirs"]:
+            path = os.path.join(directory, name)
+            try:
+                children.append((path, os.stat(path, follow_symlinks=False).st_mtime_ns))
+            except OSError:
+                continue
+        return record, children
+
+    stats["listed"] += 1
+    subdirs, files = _list_directory(directory)
+    record = {"mtime": mtime, "subdirs": [name for name, _ in subdirs], "files": files}
+    return record, [(os.path.join(directory, name), sub_mtime) for name, sub_mtime in subdirs]
+
+def _walk_records(directory: str, mtime: int, known: dict[str, dict], stats: dict[str, int]) -> Iterator[tuple[str, dict]]:
+    """Yield ``(directory, record)`` of the directory and all its sub directories, depth first in name order."""
+    # 迭代深度优先, 没有递归深度限制
+    # Iterative depth first walk, no recursion limit
+    stack: list[tuple[str, int]] = [(directory, mtime)]
+    while stack:
+        directory, mtime = stack.pop()
+        record, children = _read_directory(directory, mtime, known, stats)
+        stack.extend(reversed(children))
+        yield directory, record
+
+def _new_stats() -> dict[str, int]:
+    return {"dirs": 0, "listed": 0, "reused": 0, "files": 0}
+
+def _scan_shard(directory: str, mtime: int, known: dict[str, dict]) -> tuple[list[tuple[str, dict]], dict[str, int]]:
+    """
+    Walk one shard (a top level directory), run in a worker thread or process.
+
+    Returns:
+        ([(directory, record)], stats)
+    """
+    stats = _new_stats()
+    return list(_walk_records(directory, mtime, known, stats)), stats
+
+def _shard_records(known: dict[str, dict], directory: str) -> dict[str, dict]:
+    """The part of the known records under the directory, sent to a worker process."""
+    prefix = directory + os.sep
+    return {path: record for path, record in known.items() if path == directory or path.startswith(prefix)}
+
 class PBRLibraryScanner:
     """
     Recursively scans directories to group individual texture files into coherent PBR packages.
 
+    The walk uses ``os.scandir`` and streams the textures, with ``index_path`` the parsed result
+    is kept on disk and a rescan only lists the directories whose mtime changed.
+    A texture overwritten in place keeps its old mtime in the index, ``scan(force=True)`` lists everything.
+    With ``workers`` the top level directories are scanned as shards in a thread pool
+    (NAS listing is I/O bound) or a process pool (``processes=True``, for the parsing),
+    the shards are merged in name order so the result is the same as the serial scan.
+
     Example:
-        >>> scanner = PBRLibraryScanner("/path/to/textures")
+        >>> scanner = PBRLibraryScanner("/path/to/textures", index_path="/path/to/textures/.pbr_index.jsonl")
         >>> scanner.scan()
         >>> for pkg in scanner.packages.values():
-        ...     print(pkg.name, pkg.resolution)
+        ...     print(pkg.asset_name, pkg.resolution)
+        >>> scanner.stats
+        {'dirs': 120, 'listed': 1, 'reused': 119, 'files': 2400}
+        >>> packages = PBRLibraryScanner("/path/to/textures").build(workers=8)
     """
-    def __init__(self, root: str | Path):
+    def __init__(self, root: str | Path, index_path: Optional[str | Path] = None):
         self.root = root
         self.packages: dict[str, PBRPackage] = {}
-
-    def scan(self) -> None:
-        """Performs the directory walk and metadata extraction."""
-        # 建议优化点：对于海量文件，使用 os.scandir 比 os.path 更快
-        # Using pathlib for cleaner directory walking
-        root_path = Path(self.root)
-        if not root_path.exists():
+        self.index: Optional[ScanIndex] = ScanIndex(index_path) if index_path else None
+        self.stats: dict[str, int] = {}
+
+    def _iter_records(self, workers: int = 1, processes: bool = False, force: bool = False) -> Iterator[tuple[str, dict]]:
+        """Yield ``(directory, record)`` of the library in the serial order, the index is saved when complete."""
+        root = os.path.abspath(self.root)
+        self.stats = _new_stats()
+        try:
+            root_mtime = os.stat(root).st_mtime_ns
+        except OSError:
+            return
+        if not os.path.isdir(root):
             return
 
-        for p in root_path.rglob("*"):
-            if not p.is_file() or p.suffix.lower() not in IMAGE_EXTENSIONS:
-                continue
+        known: dict[str, dict] = {}
+        if self.index is not None:
+            self.index.load(root)
+            # a forced scan lists everything, the index is rewritten at the end
+            known = {} if force else self.index.dirs
+        dirs: dict[str, dict] = {}
+
+        if workers <= 1:
+            for directory, record in _walk_records(root, root_mtime, known, self.stats):
+                dirs[directory] = record
+                yield directory, record
+        else:
+            # 根目录在主线程读取, 每个一级子目录是一个分片
+            # The root is read here, each top level directory is a shard
+            record, shards = _read_directory(root, root_mtime, known, self.stats)
+            dirs[root] = record
+            yield root, record
+
+            if processes:
+                from concurrent.futures import ProcessPoolExecutor as Executor
+                shard_known = [_shard_records(known, path) for path, _ in shards]
+            else:
+                from concurrent.futures import ThreadPoolExecutor as Executor
+                shard_known = [known] * len(shards)
+
+            with Executor(max_workers=workers) as pool:
+                # map keeps the shard order, the merge is deterministic
+                results = pool.map(_scan_shard, [path for path, _ in shards], [mtime for _, mtime in shards], shard_known)
+                for records, stats in results:
+                    for key in ("dirs", "listed", "reused"):
+                        self.stats[key] += stats[key]
+                    for directory, record in records:
+                        dirs[directory] = record
+                        yield directory, record
+
+        if self.index is not None:
+            self.index.dirs = dirs
+            self.index.save()
+
+    def iter_scan(self, workers: int = 1, processes: bool = False, force: bool = False) -> Iterator[TextureFile]:
+        """
+        Walk the library and yield the textures directory by directory.
+        The index is saved when the walk is complete.
 
-            filename = p.name
-            tokens = tokenize(filename)
-            map_type = detect_map_type(tokens)
+        Args:
+            workers: The count of parallel shards, 1 to scan in the current thread.
+            processes: True to use a process pool instead of a thread pool.
+            force: True to list every directory, for the textures overwritten in place.
 
-            if not map_type:
-                continue
+        Example:
+            >>> for tex in PBRLibraryScanner("C:/Assets/PBR/").iter_scan():
+            ...     print(tex.asset, tex.map_type)
+        """
+        for directory, record in self._iter_records(workers, processes, force):
+            for name, _, mtime, asset, map_type, resolution, udim, extension, normal_format in record["files"]:
+                self.stats["files"] += 1
+                yield TextureFile(
+                    path=os.path.join(directory, name),
+                    asset=asset,
+                    map_type=map_type,
+                    resolution=resolution,
+                    udim=udim,
+                    extension=extension,
+                    normal_format=normal_format,
+                    mtime=mtime
+                )
+
+    def scan(self, workers: int = 1, processes: bool = False, force: bool = False) -> None:
+        """
+        Performs the directory walk and metadata extraction.
+        An asset whose textures are in several directories or shards is merged into one package.
+        With ``force`` every directory is listed again, see ``iter_scan``.
+        """
+        for tex in self.iter_scan(workers, processes, force):
+            if tex.asset not in self.packages:
+                self.packages[tex.asset] = PBRPackage(tex.asset)
 
-            asset = detect_asset_name(tokens)
-            
-            tex = TextureFile(
-                path=str(p.absolute()),
-                asset=asset,
-                map_type=map_type,
-                resolution=detect_resolution(filename),
-                udim=detect_udim(filename),
-                extension=p.suffix.lower(),
-                normal_format=detect_normal_format(tokens)
-            )
-
-            if asset not in self.packages:
-                self.packages[asset] = PBRPackage(asset)
-
-            self.packages[asset].add_texture(tex)
-
-    def build(self) -> dict[str, PBRPackage]:
+            self.packages[tex.asset].add_texture(tex)
+
+    def build(self, workers: int = 1, processes: bool = False, force: bool = False) -> dict[str, PBRPackage]:
         """
         Scans, resolves and returns the final package dictionary.
 
+        Args:
+            workers: The count of parallel shards, 1 to scan in the current thread.
+            processes: True to use a process pool instead of a thread pool.
+            force: True to list every directory, for the textures overwritten in place.
+
         Example:
             >>> scanner = PBRLibraryScanner("C:/Assets/PBR/")
-            >>> packages = scanner.build()
+            >>> packages = scanner.build(workers=8)
             >>> for name, pkg in packages.items():
             ...     print(name, pkg.workflow)
         """
-        self.scan()
+        self.scan(workers, processes, force)
         for pkg in self.packages.values():
             pkg.resolve()
         return self.packages
@@ -602,12 +974,11 @@ def _build_package_from_paths(paths: list[str], asset_name: str, resolution: Opt
     package = PBRPackage(asset_name)
     for p in paths:
         path_obj = Path(p)
-        tokens = tokenize(path_obj.name)
-        map_type = detect_map_type(tokens)
-        if not map_type:
+        info = CLASSIFIER.classify(path_obj.name)
+        if not info.map_type:
             continue
             
-        file_res = detect_resolution(path_obj.name)
+        file_res = info.resolution
         # If a specific resolution is requested, filter out others
         if resolution is not None and file_res is not None and file_res != resolution:
             continue
@@ -615,11 +986,11 @@ def _build_package_from_paths(paths: list[str], asset_name: str, resolution: Opt
         tex = TextureFile(
             path=str(path_obj.absolute()),
             asset=asset_name,
-            map_type=map_type,
+            map_type=info.map_type,
             resolution=file_res,
-            udim=detect_udim(path_obj.name),
+            udim=info.udim,
             extension=path_obj.suffix.lower(),
-            normal_format=detect_normal_format(tokens)
+            normal_format=info.normal_format
         )
         package.add_texture(tex)
         
@@ -641,8 +1012,7 @@ def pbr_from_file(file_path: str | Path, resolution: Optional[int] = None) -> Op
         return None
 
     # Identify the asset name from the input file
-    tokens = tokenize(path.name)
-    asset_name = detect_asset_name(tokens)
+    asset_name = CLASSIFIER.classify(path.name).asset
     
     # Get all sibling images belonging to this asset
     paths = GetPBRImages(path.parent, asset_name)
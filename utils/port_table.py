@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Process-wide cache of the converter port tables (constants/*.json) used by ConverterPorts."""
+import os
+import json
+import time
+import threading
+from typing import Optional
+
+# Seconds between two mtime checks of a loaded table.
+MTIME_CHECK_INTERVAL: float = 1.0
+
+
+class PortTable:
+    """
+    The compiled converter port data of one json file.
+
+    Lookups accept the full asset id or the short id (no prefix, e.g. "texturesampler"),
+    the short id is only indexed when it is unique in the file.
+    The ports can be returned as the full id or trimmed by the asset id (e.g. "outcolor").
+
+    PortTable 把json编译为字典, 支持完整asset id和去掉前缀的短id查询.
+    """
+
+    def __init__(self, path: str, data: dict, mtime: float = 0.0) -> None:
+        self.path: str = path
+        self.mtime: float = mtime
+        self.checked: float = time.monotonic()
+        self.inputs: dict = {}
+        self.outputs: dict = {}
+        self.trimmed_inputs: dict = {}
+        self.trimmed_outputs: dict = {}
+        self.aliases: dict = {}
+
+        short_ids: dict = {}
+        for asset_id, item in data.items():
+            if not isinstance(item, dict):
+                continue
+            inPort = item.get("input", "") or ""
+            outPort = item.get("output", "") or ""
+            self.inputs[asset_id] = inPort
+            self.outputs[asset_id] = outPort
+            self.trimmed_inputs[asset_id] = self._Trim(asset_id, inPort)
+            self.trimmed_outputs[asset_id] = self._Trim(asset_id, outPort)
+            short_id = asset_id.split(".")[-1]
+            short_ids.setdefault(short_id, []).append(asset_id)
+
+        for short_id, asset_ids in short_ids.items():
+            if len(asset_ids) == 1 and short_id not in self.inputs:
+                self.aliases[short_id] = asset_ids[0]
+
+    def __len__(self) -> int:
+        return len(self.inputs)
+
+    @staticmethod
+    def _Trim(asset_id: str, port: str) -> str:
+        prefix = asset_id + "."
+        if port.startswith(prefix):
+            return port[len(prefix):]
+        return port
+
+    def Resolve(self, asset_id: str) -> Optional[str]:
+        """
+        Args:
+            asset_id (str): the full asset id or the short id
+
+        Returns:
+            Optional[str]: the full asset id, None if not in the table.
+        """
+        if asset_id in self.inputs:
+            return asset_id
+        return self.aliases.get(asset_id)
+
+    def GetInput(self, asset_id: str, trim: bool = False) -> str:
+        """
+        Args:
+            asset_id (str): the full asset id or the short id
+            trim (bool, optional): True to return the port id without the asset id prefix. Defaults to False.
+
+        Returns:
+            str: the default in port, else ""
+        """
+        table = self.trimmed_inputs if trim else self.inputs
+        port = table.get(asset_id)
+        if port is None:
+            port = table.get(self.aliases.get(asset_id), "")
+        return port
+
+    def GetOutput(self, asset_id: str, trim: bool = False) -> str:
+        """
+        Args:
+            asset_id (str): the full asset id or the short id
+            trim (bool, optional): True to return the port id without the asset id prefix. Defaults to False.
+
+        Returns:
+            str: the default out port, else ""
+        """
+        table = self.trimmed_outputs if trim else self.outputs
+        port = table.get(asset_id)
+        if port is None:
+            port = table.get(self.aliases.get(asset_id), "")
+        return port
+
+
+_tables: dict = {}
+_lock = threading.Lock()
+
+
+def GetPortTable(path: str) -> PortTable:
+    """
+    Get the compiled table of the json file, the file is parsed once per process
+    and parsed again only when its mtime changed.
+
+    Args:
+        path (str): the json file path
+
+    Returns:
+        PortTable: the table
+    """
+    table: PortTable = _tables.get(path)
+    now = time.monotonic()
+    if table is not None and now - table.checked < MTIME_CHECK_INTERVAL:
+        return table
+
+    with _lock:
+        table = _tables.get(path)
+        mtime = os.stat(path).st_mtime
+        if table is not None and table.mtime == mtime:
+            table.checked = now
+            return table
+        with open(path, 'r', encoding='UTF-8') as file:
+            data: dict = json.loads(file.read())
+        table = PortTable(path, data, mtime)
+        _tables[path] = table
+        return table
+
+
+def ClearPortTables() -> None:
+    """
+    Drop all the cached tables.
+    """
+    with _lock:
+        _tables.clear()
+
+
+__all__ = [
+    "PortTable",
+    "GetPortTable",
+    "ClearPortTables",
+]
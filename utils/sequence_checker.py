@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+Check a finished render output folder before the failed chunks are sent to the farm again:
+the missing frames of every image sequence and the zero byte, truncated or broken frames.
+
+The frames are not decoded, only their structure is read from a memory map of the file
+(the EXR offset table, the PNG IEND chunk, the TIFF strips, the JPEG EOI marker) in a thread pool.
+This module has no c4d import, ``Renderer.utils.CheckRenderOutput`` takes the frame range from the render settings.
+
+渲染输出检查: 缺帧/空文件/不完整文件, 只读取文件结构不解码, 多线程 + mmap.
+
+Example:
+
+    checker = SequenceChecker(r'D:\\render\\shot010', start=1, end=240)
+    for report in checker.check():
+        print(report)
+        print(report.bad_ranges())
+"""
+import os
+import mmap
+import time
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .image_helper import SEQUENCE_PATTERN, Sequence, SequenceIndex
+
+CHECK_WORKERS: int = 8
+
+STATUS_OK: str = "ok"
+STATUS_MISSING: str = "missing"
+STATUS_EMPTY: str = "empty"
+STATUS_TRUNCATED: str = "truncated"
+STATUS_INVALID: str = "invalid"
+
+# scanlines per chunk of the EXR compressions
+EXR_LINES_PER_CHUNK: dict[int, int] = {0: 1, 1: 1, 2: 1, 3: 16, 4: 32, 5: 16, 6: 32, 7: 32, 8: 32, 9: 256}
+EXR_TILED: int = 0x200
+EXR_DEEP: int = 0x800
+EXR_MULTIPART: int = 0x1000
+
+
+# ====================================================
+# Frame structure / 文件结构检查
+# ====================================================
+
+def _read_exr_header(data: mmap.mmap, offset: int, size: int) -> tuple[dict, int]:
+    # the attributes of one header, raise IndexError past the end of the file
+    attributes = {}
+    while True:
+        if offset >= size:
+            raise IndexError
+        if data[offset] == 0:
+            return attributes, offset + 1
+        name_end = data.find(b"\0", offset, size)
+        type_end = data.find(b"\0", name_end + 1, size)
+        if name_end < 0 or type_end < 0 or type_end + 5 > size:
+            raise IndexError
+        length = struct.unpack_from("<i", data, type_end + 1)[0]
+        value = type_end + 5
+        if length < 0 or value + length > size:
+            raise IndexError
+        attributes[bytes(data[offset:name_end])] = (value, length)
+        offset = value + length
+
+def _exr_chunk_count(data: mmap.mmap, attributes: dict, tiled: bool) -> Optional[int]:
+    if b"chunkCount" in attributes:
+        return struct.unpack_from("<i", data, attributes[b"chunkCount"][0])[0]
+    if tiled or b"dataWindow" not in attributes:
+        return None
+    _, ymin, _, ymax = struct.unpack_from("<iiii", data, attributes[b"dataWindow"][0])
+    compression = data[attributes[b"compression"][0]] if b"compression" in attributes else 0
+    lines = EXR_LINES_PER_CHUNK.get(compression)
+    return -(-(ymax - ymin + 1) // lines) if lines else None
+
+def check_exr(data: mmap.mmap, size: int) -> str:
+    """
+    The headers, the offset tables and the last chunk of an OpenEXR file.
+    """
+    if size < 8 or data[:4] != b"\x76\x2f\x31\x01":
+        return STATUS_INVALID
+    flags = struct.unpack_from("<I", data, 4)[0]
+    tiled = bool(flags & EXR_TILED)
+    multipart = bool(flags & EXR_MULTIPART)
+    try:
+        headers = []
+        offset = 8
+        while True:
+            attributes, offset = _read_exr_header(data, offset, size)
+            if not attributes:
+                break
+            headers.append(attributes)
+            if not multipart:
+                break
+        if not headers:
+            return STATUS_INVALID
+
+        counts = [_exr_chunk_count(data, attributes, tiled or b"tiles" in attributes) for attributes in headers]
+        if None in counts:
+            # the tiles of a single part file: the header is all we can check cheaply
+            return STATUS_OK
+        total = sum(counts)
+        if offset + total * 8 > size:
+            return STATUS_TRUNCATED
+        chunks = struct.unpack_from(f"<{total}Q", data, offset)
+        table_end = offset + total * 8
+        # an interrupted write leaves the offsets it did not reach at zero
+        if not chunks or min(chunks) < table_end or max(chunks) >= size:
+            return STATUS_TRUNCATED
+        if flags & EXR_DEEP:
+            return STATUS_OK
+
+        # the last chunk: [part] y|tile coordinates, data size, data
+        last = max(chunks) + (4 if multipart else 0)
+        last += 16 if tiled or b"tiles" in headers[0] else 4
+        if last + 4 > size:
+            return STATUS_TRUNCATED
+        return STATUS_OK if last + 4 + struct.unpack_from("<I", data, last)[0] <= size else STATUS_TRUNCATED
+    except (IndexError, struct.error):
+        return STATUS_TRUNCATED
+
+def check_png(data: mmap.mmap, size: int) -> str:
+    """
+    The signature, the IHDR chunk and the IEND chunk at the end of a PNG file.
+    """
+    if size < 8 or data[:8] != b"\x89PNG\r\n\x1a\n":
+        return STATUS_INVALID
+    if size < 33 or data[12:16] != b"IHDR":
+        return STATUS_TRUNCATED
+    return STATUS_OK if data[size - 12:size] == b"\0\0\0\0IEND\xaeB`\x82" else STATUS_TRUNCATED
+
+def _tiff_values(data: mmap.mmap, size: int, order: str, entry: int) -> list[int]:
+    kind, count = struct.unpack_from(order + "HI", data, entry + 2)
+    code = "H" if kind == 3 else "I"
+    width = 2 if kind == 3 else 4
+    offset = entry + 8 if count * width <= 4 else struct.unpack_from(order + "I", data, entry + 8)[0]
+    if offset + count * width > size:
+        raise IndexError
+    return list(struct.unpack_from(f"{order}{count}{code}", data, offset))
+
+def check_tiff(data: mmap.mmap, size: int) -> str:
+    """
+    The first IFD and the end of its last strip or tile of a TIFF file.
+    """
+    if size < 8 or data[:4] not in (b"II*\0", b"MM\0*", b"II+\0", b"MM\0+"):
+        return STATUS_INVALID
+    if data[2:4] in (b"+\0", b"\0+"):
+        # BigTIFF, the header is all we check
+        return STATUS_OK
+    order = "<" if data[:2] == b"II" else ">"
+    try:
+        ifd = struct.unpack_from(order + "I", data, 4)[0]
+        count = struct.unpack_from(order + "H", data, ifd)[0]
+        if ifd + 2 + count * 12 > size:
+            return STATUS_TRUNCATED
+        tags = {}
+        for index in range(count):
+            entry = ifd + 2 + index * 12
+            tag = struct.unpack_from(order + "H", data, entry)[0]
+            if tag in (273, 279, 324, 325):
+                tags[tag] = _tiff_values(data, size, order, entry)
+        offsets = tags.get(273) or tags.get(324)
+        counts = tags.get(279) or tags.get(325)
+        if not offsets or not counts:
+            return STATUS_OK
+        end = max(offset + length for offset, length in zip(offsets, counts))
+        return STATUS_OK if end <= size else STATUS_TRUNCATED
+    except (IndexError, struct.error):
+        return STATUS_TRUNCATED
+
+def check_jpeg(data: mmap.mmap, size: int) -> str:
+    """
+    The SOI and EOI markers of a JPEG file.
+    """
+    if size < 4 or data[:2] != b"\xff\xd8":
+        return STATUS_INVALID
+    return STATUS_OK if data[size - 2:size] == b"\xff\xd9" else STATUS_TRUNCATED
+
+
+# lower case extension -> checker, the other formats are only checked for zero bytes
+FRAME_CHECKERS: dict[str, Callable[[mmap.mmap, int], str]] = {
+    "exr": check_exr,
+    "png": check_png,
+    "tif": check_tiff,
+    "tiff": check_tiff,
+    "jpg": check_jpeg,
+    "jpeg": check_jpeg,
+}
+
+def check_frame(path: str) -> str:
+    """
+    Check a frame file without decoding it.
+
+    Args:
+        path (str): the frame path.
+
+    Returns:
+        str: STATUS_OK, STATUS_MISSING, STATUS_EMPTY, STATUS_TRUNCATED or STATUS_INVALID.
+    """
+    try:
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return STATUS_EMPTY
+            checker = FRAME_CHECKERS.get(os.path.splitext(path)[1][1:].lower())
+            if checker is None:
+                return STATUS_OK
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return checker(data, size)
+    except FileNotFoundError:
+        return STATUS_MISSING
+    except (OSError, ValueError):
+        return STATUS_INVALID
+
+
+# ====================================================
+# Sequence check / 序列检查
+# ====================================================
+
+@dataclass
+class SequenceReport:
+    """
+    The check of one sequence over the expected frames.
+    """
+    sequence: Sequence
+    start: int
+    end: int
+    step: int = 1
+    status: dict[int, str] = field(default_factory=dict)   # frame -> status, the missing frames included
+    elapsed: float = 0.0
+
+    def get_frames(self, status: str) -> list[int]:
+        return sorted(frame for frame, value in self.status.items() if value == status)
+
+    @property
+    def missing(self) -> list[int]:
+        return self.get_frames(STATUS_MISSING)
+
+    @property
+    def empty(self) -> list[int]:
+        return self.get_frames(STATUS_EMPTY)
+
+    @property
+    def truncated(self) -> list[int]:
+        return self.get_frames(STATUS_TRUNCATED)
+
+    @property
+    def invalid(self) -> list[int]:
+        return self.get_frames(STATUS_INVALID)
+
+    @property
+    def bad_frames(self) -> list[int]:
+        """All the frames to render again, sorted."""
+        return sorted(frame for frame, value in self.status.items() if value != STATUS_OK)
+
+    @property
+    def complete(self) -> bool:
+        return not self.bad_frames
+
+    def bad_ranges(self) -> list[tuple[int, int]]:
+        """
+        The bad frames as (first, last) ranges of consecutive frames (by step), e.g. for a farm submission.
+        """
+        result = []
+        for frame in self.bad_frames:
+            if result and frame - result[-1][1] == self.step:
+                result[-1] = (result[-1][0], frame)
+            else:
+                result.append((frame, frame))
+        return result
+
+    def __str__(self) -> str:
+        counts = ", ".join(f"{len(frames)} {name}" for name, frames in (
+            (STATUS_MISSING, self.missing), (STATUS_EMPTY, self.empty),
+            (STATUS_TRUNCATED, self.truncated), (STATUS_INVALID, self.invalid)) if frames)
+        return (f"{self.sequence.prefix}[{'#' * self.sequence.padding}].{self.sequence.extension} | "
+                f"{self.start} - {self.end} | {'complete' if self.complete else counts} | {self.elapsed:.2f} s")
+
+
+class SequenceChecker:
+    """
+    Check the image sequences of a render output folder.
+
+    The expected range defaults to the range of each sequence, pass the render settings range
+    to find the frames missing at the start or the end.
+    """
+
+    def __init__(self, folder: str, start: int = None, end: int = None, step: int = 1,
+                 workers: int = CHECK_WORKERS, pattern: str = SEQUENCE_PATTERN) -> None:
+        """
+        Args:
+            folder (str): the render output folder.
+            start (int, optional): the first expected frame. Defaults to the first frame of each sequence.
+            end (int, optional): the last expected frame. Defaults to the last frame of each sequence.
+            step (int, optional): the frame step of the render settings. Defaults to 1.
+            workers (int, optional): the threads reading the frames. Defaults to CHECK_WORKERS.
+            pattern (str, optional): the sequence pattern of ImageSequence. Defaults to SEQUENCE_PATTERN.
+        """
+        if step < 1:
+            raise ValueError(f'{self.__class__.__name__} Expected a step >= 1, got {step}')
+        self.folder: str = folder
+        self.start: Optional[int] = start
+        self.end: Optional[int] = end
+        self.step: int = step
+        self.workers: int = max(1, workers)
+        self.pattern: str = pattern
+
+    def check_sequence(self, sequence: Sequence) -> SequenceReport:
+        """
+        Check the expected frames of a sequence.
+
+        Args:
+            sequence (Sequence): a sequence of the folder.
+
+        Returns:
+            SequenceReport: the report.
+        """
+        begin = time.perf_counter()
+        start = sequence.start if self.start is None else self.start
+        end = sequence.end if self.end is None else self.end
+        report = SequenceReport(sequence, start, end, self.step)
+        frames = []
+        for frame in range(start, end + 1, self.step):
+            if sequence.has_frame(frame):
+                frames.append(frame)
+            else:
+                report.status[frame] = STATUS_MISSING
+        if frames:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(frames))) as executor:
+                paths = [sequence.get_frame(frame) for frame in frames]
+                report.status.update(zip(frames, executor.map(check_frame, paths)))
+        report.elapsed = time.perf_counter() - begin
+        return report
+
+    def check(self, image_name: str = None) -> list[SequenceReport]:
+        """
+        Check all the sequences of the folder, or only the sequence of #image_name.
+
+        Args:
+            image_name (str, optional): a frame of the sequence to check. Defaults to None.
+
+        Returns:
+            list[SequenceReport]: the reports sorted by sequence.
+        """
+        index = SequenceIndex.get(self.folder, self.pattern)
+        if image_name is not None:
+            sequence = index.find(image_name)
+            return [self.check_sequence(sequence)] if sequence else []
+        return [self.check_sequence(sequence) for sequence in sorted(index, key=lambda item: item.key)]
+
+
+__all__ = [
+    "STATUS_OK",
+    "STATUS_MISSING",
+    "STATUS_EMPTY",
+    "STATUS_TRUNCATED",
+    "STATUS_INVALID",
+    "check_frame",
+    "SequenceReport",
+    "SequenceChecker",
+]
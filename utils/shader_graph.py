@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""Adjacency model for classic (BaseShader) materials, used by the Octane and Corona MaterialHelper."""
+from collections import defaultdict
+from typing import Any, Callable, Iterable, Iterator, Optional
+from .graph_traversal import IterNodes
+
+
+class ShaderGraph:
+    """
+    The connections of a classic material, built from one BaseContainer sweep of the material and each shader.
+
+    A link is ``(slot, child)``, the child shader is plugged into the slot (parameter id) of the owner,
+    the owner is a shader or the material itself (root).
+
+    ShaderGraph 记录 shader -> (slot, 子shader) 和反向的 子shader -> (slot, 父节点), 查询只和连接数有关.
+
+    Example:
+
+        graph = ShaderGraph().Build(material, shaders, get_links=helper.GetConnections)
+        graph.GetLinks(shader)      # [(slot, child), ...]
+        graph.GetParents(shader)    # [(slot, parent), ...]
+
+    """
+
+    def __init__(self, key: Callable[[Any], Any] = None) -> None:
+        """
+        Args:
+            key (Callable, optional): return a hashable key for a shader. Defaults to the object itself.
+        """
+        self._key: Callable[[Any], Any] = key if key is not None else (lambda item: item)
+        self.Clear()
+
+    def __len__(self) -> int:
+        return len(self._shaders)
+
+    def __contains__(self, shader: Any) -> bool:
+        return self._key(shader) in self._shaders
+
+    def __str__(self):
+        return (f"A {self.__class__.__name__} Instance with {len(self._shaders)} shaders and {self.GetLinkCount()} links")
+
+    #=============================================
+    # Build
+    #=============================================
+
+    def Clear(self) -> None:
+        """
+        Remove all the data of the graph.
+        """
+        self.root: Any = None
+        self._shaders: dict = {}                    # shader key -> shader
+        self._links: dict = defaultdict(list)       # owner key -> [(slot, child)]
+        self._parents: dict = defaultdict(list)     # child key -> [(slot, owner)]
+
+    def Build(self, root: Any, shaders: Iterable[Any], get_links: Callable[[Any], Iterable[tuple[int, Any]]]) -> "ShaderGraph":
+        """
+        Build the graph, the links of the root and each shader are read once.
+
+        Args:
+            root (Any): the material
+            shaders (Iterable[Any]): all the shaders of the material
+            get_links (Callable): return the ``(slot, child)`` links of the material or a shader
+
+        Returns:
+            ShaderGraph: the graph self.
+        """
+        self.Clear()
+        self.root = root
+        owners: list = [root]
+        for shader in shaders:
+            self._shaders[self._key(shader)] = shader
+            owners.append(shader)
+
+        for owner in owners:
+            for slot, child in get_links(owner):
+                self._Link(owner, slot, child)
+        return self
+
+    def _Link(self, owner: Any, slot: int, child: Any) -> None:
+        self._links[self._key(owner)].append((slot, child))
+        self._parents[self._key(child)].append((slot, owner))
+
+    def _Unlink(self, owner: Any, slot: int) -> None:
+        owner_key = self._key(owner)
+        links = self._links.get(owner_key)
+        if not links:
+            return
+        for index, (link_slot, child) in enumerate(links):
+            if link_slot == slot:
+                del links[index]
+                parents = self._parents[self._key(child)]
+                parents[:] = [(s, o) for s, o in parents if not (s == slot and self._key(o) == owner_key)]
+                if not parents:
+                    del self._parents[self._key(child)]
+                break
+        if not links:
+            del self._links[owner_key]
+
+    #=============================================
+    # Update
+    #=============================================
+
+    def AddShader(self, shader: Any, links: Iterable[tuple[int, Any]] = None) -> None:
+        """
+        Add a shader to the graph.
+
+        Args:
+            shader (Any): the shader
+            links (Iterable[tuple[int, Any]], optional): the ``(slot, child)`` links of the shader. Defaults to None.
+        """
+        self._shaders[self._key(shader)] = shader
+        for slot, child in links or []:
+            self.SetLink(shader, slot, child)
+
+    def RemoveShader(self, shader: Any) -> None:
+        """
+        Remove a shader, its links and the links to it from the graph.
+
+        Args:
+            shader (Any): the shader
+        """
+        for slot, _ in self.GetLinks(shader):
+            self._Unlink(shader, slot)
+        for slot, owner in self.GetParents(shader):
+            self._Unlink(owner, slot)
+        self._shaders.pop(self._key(shader), None)
+
+    def SetLink(self, owner: Any, slot: int, child: Any) -> None:
+        """
+        Plug the child into the slot of the owner, the old link on the slot is replaced, a None child only remove the link.
+
+        Args:
+            owner (Any): the material or a shader
+            slot (int): the parameter id
+            child (Any): the shader, or None
+        """
+        self._Unlink(owner, slot)
+        if child is not None:
+            self._Link(owner, slot, child)
+
+    def RemoveLink(self, owner: Any, slot: int) -> None:
+        """
+        Remove the link on the slot of the owner.
+
+        Args:
+            owner (Any): the material or a shader
+            slot (int): the parameter id
+        """
+        self._Unlink(owner, slot)
+
+    #=============================================
+    # Query
+    #=============================================
+
+    def IsRoot(self, shader: Any) -> bool:
+        """
+        Args:
+            shader (Any): the shader
+
+        Returns:
+            bool: True if the shader is plugged into the material.
+        """
+        root_key = self._key(self.root)
+        return any(self._key(owner) == root_key for _, owner in self._parents.get(self._key(shader), []))
+
+    def GetShaders(self) -> list:
+        """
+        Returns:
+            list: all the shaders of the material.
+        """
+        return list(self._shaders.values())
+
+    def GetLinks(self, owner: Any) -> list[tuple[int, Any]]:
+        """
+        Args:
+            owner (Any): the material or a shader
+
+        Returns:
+            list[tuple[int, Any]]: the ``(slot, child)`` links of the owner.
+        """
+        return list(self._links.get(self._key(owner), []))
+
+    def GetRootLinks(self) -> list[tuple[int, Any]]:
+        """
+        Returns:
+            list[tuple[int, Any]]: the ``(slot, shader)`` links of the material.
+        """
+        return self.GetLinks(self.root)
+
+    def GetParents(self, shader: Any, include_root: bool = True) -> list[tuple[int, Any]]:
+        """
+        Args:
+            shader (Any): the shader
+            include_root (bool, optional): False to skip the material. Defaults to True.
+
+        Returns:
+            list[tuple[int, Any]]: the ``(slot, owner)`` links the shader plugged into.
+        """
+        parents = self._parents.get(self._key(shader), [])
+        if include_root:
+            return list(parents)
+        root_key = self._key(self.root)
+        return [(slot, owner) for slot, owner in parents if self._key(owner) != root_key]
+
+    def GetSlot(self, shader: Any, owner: Any = None) -> Optional[int]:
+        """
+        Args:
+            shader (Any): the shader
+            owner (Any, optional): the owner to search, None to use the first owner. Defaults to None.
+
+        Returns:
+            Optional[int]: the slot the shader plugged into, None if the shader is not connected.
+        """
+        owner_key = None if owner is None else self._key(owner)
+        for slot, parent in self._parents.get(self._key(shader), []):
+            if owner_key is None or self._key(parent) == owner_key:
+                return slot
+        return None
+
+    def IsConnected(self, shader: Any) -> bool:
+        """
+        Args:
+            shader (Any): the shader
+
+        Returns:
+            bool: True if the shader has any link or is plugged into anything.
+        """
+        shader_key = self._key(shader)
+        return bool(self._links.get(shader_key)) or bool(self._parents.get(shader_key))
+
+    def IterDescendants(self, shader: Any, max_depth: int = None) -> Iterator[Any]:
+        """
+        Yield all the shaders plugged into the shader, include all the chain, each shader once.
+
+        Args:
+            shader (Any): the material or a shader
+            max_depth (int, optional): the max depth to walk. Defaults to None.
+
+        Yields:
+            Iterator[Any]: the shaders before the shader
+        """
+        yield from IterNodes(shader, self.GetLinks, self._key, max_depth=max_depth)
+
+    def IterAncestors(self, shader: Any, include_root: bool = False) -> Iterator[Any]:
+        """
+        Yield all the shaders the shader plugged into, include all the chain, each shader once.
+
+        Args:
+            shader (Any): the shader
+            include_root (bool, optional): True to yield the material too. Defaults to False.
+
+        Yields:
+            Iterator[Any]: the shaders after the shader
+        """
+        yield from IterNodes(shader, lambda item: self.GetParents(item, include_root), self._key)
+
+    def GetReachable(self, slot: int = None) -> list:
+        """
+        Get all the shaders reachable from the material, or from one slot of the material.
+
+        Args:
+            slot (int, optional): the material slot, None for all the slots. Defaults to None.
+
+        Returns:
+            list: the reachable shaders.
+        """
+        if slot is None:
+            return list(self.IterDescendants(self.root))
+
+        result: list = []
+        seen: set = set()
+        for link_slot, child in self.GetRootLinks():
+            if link_slot != slot:
+                continue
+            for shader in [child] + list(self.IterDescendants(child)):
+                shader_key = self._key(shader)
+                if shader_key not in seen:
+                    seen.add(shader_key)
+                    result.append(shader)
+        return result
+
+    def GetOrphans(self) -> list:
+        """
+        Get all the shaders not reachable from the material, they have no effect on the render.
+
+        Returns:
+            list: the orphan shaders.
+        """
+        reachable: set = {self._key(shader) for shader in self.IterDescendants(self.root)}
+        return [shader for shader_key, shader in self._shaders.items() if shader_key not in reachable]
+
+    def GetLinkCount(self) -> int:
+        """
+        Returns:
+            int: the count of links of the graph.
+        """
+        return sum(len(links) for links in self._links.values())
+
+
+__all__ = [
+    "ShaderGraph",
+]
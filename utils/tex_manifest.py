@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+A manifest of the document tex folder: path, size, mtime and image size of every file, updated
+incrementally with the directory mtimes, so the size and budget queries of a scene stats panel are free.
+This module has no c4d import, ``TextureHelper.GetTexManifest`` keeps one per tex folder.
+
+tex文件夹清单: 记录路径/大小/修改时间/分辨率, 依据目录mtime增量更新.
+"""
+import os
+import json
+import struct
+import heapq
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+TEX_MANIFEST_VERSION: int = 1
+JPEG_SOF_MARKERS: frozenset = frozenset((0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF))
+
+
+# ====================================================
+# Image header / 读取图片头获取分辨率
+# ====================================================
+
+def _png_size(file: BinaryIO, head: bytes) -> Optional[tuple[int, int]]:
+    if head[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+def _jpeg_size(file: BinaryIO, head: bytes) -> Optional[tuple[int, int]]:
+    file.seek(2)
+    while True:
+        byte = file.read(1)
+        while byte and byte != b"\xff":
+            byte = file.read(1)
+        while byte == b"\xff":
+            byte = file.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        if marker == 0xD9:
+            return None
+        data = file.read(2)
+        if len(data) != 2:
+            return None
+        length = struct.unpack(">H", data)[0]
+        if marker in JPEG_SOF_MARKERS:
+            data = file.read(5)
+            if len(data) != 5:
+                return None
+            height, width = struct.unpack(">xHH", data)
+            return width, height
+        file.seek(length - 2, os.SEEK_CUR)
+
+def _tiff_size(file: BinaryIO, head: bytes) -> Optional[tuple[int, int]]:
+    order = "<" if head[:2] == b"II" else ">"
+    file.seek(struct.unpack(order + "I", head[4:8])[0])
+    data = file.read(2)
+    if len(data) != 2:
+        return None
+    count = struct.unpack(order + "H", data)[0]
+    size: dict[int, int] = {}
+    for _ in range(count):
+        entry = file.read(12)
+        if len(entry) != 12:
+            break
+        tag, kind = struct.unpack(order + "HH", entry[:4])
+        if tag in (256, 257):
+            size[tag] = struct.unpack(order + ("H" if kind == 3 else "I"), entry[8:10] if kind == 3 else entry[8:12])[0]
+            if len(size) == 2:
+                return size[256], size[257]
+    return None
+
+def _exr_size(file: BinaryIO, head: bytes) -> Optional[tuple[int, int]]:
+    file.seek(8)
+    data = file.read(65536)
+    offset = 0
+    while offset < len(data) and data[offset] != 0:
+        name_end = data.index(b"\0", offset)
+        type_end = data.index(b"\0", name_end + 1)
+        size = struct.unpack("<i", data[type_end + 1:type_end + 5])[0]
+        if data[offset:name_end] == b"dataWindow":
+            xmin, ymin, xmax, ymax = struct.unpack("<iiii", data[type_end + 5:type_end + 21])
+            return xmax - xmin + 1, ymax - ymin + 1
+        offset = type_end + 5 + size
+    return None
+
+def _hdr_size(file: BinaryIO, head: bytes) -> Optional[tuple[int, int]]:
+    file.seek(0)
+    for line in file.read(8192).split(b"\n"):
+        parts = line.split()
+        if len(parts) == 4 and parts[0] in (b"-Y", b"+Y") and parts[2] in (b"+X", b"-X"):
+            return int(parts[3]), int(parts[1])
+    return None
+
+def read_image_size(path: str) -> Optional[tuple[int, int]]:
+    """
+    Read the (width, height) of an image from its header without decoding it.
+    PNG, JPEG, TIFF, EXR, TGA, BMP and HDR are supported.
+
+    Args:
+        path (str): the image path
+
+    Returns:
+        Optional[tuple[int, int]]: the size, None if the format is unknown or the file is broken.
+    """
+    try:
+        with open(path, "rb") as file:
+            head = file.read(32)
+            if head.startswith(b"\x89PNG\r\n\x1a\n"):
+                return _png_size(file, head)
+            if head.startswith(b"\xff\xd8"):
+                return _jpeg_size(file, head)
+            if head[:4] in (b"II*\0", b"MM\0*"):
+                return _tiff_size(file, head)
+            if head.startswith(b"\x76\x2f\x31\x01"):
+                return _exr_size(file, head)
+            if head.startswith(b"#?"):
+                return _hdr_size(file, head)
+            if head.startswith(b"BM") and len(head) >= 26:
+                width, height = struct.unpack("<ii", head[18:26])
+                return width, abs(height)
+            if path.lower().endswith(".tga") and len(head) >= 18:
+                return struct.unpack("<HH", head[12:16])
+    except (OSError, ValueError, struct.error):
+        return None
+    return None
+
+
+# ====================================================
+# Manifest / 清单
+# ====================================================
+
+@dataclass(slots=True)
+class TextureRecord:
+    """
+    A file of the tex folder.
+    """
+    path: str
+    size: int
+    mtime: int      # st_mtime_ns
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.path)[1].lower()
+
+    @property
+    def resolution(self) -> int:
+        """The longest side in pixels, 0 if unknown."""
+        return max(self.width or 0, self.height or 0)
+
+
+class TextureManifest:
+    """
+    The files of a folder (and its sub folders), kept up to date with ``update``.
+
+    A folder whose mtime did not change is not listed again, a changed folder is listed with
+    ``os.scandir`` and only its new or changed files have their image header read.
+    A file overwritten in place does not change the folder mtime, ``update(force=True)`` stats everything.
+
+    Example:
+
+        manifest = TextureManifest(tex_folder).update()
+        manifest.total_size()
+        manifest.largest(10)
+        manifest.over_budget(4096)
+
+    """
+
+    def __init__(self, folder: str, path: str = None) -> None:
+        """
+        Args:
+            folder (str): the tex folder.
+            path (str, optional): a json file to keep the manifest between sessions. Defaults to None.
+        """
+        self.folder: str = os.path.abspath(folder)
+        self.path: Optional[str] = os.path.abspath(path) if path else None
+        self.records: dict[str, TextureRecord] = {}
+        self.dirs: dict[str, dict] = {}     # dir -> {"mtime", "subdirs", "files"}
+        self.stats: dict[str, int] = {"listed": 0, "reused": 0, "headers": 0}
+        self._totals: Optional[tuple[int, dict[str, int]]] = None
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} of {self.folder} with {len(self.records)} files, {self.total_size()} bytes"
+
+    def load(self) -> bool:
+        """
+        Load the json file, a file of another version or folder is ignored.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != TEX_MANIFEST_VERSION or data.get("folder") != self.folder:
+            return False
+        self.dirs = data["dirs"]
+        self.records = {item[0]: TextureRecord(*item) for item in data["records"]}
+        self._totals = None
+        return True
+
+    def save(self) -> None:
+        """
+        Write the json file.
+        """
+        if not self.path:
+            return
+        data = {"version": TEX_MANIFEST_VERSION, "folder": self.folder, "dirs": self.dirs,
+                "records": [[r.path, r.size, r.mtime, r.width, r.height] for r in self.records.values()]}
+        temp = self.path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temp, self.path)
+
+    def _list(self, directory: str, force: bool) -> Optional[dict]:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        known = self.dirs.get(directory)
+        if known is not None and known["mtime"] == mtime and not force:
+            self.stats["reused"] += 1
+            return known
+
+        self.stats["listed"] += 1
+        subdirs, files = [], []
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return None
+        for entry in entries:
+            if self.path and entry.path == self.path:
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append(entry.path)
+            old = self.records.get(entry.path)
+            if old is not None and old.size == stat.st_size and old.mtime == stat.st_mtime_ns:
+                continue
+            self.stats["headers"] += 1
+            size = read_image_size(entry.path)
+            self.records[entry.path] = TextureRecord(entry.path, stat.st_size, stat.st_mtime_ns,
+                                                     *(size if size else (None, None)))
+        listed = set(files)
+        for path in (known or {}).get("files", ()):
+            if path not in listed:
+                self.records.pop(path, None)
+        record = {"mtime": mtime, "subdirs": sorted(subdirs), "files": files}
+        self.dirs[directory] = record
+        self._totals = None
+        return record
+
+    def update(self, force: bool = False) -> "TextureManifest":
+        """
+        Bring the manifest up to date with the folder.
+
+        Args:
+            force (bool, optional): stat all the folders and files, for the files overwritten in place. Defaults to False.
+
+        Returns:
+            TextureManifest: the manifest self.
+        """
+        self.stats = {"listed": 0, "reused": 0, "headers": 0}
+        seen: set[str] = set()
+        stack = [self.folder]
+        while stack:
+            directory = stack.pop()
+            record = self._list(directory, force)
+            if record is None:
+                continue
+            seen.add(directory)
+            stack.extend(reversed(record["subdirs"]))
+
+        # the removed folders
+        for directory in [d for d in self.dirs if d not in seen]:
+            for path in self.dirs.pop(directory)["files"]:
+                self.records.pop(path, None)
+            self._totals = None
+        if self.stats["listed"]:
+            self.save()
+        return self
+
+    # ========== query ==========
+
+    def _get_totals(self) -> tuple[int, dict[str, int]]:
+        if self._totals is None:
+            total, by_extension = 0, {}
+            for record in self.records.values():
+                total += record.size
+                by_extension[record.extension] = by_extension.get(record.extension, 0) + record.size
+            self._totals = (total, by_extension)
+        return self._totals
+
+    def total_size(self) -> int:
+        """The size of all the files in bytes."""
+        return self._get_totals()[0]
+
+    def size_by_extension(self) -> dict[str, int]:
+        """The size in bytes per lower case extension."""
+        return dict(self._get_totals()[1])
+
+    def largest(self, count: int = 10) -> list[TextureRecord]:
+        """The #count largest files, the largest first."""
+        return heapq.nlargest(count, self.records.values(), key=lambda record: record.size)
+
+    def over_budget(self, max_resolution: int) -> list[TextureRecord]:
+        """The images with a side longer than #max_resolution pixels, the largest first."""
+        result = [record for record in self.records.values() if record.resolution > max_resolution]
+        return sorted(result, key=lambda record: record.resolution, reverse=True)
+
+    def get(self, path: str) -> Optional[TextureRecord]:
+        """The record of a file, a relative path is relative to the folder."""
+        return self.records.get(os.path.join(self.folder, path))
+
+
+__all__ = [
+    "read_image_size",
+    "TextureRecord",
+    "TextureManifest",
+]
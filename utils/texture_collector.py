@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Copy the textures of a scene to a folder: dedupe the sources, copy them with a bounded thread pool
+and skip the files already there. This module has no c4d import, ``TextureHelper.CollectTextures``
+gathers the asset records and rewrites the paths.
+
+打包贴图: 去重, 多线程复制, 跳过未修改的文件, 并输出进度与吞吐量报告.
+"""
+import os
+import time
+import shutil
+import hashlib
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Optional
+
+# 复制前的比较方式
+VERIFY_NONE: str = "none"    # an existing file is kept
+VERIFY_SIZE: str = "size"    # size and mtime
+VERIFY_HASH: str = "hash"    # size, then the content hash
+COLLECT_WORKERS: int = 8
+HASH_CHUNK_SIZE: int = 1 << 20
+
+STATUS_COPIED: str = "copied"
+STATUS_SKIPPED: str = "skipped"
+STATUS_FAILED: str = "failed"
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class CopyJob:
+    """
+    A unique source file and its target in the collect folder.
+    """
+    source: str
+    target: str
+    status: Optional[str] = None
+    size: int = 0
+    error: Optional[str] = None
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.target)
+
+
+@dataclass
+class CollectReport:
+    """
+    The result of a collection, ``str(report)`` is a one line summary.
+    """
+    records: int = 0
+    unique: int = 0
+    copied: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes_copied: int = 0
+    seconds: float = 0.0
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Copied bytes per second."""
+        return self.bytes_copied / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.records} records, {self.unique} unique: {self.copied} copied, {self.skipped} skipped, "
+                f"{self.failed} failed, {self.bytes_copied / 1048576:.1f} MB in {self.seconds:.2f} s "
+                f"({self.throughput / 1048576:.1f} MB/s)")
+
+
+class TextureCollector:
+    """
+    Dedupe the texture sources and copy them to the target folder in parallel.
+
+    Example:
+
+        collector = TextureCollector(tex_folder, workers=8)
+        targets = collector.plan(paths)    # {source: target file name}
+        report = collector.copy(lambda done, total, job: print(done, total, job.status))
+
+    """
+
+    def __init__(self, folder: str, workers: int = COLLECT_WORKERS, verify: str = VERIFY_SIZE) -> None:
+        """
+        Args:
+            folder (str): the collect folder.
+            workers (int, optional): the copy threads. Defaults to COLLECT_WORKERS.
+            verify (str, optional): how an existing target is compared, VERIFY_NONE, VERIFY_SIZE or VERIFY_HASH. Defaults to VERIFY_SIZE.
+        """
+        if verify not in (VERIFY_NONE, VERIFY_SIZE, VERIFY_HASH):
+            raise ValueError(f"{self.__class__.__name__} Expected verify in none, size or hash, got {verify}")
+        self.folder: str = folder
+        self.workers: int = max(1, workers)
+        self.verify: str = verify
+        self.jobs: dict[str, CopyJob] = {}
+        self.report: CollectReport = CollectReport()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} to {self.folder} with {len(self.jobs)} files"
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        """The dedupe key of a source path."""
+        return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+    def plan(self, sources: Iterable[str]) -> dict[str, str]:
+        """
+        Dedupe the sources by path, two sources with the same file name get a ``name_1.ext`` target.
+
+        Args:
+            sources (Iterable[str]): the source paths, with duplicates.
+
+        Returns:
+            dict[str, str]: source path to the target file name.
+        """
+        used: dict[str, str] = {os.path.normcase(job.filename): key for key, job in self.jobs.items()}
+        result: dict[str, str] = {}
+        for source in sources:
+            self.report.records += 1
+            key = self.normalize(source)
+            job = self.jobs.get(key)
+            if job is None:
+                stem, ext = os.path.splitext(os.path.basename(source))
+                name, index = stem + ext, 0
+                while os.path.normcase(name) in used:
+                    index += 1
+                    name = f"{stem}_{index}{ext}"
+                used[os.path.normcase(name)] = key
+                job = self.jobs[key] = CopyJob(source, os.path.join(self.folder, name))
+            result[source] = job.filename
+        self.report.unique = len(self.jobs)
+        return result
+
+    def needs_copy(self, source: str, target: str) -> bool:
+        """
+        Check if the target is missing or differs from the source.
+        """
+        try:
+            target_stat = os.stat(target)
+        except OSError:
+            return True
+        if self.verify == VERIFY_NONE:
+            return False
+        source_stat = os.stat(source)
+        if source_stat.st_size != target_stat.st_size:
+            return True
+        if self.verify == VERIFY_HASH:
+            return _file_hash(source) != _file_hash(target)
+        # copy2 keeps the mtime, allow the 2 s resolution of FAT / SMB
+        return abs(source_stat.st_mtime - target_stat.st_mtime) > 2.0
+
+    def _run(self, job: CopyJob) -> CopyJob:
+        try:
+            if self.needs_copy(job.source, job.target):
+                shutil.copy2(job.source, job.target)
+                job.status = STATUS_COPIED
+                job.size = os.path.getsize(job.target)
+            else:
+                job.status = STATUS_SKIPPED
+        except OSError as error:
+            job.status = STATUS_FAILED
+            job.error = str(error)
+        return job
+
+    def copy(self, progress: Callable[[int, int, CopyJob], None] = None) -> CollectReport:
+        """
+        Copy the planned files, ``progress(done, total, job)`` is called in the caller thread.
+
+        Returns:
+            CollectReport: the counts and the throughput.
+        """
+        start = time.perf_counter()
+        jobs = [job for job in self.jobs.values() if job.status is None]
+        os.makedirs(self.folder, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self._run, job) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                job = future.result()
+                if job.status == STATUS_COPIED:
+                    self.report.copied += 1
+                    self.report.bytes_copied += job.size
+                elif job.status == STATUS_SKIPPED:
+                    self.report.skipped += 1
+                else:
+                    self.report.failed += 1
+                    self.report.errors[job.source] = job.error
+                if progress is not None:
+                    progress(done, len(jobs), job)
+        self.report.seconds += time.perf_counter() - start
+        return self.report
+
+    def failed(self) -> set[str]:
+        """The sources that could not be copied."""
+        return {job.source for job in self.jobs.values() if job.status == STATUS_FAILED}
+
+
+__all__ = [
+    "VERIFY_NONE",
+    "VERIFY_SIZE",
+    "VERIFY_HASH",
+    "CopyJob",
+    "CollectReport",
+    "TextureCollector",
+]
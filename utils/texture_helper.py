@@ -3,10 +3,12 @@ import maxon
 from typing import Union,Optional
 import os
 import random
-import itertools
 from pprint import pprint
 import shutil
 import Renderer
+from .texture_collector import TextureCollector, CollectReport, COLLECT_WORKERS, VERIFY_SIZE
+from .tex_manifest import TextureManifest
+from .folder_index import FolderIndex, g_folder_index_cache, find_keyword_textures, find_channel_textures
 #__all__ = ["TextureHelper","Tex"]
 
 # The Asset BrowserID
@@ -108,6 +110,8 @@ class TextureHelper:
         self.root_folder: str = None
         self.diskfile: list = []
         self.assetfile: list = []
+        self.collect_report: Optional[CollectReport] = None
+        self.tex_manifests: dict[str, TextureManifest] = {}
     
     @property
     def repository(self):
@@ -334,122 +338,119 @@ class TextureHelper:
         # print('Full name : ', file)
         return state
     
-    # TEST
-    def CollectTextures(self, doc: c4d.documents.BaseDocument) -> int:
-        
-        newPath: str = self.GetRootTexFolder(doc)
-        
+    # 获取节点贴图路径端口
+    def _GetTexturePathPort(self, node: maxon.GraphNode, nodeSpace: str) -> Optional[maxon.GraphNode]:
+        """
+        Get the path port of a texture node, None if the node space or the node is not supported.
+        """
+        nodeId: str = node.GetId().ToString().split("@")[0]
+        if nodeSpace == Renderer.RS_NODESPACE and nodeId == "texturesampler":
+            port = node.GetInputs().FindChild("com.redshift3d.redshift4c4d.nodes.core.texturesampler.tex0").FindChild("path")
+        elif nodeSpace == Renderer.STANDARD_NODESPACE and nodeId == "image":
+            port = node.GetInputs().FindChild("url").FindChild("path")
+        elif nodeSpace == Renderer.AR_NODESPACE and nodeId == "image":
+            port = node.GetInputs().FindChild("filename").FindChild("path")
+        elif nodeSpace == Renderer.VR_NODESPACE and nodeId == "texbitmap":
+            port = node.GetInputs().FindChild("com.chaos.vray_node.texbitmap.file").FindChild("path")
+        # Here you would have to implement other node spaces as for example the standard 
+        # space, Arnold, etc.
+        else:
+            return None
+        return None if port.IsNullValue() else port
+
+    # 打包贴图
+    def CollectTextures(self, doc: c4d.documents.BaseDocument, workers: int = COLLECT_WORKERS, verify: str = VERIFY_SIZE) -> int:
+        """
+        Copy the local textures of the document to the tex folder and point the shaders and node materials to them.
+
+        The asset records are deduped by source path, the files are copied with a pool of #workers threads and
+        an existing file is skipped when it matches (#verify: size and mtime, content hash or none).
+        The node material paths are rewritten in one transaction per (material, node space).
+        ``self.collect_report`` keeps the counts and the throughput.
+
+        Args:
+            doc (c4d.documents.BaseDocument): the document.
+            workers (int, optional): the copy threads. Defaults to COLLECT_WORKERS.
+            verify (str, optional): VERIFY_SIZE, VERIFY_HASH or VERIFY_NONE. Defaults to VERIFY_SIZE.
+
+        Returns:
+            int: the count of the copied files.
+        """
         if not doc.GetDocumentPath():
             c4d.gui.MessageDialog("Not Save")
             return
-            
-        assetData: list[dict] = []
-        c4d.documents.GetAllAssetsNew(doc, False, "", c4d.ASSETDATA_FLAG_TEXTURESONLY, assetData)
-        
+
+        newPath: str = self.GetRootTexFolder(doc)
         if not os.path.exists(newPath):
             raise IOError(f"Target path '{newPath}' does not exist.")
 
-        copy_num: int = 0
-        skip_num: int = 0
-        
+        # 1. gather
+        assetData: list[dict] = []
+        c4d.documents.GetAllAssetsNew(doc, False, "", c4d.ASSETDATA_FLAG_TEXTURESONLY, assetData)
+        records: list[dict] = [item for item in assetData
+                               if item.get("exists", False) and not item.get("filename", "").startswith("asset:")]
+
+        # 2. dedupe, 3. copy
+        collector = TextureCollector(newPath, workers, verify)
+        collector.report.records = len(assetData) - len(records)
+        targets: dict[str, str] = collector.plan(item["filename"] for item in records)
+
+        def progress(done: int, total: int, job) -> None:
+            c4d.StatusSetBar(int(done * 100 / total))
+            c4d.StatusSetText(f"{job.status.capitalize()} {job.filename} ({done}/{total})")
+
+        report = collector.copy(progress)
+        self.collect_report = report
+        failed: set[str] = collector.failed()
+
+        # 4. rewrite
         doc.StartUndo()
-        
-        for item in assetData:
-            assetExists: bool = item.get("exists", False)
-            nodePath: str = item.get("nodePath", "")
-            nodeSpace: str = item.get("nodeSpace", "")
-            oldPath: str = item.get("filename", "")
-            filename: str = maxon.Url(oldPath).GetName()
+        groups: dict[tuple, list[tuple[str, str]]] = {}
+        for item in records:
+            oldPath: str = item["filename"]
+            if oldPath in failed:
+                continue
+            filename: str = targets[oldPath]
             owner: Optional[c4d.BaseList2D] = item.get("owner", None)
             paramId: int = item.get("paramId", c4d.NOTOK)
-            
-            if not assetExists or oldPath.startswith("asset:"):
-                skip_num += 1
-                c4d.StatusSetText(f"Skipping over Asset {filename}.")
-                continue
-            
-            if os.path.exists(os.path.join(newPath, filename)):
-                skip_num += 1
-                c4d.StatusSetText(f"File {filename} already there.")
-        
-            if not os.path.exists(os.path.join(newPath, filename)) and not oldPath.startswith("asset:"):
-                c4d.StatusSetText(f"Copy file {filename}.")
-                # print(f"{file} copy!")
-                copy_num += 1
-                shutil.copy(oldPath, newPath)
+            nodePath: str = item.get("nodePath", "")
+            nodeSpace: str = item.get("nodeSpace", "")
 
             if isinstance(owner, c4d.BaseShader) and paramId != c4d.NOTOK and nodePath == "":
                 doc.AddUndo(c4d.UNDOTYPE_CHANGE, owner)
                 owner[paramId] = filename
 
             # Node material
-            if isinstance(owner, c4d.BaseMaterial) and nodePath != "" and nodeSpace != "":
-
-                nodeMaterial: c4d.NodeMaterial = owner.GetNodeMaterialReference()
-                if not nodeMaterial:
-                    raise MemoryError(f"Cannot access node material of material.")
-
-                graph: maxon.GraphModelInterface = nodeMaterial.GetGraph(nodeSpace)
-                if graph.IsNullValue():
-                    raise RuntimeError(f"Invalid node space for {owner}: {nodeSpace}")
-
-                # Disable Undo
-                settings: maxon.DataDictionaryInterface = maxon.DataDictionary()
-                
-                with graph.BeginTransaction(settings) as transaction:
+            elif isinstance(owner, c4d.BaseMaterial) and nodePath != "" and nodeSpace != "":
+                groups.setdefault((owner, nodeSpace), []).append((nodePath, filename))
+
+        for (owner, nodeSpace), paths in groups.items():
+            nodeMaterial: c4d.NodeMaterial = owner.GetNodeMaterialReference()
+            if not nodeMaterial:
+                raise MemoryError(f"Cannot access node material of material.")
+
+            graph: maxon.GraphModelInterface = nodeMaterial.GetGraph(nodeSpace)
+            if graph.IsNullValue():
+                raise RuntimeError(f"Invalid node space for {owner}: {nodeSpace}")
+
+            # Disable Undo
+            settings: maxon.DataDictionaryInterface = maxon.DataDictionary()
+            with graph.BeginTransaction(settings) as transaction:
+                for nodePath, filename in paths:
                     node: maxon.GraphNode = graph.GetNode(maxon.NodePath(nodePath))
                     if node.IsNullValue():
                         raise RuntimeError(f"Could not retrieve target node {nodePath} in {graph}.")
-
-                    if (nodeSpace == Renderer.RS_NODESPACE and 
-                        node.GetId().ToString().split("@")[0] == "texturesampler"):
-                        pathPort: maxon.GraphNode = node.GetInputs().FindChild(
-                            "com.redshift3d.redshift4c4d.nodes.core.texturesampler.tex0").FindChild(
-                                "path")
-                        if pathPort.IsNullValue():
-                            continue
-                        
-                        if c4d.GetC4DVersion() >= 2024400: pathPort.SetPortValue(filename)
-                        else: pathPort.SetDefaultValue(filename)
-
-                    elif (nodeSpace == Renderer.STANDARD_NODESPACE and 
-                        node.GetId().ToString().split("@")[0] == "image"):
-                        pathPort: maxon.GraphNode = node.GetInputs().FindChild(
-                            "url").FindChild(
-                                "path")
-                        if pathPort.IsNullValue():
-                            continue
-                        if c4d.GetC4DVersion() >= 2024400: pathPort.SetPortValue(filename)
-                        else: pathPort.SetDefaultValue(filename)
-
-                    elif (nodeSpace == Renderer.AR_NODESPACE and 
-                        node.GetId().ToString().split("@")[0] == "image"):
-                        pathPort: maxon.GraphNode = node.GetInputs().FindChild(
-                            "filename").FindChild(
-                                "path")
-                        if pathPort.IsNullValue():
-                            continue
-                        if c4d.GetC4DVersion() >= 2024400: pathPort.SetPortValue(filename)
-                        else: pathPort.SetDefaultValue(filename)
-
-                    elif (nodeSpace == Renderer.VR_NODESPACE and 
-                        node.GetId().ToString().split("@")[0] == "texbitmap"):
-                        pathPort: maxon.GraphNode = node.GetInputs().FindChild(
-                            "com.chaos.vray_node.texbitmap.file").FindChild(
-                                "path")
-                        if pathPort.IsNullValue():
-                            continue
-                        if c4d.GetC4DVersion() >= 2024400: pathPort.SetPortValue(filename)
-                        else: pathPort.SetDefaultValue(filename)        
-            
-                    # Here you would have to implement other node spaces as for example the standard 
-                    # space, Arnold, etc.
-                    else:
+                    pathPort = self._GetTexturePathPort(node, nodeSpace)
+                    if pathPort is None:
                         continue
-                        
-                    transaction.Commit()
+                    if c4d.GetC4DVersion() >= 2024400: pathPort.SetPortValue(filename)
+                    else: pathPort.SetDefaultValue(filename)
+                transaction.Commit()
 
-        return copy_num
+        doc.EndUndo()
+        c4d.StatusClear()
+        c4d.StatusSetText(str(report))
+        return report.copied
 
     def GetRootTexFolder(self, doc: c4d.documents.BaseDocument) -> str :
         """
@@ -464,13 +465,37 @@ class TextureHelper:
         self.root_folder = tex_folder
         return tex_folder
     
+    def GetTexManifest(self, doc: c4d.documents.BaseDocument = None, force: bool = False) -> TextureManifest:
+        """
+        Get the up to date manifest of the tex folder, one manifest is kept per folder and
+        only the changed folders are listed again.
+
+        Args:
+            doc (c4d.documents.BaseDocument, optional): the document, defaults to the last root folder.
+            force (bool, optional): stat every file, for the files overwritten in place. Defaults to False.
+
+        Returns:
+            TextureManifest: the manifest with total_size, size_by_extension, largest and over_budget queries.
+        """
+        folder: str = self.GetRootTexFolder(doc) if doc is not None else self.root_folder
+        if folder is None:
+            raise ValueError("Expected a document or a root folder")
+        manifest = self.tex_manifests.get(folder)
+        if manifest is None:
+            manifest = self.tex_manifests[folder] = TextureManifest(folder)
+        return manifest.update(force)
+
     def GetRootTexturesSize(self, file_names: list = None) :
+        """
+        Get the size of the files in bytes, all the files of the tex folder if #file_names is None.
+        A relative file name is relative to the tex folder.
+        """
         if file_names is None:
-            file_names = os.listdir(self.root_folder)
+            return self.GetTexManifest().total_size()
             
         total_size = 0        
         for img_file in file_names:
-            total_size += os.path.getsize(img_file)
+            total_size += os.path.getsize(os.path.join(self.root_folder, img_file))
         return total_size
 
     ###  PBR  ###
@@ -486,6 +511,12 @@ class TextureHelper:
         keys = list(set(sum(self.keys_json.values(), [])))
         return keys, self.keys_json
 
+    def GetFolderIndex(self, folder: str) -> FolderIndex:
+        """
+        Get the index of the texture folder, the folder is listed again only when its mtime changed.
+        """
+        return g_folder_index_cache.get(folder)
+
     def get_texture_data(self, texture: str = None):
         
         if texture is None:
@@ -504,40 +535,15 @@ class TextureHelper:
             # 文件名 和 后缀
             fn, ext = os.path.splitext(fn)
 
-            channels = []  # 贴图通道
-            textures = []  # 贴图
-
-            name = ""
-            # 遍历关键词列表，k = 关键词
-            for k in all_keys:
-                if k:
-                    if k in fn:
-                        # 如果贴图文件名中有某个关键词
-                        # 以关键词对文件名拆分，例如：ground_albedo_2k ---> ['ground_', '_2k']
-                        # ['asdasd_4k_', ""]
-                        words = fn.split(k)
-
-                        for k in all_keys:
-                            if k:
-                                # 遍历通道，key = 通道名（原始数据字典中的key）
-                                for key in key_data:
-                                    # 用户的 关键词 在原始数据中的哪个列表里
-                                    if k in key_data[key]:
-                                        for e in self.ext_list:
-                                            # 组合贴图完整路径和名称，开始找贴图
-                                            tex = os.path.join(fp, f"{words[0]}{k}{words[1]}{e}")
-                                            # 如果贴图存在
-                                            if os.path.exists(tex):
-                                                # 在通道列表里加入 通道key，贴图列表里加入 贴图tex
-                                                channels.append(key)
-                                                textures.append(tex)
-                                                name = words[0]
-                                                # 得到了 贴图属于哪个通道 和 贴图路径
+            # 遍历关键词列表, 以关键词对文件名拆分后替换为每个关键词, 在目录索引中查找贴图
+            # 例如：ground_albedo_2k ---> ['ground_', '_2k'] ---> ground_Roughness_2k.jpg
+            channels, textures, name = find_keyword_textures(self.GetFolderIndex(fp), fp, fn, all_keys, key_data, self.ext_list)
+
             # 将两个列表组合成一个字典：
             # {"Diffuse": "D:\Texture\ground_albedo_2k.jpg"} ...
             tex_data = dict(zip(channels, textures))
             #print(tex_data)
-            if name[-1] == "_" or name[-1] == "-" or name[-1] == " ":
+            if name and name[-1] in ("_", "-", " "):
                 name = name[:-1]
             elif name == "":
                 name = "MyMaterial"
@@ -551,13 +557,10 @@ class TextureHelper:
 
         # 用户选择的贴图文件的 路径 和 文件名
         folder_path, file_name = os.path.split(file)
-        all_textures = os.listdir(folder_path)
+        index: FolderIndex = self.GetFolderIndex(folder_path)
 
         # 文件名 和 后缀
         file_name, ext = os.path.splitext(file_name)
-
-        channels = []  # 贴图通道
-        textures = []  # 贴图
         
         all_keys, key_data = self.get_all_keys()
         
@@ -574,15 +577,8 @@ class TextureHelper:
                     name = name[:-1]
                 #print(name)
 
-        for channel in self.keys_json.keys():
-            combinations = list(itertools.product([name], key_data[str(channel)], self.ext_list))
-            for c in combinations:
-                # 贴图组合
-                file = f"{c[0]}_{c[1]}{c[2]}"
-                # 如果list中有同名，判定找到贴图
-                if file in all_textures:                
-                    channels.append(str(channel))
-                    textures.append(os.path.join(folder_path, file))
+        # 贴图组合 {name}_{关键词}{后缀}, 索引中有同名，判定找到贴图
+        channels, textures = find_channel_textures(index, folder_path, name, key_data, self.ext_list)
         # 将两个列表组合成一个字典：
         tex_data = dict(zip(channels, textures))
         return tex_data, name
@@ -594,26 +590,18 @@ class TextureHelper:
         if not os.path.isdir(folder_path) or not os.path.exists(folder_path):
             raise ValueError(f"{folder_path} is not a dir or not exist")
         
-        all_textures = os.listdir(folder_path)
-
-        channels = []  # 贴图通道
-        textures = []  # 贴图
-
         all_keys, key_data = self.get_all_keys()
 
-        name = file
-        for channel in self.keys_json.keys():
-            combinations = list(itertools.product([name], key_data[str(channel)], self.ext_list))
-            for c in combinations:
-                # 贴图组合
-                file = f"{c[0]}_{c[1]}{c[2]}"
-                # 如果list中有同名，判定找到贴图
-                if file in all_textures:
-                    channels.append(str(channel))
-                    textures.append(os.path.join(folder_path, file))
+        # 贴图组合 {name}_{关键词}{后缀}, 索引中有同名，判定找到贴图
+        channels, textures = find_channel_textures(self.GetFolderIndex(folder_path), folder_path, file, key_data, self.ext_list)
         # 将两个列表组合成一个字典：
         tex_data = dict(zip(channels, textures))
         return tex_data
 
 
-g_texture_helper = TextureHelper()
+def __getattr__(name: str):
+    # the shared helper is built on first use, not at import (PEP 562)
+    if name == "g_texture_helper":
+        helper = globals()[name] = TextureHelper()
+        return helper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
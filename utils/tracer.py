@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+A hierarchical span tracer: nested spans opened by a decorator or a context manager, aggregated per name
+(count, total, self time, p50/p95), with counters of the native calls made inside each span, exported as
+Chrome trace events (chrome://tracing, Perfetto) or as a compact text summary.
+
+A disabled tracer costs one attribute check per traced call, spans and events are only made when it is enabled.
+The percentiles come from a fixed log scale histogram per name, the memory of the aggregates does not grow
+with the count of spans.
+
+Example:
+
+    from Renderer.utils.tracer import tracer, trace, span
+
+    @trace
+    def MakeMaterial(...):
+        with span("textures"):
+            ...
+        tracer.count("BeginTransaction")
+
+    tracer.enable()
+    MakeMaterial(...)
+    print(tracer.summary())
+    tracer.export_chrome_trace("/tmp/make_material.json")
+
+分层追踪: 装饰器/上下文管理器的嵌套区间, 按名称汇总次数/总耗时/自身耗时/分位数和原生调用计数, 导出Chrome trace或文本摘要.
+"""
+import os
+import json
+import math
+import time
+import functools
+import threading
+from typing import Any, Callable, Optional, Union
+
+MAX_EVENTS: int = 1_000_000  # events kept for the chrome trace, the aggregates have no limit
+HISTOGRAM_MIN: float = 1e-7  # 100 ns, the upper bound of the first bucket
+HISTOGRAM_STEPS: int = 8     # buckets per doubling, a percentile is at most 9% over the span duration
+HISTOGRAM_SIZE: int = 274    # up to 1e-7 * 2 ** 34 s (about 28 min), the last bucket holds the longer spans
+
+
+class SpanStats:
+    """
+    The aggregate of all the spans of a name, the self time is the time not spent in a child span.
+    The durations are counted in a log scale histogram, ``buckets`` maps a bucket to its count of spans.
+    """
+    __slots__ = ("name", "count", "total", "self_time", "min", "max", "buckets", "counters")
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.count: int = 0
+        self.total: float = 0.0
+        self.self_time: float = 0.0
+        self.min: float = math.inf
+        self.max: float = 0.0
+        self.buckets: dict[int, int] = {}
+        self.counters: dict[str, int] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name}, {self.count} spans, {self.total:.6f} s)"
+
+    def add(self, duration: float, self_time: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.self_time += self_time
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+        # bucket i > 0 holds (HISTOGRAM_MIN * 2 ** ((i - 1) / STEPS), HISTOGRAM_MIN * 2 ** (i / STEPS)]
+        if duration <= HISTOGRAM_MIN:
+            bucket = 0
+        else:
+            bucket = min(int(math.log2(duration / HISTOGRAM_MIN) * HISTOGRAM_STEPS) + 1, HISTOGRAM_SIZE - 1)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """
+        The nearest rank percentile of the span durations, #q in [0, 1].
+        The upper bound of the histogram bucket of the rank, within [min, max] of the durations.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                upper = self.max if bucket == HISTOGRAM_SIZE - 1 else HISTOGRAM_MIN * 2 ** (bucket / HISTOGRAM_STEPS)
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(0.5)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(0.95)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"count": self.count, "total": self.total, "self": self.self_time, "min": self.min if self.count else 0.0,
+                "max": self.max, "p50": self.p50, "p95": self.p95, "counters": dict(self.counters)}
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start", "children", "counters")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Optional[dict]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.children = 0.0
+        self.counters = None
+
+    def __enter__(self) -> "_Span":
+        self.tracer._stack().append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        end = time.perf_counter()
+        self.tracer._close(self, end)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Record nested spans and counters, per thread, while ``enabled``.
+
+    A recursive span is counted at each level in ``total``, ``self`` counts each second once.
+    A counter goes to the innermost open span and to the totals in ``counters``.
+    """
+
+    def __init__(self, max_events: int = MAX_EVENTS) -> None:
+        self.enabled: bool = False
+        self.max_events: int = max_events
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __str__(self) -> str:
+        state = "enabled" if self.enabled else "disabled"
+        return f"{self.__class__.__name__} {state}, {len(self._stats)} spans, {len(self.events)} events"
+
+    def reset(self) -> None:
+        """
+        Clear the aggregates, the counters and the events.
+        """
+        self._stats: dict[str, SpanStats] = {}
+        self.counters: dict[str, int] = {}
+        self.events: list[tuple] = []
+        self.dropped: int = 0
+        self._origin: float = time.perf_counter()
+
+    def enable(self, reset: bool = True) -> None:
+        if reset:
+            self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def span(self, name: str, **args: Any) -> Union[_Span, _NullSpan]:
+        """
+        A context manager timing the block as a span of #name, #args are shown in the chrome trace.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args or None)
+
+    def trace(self, name: Union[str, Callable, None] = None) -> Callable:
+        """
+        Decorate a function to time each call as a span, the name defaults to the qualified name of the function.
+        Used as ``@trace`` or ``@trace("name")``.
+        """
+        if callable(name):
+            return self.trace()(name)
+
+        def decorator(func: Callable) -> Callable:
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, label, None):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        Count #n calls of #name, e.g. a native call like ``FindChild``, in the innermost open span.
+        """
+        if not self.enabled:
+            return
+        stack = self._stack()
+        if stack:
+            span = stack[-1]
+            if span.counters is None:
+                span.counters = {}
+            span.counters[name] = span.counters.get(name, 0) + n
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def _stack(self) -> list:
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def _close(self, span: _Span, end: float) -> None:
+        duration = end - span.start
+        stack = self._stack()
+        # a span closed out of order closes the spans opened in it
+        while stack and stack.pop() is not span:
+            pass
+        if stack:
+            stack[-1].children += duration
+        with self._lock:
+            stats = self._stats.get(span.name)
+            if stats is None:
+                stats = self._stats[span.name] = SpanStats(span.name)
+            stats.add(duration, duration - span.children)
+            if span.counters:
+                for name, n in span.counters.items():
+                    stats.counters[name] = stats.counters.get(name, 0) + n
+            if len(self.events) < self.max_events:
+                self.events.append((span.name, span.start, duration, threading.get_ident(), span.args, span.counters))
+            else:
+                self.dropped += 1
+
+    def stats(self) -> dict[str, SpanStats]:
+        """
+        The aggregates by span name.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """
+        The events in the Chrome trace event format, complete events ("X") in microseconds.
+        """
+        pid = os.getpid()
+        events = []
+        for name, start, duration, tid, args, counters in list(self.events):
+            event = {"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+                     "ts": round((start - self._origin) * 1e6, 3), "dur": round(duration * 1e6, 3)}
+            if args or counters:
+                event["args"] = {**(args or {}), **(counters or {})}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"counters": dict(self.counters), "dropped": self.dropped}}
+
+    def export_chrome_trace(self, path: str) -> str:
+        """
+        Write the chrome trace JSON to #path, open it in chrome://tracing or https://ui.perfetto.dev.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file)
+        return path
+
+    def summary(self, limit: Optional[int] = None, sort: str = "self") -> str:
+        """
+        A text table of the aggregates, sorted by #sort ("self", "total" or "count"), the #limit first rows.
+        """
+        key = {"self": lambda s: s.self_time, "total": lambda s: s.total, "count": lambda s: s.count}.get(sort)
+        if key is None:
+            raise ValueError(f'{self.summary.__name__} Expected a sort of "self", "total" or "count", got {sort}')
+        rows = sorted(self.stats().values(), key=key, reverse=True)[:limit]
+        width = max([len(stats.name) for stats in rows] + [4])
+        lines = [f"{'span':<{width}} {'count':>8} {'total ms':>11} {'self ms':>11} {'p50 ms':>9} {'p95 ms':>9}  counters"]
+        for stats in rows:
+            counters = " ".join(f"{name}={n}" for name, n in sorted(stats.counters.items()))
+            lines.append(f"{stats.name:<{width}} {stats.count:>8} {stats.total * 1e3:>11.3f} "
+                         f"{stats.self_time * 1e3:>11.3f} {stats.p50 * 1e3:>9.3f} {stats.p95 * 1e3:>9.3f}  {counters}")
+        if self.counters:
+            lines.append("counters: " + " ".join(f"{name}={n}" for name, n in sorted(self.counters.items())))
+        if self.dropped:
+            lines.append(f"{self.dropped} events dropped over {self.max_events}")
+        return "\n".join(lines)
+
+
+# the tracer of the package
+tracer: Tracer = Tracer()
+trace = tracer.trace
+span = tracer.span
+
+
+__all__ = [
+    "MAX_EVENTS",
+    "HISTOGRAM_MIN",
+    "HISTOGRAM_STEPS",
+    "HISTOGRAM_SIZE",
+    "SpanStats",
+    "Tracer",
+    "tracer",
+    "trace",
+    "span",
+]